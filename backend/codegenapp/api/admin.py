@@ -0,0 +1,54 @@
+"""
+Admin API endpoints.
+
+Exposes runtime diagnostics such as the event-loop monitor and recent
+trace summaries, so loop stalls and slow executions can be found and
+ranked in production.
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from codegenapp.observability.loop_monitor import loop_monitor
+from codegenapp.observability.tracing import get_tracer
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/loop-monitor")
+async def get_loop_monitor_stats(limit: int = Query(20, ge=1, le=200)):
+    """
+    Get event-loop lag and the call sites that blocked the loop longest.
+
+    Args:
+        limit: Maximum call sites returned
+
+    Returns:
+        Lag summary and call sites ranked by total stall time
+    """
+    if not loop_monitor.running:
+        raise HTTPException(
+            status_code=404,
+            detail="Event-loop monitor is not running (set LOOP_MONITOR_ENABLED=true)"
+        )
+    return loop_monitor.get_stats(limit=limit)
+
+
+@router.delete("/loop-monitor")
+async def reset_loop_monitor_stats():
+    """Clear collected lag samples and call sites"""
+    loop_monitor.reset()
+    return {"success": True}
+
+
+@router.get("/traces")
+async def get_recent_traces(limit: int = Query(20, ge=1, le=100)):
+    """
+    Get critical-path summaries of recently finished traces.
+
+    Args:
+        limit: Maximum traces returned
+
+    Returns:
+        Trace summaries, newest first (empty unless a recording tracer is configured)
+    """
+    return {"traces": get_tracer().get_recent_traces(limit=limit)}
@@ -7,11 +7,12 @@ their execution, and interaction within the CI/CD system.
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 import uuid
 
-from ..database.connection import get_db
+from ..database.async_session import get_async_db
+from ..repositories.async_repositories import AsyncAgentRunRepository, AsyncAuditLogRepository, AsyncProjectRepository
 from ..models import AgentRun, AgentRunStatus, ResponseType, Project, AuditLog, AuditAction
 from ..orchestration.workflow_engine import WorkflowEngine
 from ..orchestration.state_manager import StateManager
@@ -66,7 +67,7 @@ async def create_agent_run(
     run_data: AgentRunCreate,
     background_tasks: BackgroundTasks,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Start a new agent run.
@@ -81,7 +82,7 @@ async def create_agent_run(
         Agent run creation response
     """
     # Validate project exists
-    project = db.query(Project).filter(Project.id == run_data.project_id).first()
+    project = await AsyncProjectRepository(db).get(run_data.project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,7 +117,7 @@ async def list_agent_runs(
     status_filter: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List agent runs with optional filtering.
@@ -131,25 +132,23 @@ async def list_agent_runs(
     Returns:
         List of agent runs
     """
-    query = db.query(AgentRun)
-    
-    if project_id:
-        query = query.filter(AgentRun.project_id == project_id)
-    
+    status_enum = None
     if status_filter:
         try:
             status_enum = AgentRunStatus(status_filter)
-            query = query.filter(AgentRun.status == status_enum)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status: {status_filter}"
             )
     
-    # Order by creation time (newest first)
-    query = query.order_by(AgentRun.created_at.desc())
-    
-    agent_runs = query.offset(offset).limit(limit).all()
+    # Ordered by creation time (newest first)
+    agent_runs = await AsyncAgentRunRepository(db).list(
+        project_id=project_id,
+        status=status_enum,
+        limit=limit,
+        offset=offset
+    )
     
     return [
         AgentRunResponse(
@@ -175,7 +174,7 @@ async def list_agent_runs(
 
 
 @router.get("/{run_id}", response_model=AgentRunResponse)
-async def get_agent_run(run_id: str, db: Session = Depends(get_db)):
+async def get_agent_run(run_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get a specific agent run by ID.
     
@@ -186,7 +185,7 @@ async def get_agent_run(run_id: str, db: Session = Depends(get_db)):
     Returns:
         Agent run data
     """
-    agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+    agent_run = await AsyncAgentRunRepository(db).get(run_id)
     
     if not agent_run:
         raise HTTPException(
@@ -219,7 +218,7 @@ async def continue_agent_run(
     run_id: str,
     continue_data: AgentRunContinue,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Continue an existing agent run with additional input.
@@ -234,7 +233,7 @@ async def continue_agent_run(
         Continuation response
     """
     # Validate agent run exists
-    agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+    agent_run = await AsyncAgentRunRepository(db).get(run_id)
     if not agent_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -272,7 +271,7 @@ async def handle_plan_response(
     run_id: str,
     plan_data: PlanResponse,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Handle user response to a plan-type agent response.
@@ -287,7 +286,7 @@ async def handle_plan_response(
         Plan response handling result
     """
     # Validate agent run exists
-    agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+    agent_run = await AsyncAgentRunRepository(db).get(run_id)
     if not agent_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -325,7 +324,7 @@ async def handle_plan_response(
 async def cancel_agent_run(
     run_id: str,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Cancel a running agent run.
@@ -339,7 +338,7 @@ async def cancel_agent_run(
         Cancellation response
     """
     # Validate agent run exists
-    agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+    agent_run = await AsyncAgentRunRepository(db).get(run_id)
     if not agent_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -360,8 +359,7 @@ async def cancel_agent_run(
                 project_id=agent_run.project_id,
                 user_id=user_id
             )
-            db.add(audit_log)
-            db.commit()
+            await AsyncAuditLogRepository(db).add(audit_log)
             
             return {
                 "success": True,
@@ -384,7 +382,7 @@ async def cancel_agent_run(
 async def retry_agent_run(
     run_id: str,
     user_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retry a failed agent run.
@@ -398,7 +396,7 @@ async def retry_agent_run(
         Retry response
     """
     # Validate agent run exists and can be retried
-    agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+    agent_run = await AsyncAgentRunRepository(db).get(run_id)
     if not agent_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -421,9 +419,11 @@ async def retry_agent_run(
         )
         
         # Update original run to reference the retry
-        agent_run.continuation_context = agent_run.continuation_context or {}
-        agent_run.continuation_context["retried_as"] = result["run_id"]
-        db.commit()
+        agent_run.continuation_context = {
+            **(agent_run.continuation_context or {}),
+            "retried_as": result["run_id"]
+        }
+        await db.commit()
         
         return {
             "success": True,
@@ -439,7 +439,7 @@ async def retry_agent_run(
 
 
 @router.get("/{run_id}/status", response_model=dict)
-async def get_agent_run_status(run_id: str, db: Session = Depends(get_db)):
+async def get_agent_run_status(run_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get current status of an agent run.
     
@@ -473,7 +473,7 @@ async def get_agent_run_status(run_id: str, db: Session = Depends(get_db)):
 async def get_agent_run_logs(
     run_id: str,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get logs for an agent run.
@@ -487,7 +487,7 @@ async def get_agent_run_logs(
         Agent run logs
     """
     # Validate agent run exists
-    agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+    agent_run = await AsyncAgentRunRepository(db).get(run_id)
     if not agent_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -495,10 +495,7 @@ async def get_agent_run_logs(
         )
     
     # Get audit logs for this agent run
-    logs = db.query(AuditLog).filter(
-        AuditLog.entity_id == run_id,
-        AuditLog.entity_type == "agent_run"
-    ).order_by(AuditLog.timestamp.desc()).limit(limit).all()
+    logs = await AsyncAuditLogRepository(db).list_for_entity("agent_run", run_id, limit=limit)
     
     return {
         "success": True,
@@ -12,7 +12,6 @@ from pydantic import BaseModel
 
 from codegenapp.services.github_service import GitHubService, GitHubRepository
 from codegenapp.services.adapters.codegen_adapter import CodegenAdapter
-from codegenapp.services.adapters.web_eval_adapter import WebEvalAdapter
 from codegenapp.websocket.manager import websocket_manager
 from codegenapp.config.settings import get_settings
 
@@ -65,7 +64,6 @@ codegen_service = CodegenAdapter(
     api_token=settings.codegen_api_token,
     base_url=settings.codegen_api_base_url
 )
-web_eval_adapter = WebEvalAdapter()
 
 
 @router.get("/repositories", response_model=List[Dict[str, Any]])
@@ -62,11 +62,10 @@ async def get_workflow_engine() -> CICDWorkflowEngine:
     # In a real application, this would be injected via dependency injection
     # For now, we'll create a mock instance
     from codegenapp.services.adapters.codegen_adapter import CodegenAdapter
-    from codegenapp.websocket.manager import WebSocketManager
+    from codegenapp.websocket.manager import websocket_manager
     from codegenapp.services.webhook_processor import WebhookProcessor
     
     codegen_adapter = CodegenAdapter()
-    websocket_manager = WebSocketManager()
     webhook_processor = WebhookProcessor()
     
     return CICDWorkflowEngine(
@@ -6,11 +6,21 @@ This module handles incoming webhook notifications from GitHub and other service
 
 import logging
 import json
-from typing import Dict, Any
-from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
 
+from codegenapp.config.settings import get_settings
+from codegenapp.observability.metrics import set_gauge_function, webhook_queue_depth, webhook_queue_lag
+from codegenapp.services.webhook_dedup import create_webhook_deduplicator
+from codegenapp.services.webhook_ingress import (
+    WEBHOOK_PAYLOAD_FIELDS, WebhookPayloadTooLargeError, WebhookSignatureError,
+    extract_webhook_fields, read_webhook_body, select_webhook_fields
+)
 from codegenapp.services.webhook_processor import WebhookProcessor
+from codegenapp.services.webhook_queue import (
+    WebhookQueue, WebhookQueueFullError, create_webhook_queue_store
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +29,71 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 # Initialize webhook processor
 webhook_processor = WebhookProcessor()
 
+# Durable queue drained by a bounded worker pool (started in the app lifespan)
+_settings = get_settings()
+webhook_queue = WebhookQueue(
+    create_webhook_queue_store(
+        _settings.webhook_queue_backend,
+        sqlite_path=_settings.webhook_queue_path,
+        redis_url=_settings.redis_url,
+        redis_stream=_settings.webhook_queue_stream
+    ),
+    webhook_processor.process_github_webhook,
+    workers=_settings.webhook_queue_workers,
+    max_attempts=_settings.webhook_queue_max_attempts,
+    max_depth=_settings.webhook_queue_max_depth,
+    lease_seconds=_settings.webhook_queue_lease_seconds
+)
+
+# Queue depth and lag are read only when metrics are scraped
+set_gauge_function(webhook_queue_depth, lambda: webhook_queue.get_stats()["depth"])
+set_gauge_function(webhook_queue_lag, lambda: webhook_queue.get_stats()["lag_seconds"])
+
+# Seen-set of delivery IDs, checked before a delivery is queued
+webhook_deduplicator = create_webhook_deduplicator(
+    _settings.webhook_dedup_backend,
+    ttl=_settings.webhook_dedup_ttl,
+    redis_url=_settings.redis_url
+)
+
+
+async def _accept_github_delivery(
+    event_type: str,
+    payload: Dict[str, Any],
+    delivery_id: Optional[str]
+) -> bool:
+    """
+    Queue a GitHub delivery unless it is a duplicate
+    
+    Args:
+        event_type: Type of GitHub event
+        payload: Webhook payload
+        delivery_id: GitHub delivery ID
+        
+    Returns:
+        bool: False if the delivery was skipped as a duplicate
+    """
+    if await webhook_deduplicator.is_duplicate(delivery_id):
+        logger.info(f"Skipping duplicate GitHub webhook delivery: {delivery_id}")
+        return False
+    
+    try:
+        await webhook_queue.enqueue(
+            event_type=event_type,
+            payload=payload,
+            delivery_id=delivery_id
+        )
+    except Exception:
+        # Let a redelivery through since this one was not accepted
+        await webhook_deduplicator.forget(delivery_id)
+        raise
+    
+    return True
+
 
 @router.post("/github")
 async def handle_github_webhook(
-    request: Request,
-    background_tasks: BackgroundTasks
+    request: Request
 ):
     """
     Handle GitHub webhook notifications
@@ -39,24 +109,47 @@ async def handle_github_webhook(
         if not event_type:
             raise HTTPException(status_code=400, detail="Missing X-GitHub-Event header")
         
-        # Parse the webhook payload
-        payload = await request.json()
+        # Check size and signature over the raw stream before parsing anything
+        body = await read_webhook_body(
+            request,
+            max_bytes=_settings.webhook_max_body_bytes,
+            secret=_settings.github_webhook_secret,
+            signature=request.headers.get("X-Hub-Signature-256")
+        )
         
         logger.info(f"Received GitHub webhook: {event_type} (delivery: {delivery_id})")
         
-        # Process the webhook in the background
-        background_tasks.add_task(
-            webhook_processor.process_github_webhook,
-            event_type=event_type,
-            payload=payload,
-            delivery_id=delivery_id
-        )
+        # Parse only event types the processor handles, keeping only the fields it reads
+        payload = extract_webhook_fields(event_type, body)
+        if payload is None:
+            return JSONResponse(
+                status_code=200,
+                content={"status": "ignored", "event_type": event_type}
+            )
+        
+        # Acknowledge once the delivery is durably queued
+        accepted = await _accept_github_delivery(event_type, payload, delivery_id)
         
         return JSONResponse(
             status_code=200,
-            content={"status": "received", "event_type": event_type}
+            content={"status": "received" if accepted else "duplicate", "event_type": event_type}
         )
         
+    except HTTPException:
+        raise
+    
+    except WebhookPayloadTooLargeError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        raise HTTPException(status_code=413, detail="Webhook payload too large")
+    
+    except WebhookSignatureError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
+    except WebhookQueueFullError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        raise HTTPException(status_code=503, detail="Webhook queue is full")
+    
     except json.JSONDecodeError:
         logger.error("Invalid JSON payload in GitHub webhook")
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
@@ -68,8 +161,7 @@ async def handle_github_webhook(
 
 @router.post("/cloudflare")
 async def handle_cloudflare_webhook(
-    request: Request,
-    background_tasks: BackgroundTasks
+    request: Request
 ):
     """
     Handle Cloudflare Worker webhook notifications
@@ -77,8 +169,10 @@ async def handle_cloudflare_webhook(
     This endpoint receives webhook notifications forwarded by Cloudflare Workers
     """
     try:
-        # Parse the webhook payload
-        payload = await request.json()
+        # Parse the webhook payload once it is known to be within the size limit
+        payload = json.loads(
+            await read_webhook_body(request, max_bytes=_settings.webhook_max_body_bytes)
+        )
         
         # Extract the original event information
         event_type = payload.get("event_type")
@@ -88,21 +182,43 @@ async def handle_cloudflare_webhook(
         logger.info(f"Received Cloudflare webhook: {event_type} from {source}")
         
         # Process based on the original source
+        status = "received"
         if source == "github":
-            background_tasks.add_task(
-                webhook_processor.process_github_webhook,
-                event_type=event_type,
-                payload=original_payload,
-                delivery_id=payload.get("delivery_id")
-            )
+            if event_type not in WEBHOOK_PAYLOAD_FIELDS:
+                status = "ignored"
+            elif not await _accept_github_delivery(
+                event_type,
+                select_webhook_fields(event_type, original_payload),
+                payload.get("delivery_id")
+            ):
+                status = "duplicate"
         else:
             logger.warning(f"Unknown webhook source: {source}")
         
         return JSONResponse(
             status_code=200,
-            content={"status": "received", "source": source, "event_type": event_type}
+            content={
+                "status": status,
+                "source": source,
+                "event_type": event_type
+            }
         )
         
+    except HTTPException:
+        raise
+    
+    except WebhookPayloadTooLargeError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        raise HTTPException(status_code=413, detail="Webhook payload too large")
+    
+    except WebhookSignatureError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
+    except WebhookQueueFullError as e:
+        logger.warning(f"Rejecting webhook: {e}")
+        raise HTTPException(status_code=503, detail="Webhook queue is full")
+    
     except json.JSONDecodeError:
         logger.error("Invalid JSON payload in Cloudflare webhook")
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
@@ -123,11 +239,22 @@ async def webhook_health():
             "endpoints": [
                 "/webhooks/github",
                 "/webhooks/cloudflare"
-            ]
+            ],
+            "queue": webhook_queue.get_stats(),
+            "deduplication": webhook_deduplicator.get_stats()
         }
     )
 
 
+@router.get("/queue")
+async def webhook_queue_stats():
+    """Get webhook queue depth, lag and processing counters"""
+    return JSONResponse(
+        status_code=200,
+        content={**webhook_queue.get_stats(), "deduplication": webhook_deduplicator.get_stats()}
+    )
+
+
 @router.post("/test")
 async def test_webhook(payload: Dict[str, Any]):
     """
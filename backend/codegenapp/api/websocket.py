@@ -6,9 +6,13 @@ with frontend clients.
 """
 
 import logging
+import uuid
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from typing import Optional
 
+from codegenapp.services.adapters.sandbox_logs import sandbox_log_store
+from codegenapp.utils.serialization import dumps_text
+from codegenapp.websocket.connection_manager import connection_manager
 from codegenapp.websocket.manager import websocket_manager
 
 logger = logging.getLogger(__name__)
@@ -50,6 +54,97 @@ async def websocket_endpoint(
         websocket_manager.disconnect(websocket)
 
 
+@router.websocket("/ws/dashboard")
+async def dashboard_websocket_endpoint(
+    websocket: WebSocket,
+    project_id: Optional[str] = Query(None, description="Project ID to subscribe to"),
+    last_seq: Optional[int] = Query(None, description="Last event sequence received before reconnecting"),
+    epoch: Optional[str] = Query(None, description="Epoch sent with the last_seq event")
+):
+    """
+    WebSocket endpoint for dashboard notifications with reconnect replay
+    
+    Args:
+        websocket: WebSocket connection
+        project_id: Optional project ID to subscribe to
+        last_seq: Optional last sequence number seen; missed events are replayed
+        epoch: Optional epoch of last_seq; a mismatch is reported as a replay gap
+    """
+    connection_id = str(uuid.uuid4())
+    await connection_manager.connect(
+        websocket, connection_id, project_id=project_id, last_seq=last_seq, epoch=epoch
+    )
+    
+    try:
+        while True:
+            message = await websocket.receive_json()
+            await connection_manager.handle_message(connection_id, message)
+            
+    except WebSocketDisconnect:
+        connection_manager.disconnect(connection_id)
+        logger.info(f"Dashboard WebSocket disconnected: {connection_id}")
+    except Exception as e:
+        logger.error(f"Dashboard WebSocket error for {connection_id}: {e}")
+        connection_manager.disconnect(connection_id)
+
+
+@router.websocket("/ws/sandboxes/{sandbox_id}/logs")
+async def sandbox_logs_websocket_endpoint(
+    websocket: WebSocket,
+    sandbox_id: str,
+    since_offset: int = Query(0, description="Byte offset to stream from (next_offset of the last chunk seen)")
+):
+    """
+    WebSocket endpoint streaming sandbox output as it is written
+    
+    Args:
+        websocket: WebSocket connection
+        sandbox_id: ID of the sandbox to tail
+        since_offset: Byte offset to resume from
+    """
+    await websocket.accept()
+    
+    buffer = sandbox_log_store.get(sandbox_id)
+    if buffer is None:
+        await websocket.send_json({"type": "error", "message": f"Sandbox {sandbox_id} not found"})
+        await websocket.close(code=4404)
+        return
+    
+    offset = since_offset
+    
+    try:
+        while True:
+            chunk = buffer.read_text(offset)
+            if chunk["text"] or chunk["truncated"]:
+                await websocket.send_text(dumps_text({
+                    "type": "sandbox_logs",
+                    "sandbox_id": sandbox_id,
+                    "offset": chunk["offset"],
+                    "next_offset": chunk["next_offset"],
+                    "truncated": chunk["truncated"],
+                    "text": chunk["text"]
+                }))
+            offset = chunk["next_offset"]
+            
+            if chunk["eof"]:
+                await websocket.send_json({
+                    "type": "sandbox_logs_end",
+                    "sandbox_id": sandbox_id,
+                    "next_offset": offset
+                })
+                await websocket.close()
+                return
+            
+            # Wake on new output; the timeout bounds how long a dead client goes unnoticed.
+            # Bytes of a partly written character alone are not new output.
+            await buffer.wait(offset if chunk["text"] else buffer.end_offset, timeout=30)
+            
+    except WebSocketDisconnect:
+        logger.info(f"Sandbox log stream disconnected: {sandbox_id}")
+    except Exception as e:
+        logger.error(f"Sandbox log stream error for {sandbox_id}: {e}")
+
+
 @router.websocket("/ws/{project_name}")
 async def project_websocket_endpoint(websocket: WebSocket, project_name: str):
     """
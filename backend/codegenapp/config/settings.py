@@ -62,6 +62,120 @@ class Settings(BaseSettings):
         description="Redis URL for task queue"
     )
     
+    # WebSocket broadcast configuration (memory = single process, redis = pub/sub across workers)
+    websocket_broadcast_backend: str = Field(
+        default="memory",
+        description="WebSocket broadcast backend (memory or redis)"
+    )
+    websocket_broadcast_channel_prefix: str = Field(
+        default="codegenapp:ws",
+        description="Redis channel prefix for WebSocket broadcasts"
+    )
+    
+    # Webhook ingestion queue configuration (sqlite file or redis stream)
+    webhook_queue_backend: str = Field(
+        default="sqlite",
+        description="Durable webhook queue backend (sqlite or redis)"
+    )
+    webhook_queue_path: str = Field(
+        default="./data/webhook_queue.db",
+        description="SQLite database file for the webhook queue"
+    )
+    webhook_queue_stream: str = Field(
+        default="codegenapp:webhooks",
+        description="Redis stream name for the webhook queue"
+    )
+    webhook_queue_workers: int = Field(
+        default=4,
+        description="Number of webhook queue workers"
+    )
+    webhook_queue_max_attempts: int = Field(
+        default=5,
+        description="Processing attempts before a webhook is dead-lettered"
+    )
+    webhook_queue_max_depth: int = Field(
+        default=10000,
+        description="Maximum queued webhooks before new deliveries are rejected"
+    )
+    webhook_queue_lease_seconds: float = Field(
+        default=60.0,
+        description="Seconds a claimed webhook stays reserved for a process that stops renewing it"
+    )
+    
+    # Webhook ingress limits (signature checking is skipped when no secret is set)
+    github_webhook_secret: Optional[str] = Field(
+        default=None,
+        description="Secret used to verify GitHub webhook signatures"
+    )
+    webhook_max_body_bytes: int = Field(
+        default=25 * 1024 * 1024,
+        description="Maximum accepted webhook body size in bytes"
+    )
+    
+    # Webhook delivery deduplication (memory = per process, redis = shared seen-set)
+    webhook_dedup_backend: str = Field(
+        default="memory",
+        description="Webhook delivery dedup backend (memory or redis)"
+    )
+    webhook_dedup_ttl: int = Field(
+        default=86400,
+        description="Seconds a webhook delivery ID is remembered"
+    )
+    
+    # Validation verdict cache per (project, commit, pipeline config)
+    validation_cache_backend: str = Field(
+        default="memory",
+        description="Validation result cache backend (memory or redis)"
+    )
+    validation_cache_ttl: int = Field(
+        default=86400,
+        description="Seconds a cached validation verdict is reused"
+    )
+    
+    # Warm snapshot environments per project image
+    snapshot_pool_min_size: int = Field(
+        default=1,
+        description="Idle snapshots kept warm per project image"
+    )
+    snapshot_pool_max_size: int = Field(
+        default=4,
+        description="Maximum idle snapshots kept per project image"
+    )
+    snapshot_pool_idle_timeout: float = Field(
+        default=600.0,
+        description="Seconds an idle snapshot above the minimum is kept before it is destroyed"
+    )
+    
+    # Event-loop monitor (opt-in; heartbeat lag and stacks of stalls)
+    loop_monitor_enabled: bool = Field(
+        default=False,
+        description="Measure event-loop lag and capture stacks of blocking callbacks"
+    )
+    loop_monitor_interval: float = Field(
+        default=0.1,
+        description="Seconds between event-loop heartbeats"
+    )
+    loop_monitor_threshold: float = Field(
+        default=0.1,
+        description="Event-loop lag in seconds above which the blocking stack is captured"
+    )
+    
+    # Metrics (queue gauges are sampled per worker when PROMETHEUS_MULTIPROC_DIR is set)
+    metrics_gauge_sample_interval: float = Field(
+        default=5.0,
+        description="Seconds between queue gauge samples in multiprocess metrics mode"
+    )
+    
+    # Tracing (none = disabled, json = trace files with critical paths, otel = OpenTelemetry)
+    tracing_backend: str = Field(
+        default="none",
+        description="Tracing backend (none, json or otel)"
+    )
+    tracing_dir: str = Field(
+        default="./data/traces",
+        description="Directory for JSON trace files"
+    )
+    
     # Grainchain configuration
     grainchain_config: Dict[str, Any] = Field(
         default_factory=lambda: {
@@ -70,6 +184,15 @@ class Settings(BaseSettings):
             "default_timeout": 300,  # 5 minutes
             "max_concurrent_sandboxes": 10,
             "cleanup_interval": 3600,  # 1 hour
+            "sandbox_backend": "simulated",  # simulated or local (subprocesses)
+            "sandbox_isolation": "auto",  # auto (namespaces/cgroups if available) or none
+            "sandbox_cgroup_root": None,  # writable cgroup v2 directory for sandbox limits
+            "sandbox_log_buffer_bytes": 1024 * 1024,  # output retained per sandbox
+            "sandbox_capacity": {"cpu": None, "memory": "8Gi", "ports": 200},  # cpu None = host CPUs
+            "default_sandbox_resources": {"cpu": 0.5, "memory": "512Mi"},  # reserved when a sandbox sets none
+            "admission_timeout": None,  # seconds a sandbox may queue; None waits indefinitely
+            "reaper_interval": 30,  # seconds between expired-sandbox sweeps
+            "finished_sandbox_retention": 300,  # seconds failed or exited sandboxes stay listed
         },
         description="Grainchain service configuration"
     )
@@ -97,6 +220,10 @@ class Settings(BaseSettings):
             "max_concurrent_evaluations": 5,
             "screenshot_on_failure": True,
             "viewport": {"width": 1280, "height": 720},
+            "agent_path": None,  # vendored checkout; used as-is, works offline
+            "install_dir": "./data/web-eval-agent",  # cloned once when not vendored
+            "repository_url": "https://github.com/zeeeepa/web-eval-agent.git",
+            "workers": 2,  # persistent worker processes
         },
         description="Web-eval-agent service configuration"
     )
@@ -3,8 +3,11 @@ Service Coordinator - Routes workflow steps to appropriate service adapters
 """
 
 import logging
+import time
 from typing import Dict, Any, Protocol
 from codegenapp.models.domain.workflow import WorkflowStep
+from codegenapp.observability.metrics import workflow_step_duration
+from codegenapp.observability.tracing import get_tracer
 from codegenapp.utils.exceptions import ServiceNotFoundError, ActionNotFoundError
 
 logger = logging.getLogger(__name__)
@@ -41,13 +44,21 @@ class ServiceCoordinator:
         
         logger.info(f"🔄 Executing {step.service}.{step.action} for step {step.id}")
         
+        start = time.perf_counter()
+        outcome = "error"
         try:
-            result = await adapter.execute_action(step.action, context)
+            with get_tracer().start_as_current_span(
+                f"{step.service}.{step.action}", {"component": step.service, "step_id": step.id}
+            ):
+                result = await adapter.execute_action(step.action, context)
+            outcome = "success"
             logger.info(f"✅ Successfully executed step {step.id}")
             return result
         except Exception as e:
             logger.error(f"❌ Failed to execute step {step.id}: {e}")
             raise
+        finally:
+            workflow_step_duration.labels(step.service, step.action, outcome).observe(time.perf_counter() - start)
     
     async def health_check_all(self) -> Dict[str, str]:
         """Check health of all registered adapters"""
@@ -16,6 +16,7 @@ from codegenapp.models.domain.workflow import (
 )
 from codegenapp.core.orchestration.coordinator import ServiceCoordinator
 from codegenapp.core.orchestration.state_manager import WorkflowStateManager
+from codegenapp.observability.tracing import get_tracer
 from codegenapp.utils.exceptions import WorkflowExecutionError, StepExecutionError
 
 logger = logging.getLogger(__name__)
@@ -93,6 +94,19 @@ class WorkflowEngine:
         self, 
         execution: WorkflowExecution, 
         workflow: WorkflowDefinition
+    ):
+        """Execute workflow steps in a trace of their own"""
+        with get_tracer().start_as_current_span(
+            "workflow.execute",
+            {"execution_id": execution.id, "workflow_id": workflow.id},
+            new_trace=True
+        ):
+            await self._run_workflow(execution, workflow)
+    
+    async def _run_workflow(
+        self, 
+        execution: WorkflowExecution, 
+        workflow: WorkflowDefinition
     ):
         """Execute workflow steps"""
         try:
@@ -204,13 +218,16 @@ class WorkflowEngine:
         
         # Execute step through coordinator
         try:
-            if step.timeout:
-                result = await asyncio.wait_for(
-                    self.coordinator.execute_step(step, step_context),
-                    timeout=step.timeout
-                )
-            else:
-                result = await self.coordinator.execute_step(step, step_context)
+            with get_tracer().start_as_current_span(
+                "workflow.step", {"step_id": step.id, "step_name": step.name}
+            ):
+                if step.timeout:
+                    result = await asyncio.wait_for(
+                        self.coordinator.execute_step(step, step_context),
+                        timeout=step.timeout
+                    )
+                else:
+                    result = await self.coordinator.execute_step(step, step_context)
             
             return {
                 "status": "completed",
@@ -4,11 +4,15 @@ Provides database connection, models, and utilities.
 """
 
 from .connection import DatabaseManager, get_database_session
+from .async_session import get_async_session, open_async_session, async_session_scope
 from .models import Base, Project, AgentRun, ValidationPipeline
 
 __all__ = [
     'DatabaseManager',
     'get_db_session',
+    'get_async_session',
+    'open_async_session',
+    'async_session_scope',
     'Base',
     'Project',
     'AgentRun',
@@ -3,7 +3,7 @@ FastAPI Backend for Strands-Agents Workflow Orchestration System
 Integrates: Codegen SDK, grainchain, graph-sitter, web-eval-agent
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
@@ -21,6 +21,13 @@ from codegenapp.services.adapters.grainchain_adapter import GrainchainAdapter
 from codegenapp.api.v1.dependencies import set_global_dependencies
 from codegenapp.api.v1.routes.workflow import router as workflow_router
 from codegenapp.models.api.api_models import HealthResponse
+from codegenapp.api.webhooks import webhook_deduplicator, webhook_queue
+from codegenapp.websocket.broadcast import create_broadcast_backend
+from codegenapp.websocket.connection_manager import connection_manager
+from codegenapp.websocket.manager import websocket_manager
+from codegenapp.observability.loop_monitor import loop_monitor
+from codegenapp.observability.metrics import METRICS_CONTENT_TYPE, gauge_sampler, render_metrics
+from codegenapp.observability.tracing import TracingMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +42,8 @@ service_coordinator: ServiceCoordinator = None
 state_manager = None
 codegen_adapter = None
 grainchain_adapter = None
+web_eval_adapter = None
+broadcast_backend = None
 
 
 @asynccontextmanager
@@ -47,8 +56,30 @@ async def lifespan(app: FastAPI):
     
     # Initialize global instances
     global workflow_engine, service_coordinator, state_manager, codegen_adapter, grainchain_adapter
+    global web_eval_adapter, broadcast_backend
     
     try:
+        # Initialize WebSocket broadcast backend shared by all connection managers
+        broadcast_backend = create_broadcast_backend(
+            settings.websocket_broadcast_backend,
+            redis_url=settings.redis_url,
+            channel_prefix=settings.websocket_broadcast_channel_prefix
+        )
+        await broadcast_backend.connect()
+        connection_manager.attach_broadcast_backend(broadcast_backend)
+        websocket_manager.attach_broadcast_backend(broadcast_backend)
+        
+        # Start the opt-in event-loop monitor
+        if settings.loop_monitor_enabled:
+            await loop_monitor.start()
+        
+        # Start draining the durable webhook queue
+        await webhook_queue.start()
+        
+        # Sample queue gauges when metrics are aggregated across workers
+        gauge_sampler.interval = settings.metrics_gauge_sample_interval
+        await gauge_sampler.start()
+        
         # Initialize state manager
         state_manager = StateManagerFactory.create_in_memory_manager()
         await state_manager.start()
@@ -99,12 +130,31 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down Strands-Agents Backend")
     
     # Cleanup services
+    await loop_monitor.stop()
+    await webhook_queue.stop()
+    await gauge_sampler.stop()
+    await webhook_deduplicator.close()
     if state_manager:
         await state_manager.stop()
     if codegen_adapter:
         await codegen_adapter.cleanup()
     if grainchain_adapter:
         await grainchain_adapter.cleanup()
+    if web_eval_adapter:
+        await web_eval_adapter.cleanup()
+    
+    # Stop validations and release snapshots, probe sessions and the verdict cache
+    from codegenapp.validation.pipeline_coordinator import pipeline_coordinator
+    await pipeline_coordinator.close()
+    await connection_manager.disconnect_all()
+    
+    # Close pooled async database connections
+    from codegenapp.database.async_session import dispose_async_engine
+    await dispose_async_engine()
+    if broadcast_backend:
+        connection_manager.detach_broadcast_backend()
+        websocket_manager.detach_broadcast_backend()
+        await broadcast_backend.disconnect()
 
 
 # Create FastAPI app
@@ -141,6 +191,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Trace each request when tracing is enabled; background work it starts inherits the span
+if settings.tracing_backend != "none":
+    app.add_middleware(TracingMiddleware)
+
+
 # Include API routes
 app.include_router(workflow_router, prefix="/api/v1")
 
@@ -156,6 +211,10 @@ app.include_router(websocket_router)
 from codegenapp.api.projects import router as projects_router
 app.include_router(projects_router)
 
+# Include admin routes
+from codegenapp.api.admin import router as admin_router
+app.include_router(admin_router)
+
 
 # Health check endpoint
 @app.get("/health", response_model=HealthResponse)
@@ -186,6 +245,13 @@ async def health_check():
         raise HTTPException(status_code=500, detail="Health check failed")
 
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 # Root endpoint
 @app.get("/")
 async def root():
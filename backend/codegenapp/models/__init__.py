@@ -5,13 +5,15 @@ This module contains all SQLAlchemy models for the CI/CD orchestration platform,
 including projects, agent runs, validation pipelines, and audit logging.
 """
 
+from .base import Base
 from .project import Project, ProjectSettings
 from .agent_run import AgentRun, AgentRunStatus, ResponseType
-from .validation import ValidationPipeline, ValidationStep, ValidationResult
+from .validation import ValidationPipeline, ValidationStep, ValidationResult, ValidationStatus, ValidationStepType
 from .audit_log import AuditLog, AuditAction
 from .github_integration import GitHubIntegration, PullRequest
 
 __all__ = [
+    "Base",
     "Project",
     "ProjectSettings", 
     "AgentRun",
@@ -20,6 +22,8 @@ __all__ = [
     "ValidationPipeline",
     "ValidationStep",
     "ValidationResult",
+    "ValidationStatus",
+    "ValidationStepType",
     "AuditLog",
     "AuditAction",
     "GitHubIntegration",
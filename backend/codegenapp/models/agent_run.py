@@ -11,9 +11,8 @@ from typing import Dict, Any, Optional, List
 from pydantic import BaseModel, Field
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Text, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+from .base import Base
 
 
 class AgentRunStatus(Enum):
@@ -9,9 +9,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, Any, Optional
 from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Enum as SQLEnum
-from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+from .base import Base
 
 
 class AuditAction(Enum):
@@ -0,0 +1,10 @@
+"""
+Declarative base shared by all CodegenApp models.
+
+Models reference each other across modules through foreign keys and
+relationships, so they must be registered in one metadata and registry.
+"""
+
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
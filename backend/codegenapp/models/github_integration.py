@@ -10,9 +10,8 @@ from enum import Enum
 from typing import Dict, Any, Optional
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Text, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+from .base import Base
 
 
 class PullRequestStatus(Enum):
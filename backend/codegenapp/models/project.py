@@ -9,9 +9,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Text, ForeignKey
 from sqlalchemy.orm import relationship
-from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+from .base import Base
 
 
 class Project(Base):
@@ -0,0 +1,6 @@
+"""
+Runtime observability for CodegenApp.
+
+Provides event-loop monitoring, Prometheus metrics for the hot paths and
+request-scoped tracing.
+"""
@@ -0,0 +1,242 @@
+"""
+Event-loop lag and slow-callback monitor.
+
+A heartbeat task sleeps for a fixed interval and records how late it
+wakes up, which is the time the loop spent running other callbacks.
+A watchdog thread notices when a heartbeat is overdue by more than the
+threshold and captures the stack of the event-loop thread while it is
+still stuck, so the blocking call itself shows up. Stalls are
+aggregated by call site (the innermost application frame) and ranked
+by total time lost.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from codegenapp.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between heartbeats
+DEFAULT_HEARTBEAT_INTERVAL = 0.1
+
+# Default lag in seconds above which a stall is captured
+DEFAULT_STALL_THRESHOLD = 0.1
+
+# Default number of call sites kept
+DEFAULT_MAX_CALL_SITES = 200
+
+# Frames kept per captured stack
+DEFAULT_STACK_DEPTH = 30
+
+# Lag samples kept for percentiles
+LAG_SAMPLE_WINDOW = 1000
+
+# Frames from this package are preferred as the call site
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class CallSiteStats:
+    """Stalls attributed to one call site"""
+    call_site: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seen: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "call_site": self.call_site,
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 3),
+            "max_seconds": round(self.max_seconds, 3),
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and captures the stacks of stalls.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        threshold: float = DEFAULT_STALL_THRESHOLD,
+        max_call_sites: int = DEFAULT_MAX_CALL_SITES,
+        stack_depth: int = DEFAULT_STACK_DEPTH
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between heartbeats
+            threshold: Lag in seconds above which a stall's stack is captured
+            max_call_sites: Call sites kept (the ones losing least time are dropped)
+            stack_depth: Frames kept per captured stack
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.max_call_sites = max_call_sites
+        self.stack_depth = stack_depth
+
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self._lag_samples: Deque[float] = deque(maxlen=LAG_SAMPLE_WINDOW)
+        self._call_sites: Dict[str, CallSiteStats] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._pending_stack: Optional[List[traceback.FrameSummary]] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is running"""
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread"""
+        if self.running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event-loop monitor started (interval {self.interval}s, threshold {self.threshold}s)")
+
+    async def stop(self):
+        """Stop the heartbeat and the watchdog thread"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    def reset(self):
+        """Clear collected lag samples and call sites"""
+        with self._lock:
+            self.stall_count = 0
+            self.max_lag = 0.0
+            self._lag_samples.clear()
+            self._call_sites.clear()
+
+    def get_stats(self, limit: int = 20) -> Dict[str, Any]:
+        """
+        Get lag statistics and the call sites losing the most time.
+
+        Args:
+            limit: Maximum call sites returned
+
+        Returns:
+            dict: Lag summary and call sites ranked by total stall time
+        """
+        with self._lock:
+            samples = sorted(self._lag_samples)
+            call_sites = sorted(self._call_sites.values(), key=lambda site: site.total_seconds, reverse=True)
+
+            return {
+                "running": self.running,
+                "interval": self.interval,
+                "threshold": self.threshold,
+                "lag": {
+                    "current": round(self._lag_samples[-1], 4) if self._lag_samples else 0.0,
+                    "mean": round(sum(samples) / len(samples), 4) if samples else 0.0,
+                    "p99": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 4) if samples else 0.0,
+                    "max": round(self.max_lag, 4),
+                },
+                "stalls": self.stall_count,
+                "call_sites": [site.to_dict() for site in call_sites[:limit]],
+            }
+
+    async def _heartbeat(self):
+        """Sleep for the interval and record how late each wake-up is."""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+
+            with self._lock:
+                self._last_beat = now
+                stack, self._pending_stack = self._pending_stack, None
+                self._lag_samples.append(lag)
+                self.max_lag = max(self.max_lag, lag)
+
+                if lag >= self.threshold:
+                    self.stall_count += 1
+                    if stack is not None:
+                        self._record_stall(stack, lag)
+
+            if lag >= self.threshold:
+                logger.warning(f"Event loop blocked for {lag:.3f}s" + (f" in {self._call_site(stack)}" if stack else ""))
+
+    def _watch(self):
+        """Capture the loop thread's stack while a heartbeat is overdue."""
+        check_interval = min(self.interval, self.threshold) / 2
+
+        while not self._stopped.wait(check_interval):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                if overdue < self.threshold or self._pending_stack is not None:
+                    continue
+
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending_stack = traceback.extract_stack(frame, limit=self.stack_depth)
+
+    def _record_stall(self, stack: List[traceback.FrameSummary], duration: float):
+        """Attribute a stall to its call site (called with the lock held)."""
+        call_site = self._call_site(stack)
+        stats = self._call_sites.get(call_site)
+        if stats is None:
+            if len(self._call_sites) >= self.max_call_sites:
+                least = min(self._call_sites.values(), key=lambda site: site.total_seconds)
+                del self._call_sites[least.call_site]
+            stats = self._call_sites[call_site] = CallSiteStats(call_site)
+
+        stats.count += 1
+        stats.total_seconds += duration
+        stats.max_seconds = max(stats.max_seconds, duration)
+        stats.last_seen = time.time()
+        stats.stack = [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in stack]
+
+    @staticmethod
+    def _call_site(stack: List[traceback.FrameSummary]) -> str:
+        """Innermost application frame of a stack, or its innermost frame."""
+        for frame in reversed(stack):
+            if frame.filename.startswith(PACKAGE_DIR):
+                return f"{os.path.relpath(frame.filename, os.path.dirname(PACKAGE_DIR))}:{frame.lineno} in {frame.name}"
+        frame = stack[-1]
+        return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+# Global event-loop monitor (started on startup when enabled)
+loop_monitor = LoopMonitor(
+    interval=get_settings().loop_monitor_interval,
+    threshold=get_settings().loop_monitor_threshold
+)
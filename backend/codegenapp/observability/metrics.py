@@ -0,0 +1,281 @@
+"""
+Prometheus metrics.
+
+Histograms and gauges for the hot paths used to set capacity and SLOs:
+workflow step latency, adapter HTTP calls, database queries, WebSocket
+send queues, webhook queue lag, deployment readiness and graph-sitter
+analysis. Recording a
+sample is a label lookup and a bucket increment; queue depths are read
+only when /metrics is scraped.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` to an
+empty directory shared by the workers (and wiped before they start).
+Samples are then written there, queue depths are sampled periodically by
+each worker, and /metrics aggregates every worker's values.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Directory shared by worker processes; unset for a single process
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Buckets for calls that take milliseconds to seconds
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for steps and analyses that take seconds to minutes
+SLOW_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+workflow_step_duration = Histogram(
+    "codegenapp_workflow_step_duration_seconds",
+    "Workflow step execution time by service and action",
+    ["service", "action", "outcome"],
+    buckets=SLOW_BUCKETS
+)
+
+adapter_http_duration = Histogram(
+    "codegenapp_adapter_http_request_duration_seconds",
+    "Adapter HTTP request time by adapter, method and response status",
+    ["adapter", "method", "status"],
+    buckets=FAST_BUCKETS
+)
+
+db_query_duration = Histogram(
+    "codegenapp_db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ["operation"],
+    buckets=FAST_BUCKETS
+)
+
+websocket_send_duration = Histogram(
+    "codegenapp_websocket_send_duration_seconds",
+    "Time to write one queued message to a WebSocket",
+    buckets=FAST_BUCKETS
+)
+
+websocket_send_queue_depth = Gauge(
+    "codegenapp_websocket_send_queue_depth",
+    "Messages waiting in WebSocket send queues",
+    multiprocess_mode="livesum"
+)
+
+webhook_queue_wait = Histogram(
+    "codegenapp_webhook_queue_wait_seconds",
+    "Time a webhook delivery waited in the queue before its first attempt",
+    buckets=SLOW_BUCKETS
+)
+
+webhook_queue_depth = Gauge(
+    "codegenapp_webhook_queue_depth",
+    "Webhook deliveries queued or in progress",
+    multiprocess_mode="livesum"
+)
+
+webhook_queue_lag = Gauge(
+    "codegenapp_webhook_queue_lag_seconds",
+    "Age of the oldest queued webhook delivery",
+    multiprocess_mode="livemax"
+)
+
+deployment_time_to_ready = Histogram(
+    "codegenapp_deployment_time_to_ready_seconds",
+    "Time from the first readiness probe until a validation deployment was ready",
+    buckets=SLOW_BUCKETS
+)
+
+graph_sitter_analysis_duration = Histogram(
+    "codegenapp_graph_sitter_analysis_duration_seconds",
+    "Graph-sitter analysis time by analysis type",
+    ["analysis_type", "outcome"],
+    buckets=SLOW_BUCKETS
+)
+
+# Statement types recorded as-is; anything else is recorded as OTHER
+DB_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+# Content type of the rendered metrics
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+# Gauges read from callbacks, sampled by GaugeSampler in multiprocess mode
+_gauge_functions: List[Tuple[Gauge, Callable[[], float]]] = []
+
+
+def set_gauge_function(gauge: Gauge, function: Callable[[], float]):
+    """
+    Read a gauge from a callback.
+
+    A single process calls the callback when metrics are scraped. In
+    multiprocess mode a callback gauge would only report the process that
+    serves the scrape, so the value is sampled into the shared directory
+    instead.
+
+    Args:
+        gauge: Gauge without labels
+        function: Callback returning the current value
+    """
+    if MULTIPROCESS_DIR:
+        _gauge_functions.append((gauge, function))
+    else:
+        gauge.set_function(function)
+
+
+def sample_gauges():
+    """Store the current value of every callback gauge"""
+    for gauge, function in _gauge_functions:
+        try:
+            gauge.set(function())
+        except Exception as e:
+            logger.error(f"Failed to sample gauge {gauge._name}: {e}")
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format"""
+    if not MULTIPROCESS_DIR:
+        return generate_latest()
+
+    # This process is scraped now; the other workers report their last sample
+    sample_gauges()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+class GaugeSampler:
+    """
+    Periodically samples callback gauges in multiprocess mode.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start sampling; does nothing for a single process"""
+        if not MULTIPROCESS_DIR or self._task is not None:
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Sampling queue gauges every {self.interval}s into {MULTIPROCESS_DIR}")
+
+    async def stop(self):
+        """Stop sampling and drop this process from the live gauges"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        multiprocess.mark_process_dead(os.getpid())
+
+    async def _run(self):
+        while True:
+            sample_gauges()
+            await asyncio.sleep(self.interval)
+
+
+# Global sampler instance, started by the application lifespan
+gauge_sampler = GaugeSampler()
+
+
+class InstrumentedAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that records request time and status per adapter.
+    """
+
+    def __init__(self, adapter: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            adapter: Adapter name used as the metric label
+            transport: Transport performing the requests (default: a new AsyncHTTPTransport)
+        """
+        self.adapter = adapter
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with get_tracer().start_as_current_span(
+                f"http.{request.method}", {"component": self.adapter, "host": request.url.host}
+            ) as span:
+                response = await self._transport.handle_async_request(request)
+                status = str(response.status_code)
+                span.set_attribute("status", response.status_code)
+            return response
+        finally:
+            adapter_http_duration.labels(self.adapter, request.method, status).observe(
+                time.perf_counter() - start
+            )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def requests_response_hook(adapter: str) -> Callable:
+    """
+    Build a requests response hook that records request time and status.
+
+    Args:
+        adapter: Adapter name used as the metric label
+
+    Returns:
+        Callable: Hook for ``session.hooks["response"]``
+    """
+    def hook(response, *args, **kwargs):
+        adapter_http_duration.labels(adapter, response.request.method, str(response.status_code)).observe(
+            response.elapsed.total_seconds()
+        )
+
+    return hook
+
+
+def instrument_engine(engine: Engine):
+    """
+    Record the execution time of every statement run by an engine.
+
+    Args:
+        engine: Sync engine (for an AsyncEngine, pass its sync_engine)
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start_times"].pop()
+        operation = statement.lstrip()[:6].upper()
+        db_query_duration.labels(operation if operation in DB_OPERATIONS else "OTHER").observe(
+            time.perf_counter() - start
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # Failed statements never reach after_cursor_execute
+        if context.connection is not None and context.connection.info.get("query_start_times"):
+            context.connection.info["query_start_times"].pop()
@@ -0,0 +1,438 @@
+"""
+Request-scoped tracing.
+
+Spans mark where time goes inside a request or workflow execution
+(workflow steps, adapter calls, HTTP requests, DB sessions, WebSocket
+broadcasts). The current span lives in a context variable, so work
+started with asyncio.create_task or asyncio.to_thread inherits its
+parent span without any explicit passing.
+
+Tracers follow the OpenTelemetry ``start_as_current_span`` shape:
+
+- "none" (default) does nothing and costs one attribute lookup
+- "json" writes each finished trace, with a critical-path summary, to a JSON file
+- "otel" forwards spans to the configured OpenTelemetry tracer provider
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from codegenapp.config.settings import get_settings
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace as otel_trace
+    OPENTELEMETRY_AVAILABLE = True
+except ImportError:
+    OPENTELEMETRY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Default directory for the JSON trace exporter
+DEFAULT_TRACE_DIR = "./data/traces"
+
+# Summaries of recently finished traces kept in memory
+DEFAULT_RECENT_TRACES = 100
+
+# Seconds a trace waits after its last span ends for spans of tasks it started
+DEFAULT_EXPORT_DELAY = 1.0
+
+# Component of spans that do not set one
+DEFAULT_COMPONENT = "app"
+
+# Clock jitter tolerated when ordering spans on the critical path, in seconds
+CRITICAL_PATH_TOLERANCE = 0.0005
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("codegenapp_current_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + (self.duration or 0.0)
+
+    def set_attribute(self, key: str, value: Any):
+        """Set a span attribute"""
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException):
+        """Mark the span as failed"""
+        self.error = f"{type(exception).__name__}: {exception}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoOpSpan:
+    """Span that records nothing"""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, exception: BaseException):
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class Tracer:
+    """Base tracer; the default implementation records nothing"""
+
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        new_trace: bool = False
+    ):
+        """
+        Start a span and make it current for the enclosed block.
+
+        Args:
+            name: Span name
+            attributes: Span attributes, e.g. component (optional)
+            new_trace: Start a new trace instead of a child of the current span
+
+        Returns:
+            Context manager yielding the span
+        """
+        return _NOOP_SPAN
+
+    def get_recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get summaries of recently finished traces"""
+        return []
+
+
+class _SpanScope:
+    """Context manager making a recorded span current."""
+
+    def __init__(self, tracer: "JsonFileTracer", span: Span):
+        self._tracer = tracer
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self._token)
+        if exc is not None and not isinstance(exc, asyncio.CancelledError):
+            self._span.record_exception(exc)
+        self._span.duration = time.perf_counter() - self._span._start
+        self._tracer._finish(self._span)
+        return False
+
+
+@dataclass
+class _Trace:
+    """Spans of one trace and how many are still open."""
+    spans: List[Span] = field(default_factory=list)
+    open_spans: int = 0
+
+
+class JsonFileTracer(Tracer):
+    """
+    Records spans in memory and writes each finished trace to a JSON file.
+
+    A trace is finished when all of its spans have ended, including spans
+    of background tasks that outlive the root span. Export waits a short
+    delay so tasks started just before the root span ended can still add
+    their spans.
+    """
+
+    def __init__(
+        self,
+        trace_dir: str = DEFAULT_TRACE_DIR,
+        recent_traces: int = DEFAULT_RECENT_TRACES,
+        export_delay: float = DEFAULT_EXPORT_DELAY
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            trace_dir: Directory the trace files are written to
+            recent_traces: Summaries of finished traces kept in memory
+            export_delay: Seconds to wait for late spans before exporting a trace
+        """
+        self.trace_dir = trace_dir
+        self.export_delay = export_delay
+        self._traces: Dict[str, _Trace] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=recent_traces)
+
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        new_trace: bool = False
+    ) -> _SpanScope:
+        """Start a span and make it current for the enclosed block"""
+        parent = None if new_trace else _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=dict(attributes or {})
+        )
+        if new_trace and _current_span.get() is not None:
+            span.attributes["parent_trace_id"] = _current_span.get().trace_id
+
+        trace = self._traces.setdefault(span.trace_id, _Trace())
+        trace.spans.append(span)
+        trace.open_spans += 1
+        return _SpanScope(self, span)
+
+    def get_recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get summaries of recently finished traces, newest first"""
+        return list(self._recent)[::-1][:limit]
+
+    def _finish(self, span: Span):
+        """Schedule the trace for export once its last open span ends."""
+        trace = self._traces[span.trace_id]
+        trace.open_spans -= 1
+        if trace.open_spans > 0:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None or self.export_delay <= 0:
+            self._export(span.trace_id, loop)
+        else:
+            loop.call_later(self.export_delay, self._export, span.trace_id, loop)
+
+    def _export(self, trace_id: str, loop: Optional[asyncio.AbstractEventLoop]):
+        """Summarize a finished trace and write it, unless late spans reopened it."""
+        trace = self._traces.get(trace_id)
+        if trace is None or trace.open_spans > 0:
+            return
+
+        del self._traces[trace_id]
+        summary = summarize_trace(trace.spans)
+        self._recent.append(summary)
+
+        document = {**summary, "spans": [recorded.to_dict() for recorded in trace.spans]}
+        if loop is None:
+            self._write(trace_id, document)
+        else:
+            loop.run_in_executor(None, self._write, trace_id, document)
+
+    def _write(self, trace_id: str, document: Dict[str, Any]):
+        """Write a trace file."""
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            with open(os.path.join(self.trace_dir, f"{trace_id}.json"), "w") as trace_file:
+                json.dump(document, trace_file, default=str)
+        except OSError as e:
+            logger.error(f"Failed to write trace {trace_id}: {e}")
+
+
+class OpenTelemetryTracer(Tracer):
+    """Forwards spans to the OpenTelemetry tracer provider"""
+
+    def __init__(self, instrumentation_name: str = "codegenapp"):
+        self._tracer = otel_trace.get_tracer(instrumentation_name)
+
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        new_trace: bool = False
+    ):
+        """Start an OpenTelemetry span and make it current for the enclosed block"""
+        return self._tracer.start_as_current_span(
+            name,
+            context=otel_context.Context() if new_trace else None,
+            attributes=attributes
+        )
+
+
+def summarize_trace(spans: List[Span]) -> Dict[str, Any]:
+    """
+    Summarize a finished trace by its critical path.
+
+    The critical path starts at the root span and, inside each span,
+    follows the chain of children that ended last, so parallel children
+    that finished early are skipped. Self time on the path is grouped by
+    the spans' component attribute to show where the time went.
+
+    Args:
+        spans: All spans of the trace
+
+    Returns:
+        dict: Trace ID, root span, duration and critical path
+    """
+    span_ids = {span.span_id for span in spans}
+    roots = [span for span in spans if span.parent_id not in span_ids]
+    root = min(roots, key=lambda span: span.start_time)
+
+    children: Dict[str, List[Span]] = defaultdict(list)
+    for span in spans:
+        if span.parent_id in span_ids:
+            children[span.parent_id].append(span)
+
+    path: List[Dict[str, Any]] = []
+    by_component: Dict[str, float] = defaultdict(float)
+
+    def walk(span: Span, depth: int):
+        # Chain of children ending last, each ending before the next one starts
+        chain = []
+        limit = span.end_time
+        for child in sorted(children[span.span_id], key=lambda child: child.end_time, reverse=True):
+            if child.end_time <= limit + CRITICAL_PATH_TOLERANCE:
+                chain.append(child)
+                limit = child.start_time
+
+        self_time = (span.duration or 0.0) - sum(child.duration or 0.0 for child in chain)
+        component = span.attributes.get("component", DEFAULT_COMPONENT)
+        by_component[component] += max(0.0, self_time)
+        path.append({
+            "name": span.name,
+            "component": component,
+            "depth": depth,
+            "duration_ms": round((span.duration or 0.0) * 1000, 3),
+            "self_ms": round(max(0.0, self_time) * 1000, 3),
+            "error": span.error,
+        })
+
+        for child in reversed(chain):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+
+    return {
+        "trace_id": root.trace_id,
+        "root": root.name,
+        "attributes": root.attributes,
+        "start_time": root.start_time,
+        "duration_ms": round((max(span.end_time for span in spans) - root.start_time) * 1000, 3),
+        "span_count": len(spans),
+        "critical_path": path,
+        "critical_path_by_component": {
+            component: round(seconds * 1000, 3)
+            for component, seconds in sorted(by_component.items(), key=lambda item: item[1], reverse=True)
+        },
+    }
+
+
+def create_tracer(backend: str = "none", trace_dir: str = DEFAULT_TRACE_DIR) -> Tracer:
+    """
+    Create a tracer by backend name.
+
+    Args:
+        backend: "none" to disable tracing, "json" for local trace files, "otel" for OpenTelemetry
+        trace_dir: Directory for the json backend
+
+    Returns:
+        Tracer: Configured tracer
+    """
+    if backend == "none":
+        return Tracer()
+
+    if backend == "json":
+        return JsonFileTracer(trace_dir)
+
+    if backend == "otel":
+        if not OPENTELEMETRY_AVAILABLE:
+            raise ValueError("opentelemetry-api is required for the otel tracing backend")
+        return OpenTelemetryTracer()
+
+    raise ValueError(f"Unknown tracing backend: {backend}")
+
+
+# Global tracer (replaced with set_tracer, e.g. in tests)
+_tracer = create_tracer(get_settings().tracing_backend, trace_dir=get_settings().tracing_dir)
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    """Replace the global tracer"""
+    global _tracer
+    _tracer = tracer
+
+
+def traced(name: str, component: str = DEFAULT_COMPONENT) -> Callable:
+    """
+    Decorate a coroutine function to run inside a span.
+
+    Args:
+        name: Span name
+        component: Component the time is attributed to
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with _tracer.start_as_current_span(name, {"component": component}):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running each HTTP request inside a root span.
+
+    Background work started while handling the request inherits the
+    span. Being plain ASGI, it adds no per-request task or body
+    streaming overhead; register it only when tracing is enabled.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with _tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}", {"component": "http"}, new_trace=True
+        ):
+            await self.app(scope, receive, send)
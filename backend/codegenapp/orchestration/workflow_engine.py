@@ -6,20 +6,24 @@ integrations within the CI/CD workflow system.
 """
 
 import asyncio
+import re
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from sqlalchemy.orm import Session
 
 from ..models import (
     Project, AgentRun, AgentRunStatus, ResponseType, ValidationPipeline,
     ValidationStatus, AuditLog, AuditAction
 )
-from ..database.connection import get_database_session
+from ..database.async_session import open_async_session
+from ..repositories.async_repositories import AsyncAgentRunRepository, AsyncAuditLogRepository, AsyncProjectRepository
 from ..services.codegen_service import CodegenService
 from ..services.github_service import GitHubService
 from .state_manager import StateManager
-from ..websocket.connection_manager import ConnectionManager
+from ..websocket.connection_manager import connection_manager
+
+# Owner, repository and number of a pull request web URL
+PR_URL_PATTERN = re.compile(r"github\.com/([^/]+)/([^/]+)/pull/(\d+)")
 
 
 class WorkflowEngine:
@@ -34,7 +38,7 @@ class WorkflowEngine:
         self.codegen_service = CodegenService()
         self.github_service = GitHubService()
         self.state_manager = StateManager()
-        self.connection_manager = ConnectionManager()
+        self.connection_manager = connection_manager
         self._running_workflows: Dict[str, asyncio.Task] = {}
     
     async def start_agent_run(
@@ -58,9 +62,9 @@ class WorkflowEngine:
         """
         run_id = str(uuid.uuid4())
         
-        with next(get_database_session()) as db:
+        async with open_async_session() as db:
             # Validate project exists
-            project = db.query(Project).filter(Project.id == project_id).first()
+            project = await AsyncProjectRepository(db).get(project_id)
             if not project:
                 raise ValueError(f"Project {project_id} not found")
             
@@ -76,7 +80,7 @@ class WorkflowEngine:
             )
             
             db.add(agent_run)
-            db.commit()
+            await db.commit()
             
             # Create audit log
             audit_log = AuditLog.create_log(
@@ -89,7 +93,7 @@ class WorkflowEngine:
                 metadata={"target_text": target_text}
             )
             db.add(audit_log)
-            db.commit()
+            await db.commit()
         
         # Start async workflow
         task = asyncio.create_task(self._execute_agent_run(run_id))
@@ -131,8 +135,8 @@ class WorkflowEngine:
         Returns:
             dict: Updated agent run status
         """
-        with next(get_database_session()) as db:
-            agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+        async with open_async_session() as db:
+            agent_run = await AsyncAgentRunRepository(db).get(run_id)
             if not agent_run:
                 raise ValueError(f"Agent run {run_id} not found")
             
@@ -149,7 +153,7 @@ class WorkflowEngine:
             agent_run.continuation_context["continuation_text"] = continuation_text
             agent_run.continuation_context["continued_at"] = datetime.utcnow().isoformat()
             
-            db.commit()
+            await db.commit()
             
             # Create audit log
             audit_log = AuditLog.create_log(
@@ -162,7 +166,7 @@ class WorkflowEngine:
                 metadata={"continuation_text": continuation_text}
             )
             db.add(audit_log)
-            db.commit()
+            await db.commit()
         
         # Resume workflow execution
         if run_id in self._running_workflows:
@@ -193,8 +197,8 @@ class WorkflowEngine:
         Returns:
             dict: Updated agent run status
         """
-        with next(get_database_session()) as db:
-            agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+        async with open_async_session() as db:
+            agent_run = await AsyncAgentRunRepository(db).get(run_id)
             if not agent_run:
                 raise ValueError(f"Agent run {run_id} not found")
             
@@ -222,7 +226,7 @@ class WorkflowEngine:
             agent_run.continuation_context["plan_response"] = response_text
             agent_run.continuation_context["responded_at"] = datetime.utcnow().isoformat()
             
-            db.commit()
+            await db.commit()
         
         # Continue execution with plan response
         task = asyncio.create_task(self._continue_agent_execution(run_id, response_text))
@@ -234,7 +238,9 @@ class WorkflowEngine:
         self,
         project_id: str,
         pull_request_id: str,
-        agent_run_id: Optional[str] = None
+        agent_run_id: Optional[str] = None,
+        head_sha: Optional[str] = None,
+        force: bool = False
     ) -> Dict[str, Any]:
         """
         Trigger validation pipeline for a pull request.
@@ -243,21 +249,24 @@ class WorkflowEngine:
             project_id: ID of the project
             pull_request_id: ID of the pull request
             agent_run_id: ID of the associated agent run (optional)
+            head_sha: Head commit SHA to validate; without it the verdict is not cached
+            force: Rerun even if a verdict for the commit is cached
             
         Returns:
             dict: Validation pipeline details
         """
-        from ..validation.pipeline_coordinator import PipelineCoordinator
+        from ..validation.pipeline_coordinator import pipeline_coordinator
         
         pipeline_id = str(uuid.uuid4())
-        coordinator = PipelineCoordinator()
         
-        # Start validation pipeline
-        result = await coordinator.start_validation(
+        # Start validation pipeline (superseding any running for the same PR)
+        result = await pipeline_coordinator.start_validation(
             pipeline_id=pipeline_id,
             project_id=project_id,
             pull_request_id=pull_request_id,
-            agent_run_id=agent_run_id
+            agent_run_id=agent_run_id,
+            head_sha=head_sha,
+            force=force
         )
         
         # Notify connected clients
@@ -281,8 +290,8 @@ class WorkflowEngine:
             run_id: ID of the agent run to execute
         """
         try:
-            with next(get_database_session()) as db:
-                agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+            async with open_async_session() as db:
+                agent_run = await AsyncAgentRunRepository(db).get(run_id)
                 if not agent_run:
                     return
                 
@@ -290,11 +299,12 @@ class WorkflowEngine:
                 agent_run.status = AgentRunStatus.RUNNING
                 agent_run.started_at = datetime.utcnow()
                 agent_run.progress_percentage = 10
-                db.commit()
+                await db.commit()
                 
                 # Notify progress
-                await self.connection_manager.broadcast_to_project(
+                await self.connection_manager.broadcast_progress(
                     agent_run.project_id,
+                    run_id,
                     {
                         "type": "agent_run_progress",
                         "run_id": run_id,
@@ -353,8 +363,8 @@ class WorkflowEngine:
             run_id: ID of the agent run
             response: Agent response data
         """
-        with next(get_database_session()) as db:
-            agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+        async with open_async_session() as db:
+            agent_run = await AsyncAgentRunRepository(db).get(run_id)
             if not agent_run:
                 return
             
@@ -387,9 +397,10 @@ class WorkflowEngine:
                 agent_run.completed_at = datetime.utcnow()
             
             agent_run.progress_percentage = 100
-            db.commit()
+            await db.commit()
             
-            # Notify connected clients
+            # Notify connected clients, dropping any buffered progress first
+            self.connection_manager.finish_progress(agent_run.project_id, run_id)
             await self.connection_manager.broadcast_to_project(
                 agent_run.project_id,
                 {
@@ -409,8 +420,8 @@ class WorkflowEngine:
             run_id: ID of the failed agent run
             error_message: Error message
         """
-        with next(get_database_session()) as db:
-            agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+        async with open_async_session() as db:
+            agent_run = await AsyncAgentRunRepository(db).get(run_id)
             if not agent_run:
                 return
             
@@ -419,7 +430,7 @@ class WorkflowEngine:
             agent_run.completed_at = datetime.utcnow()
             agent_run.retry_count += 1
             
-            db.commit()
+            await db.commit()
             
             # Create audit log
             audit_log = AuditLog.create_log(
@@ -431,9 +442,10 @@ class WorkflowEngine:
                 error_message=error_message
             )
             db.add(audit_log)
-            db.commit()
+            await db.commit()
             
-            # Notify connected clients
+            # Notify connected clients, dropping any buffered progress first
+            self.connection_manager.finish_progress(agent_run.project_id, run_id)
             await self.connection_manager.broadcast_to_project(
                 agent_run.project_id,
                 {
@@ -474,13 +486,19 @@ class WorkflowEngine:
             pr_url: URL of the created PR
             agent_run_id: ID of the agent run that created the PR
         """
-        # Extract PR ID from URL and trigger validation
-        pr_id = self.github_service.extract_pr_id_from_url(pr_url)
-        if pr_id:
+        match = PR_URL_PATTERN.search(pr_url)
+        if not match:
+            return
+        
+        # Look up the PR for its ID (as sent in webhooks) and head commit
+        owner, repo, number = match.groups()
+        pull_request = await self.github_service.get_pull_request(owner, repo, int(number))
+        if pull_request:
             await self.trigger_validation_pipeline(
                 project_id=project_id,
-                pull_request_id=pr_id,
-                agent_run_id=agent_run_id
+                pull_request_id=str(pull_request.id),
+                agent_run_id=agent_run_id,
+                head_sha=pull_request.head.get("sha")
             )
     
     async def get_workflow_status(self, run_id: str) -> Dict[str, Any]:
@@ -493,8 +511,8 @@ class WorkflowEngine:
         Returns:
             dict: Current workflow status
         """
-        with next(get_database_session()) as db:
-            agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+        async with open_async_session() as db:
+            agent_run = await AsyncAgentRunRepository(db).get(run_id)
             if not agent_run:
                 raise ValueError(f"Agent run {run_id} not found")
             
@@ -523,12 +541,12 @@ class WorkflowEngine:
             del self._running_workflows[run_id]
             
             # Update database
-            with next(get_database_session()) as db:
-                agent_run = db.query(AgentRun).filter(AgentRun.id == run_id).first()
+            async with open_async_session() as db:
+                agent_run = await AsyncAgentRunRepository(db).get(run_id)
                 if agent_run:
                     agent_run.status = AgentRunStatus.CANCELLED
                     agent_run.completed_at = datetime.utcnow()
-                    db.commit()
+                    await db.commit()
             
             return True
         
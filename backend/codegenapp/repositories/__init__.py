@@ -7,10 +7,19 @@ from .project_repository import ProjectRepository
 from .agent_run_repository import AgentRunRepository
 from .validation_repository import ValidationRepository
 from .audit_repository import AuditRepository
+from .async_repositories import (
+    AsyncRepository, AsyncProjectRepository, AsyncAgentRunRepository,
+    AsyncAuditLogRepository, AsyncValidationPipelineRepository
+)
 
 __all__ = [
     'ProjectRepository',
     'AgentRunRepository', 
     'ValidationRepository',
-    'AuditRepository'
+    'AuditRepository',
+    'AsyncRepository',
+    'AsyncProjectRepository',
+    'AsyncAgentRunRepository',
+    'AsyncAuditLogRepository',
+    'AsyncValidationPipelineRepository'
 ]
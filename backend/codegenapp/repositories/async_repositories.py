@@ -0,0 +1,168 @@
+"""
+Async repositories for CodegenApp models.
+
+Wrap the common queries of each model behind coroutines that take an
+AsyncSession, so routes and workflow code never issue blocking queries
+or trigger lazy loads outside the session's greenlet.
+"""
+
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..models import AgentRun, AgentRunStatus, AuditLog, Project, ValidationPipeline
+
+ModelType = TypeVar("ModelType")
+
+
+class AsyncRepository(Generic[ModelType]):
+    """
+    Primary-key access to one model through an AsyncSession.
+    """
+
+    model: Type[ModelType]
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, entity_id: Any) -> Optional[ModelType]:
+        """
+        Get an entity by primary key.
+
+        Args:
+            entity_id: Primary key value
+
+        Returns:
+            Optional[ModelType]: Entity, or None if it does not exist
+        """
+        return await self.session.get(self.model, entity_id)
+
+    async def add(self, entity: ModelType, commit: bool = True) -> ModelType:
+        """
+        Add an entity to the session.
+
+        Args:
+            entity: Entity to persist
+            commit: Commit immediately (otherwise the caller commits)
+
+        Returns:
+            ModelType: The added entity
+        """
+        self.session.add(entity)
+        if commit:
+            await self.session.commit()
+        return entity
+
+    async def update_by_id(self, entity_id: Any, values: Dict[str, Any], commit: bool = True):
+        """
+        Issue a primary-key UPDATE without loading the row.
+
+        Args:
+            entity_id: Primary key value
+            values: Columns to set
+            commit: Commit immediately (otherwise the caller commits)
+        """
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == entity_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            await self.session.commit()
+
+    async def delete(self, entity: ModelType, commit: bool = True):
+        """
+        Delete an entity.
+
+        Args:
+            entity: Entity to delete
+            commit: Commit immediately (otherwise the caller commits)
+        """
+        await self.session.delete(entity)
+        if commit:
+            await self.session.commit()
+
+    async def commit(self):
+        """Commit pending changes"""
+        await self.session.commit()
+
+
+class AsyncProjectRepository(AsyncRepository[Project]):
+    """Async queries for projects"""
+
+    model = Project
+
+    async def get_with_settings(self, project_id: str) -> Optional[Project]:
+        """Get a project with its settings eagerly loaded"""
+        result = await self.session.execute(
+            select(Project).options(selectinload(Project.settings)).where(Project.id == project_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_repository(self, github_repo: str) -> Optional[Project]:
+        """Get the project configured for a GitHub repository (owner/name)"""
+        result = await self.session.execute(
+            select(Project).where(Project.github_repo == github_repo).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+
+class AsyncAgentRunRepository(AsyncRepository[AgentRun]):
+    """Async queries for agent runs"""
+
+    model = AgentRun
+
+    async def list(
+        self,
+        project_id: Optional[str] = None,
+        status: Optional[AgentRunStatus] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[AgentRun]:
+        """
+        List agent runs, newest first.
+
+        Args:
+            project_id: Filter by project ID (optional)
+            status: Filter by status (optional)
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            List[AgentRun]: Matching agent runs
+        """
+        query = select(AgentRun)
+        if project_id:
+            query = query.where(AgentRun.project_id == project_id)
+        if status is not None:
+            query = query.where(AgentRun.status == status)
+
+        result = await self.session.execute(
+            query.order_by(AgentRun.created_at.desc()).offset(offset).limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+class AsyncAuditLogRepository(AsyncRepository[AuditLog]):
+    """Async queries for audit logs"""
+
+    model = AuditLog
+
+    async def list_for_entity(self, entity_type: str, entity_id: str, limit: int = 100) -> List[AuditLog]:
+        """Get the most recent audit logs of an entity"""
+        result = await self.session.execute(
+            select(AuditLog)
+            .where(AuditLog.entity_id == entity_id, AuditLog.entity_type == entity_type)
+            .order_by(AuditLog.timestamp.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+class AsyncValidationPipelineRepository(AsyncRepository[ValidationPipeline]):
+    """Async queries for validation pipelines"""
+
+    model = ValidationPipeline
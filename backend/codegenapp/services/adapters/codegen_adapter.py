@@ -23,6 +23,7 @@ from codegenapp.models.api.api_models import (
     CreateAgentRunRequest, ResumeAgentRunRequest, StopAgentRunRequest,
     PaginatedResponse, AgentRunStatus
 )
+from codegenapp.observability.metrics import InstrumentedAsyncTransport
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,8 @@ class CodegenAdapter:
                 "Authorization": f"Bearer {api_token}",
                 "Content-Type": "application/json",
                 "User-Agent": "CodegenApp/1.0.0"
-            }
+            },
+            transport=InstrumentedAsyncTransport("codegen")
         )
         
     async def cleanup(self) -> None:
@@ -66,7 +68,8 @@ class CodegenAdapter:
                 headers={
                     "Authorization": f"Bearer {token}",
                     "Content-Type": "application/json"
-                }
+                },
+                transport=InstrumentedAsyncTransport("codegen")
             )
             try:
                 response = await temp_client.get(f"{self.base_url}/v1/users/me")
@@ -12,6 +12,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from codegenapp.observability.metrics import requests_response_hook
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +45,7 @@ class GitHubAdapter:
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self.session.hooks["response"].append(requests_response_hook("github"))
         
         if self.token:
             self.session.headers.update({
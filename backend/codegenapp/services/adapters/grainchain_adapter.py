@@ -4,6 +4,9 @@ Grainchain Service Adapter - Sandbox management and deployment testing
 
 import asyncio
 import logging
+import os
+import time
+import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime
 import httpx
@@ -12,6 +15,14 @@ from codegenapp.models.api.api_models import (
     SandboxStatus,
 )
 from codegenapp.core.orchestration.coordinator import ServiceAdapter
+from codegenapp.observability.metrics import InstrumentedAsyncTransport
+from codegenapp.services.adapters.sandbox_admission import (
+    ResourceRequest, SandboxAdmissionController, SandboxAdmissionError
+)
+from codegenapp.services.adapters.sandbox_backends import (
+    SandboxBackend, SandboxSpec, create_sandbox_backend, parse_cpu, parse_memory
+)
+from codegenapp.services.adapters.sandbox_logs import DEFAULT_LOG_READ_BYTES, SandboxLogStore, sandbox_log_store
 from codegenapp.utils.exceptions import ServiceNotFoundError, ActionNotFoundError
 
 logger = logging.getLogger(__name__)
@@ -20,7 +31,12 @@ logger = logging.getLogger(__name__)
 class GrainchainAdapter(ServiceAdapter):
     """Adapter for Grainchain sandbox and deployment services"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        backend: Optional[SandboxBackend] = None,
+        logs: Optional[SandboxLogStore] = None
+    ):
         self.config = config
         self.docker_host = config.get("docker_host", "unix://var/run/docker.sock")
         self.registry_url = config.get("registry_url")
@@ -30,8 +46,38 @@ class GrainchainAdapter(ServiceAdapter):
         # In-memory tracking of active sandboxes
         self.active_sandboxes: Dict[str, Dict[str, Any]] = {}
         
+        # Sandbox output ring buffers, and the backend actually running sandboxes
+        self.logs = logs or sandbox_log_store
+        self.backend = backend or create_sandbox_backend(
+            config.get("sandbox_backend", "simulated"), config, logs=self.logs
+        )
+        self._startup_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Resource-aware admission; sandboxes beyond capacity queue per project
+        capacity = config.get("sandbox_capacity", {})
+        self.default_resources = config.get("default_sandbox_resources", {"cpu": 0.5, "memory": "512Mi"})
+        self.admission = SandboxAdmissionController(
+            capacity=ResourceRequest(
+                cpu=parse_cpu(capacity.get("cpu")) or float(os.cpu_count() or 1),
+                memory=parse_memory(capacity.get("memory")) or 8 * 1024 ** 3,
+                ports=capacity.get("ports", 200)
+            ),
+            max_sandboxes=self.max_concurrent_sandboxes,
+            initial_hold_time=self.default_timeout
+        )
+        self.admission_timeout = config.get("admission_timeout")
+        
+        # Background reaper reclaiming sandboxes past their timeout, exited
+        # sandboxes, and failed or exited entries past their retention
+        self.reaper_interval = config.get("reaper_interval", 30)
+        self.finished_sandbox_retention = config.get("finished_sandbox_retention", 300)
+        self._reaper_task: Optional[asyncio.Task] = None
+        
         # HTTP client for API calls (if grainchain has an API)
-        self.client = httpx.AsyncClient(timeout=httpx.Timeout(30.0))
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            transport=InstrumentedAsyncTransport("grainchain")
+        )
     
     async def execute_action(self, action: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute grainchain action"""
@@ -57,15 +103,26 @@ class GrainchainAdapter(ServiceAdapter):
         try:
             # Check Docker daemon connectivity
             # This is a simplified check - in reality you'd ping Docker API
-            if len(self.active_sandboxes) <= self.max_concurrent_sandboxes:
+            queued = self.admission.queued_count
+            if not queued:
                 return "healthy"
             else:
-                return "degraded: max sandboxes reached"
+                return f"degraded: {queued} sandboxes queued, expected wait {self.admission.expected_wait()}s"
         except Exception as e:
             return f"unhealthy: {str(e)}"
     
     async def cleanup(self):
         """Cleanup resources"""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        
+        tasks = list(self._startup_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.backend.close()
+        self.active_sandboxes.clear()
         await self.client.aclose()
     
     # ============================================================================
@@ -83,15 +140,19 @@ class GrainchainAdapter(ServiceAdapter):
         ports = parameters.get("ports", [])
         timeout = parameters.get("timeout", self.default_timeout)
         resources = parameters.get("resources", {})
+        command = parameters.get("command")
+        workdir = parameters.get("workdir")
+        project_id = parameters.get("project_id", "default")
         
-        # Check sandbox limits
-        if len(self.active_sandboxes) >= self.max_concurrent_sandboxes:
-            raise Exception(f"Maximum concurrent sandboxes ({self.max_concurrent_sandboxes}) reached")
+        # Check the request can ever be admitted; otherwise it queues
+        request = self._resource_request(resources, ports)
+        if not request.fits(self.admission.capacity):
+            raise Exception(f"Requested resources exceed sandbox capacity: {request}")
+        expected_wait = self.admission.expected_wait(project_id)
         
         # Generate sandbox ID
-        sandbox_id = f"sandbox-{len(self.active_sandboxes) + 1}-{datetime.utcnow().strftime('%H%M%S')}"
+        sandbox_id = f"sandbox-{uuid.uuid4().hex[:12]}"
         
-        # Simulate sandbox creation (in real implementation, this would use Docker API)
         sandbox_info = {
             "id": sandbox_id,
             "name": name,
@@ -102,14 +163,23 @@ class GrainchainAdapter(ServiceAdapter):
             "ports": ports,
             "timeout": timeout,
             "resources": resources,
+            "command": command,
+            "workdir": workdir,
+            "project_id": project_id,
+            "resource_request": request,
+            "started_at": None,
             "endpoints": {}
         }
         
-        # Store sandbox info
+        # Store sandbox info; logs can be tailed from creation on
         self.active_sandboxes[sandbox_id] = sandbox_info
+        self.logs.create(sandbox_id)
         
-        # Simulate async creation process
-        asyncio.create_task(self._simulate_sandbox_startup(sandbox_id))
+        # Start the sandbox in the background
+        task = asyncio.create_task(self._start_sandbox(sandbox_id))
+        self._startup_tasks[sandbox_id] = task
+        task.add_done_callback(lambda _: self._startup_tasks.pop(sandbox_id, None))
+        self._ensure_reaper()
         
         logger.info(f"🐳 Created sandbox {sandbox_id} with image {image}")
         
@@ -119,6 +189,8 @@ class GrainchainAdapter(ServiceAdapter):
             "status": SandboxStatus.CREATING.value,
             "image": image,
             "created_at": sandbox_info["created_at"].isoformat(),
+            "queued": expected_wait > 0,
+            "expected_wait_seconds": expected_wait,
             "endpoints": {}
         }
     
@@ -140,6 +212,7 @@ class GrainchainAdapter(ServiceAdapter):
             "status": sandbox_info["status"].value,
             "image": sandbox_info["image"],
             "created_at": sandbox_info["created_at"].isoformat(),
+            "queued": not self.admission.is_admitted(sandbox_id) and sandbox_info["status"] == SandboxStatus.CREATING,
             "endpoints": sandbox_info["endpoints"]
         }
     
@@ -154,8 +227,7 @@ class GrainchainAdapter(ServiceAdapter):
         if sandbox_id not in self.active_sandboxes:
             raise Exception(f"Sandbox {sandbox_id} not found")
         
-        # Remove from active sandboxes
-        sandbox_info = self.active_sandboxes.pop(sandbox_id)
+        await self._teardown_sandbox(sandbox_id)
         
         logger.info(f"🗑️ Destroyed sandbox {sandbox_id}")
         
@@ -184,26 +256,48 @@ class GrainchainAdapter(ServiceAdapter):
         }
     
     async def _get_sandbox_logs(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Get sandbox logs"""
+        """Get sandbox log bytes written since an offset"""
         parameters = context.get("parameters", {})
         sandbox_id = parameters.get("sandbox_id")
         
         if not sandbox_id:
             raise Exception("sandbox_id parameter required")
         
-        if sandbox_id not in self.active_sandboxes:
+        return self.get_sandbox_logs(
+            sandbox_id,
+            since_offset=int(parameters.get("since_offset", 0)),
+            max_bytes=int(parameters.get("max_bytes", DEFAULT_LOG_READ_BYTES))
+        )
+    
+    def get_sandbox_logs(
+        self,
+        sandbox_id: str,
+        since_offset: int = 0,
+        max_bytes: int = DEFAULT_LOG_READ_BYTES
+    ) -> Dict[str, Any]:
+        """
+        Read sandbox output after a byte offset.
+        
+        Args:
+            sandbox_id: ID of the sandbox
+            since_offset: next_offset of the previous read (0 for the oldest retained output)
+            max_bytes: Maximum bytes to return
+            
+        Returns:
+            dict: Log text with offset, next_offset, truncated and eof markers
+        """
+        buffer = self.logs.get(sandbox_id)
+        if buffer is None:
             raise Exception(f"Sandbox {sandbox_id} not found")
         
-        # Simulate log retrieval
-        logs = [
-            f"[{datetime.utcnow().isoformat()}] Sandbox {sandbox_id} started",
-            f"[{datetime.utcnow().isoformat()}] Container running on image {self.active_sandboxes[sandbox_id]['image']}",
-            f"[{datetime.utcnow().isoformat()}] Ready to accept connections"
-        ]
+        chunk = buffer.read_text(since_offset, max_bytes)
+        text = chunk.pop("text")
         
         return {
             "sandbox_id": sandbox_id,
-            "logs": logs
+            "logs": text.splitlines(),
+            "text": text,
+            **chunk
         }
     
     # ============================================================================
@@ -308,25 +402,129 @@ class GrainchainAdapter(ServiceAdapter):
     # HELPER METHODS
     # ============================================================================
     
-    async def _simulate_sandbox_startup(self, sandbox_id: str):
-        """Simulate sandbox startup process"""
+    def _resource_request(self, resources: Dict[str, Any], ports: list) -> ResourceRequest:
+        """Translate sandbox resource parameters into an admission request"""
+        return ResourceRequest(
+            cpu=parse_cpu(resources.get("cpu", self.default_resources.get("cpu"))) or 0.0,
+            memory=parse_memory(resources.get("memory", self.default_resources.get("memory"))) or 0,
+            ports=max(1, len(ports))
+        )
+    
+    async def _start_sandbox(self, sandbox_id: str):
+        """Wait for admission, start a sandbox on the backend and record its endpoints"""
+        sandbox_info = self.active_sandboxes.get(sandbox_id)
+        if sandbox_info is None:
+            return
+        
         try:
-            # Wait a bit to simulate startup time
-            await asyncio.sleep(2)
+            await self.admission.acquire(
+                sandbox_id,
+                sandbox_info["project_id"],
+                sandbox_info["resource_request"],
+                timeout=self.admission_timeout
+            )
+        except SandboxAdmissionError as e:
+            logger.error(f"❌ Sandbox {sandbox_id} was not admitted: {e}")
+            sandbox_info["status"] = SandboxStatus.FAILED
+            sandbox_info["error"] = str(e)
+            sandbox_info["finished_at"] = time.monotonic()
+            self.logs.close(sandbox_id)
+            return
+        
+        spec = SandboxSpec(
+            image=sandbox_info["image"],
+            environment=sandbox_info["environment"],
+            ports=sandbox_info["ports"],
+            resources=sandbox_info["resources"],
+            command=sandbox_info["command"],
+            workdir=sandbox_info["workdir"]
+        )
+        
+        try:
+            runtime = await self.backend.start(sandbox_id, spec)
             
-            if sandbox_id in self.active_sandboxes:
-                sandbox_info = self.active_sandboxes[sandbox_id]
-                sandbox_info["status"] = SandboxStatus.RUNNING
-                
-                # Add mock endpoints
-                sandbox_info["endpoints"] = {
-                    "http": f"http://localhost:808{len(self.active_sandboxes)}",
-                    "ssh": f"ssh://localhost:222{len(self.active_sandboxes)}"
-                }
-                
-                logger.info(f"✅ Sandbox {sandbox_id} is now running")
+            if sandbox_id not in self.active_sandboxes:
+                # Destroyed while starting
+                await self.backend.stop(sandbox_id)
+                return
+            
+            sandbox_info["status"] = SandboxStatus.RUNNING
+            sandbox_info["started_at"] = time.monotonic()
+            sandbox_info["endpoints"] = runtime.get("endpoints", {})
+            sandbox_info["runtime"] = runtime
+            
+            logger.info(f"✅ Sandbox {sandbox_id} is now running")
         
         except Exception as e:
             logger.error(f"❌ Failed to start sandbox {sandbox_id}: {e}")
+            self.admission.release(sandbox_id)
             if sandbox_id in self.active_sandboxes:
                 self.active_sandboxes[sandbox_id]["status"] = SandboxStatus.FAILED
+                self.active_sandboxes[sandbox_id]["error"] = str(e)
+                self.active_sandboxes[sandbox_id]["finished_at"] = time.monotonic()
+    
+    async def _teardown_sandbox(self, sandbox_id: str):
+        """Stop a sandbox (or its pending start) and release its resources"""
+        self.active_sandboxes.pop(sandbox_id, None)
+        
+        task = self._startup_tasks.get(sandbox_id)
+        if task is not None and not self.admission.is_admitted(sandbox_id):
+            # Still queued for admission: just withdraw it
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        
+        await self.backend.stop(sandbox_id)
+        self.admission.release(sandbox_id)
+        self.logs.close(sandbox_id)
+    
+    def _ensure_reaper(self):
+        """Start the expired-sandbox reaper on first use"""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+    
+    async def _reap_loop(self):
+        """Periodically reclaim sandboxes past their timeout"""
+        while True:
+            await asyncio.sleep(self.reaper_interval)
+            try:
+                await self.reap_expired_sandboxes()
+            except Exception as e:
+                logger.error(f"Sandbox reaper failed: {e}")
+    
+    async def reap_expired_sandboxes(self) -> int:
+        """
+        Reclaim sandboxes that are past their timeout or no longer running.
+        
+        Running sandboxes past their timeout are destroyed. Sandboxes whose
+        process exited are stopped and release their admission budget but
+        stay listed as STOPPED; failed and stopped entries are dropped once
+        finished_sandbox_retention has passed.
+        
+        Returns:
+            int: Number of sandboxes reclaimed
+        """
+        now = time.monotonic()
+        reclaimed = 0
+        
+        for sandbox_id, info in list(self.active_sandboxes.items()):
+            if self.active_sandboxes.get(sandbox_id) is not info:
+                continue
+            
+            if info["status"] in (SandboxStatus.FAILED, SandboxStatus.STOPPED):
+                if now - info.get("finished_at", now) > self.finished_sandbox_retention:
+                    self.active_sandboxes.pop(sandbox_id, None)
+                    reclaimed += 1
+            elif info["status"] == SandboxStatus.RUNNING and not self.backend.is_running(sandbox_id):
+                logger.info(f"Sandbox {sandbox_id} exited, releasing its resources")
+                info["status"] = SandboxStatus.STOPPED
+                info["finished_at"] = now
+                await self.backend.stop(sandbox_id)
+                self.admission.release(sandbox_id)
+                self.logs.close(sandbox_id)
+                reclaimed += 1
+            elif info.get("started_at") is not None and info["timeout"] and now - info["started_at"] > info["timeout"]:
+                logger.info(f"⏰ Reclaiming sandbox {sandbox_id} after its {info['timeout']}s timeout")
+                await self._teardown_sandbox(sandbox_id)
+                reclaimed += 1
+        
+        return reclaimed
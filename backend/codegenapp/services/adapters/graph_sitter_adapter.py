@@ -4,6 +4,8 @@ This adapter provides full integration with the graph-sitter library for advance
 code analysis, symbol resolution, and visual repository structure capabilities.
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 from pathlib import Path
@@ -0,0 +1,237 @@
+"""
+Sandbox admission control.
+
+Sandboxes are admitted against a CPU, memory and port budget instead of
+a flat count. Requests that do not fit wait in per-project FIFO queues
+served round-robin, so a burst of validations from one project cannot
+starve the others, and each waiter can be told roughly how long it will
+wait based on how long sandboxes have recently been held.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight given to the latest hold time when estimating waits
+HOLD_TIME_SMOOTHING = 0.2
+
+
+@dataclass(frozen=True)
+class ResourceRequest:
+    """Resources a sandbox reserves while it exists"""
+    cpu: float = 1.0
+    memory: int = 512 * 1024 ** 2
+    ports: int = 1
+
+    def fits(self, free: "ResourceRequest") -> bool:
+        """Whether this request fits in the given free resources"""
+        return self.cpu <= free.cpu and self.memory <= free.memory and self.ports <= free.ports
+
+
+class SandboxAdmissionError(Exception):
+    """Raised when a request can never be admitted or times out waiting"""
+    pass
+
+
+@dataclass
+class _Waiter:
+    """A queued admission request"""
+    sandbox_id: str
+    project_id: str
+    request: ResourceRequest
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class SandboxAdmissionController:
+    """
+    Admits sandboxes against a resource budget with fair queuing.
+    """
+
+    def __init__(
+        self,
+        capacity: ResourceRequest,
+        max_sandboxes: Optional[int] = None,
+        initial_hold_time: float = 60.0
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            capacity: Total CPU, memory and ports available to sandboxes
+            max_sandboxes: Maximum sandboxes admitted at once (optional)
+            initial_hold_time: Assumed seconds a sandbox is held before any were observed
+        """
+        self.capacity = capacity
+        self.max_sandboxes = max_sandboxes
+        self.average_hold_time = initial_hold_time
+
+        self._admitted: Dict[str, ResourceRequest] = {}
+        self._admitted_at: Dict[str, float] = {}
+        self._used = ResourceRequest(0.0, 0, 0)
+
+        # Per-project FIFO queues in round-robin order
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+
+    async def acquire(
+        self,
+        sandbox_id: str,
+        project_id: str,
+        request: ResourceRequest,
+        timeout: Optional[float] = None
+    ):
+        """
+        Reserve resources for a sandbox, waiting in the project's queue if needed.
+
+        Args:
+            sandbox_id: ID of the sandbox
+            project_id: Project the sandbox belongs to
+            request: Resources to reserve
+            timeout: Seconds to wait before giving up (optional)
+        """
+        if not request.fits(self.capacity):
+            raise SandboxAdmissionError(
+                f"Sandbox {sandbox_id} requests more than the total capacity ({request} > {self.capacity})"
+            )
+
+        if not self.queued_count and self._can_admit(request):
+            self._admit(sandbox_id, request)
+            return
+
+        waiter = _Waiter(sandbox_id, project_id, request, asyncio.get_running_loop().create_future(), time.monotonic())
+        self._queues.setdefault(project_id, deque()).append(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(waiter)
+            raise SandboxAdmissionError(f"Sandbox {sandbox_id} was not admitted within {timeout}s")
+        except asyncio.CancelledError:
+            self._remove_waiter(waiter)
+            raise
+
+    def release(self, sandbox_id: str):
+        """
+        Return a sandbox's resources and admit waiting sandboxes that now fit.
+
+        Args:
+            sandbox_id: ID of the sandbox
+        """
+        request = self._admitted.pop(sandbox_id, None)
+        if request is None:
+            return
+
+        held = time.monotonic() - self._admitted_at.pop(sandbox_id)
+        self.average_hold_time += HOLD_TIME_SMOOTHING * (held - self.average_hold_time)
+
+        self._used = ResourceRequest(
+            self._used.cpu - request.cpu,
+            self._used.memory - request.memory,
+            self._used.ports - request.ports
+        )
+        self._dispatch()
+
+    def is_admitted(self, sandbox_id: str) -> bool:
+        """Whether a sandbox currently holds resources"""
+        return sandbox_id in self._admitted
+
+    @property
+    def queued_count(self) -> int:
+        """Number of waiting sandboxes"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def expected_wait(self, project_id: Optional[str] = None) -> float:
+        """
+        Estimate seconds until a new request would be admitted.
+
+        Each round of admissions is assumed to take one average hold time
+        and to admit as many sandboxes as currently run.
+
+        Args:
+            project_id: Project the request would belong to (optional)
+
+        Returns:
+            float: Estimated wait in seconds (0 if it would be admitted now)
+        """
+        if project_id is not None and project_id in self._queues:
+            # Round-robin: everything queued ahead in this project, and as many from each other project
+            depth = len(self._queues[project_id])
+            ahead = sum(min(len(queue), depth + 1) for queue in self._queues.values())
+        else:
+            ahead = self.queued_count
+
+        if ahead == 0 and self._can_admit(ResourceRequest()):
+            return 0.0
+
+        per_round = max(1, len(self._admitted))
+        return round(math.ceil((ahead + 1) / per_round) * self.average_hold_time, 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission statistics"""
+        return {
+            "admitted": len(self._admitted),
+            "queued": {project_id: len(queue) for project_id, queue in self._queues.items()},
+            "used": {"cpu": self._used.cpu, "memory": self._used.memory, "ports": self._used.ports},
+            "capacity": {"cpu": self.capacity.cpu, "memory": self.capacity.memory, "ports": self.capacity.ports},
+            "average_hold_time": round(self.average_hold_time, 1),
+            "expected_wait": self.expected_wait(),
+        }
+
+    def _free(self) -> ResourceRequest:
+        """Resources not reserved by admitted sandboxes."""
+        return ResourceRequest(
+            self.capacity.cpu - self._used.cpu,
+            self.capacity.memory - self._used.memory,
+            self.capacity.ports - self._used.ports
+        )
+
+    def _can_admit(self, request: ResourceRequest) -> bool:
+        """Whether a request fits now."""
+        if self.max_sandboxes is not None and len(self._admitted) >= self.max_sandboxes:
+            return False
+        return request.fits(self._free())
+
+    def _admit(self, sandbox_id: str, request: ResourceRequest):
+        """Reserve resources for a sandbox."""
+        self._admitted[sandbox_id] = request
+        self._admitted_at[sandbox_id] = time.monotonic()
+        self._used = ResourceRequest(
+            self._used.cpu + request.cpu,
+            self._used.memory + request.memory,
+            self._used.ports + request.ports
+        )
+
+    def _dispatch(self):
+        """Admit queue heads round-robin across projects until one does not fit."""
+        while self._queues:
+            project_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+
+            if not self._can_admit(waiter.request):
+                # No backfilling past the head, so large requests are not starved
+                return
+
+            queue.popleft()
+            del self._queues[project_id]
+            if queue:
+                self._queues[project_id] = queue  # move the project to the back
+
+            self._admit(waiter.sandbox_id, waiter.request)
+            waiter.future.set_result(None)
+
+    def _remove_waiter(self, waiter: _Waiter):
+        """Drop a waiter that gave up, or release it if it was admitted meanwhile."""
+        queue = self._queues.get(waiter.project_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.project_id]
+            self._dispatch()
+        elif waiter.future.done() and not waiter.future.cancelled():
+            self.release(waiter.sandbox_id)
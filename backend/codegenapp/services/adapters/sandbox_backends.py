@@ -0,0 +1,564 @@
+"""
+Sandbox backends for the Grainchain adapter.
+
+A backend turns a sandbox specification into a running environment and
+tears it down again. The simulated backend keeps the adapter's original
+behaviour; the local process backend runs the sandbox command as a real
+subprocess on allocated ports, inside user/PID namespaces and a cgroup
+when the host allows it, so the deploy and test path can be exercised
+and load-tested without Docker.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import resource
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from codegenapp.services.adapters.sandbox_logs import SandboxLogStore, sandbox_log_store
+
+logger = logging.getLogger(__name__)
+
+# Seconds a local sandbox gets to start listening on its port
+DEFAULT_START_TIMEOUT = 30.0
+
+# Seconds between SIGTERM and SIGKILL when stopping a local sandbox
+DEFAULT_STOP_GRACE_PERIOD = 5.0
+
+# Bytes read from a sandbox's output per chunk
+LOG_CHUNK_BYTES = 64 * 1024
+
+_MEMORY_UNITS = {
+    "": 1, "b": 1,
+    "k": 1000, "kb": 1000, "ki": 1024, "kib": 1024,
+    "m": 1000 ** 2, "mb": 1000 ** 2, "mi": 1024 ** 2, "mib": 1024 ** 2,
+    "g": 1000 ** 3, "gb": 1000 ** 3, "gi": 1024 ** 3, "gib": 1024 ** 3,
+}
+
+
+def parse_cpu(value: Any) -> Optional[float]:
+    """
+    Parse a CPU quantity such as 2, "1.5", "500m" or "2 cores".
+
+    Args:
+        value: CPU quantity
+
+    Returns:
+        Optional[float]: Number of CPUs, or None if unset
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip().lower()
+    if text.endswith("m"):
+        return float(text[:-1]) / 1000
+    match = re.match(r"^([\d.]+)\s*(cores?|cpus?)?$", text)
+    if not match:
+        raise ValueError(f"Invalid CPU quantity: {value}")
+    return float(match.group(1))
+
+
+def parse_memory(value: Any) -> Optional[int]:
+    """
+    Parse a memory quantity such as 536870912, "512Mi" or "4GB".
+
+    Args:
+        value: Memory quantity
+
+    Returns:
+        Optional[int]: Number of bytes, or None if unset
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    match = re.match(r"^([\d.]+)\s*([a-z]*)$", str(value).strip().lower())
+    if not match or match.group(2) not in _MEMORY_UNITS:
+        raise ValueError(f"Invalid memory quantity: {value}")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2)])
+
+
+@dataclass
+class SandboxSpec:
+    """What a backend should run for a sandbox"""
+    image: str
+    environment: Dict[str, str] = field(default_factory=dict)
+    ports: List[int] = field(default_factory=list)
+    resources: Dict[str, Any] = field(default_factory=dict)
+    command: Optional[List[str]] = None
+    workdir: Optional[str] = None
+
+
+class SandboxBackend(ABC):
+    """Abstract base class for sandbox backends"""
+
+    @abstractmethod
+    async def start(self, sandbox_id: str, spec: SandboxSpec) -> Dict[str, Any]:
+        """
+        Start a sandbox and wait until it is running.
+
+        Args:
+            sandbox_id: Unique ID of the sandbox
+            spec: Sandbox specification
+
+        Returns:
+            dict: Runtime details, including "endpoints"
+        """
+        pass
+
+    @abstractmethod
+    async def stop(self, sandbox_id: str):
+        """
+        Stop a sandbox and release its resources.
+
+        Args:
+            sandbox_id: Unique ID of the sandbox
+        """
+        pass
+
+    async def close(self):
+        """Stop every sandbox still running"""
+        pass
+
+    def is_running(self, sandbox_id: str) -> bool:
+        """Whether a started sandbox is still running (assumed so if unknown)"""
+        return True
+
+
+class PortAllocator:
+    """Hands out free local TCP ports, never the same one twice while in use"""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self._allocated: Set[int] = set()
+
+    def allocate(self) -> int:
+        """
+        Reserve a free port.
+
+        Returns:
+            int: Port number
+        """
+        for _ in range(100):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.bind((self.host, 0))
+                port = sock.getsockname()[1]
+            if port not in self._allocated:
+                self._allocated.add(port)
+                return port
+        raise RuntimeError("No free port available")
+
+    def release(self, port: int):
+        """Return a port to the pool"""
+        self._allocated.discard(port)
+
+    @property
+    def in_use(self) -> int:
+        """Number of ports currently allocated"""
+        return len(self._allocated)
+
+
+class SimulatedSandboxBackend(SandboxBackend):
+    """Pretends to start sandboxes; endpoints use allocated but unbound ports"""
+
+    def __init__(
+        self,
+        startup_delay: float = 2.0,
+        ports: Optional[PortAllocator] = None,
+        logs: Optional[SandboxLogStore] = None
+    ):
+        self.startup_delay = startup_delay
+        self.ports = ports or PortAllocator()
+        self.logs = logs or sandbox_log_store
+        self._sandbox_ports: Dict[str, List[int]] = {}
+
+    async def start(self, sandbox_id: str, spec: SandboxSpec) -> Dict[str, Any]:
+        """Wait for the simulated startup time"""
+        http_port, ssh_port = self.ports.allocate(), self.ports.allocate()
+        self._sandbox_ports[sandbox_id] = [http_port, ssh_port]
+
+        buffer = self.logs.create(sandbox_id)
+        buffer.append(f"Sandbox {sandbox_id} started\n".encode())
+        await asyncio.sleep(self.startup_delay)
+        buffer.append(f"Container running on image {spec.image}\nReady to accept connections\n".encode())
+
+        return {
+            "endpoints": {
+                "http": f"http://localhost:{http_port}",
+                "ssh": f"ssh://localhost:{ssh_port}"
+            }
+        }
+
+    async def stop(self, sandbox_id: str):
+        """Release the sandbox's ports"""
+        for port in self._sandbox_ports.pop(sandbox_id, []):
+            self.ports.release(port)
+        self.logs.close(sandbox_id)
+
+    async def close(self):
+        """Release all ports"""
+        for sandbox_id in list(self._sandbox_ports):
+            await self.stop(sandbox_id)
+
+    def is_running(self, sandbox_id: str) -> bool:
+        """Whether the sandbox was started and not stopped"""
+        return sandbox_id in self._sandbox_ports
+
+
+@dataclass
+class _LocalSandbox:
+    """Bookkeeping for a running local sandbox"""
+    process: asyncio.subprocess.Process
+    ports: Dict[int, int]
+    workdir: str
+    owns_workdir: bool
+    cgroup: Optional[Path] = None
+    namespaced: bool = False
+    log_task: Optional[asyncio.Task] = None
+
+
+class LocalProcessSandboxBackend(SandboxBackend):
+    """
+    Runs each sandbox as a local subprocess.
+
+    The sandbox command defaults to a static HTTP server over the sandbox
+    working directory. Every requested container port is mapped to a free
+    host port, passed to the command as PORT / SANDBOX_PORT_<port> and
+    substituted for ``{port}`` in the command. Isolation is best effort:
+    user, PID and mount namespaces via ``unshare`` and a cgroup v2 group
+    with cpu.max / memory.max when available, rlimits otherwise. Output
+    is captured into the sandbox's log ring buffer.
+    """
+
+    def __init__(
+        self,
+        isolation: str = "auto",
+        cgroup_root: Optional[str] = None,
+        host: str = "127.0.0.1",
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+        stop_grace_period: float = DEFAULT_STOP_GRACE_PERIOD,
+        logs: Optional[SandboxLogStore] = None
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            isolation: "auto" to use namespaces/cgroups when available, "none" for plain subprocesses
+            cgroup_root: Writable cgroup v2 directory to create sandbox groups under (optional)
+            host: Interface sandboxes listen on
+            start_timeout: Seconds a sandbox gets to start listening
+            stop_grace_period: Seconds between SIGTERM and SIGKILL on stop
+            logs: Store receiving sandbox output (defaults to the global store)
+        """
+        if isolation not in ("auto", "none"):
+            raise ValueError(f"Unknown sandbox isolation mode: {isolation}")
+
+        self.isolation = isolation
+        self.cgroup_root = Path(cgroup_root) if cgroup_root else None
+        self.host = host
+        self.start_timeout = start_timeout
+        self.stop_grace_period = stop_grace_period
+        self.ports = PortAllocator(host)
+        self.logs = logs or sandbox_log_store
+
+        self._sandboxes: Dict[str, _LocalSandbox] = {}
+        self._namespaces_available: Optional[bool] = None
+
+    async def start(self, sandbox_id: str, spec: SandboxSpec) -> Dict[str, Any]:
+        """Start the sandbox process and wait for its first port to accept connections"""
+        ports = {container_port: self.ports.allocate() for container_port in (spec.ports or [80])}
+        primary_port = next(iter(ports.values()))
+
+        owns_workdir = spec.workdir is None
+        workdir = spec.workdir or tempfile.mkdtemp(prefix=f"{sandbox_id}-")
+
+        env = {
+            **os.environ,
+            **spec.environment,
+            "PORT": str(primary_port),
+            "SANDBOX_ID": sandbox_id,
+            **{f"SANDBOX_PORT_{container}": str(host) for container, host in ports.items()},
+        }
+        command = [
+            part.format(port=primary_port, workdir=workdir)
+            for part in (spec.command or [sys.executable, "-m", "http.server", "{port}", "--bind", self.host])
+        ]
+
+        cpus = parse_cpu(spec.resources.get("cpu"))
+        memory = parse_memory(spec.resources.get("memory"))
+        cgroup = self._create_cgroup(sandbox_id, cpus, memory)
+
+        namespaced = await self._use_namespaces()
+        if namespaced:
+            command = ["unshare", "--user", "--map-root-user", "--pid", "--fork", "--mount-proc", "--kill-child", *command]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=workdir,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+                preexec_fn=self._sandbox_preexec(cgroup, memory)
+            )
+        except Exception:
+            self._release(ports, workdir, owns_workdir, cgroup)
+            raise
+
+        sandbox = _LocalSandbox(process, ports, workdir, owns_workdir, cgroup, namespaced)
+        sandbox.log_task = asyncio.create_task(self._capture_output(sandbox_id, process.stdout))
+        self._sandboxes[sandbox_id] = sandbox
+
+        if cgroup is not None and not self._in_cgroup(cgroup, process.pid):
+            logger.warning(f"Sandbox {sandbox_id} could not join {cgroup}, limited by rlimits instead")
+
+        try:
+            await self._wait_for_port(process, primary_port)
+        except Exception:
+            await self.stop(sandbox_id)
+            raise
+
+        return {
+            "pid": process.pid,
+            "workdir": workdir,
+            "ports": {str(container): host for container, host in ports.items()},
+            "isolation": {
+                "namespaces": bool(self._namespaces_available),
+                "cgroup": str(cgroup) if cgroup else None,
+            },
+            "endpoints": {"http": f"http://{self.host}:{primary_port}"},
+        }
+
+    async def stop(self, sandbox_id: str):
+        """Terminate the sandbox's process group and release its ports"""
+        sandbox = self._sandboxes.pop(sandbox_id, None)
+        if sandbox is None:
+            return
+
+        process = sandbox.process
+        if process.returncode is None and sandbox.namespaced:
+            # The namespace's init process ignores SIGTERM; killing it tears down the namespace
+            self._signal_group(process, signal.SIGKILL)
+            await process.wait()
+        elif process.returncode is None:
+            self._signal_group(process, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=self.stop_grace_period)
+            except asyncio.TimeoutError:
+                self._signal_group(process, signal.SIGKILL)
+                await process.wait()
+
+        if sandbox.log_task is not None:
+            try:
+                await asyncio.wait_for(sandbox.log_task, timeout=self.stop_grace_period)
+            except asyncio.TimeoutError:
+                # Output pipe held open by an escaped descendant
+                self.logs.close(sandbox_id)
+
+        self._release(sandbox.ports, sandbox.workdir, sandbox.owns_workdir, sandbox.cgroup)
+
+    async def close(self):
+        """Stop all sandboxes"""
+        await asyncio.gather(*(self.stop(sandbox_id) for sandbox_id in list(self._sandboxes)))
+
+    def is_running(self, sandbox_id: str) -> bool:
+        """Whether the sandbox's process is still alive"""
+        sandbox = self._sandboxes.get(sandbox_id)
+        return sandbox is not None and sandbox.process.returncode is None
+
+    async def _capture_output(self, sandbox_id: str, stream: asyncio.StreamReader):
+        """Copy the sandbox's output into its log buffer until EOF."""
+        buffer = self.logs.create(sandbox_id)
+        try:
+            while True:
+                chunk = await stream.read(LOG_CHUNK_BYTES)
+                if not chunk:
+                    break
+                buffer.append(chunk)
+        finally:
+            self.logs.close(sandbox_id)
+
+    async def _wait_for_port(self, process: asyncio.subprocess.Process, port: int):
+        """Wait until the port accepts connections or the process exits."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.start_timeout
+        delay = 0.02
+
+        while True:
+            if process.returncode is not None:
+                raise RuntimeError(f"Sandbox process exited with code {process.returncode} before listening")
+            try:
+                _, writer = await asyncio.open_connection(self.host, port)
+                writer.close()
+                await writer.wait_closed()
+                return
+            except OSError:
+                if loop.time() >= deadline:
+                    raise RuntimeError(f"Sandbox did not listen on port {port} within {self.start_timeout}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+
+    async def _use_namespaces(self) -> bool:
+        """Probe once whether unprivileged namespaces can be created."""
+        if self.isolation == "none":
+            return False
+
+        if self._namespaces_available is None:
+            self._namespaces_available = False
+            if shutil.which("unshare"):
+                try:
+                    probe = await asyncio.create_subprocess_exec(
+                        "unshare", "--user", "--map-root-user", "--pid", "--fork", "--mount-proc", "--kill-child", "true",
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
+                    )
+                    self._namespaces_available = await asyncio.wait_for(probe.wait(), timeout=5) == 0
+                except Exception as e:
+                    logger.debug(f"Namespace probe failed: {e}")
+            logger.info(f"Local sandboxes {'use' if self._namespaces_available else 'run without'} namespaces")
+
+        return self._namespaces_available
+
+    def _create_cgroup(self, sandbox_id: str, cpus: Optional[float], memory: Optional[int]) -> Optional[Path]:
+        """Create a cgroup v2 group with the sandbox's limits, if possible."""
+        if self.isolation == "none" or self.cgroup_root is None:
+            return None
+        if not (self.cgroup_root / "cgroup.controllers").exists():
+            return None
+
+        cgroup = self.cgroup_root / sandbox_id
+        try:
+            cgroup.mkdir()
+            if cpus:
+                (cgroup / "cpu.max").write_text(f"{int(cpus * 100000)} 100000")
+            if memory:
+                (cgroup / "memory.max").write_text(str(memory))
+        except OSError as e:
+            logger.warning(f"Could not create cgroup for sandbox {sandbox_id}: {e}")
+            self._remove_cgroup(cgroup)
+            return None
+
+        return cgroup
+
+    def _release(self, ports: Dict[int, int], workdir: str, owns_workdir: bool, cgroup: Optional[Path]):
+        """Release ports, temporary working directory and cgroup."""
+        for port in ports.values():
+            self.ports.release(port)
+        if owns_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if cgroup is not None:
+            self._remove_cgroup(cgroup)
+
+    @staticmethod
+    def _remove_cgroup(cgroup: Path):
+        """Remove an (empty) cgroup directory."""
+        try:
+            cgroup.rmdir()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _rlimit_preexec(memory: Optional[int]):
+        """Build a preexec function applying a memory rlimit, if any."""
+        if not memory:
+            return None
+
+        def apply_limits():
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+        return apply_limits
+
+    @classmethod
+    def _sandbox_preexec(cls, cgroup: Optional[Path], memory: Optional[int]):
+        """
+        Build a preexec function placing the child in its cgroup before exec.
+
+        Joining from the child itself means everything it later forks,
+        including the workload behind ``unshare --fork``, starts inside the
+        cgroup. When the cgroup cannot be joined the memory rlimit applies.
+
+        Args:
+            cgroup: Sandbox cgroup, if one was created
+            memory: Memory limit in bytes, if any
+
+        Returns:
+            Callable or None: Function to run in the child before exec
+        """
+        apply_limits = cls._rlimit_preexec(memory)
+        if cgroup is None:
+            return apply_limits
+
+        procs = str(cgroup / "cgroup.procs")
+
+        def join_cgroup():
+            try:
+                with open(procs, "w") as f:
+                    f.write(str(os.getpid()))
+            except OSError:
+                if apply_limits is not None:
+                    apply_limits()
+
+        return join_cgroup
+
+    @staticmethod
+    def _in_cgroup(cgroup: Path, pid: int) -> bool:
+        """Check whether a process is a member of a cgroup."""
+        try:
+            return str(pid) in (cgroup / "cgroup.procs").read_text().split()
+        except OSError:
+            return False
+
+    @staticmethod
+    def _signal_group(process: asyncio.subprocess.Process, sig: int):
+        """Signal the sandbox's whole process group."""
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def create_sandbox_backend(
+    backend: str = "simulated",
+    config: Optional[Dict[str, Any]] = None,
+    logs: Optional[SandboxLogStore] = None
+) -> SandboxBackend:
+    """
+    Create a sandbox backend by name.
+
+    Args:
+        backend: "simulated" or "local"
+        config: Grainchain configuration
+        logs: Store receiving sandbox output (defaults to the global store)
+
+    Returns:
+        SandboxBackend: Configured backend
+    """
+    config = config or {}
+
+    if backend == "simulated":
+        return SimulatedSandboxBackend(logs=logs)
+
+    if backend == "local":
+        return LocalProcessSandboxBackend(
+            isolation=config.get("sandbox_isolation", "auto"),
+            cgroup_root=config.get("sandbox_cgroup_root"),
+            start_timeout=config.get("sandbox_start_timeout", DEFAULT_START_TIMEOUT),
+            logs=logs
+        )
+
+    raise ValueError(f"Unknown sandbox backend: {backend}")
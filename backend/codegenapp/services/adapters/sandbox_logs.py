@@ -0,0 +1,210 @@
+"""
+Sandbox log ring buffers.
+
+Sandbox output (stdout and stderr interleaved) is kept in a bounded
+buffer per sandbox, addressed by absolute byte offsets. Readers keep the
+offset returned by their last read and ask only for newer bytes, so a
+UI can tail multi-megabyte build logs while validation runs. Once the
+buffer is full the oldest bytes are dropped; a reader that fell behind
+is told its range was truncated.
+"""
+
+import asyncio
+import codecs
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from codegenapp.config.settings import get_settings
+
+# Default bytes of output retained per sandbox
+DEFAULT_LOG_BUFFER_BYTES = 1024 * 1024
+
+# Default bytes returned by a single read
+DEFAULT_LOG_READ_BYTES = 64 * 1024
+
+# Buffers of finished sandboxes kept for late readers
+DEFAULT_RETAINED_CLOSED_BUFFERS = 100
+
+
+class LogRingBuffer:
+    """
+    Bounded byte buffer with absolute offsets.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_LOG_BUFFER_BYTES):
+        self.max_bytes = max_bytes
+        self.start_offset = 0
+        self.closed = False
+
+        self._data = bytearray()
+        self._changed = asyncio.Event()
+
+    @property
+    def end_offset(self) -> int:
+        """Offset just past the last byte written"""
+        return self.start_offset + len(self._data)
+
+    def append(self, data: bytes):
+        """
+        Append output, dropping the oldest bytes beyond max_bytes.
+
+        Args:
+            data: Output bytes
+        """
+        if not data or self.closed:
+            return
+
+        self._data += data
+        overflow = len(self._data) - self.max_bytes
+        if overflow > 0:
+            del self._data[:overflow]
+            self.start_offset += overflow
+
+        self._notify()
+
+    def close(self):
+        """Mark the output as complete and wake waiting readers"""
+        if not self.closed:
+            self.closed = True
+            self._notify()
+
+    def read(self, since_offset: int = 0, max_bytes: int = DEFAULT_LOG_READ_BYTES) -> Dict[str, Any]:
+        """
+        Read bytes written at or after an offset.
+
+        Args:
+            since_offset: Offset returned as next_offset by the previous read
+            max_bytes: Maximum bytes to return
+
+        Returns:
+            dict: data, offset it starts at, next_offset, and whether bytes were skipped
+        """
+        offset = min(max(since_offset, self.start_offset), self.end_offset)
+        start = offset - self.start_offset
+        data = bytes(self._data[start:start + max_bytes])
+
+        return {
+            "data": data,
+            "offset": offset,
+            "next_offset": offset + len(data),
+            "truncated": since_offset < self.start_offset,
+            "eof": self.closed and offset + len(data) == self.end_offset,
+        }
+
+    def read_text(self, since_offset: int = 0, max_bytes: int = DEFAULT_LOG_READ_BYTES) -> Dict[str, Any]:
+        """
+        Read output written at or after an offset as UTF-8 text.
+
+        Reads stop before a multibyte character cut off by max_bytes or by
+        a write still in progress, so next_offset always falls on a
+        character boundary; after truncation the read skips ahead to the
+        first whole character.
+
+        Args:
+            since_offset: Offset returned as next_offset by the previous read
+            max_bytes: Maximum bytes to decode
+
+        Returns:
+            dict: text, offset it starts at, next_offset, and whether bytes were skipped
+        """
+        chunk = self.read(since_offset, max_bytes)
+        data = chunk.pop("data")
+
+        skipped = 0
+        if chunk["truncated"]:
+            while skipped < min(3, len(data)) and 0x80 <= data[skipped] < 0xC0:
+                skipped += 1
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        text = decoder.decode(data[skipped:], final=chunk["eof"])
+        pending = len(decoder.getstate()[0])
+
+        return {
+            "text": text,
+            **chunk,
+            "offset": chunk["offset"] + skipped,
+            "next_offset": chunk["next_offset"] - pending,
+        }
+
+    async def wait(self, offset: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until bytes past an offset exist or the output is complete.
+
+        Args:
+            offset: Offset the reader has consumed up to
+            timeout: Seconds to wait (optional)
+
+        Returns:
+            bool: True if new bytes or EOF are available
+        """
+        if offset < self.end_offset or self.closed:
+            return True
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _notify(self):
+        """Wake current waiters and arm a fresh event for the next ones."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class SandboxLogStore:
+    """
+    Log buffers of running and recently finished sandboxes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_LOG_BUFFER_BYTES,
+        retained_closed: int = DEFAULT_RETAINED_CLOSED_BUFFERS
+    ):
+        self.max_bytes = max_bytes
+        self.retained_closed = retained_closed
+
+        self._buffers: Dict[str, LogRingBuffer] = {}
+        self._closed: "OrderedDict[str, LogRingBuffer]" = OrderedDict()
+
+    def create(self, sandbox_id: str) -> LogRingBuffer:
+        """
+        Get the buffer of a sandbox, creating it if needed.
+
+        Args:
+            sandbox_id: ID of the sandbox
+
+        Returns:
+            LogRingBuffer: Sandbox log buffer
+        """
+        buffer = self.get(sandbox_id)
+        if buffer is None:
+            buffer = self._buffers[sandbox_id] = LogRingBuffer(self.max_bytes)
+        return buffer
+
+    def get(self, sandbox_id: str) -> Optional[LogRingBuffer]:
+        """Get the buffer of a running or recently finished sandbox"""
+        return self._buffers.get(sandbox_id) or self._closed.get(sandbox_id)
+
+    def close(self, sandbox_id: str):
+        """
+        Mark a sandbox's output complete, keeping it for late readers.
+
+        Args:
+            sandbox_id: ID of the sandbox
+        """
+        buffer = self._buffers.pop(sandbox_id, None)
+        if buffer is None:
+            return
+
+        buffer.close()
+        self._closed[sandbox_id] = buffer
+        while len(self._closed) > self.retained_closed:
+            self._closed.popitem(last=False)
+
+
+# Global sandbox log store
+sandbox_log_store = SandboxLogStore(
+    max_bytes=get_settings().grainchain_config.get("sandbox_log_buffer_bytes", DEFAULT_LOG_BUFFER_BYTES)
+)
@@ -8,13 +8,15 @@ and browser automation validation.
 import asyncio
 import logging
 import subprocess
-import tempfile
 import os
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from codegenapp.core.orchestration.coordinator import ServiceAdapter
 from codegenapp.config.settings import get_settings
+from codegenapp.services.adapters.web_eval_runtime import (
+    DEFAULT_WEB_EVAL_INSTALL_DIR, DEFAULT_WEB_EVAL_REPOSITORY, WebEvalRuntime
+)
 
 logger = logging.getLogger(__name__)
 
@@ -58,11 +60,19 @@ class WebEvalValidationResult:
 class WebEvalAdapter(ServiceAdapter):
     """Service adapter for Web-Eval-Agent integration"""
     
-    def __init__(self):
+    def __init__(self, runtime: Optional[WebEvalRuntime] = None):
         self.settings = get_settings()
         self.gemini_api_key = self.settings.gemini_api_key
         self.service_name = "web-eval-agent"
         
+        config = self.settings.web_eval_config
+        self.runtime = runtime or WebEvalRuntime(
+            agent_path=config.get("agent_path"),
+            install_dir=config.get("install_dir", DEFAULT_WEB_EVAL_INSTALL_DIR),
+            repository_url=config.get("repository_url", DEFAULT_WEB_EVAL_REPOSITORY),
+            workers=config.get("workers", 2)
+        )
+        
     async def is_healthy(self) -> bool:
         """Check if Web-Eval-Agent service is available"""
         try:
@@ -95,27 +105,14 @@ class WebEvalAdapter(ServiceAdapter):
         try:
             logger.info(f"Starting Web-Eval-Agent validation for {request.project_url}")
             
-            # Create temporary directory for the validation
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
-                # Clone the Web-Eval-Agent repository
-                await self._clone_web_eval_agent(temp_path)
-                
-                # Set up environment variables
-                env_vars = {
-                    "GEMINI_API_KEY": self.gemini_api_key,
-                    **request.environment_vars
-                }
-                
-                # Run validation tests
-                validation_result = await self._run_validation_tests(
-                    temp_path,
-                    request,
-                    env_vars
-                )
-                
-                return validation_result
+            # Set up environment variables
+            env_vars = {
+                "GEMINI_API_KEY": self.gemini_api_key,
+                **request.environment_vars
+            }
+            
+            # Run validation tests on a warm worker
+            return await self._run_validation_tests(request, env_vars)
                 
         except Exception as e:
             logger.error(f"Web-Eval-Agent validation failed: {e}")
@@ -151,31 +148,12 @@ class WebEvalAdapter(ServiceAdapter):
         
         return await self.validate_deployment(request)
     
-    async def _clone_web_eval_agent(self, temp_path: Path) -> None:
-        """Clone the Web-Eval-Agent repository"""
-        web_eval_path = temp_path / "web-eval-agent"
-        
-        clone_cmd = [
-            "git", "clone", 
-            "https://github.com/zeeeepa/web-eval-agent.git",
-            str(web_eval_path)
-        ]
-        
-        result = await self._run_command(clone_cmd, timeout=60)
-        if result.returncode != 0:
-            raise Exception(f"Failed to clone Web-Eval-Agent: {result.stderr}")
-        
-        logger.info("Successfully cloned Web-Eval-Agent repository")
-    
     async def _run_validation_tests(
         self,
-        temp_path: Path,
         request: WebEvalValidationRequest,
         env_vars: Dict[str, str]
     ) -> WebEvalValidationResult:
         """Run validation tests using Web-Eval-Agent"""
-        web_eval_path = temp_path / "web-eval-agent"
-        
         # Create test configuration
         test_config = {
             "target_url": request.deployment_url or request.project_url,
@@ -183,44 +161,27 @@ class WebEvalAdapter(ServiceAdapter):
             "gemini_api_key": self.gemini_api_key
         }
         
-        # Write test configuration to file
-        config_file = web_eval_path / "test_config.json"
-        import json
-        with open(config_file, 'w') as f:
-            json.dump(test_config, f, indent=2)
-        
-        # Run Web-Eval-Agent validation
-        validation_cmd = [
-            "python", "main.py",
-            "--config", str(config_file),
-            "--output", "validation_results.json"
-        ]
-        
-        result = await self._run_command(
-            validation_cmd,
-            cwd=web_eval_path,
-            env=env_vars,
+        response = await self.runtime.evaluate(
+            test_config,
+            env={key: value for key, value in env_vars.items() if value is not None},
             timeout=300  # 5 minutes timeout
         )
         
         # Parse results
-        results_file = web_eval_path / "validation_results.json"
-        if results_file.exists():
-            with open(results_file, 'r') as f:
-                results_data = json.load(f)
-            
+        results_data = response.get("results")
+        if results_data is not None:
             return WebEvalValidationResult(
                 success=results_data.get("success", False),
                 test_results=results_data.get("test_results", []),
-                logs=result.stdout,
+                logs=response.get("logs"),
                 error_message=results_data.get("error_message") if not results_data.get("success") else None
             )
         else:
             return WebEvalValidationResult(
                 success=False,
                 test_results=[],
-                error_message=f"Validation failed: {result.stderr}",
-                logs=result.stdout
+                error_message=f"Validation failed with exit code {response.get('exit_code')}",
+                logs=response.get("logs")
             )
     
     async def _run_command(
@@ -264,6 +225,10 @@ class WebEvalAdapter(ServiceAdapter):
             await process.wait()
             raise Exception(f"Command timed out after {timeout} seconds: {' '.join(cmd)}")
     
+    async def cleanup(self):
+        """Stop the Web-Eval-Agent workers"""
+        await self.runtime.close()
+    
     async def get_service_info(self) -> Dict[str, Any]:
         """Get service information"""
         return {
@@ -271,6 +236,7 @@ class WebEvalAdapter(ServiceAdapter):
             "version": "1.0.0",
             "status": "healthy" if await self.is_healthy() else "unhealthy",
             "gemini_api_configured": bool(self.gemini_api_key),
+            "runtime": self.runtime.get_stats(),
             "capabilities": [
                 "ui_validation",
                 "browser_automation",
@@ -0,0 +1,275 @@
+"""
+Managed Web-Eval-Agent runtime.
+
+Provides a single installed web-eval-agent checkout, either a vendored
+directory or one cloned once into a persistent install directory, and a
+pool of long-lived worker processes that take test configurations over
+a pipe. Validations reuse warm workers instead of cloning the agent and
+starting a fresh interpreter every time.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upstream repository used when no vendored checkout is available
+DEFAULT_WEB_EVAL_REPOSITORY = "https://github.com/zeeeepa/web-eval-agent.git"
+
+# Persistent directory the agent is installed into when cloned
+DEFAULT_WEB_EVAL_INSTALL_DIR = os.path.join(tempfile.gettempdir(), "codegenapp", "web-eval-agent")
+
+# Script run by each worker process
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_eval_worker.py")
+
+# Maximum size of a single worker response line
+WORKER_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class WebEvalRuntimeError(Exception):
+    """Raised when the runtime cannot install the agent or run an evaluation"""
+    pass
+
+
+class WebEvalWorker:
+    """
+    A long-lived worker process serving one evaluation at a time.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.evaluations = 0
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is still running"""
+        return self.process.returncode is None
+
+    async def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response line.
+
+        Args:
+            payload: JSON-serializable request
+            timeout: Seconds to wait for the response
+
+        Returns:
+            dict: Worker response
+        """
+        self.process.stdin.write((json.dumps(payload) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout)
+        if not line:
+            raise WebEvalRuntimeError("Web-Eval-Agent worker exited unexpectedly")
+
+        self.evaluations += 1
+        return json.loads(line)
+
+    async def stop(self):
+        """Terminate the worker process."""
+        if not self.alive:
+            return
+
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+class WebEvalRuntime:
+    """
+    Installed web-eval-agent plus a pool of warm worker processes.
+    """
+
+    def __init__(
+        self,
+        agent_path: Optional[str] = None,
+        install_dir: str = DEFAULT_WEB_EVAL_INSTALL_DIR,
+        repository_url: Optional[str] = DEFAULT_WEB_EVAL_REPOSITORY,
+        workers: int = 2,
+        python: str = sys.executable,
+        install_timeout: int = 300
+    ):
+        """
+        Initialize the runtime.
+
+        Args:
+            agent_path: Vendored web-eval-agent checkout, used as-is (optional)
+            install_dir: Persistent directory to clone the agent into otherwise
+            repository_url: Repository to clone from; None disables cloning (offline)
+            workers: Number of worker processes
+            python: Interpreter running the workers
+            install_timeout: Timeout for the one-time clone in seconds
+        """
+        self.agent_path = agent_path
+        self.install_dir = install_dir
+        self.repository_url = repository_url
+        self.workers = max(1, workers)
+        self.python = python
+        self.install_timeout = install_timeout
+
+        self._agent_dir: Optional[Path] = None
+        self._idle: "asyncio.Queue[WebEvalWorker]" = asyncio.Queue()
+        self._workers: List[WebEvalWorker] = []
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+    async def start(self):
+        """Install the agent if needed and start the worker processes."""
+        async with self._start_lock:
+            if self._started:
+                return
+
+            self._agent_dir = await self.ensure_installed()
+            for _ in range(self.workers):
+                self._idle.put_nowait(await self._spawn_worker())
+
+            self._started = True
+            logger.info(f"Started {self.workers} Web-Eval-Agent workers from {self._agent_dir}")
+
+    async def ensure_installed(self) -> Path:
+        """
+        Locate the agent checkout, cloning it once if none exists.
+
+        Returns:
+            Path: Directory containing the agent's main.py
+        """
+        if self.agent_path:
+            agent_dir = Path(self.agent_path)
+            if not (agent_dir / "main.py").exists():
+                raise WebEvalRuntimeError(f"No web-eval-agent checkout at {agent_dir}")
+            return agent_dir
+
+        install_dir = Path(self.install_dir)
+        if (install_dir / "main.py").exists():
+            return install_dir
+
+        if not self.repository_url:
+            raise WebEvalRuntimeError(
+                f"Web-eval-agent is not installed at {install_dir} and cloning is disabled"
+            )
+
+        logger.info(f"Installing Web-Eval-Agent into {install_dir}")
+        install_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix="web-eval-agent-", dir=install_dir.parent))
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", "clone", "--depth", "1", "--quiet", self.repository_url, str(staging_dir / "agent"),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=self.install_timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise WebEvalRuntimeError(f"Cloning Web-Eval-Agent timed out after {self.install_timeout}s")
+
+            if process.returncode != 0:
+                raise WebEvalRuntimeError(f"Failed to clone Web-Eval-Agent: {stderr.decode('utf-8', 'replace')}")
+
+            if not install_dir.exists():
+                os.replace(staging_dir / "agent", install_dir)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        return install_dir
+
+    async def evaluate(
+        self,
+        config: Dict[str, Any],
+        env: Optional[Dict[str, str]] = None,
+        timeout: float = 300
+    ) -> Dict[str, Any]:
+        """
+        Run one evaluation on a warm worker.
+
+        Args:
+            config: Test configuration passed to the agent
+            env: Environment variables for this evaluation (optional)
+            timeout: Seconds before the worker is killed and replaced
+
+        Returns:
+            dict: Worker response with exit_code, results and logs
+        """
+        await self.start()
+
+        worker = await self._idle.get()
+        released = False
+        try:
+            if not worker.alive:
+                worker = await self._replace_worker(worker)
+
+            try:
+                response = await worker.request({"config": config, "env": env or {}}, timeout)
+            except asyncio.TimeoutError:
+                raise WebEvalRuntimeError(f"Web-Eval-Agent evaluation timed out after {timeout} seconds")
+
+            self._idle.put_nowait(worker)
+            released = True
+            return response
+        finally:
+            if not released:
+                # The worker may still owe a response to this request (timeout,
+                # cancellation, broken pipe), so it must never be reused
+                await asyncio.shield(self._release_replacement(worker))
+
+    async def close(self):
+        """Stop all worker processes."""
+        async with self._start_lock:
+            workers, self._workers = self._workers, []
+            self._idle = asyncio.Queue()
+            self._started = False
+
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get runtime statistics"""
+        return {
+            "agent_dir": str(self._agent_dir) if self._agent_dir else None,
+            "workers": len(self._workers),
+            "idle_workers": self._idle.qsize(),
+            "evaluations": sum(worker.evaluations for worker in self._workers),
+        }
+
+    async def _spawn_worker(self) -> WebEvalWorker:
+        """Start a worker process serving the installed agent."""
+        process = await asyncio.create_subprocess_exec(
+            self.python, WORKER_SCRIPT, str(self._agent_dir),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=WORKER_STREAM_LIMIT
+        )
+        worker = WebEvalWorker(process)
+        self._workers.append(worker)
+        return worker
+
+    async def _release_replacement(self, worker: WebEvalWorker):
+        """Replace a worker that did not finish its request and return the new one to the pool."""
+        try:
+            worker = await self._replace_worker(worker)
+        except Exception as e:
+            # The killed worker goes back, so the next evaluation retries the spawn
+            logger.error(f"Failed to replace Web-Eval-Agent worker: {e}")
+        self._idle.put_nowait(worker)
+
+    async def _replace_worker(self, worker: WebEvalWorker) -> WebEvalWorker:
+        """Kill a broken worker and start a fresh one in its place."""
+        if worker.alive:
+            worker.process.kill()
+            await worker.process.wait()
+
+        if worker in self._workers:
+            self._workers.remove(worker)
+        return await self._spawn_worker()
@@ -0,0 +1,96 @@
+"""
+Web-Eval-Agent worker process.
+
+Runs inside a long-lived interpreter started by ``WebEvalRuntime``. Each
+line on stdin is a JSON request holding a test configuration; the agent's
+``main.py`` is executed in-process for it and one JSON response line is
+written back on a private copy of the original stdout. Modules imported
+by the agent stay loaded between requests, so only the evaluation itself
+is paid for per validation.
+
+Usage: python -m codegenapp.services.adapters.web_eval_worker <agent_dir>
+"""
+
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import tempfile
+import traceback
+from typing import Any, Dict
+
+
+def run_evaluation(agent_dir: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one evaluation with the agent's entry point.
+
+    Args:
+        agent_dir: Directory of the web-eval-agent checkout
+        request: Request with "config" and optional "env"
+
+    Returns:
+        dict: Response with the parsed results and captured logs
+    """
+    logs = io.StringIO()
+    previous_env = dict(os.environ)
+    os.environ.update(request.get("env") or {})
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_file = os.path.join(work_dir, "test_config.json")
+        output_file = os.path.join(work_dir, "validation_results.json")
+        with open(config_file, "w") as f:
+            json.dump(request["config"], f)
+
+        sys.argv = ["main.py", "--config", config_file, "--output", output_file]
+        exit_code = 0
+
+        try:
+            with contextlib.redirect_stdout(logs), contextlib.redirect_stderr(logs):
+                runpy.run_path(os.path.join(agent_dir, "main.py"), run_name="__main__")
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            logs.write(traceback.format_exc())
+            exit_code = 1
+        finally:
+            os.environ.clear()
+            os.environ.update(previous_env)
+
+        results = None
+        if os.path.exists(output_file):
+            with open(output_file) as f:
+                results = json.load(f)
+
+    return {"exit_code": exit_code, "results": results, "logs": logs.getvalue()}
+
+
+def main():
+    """Serve evaluation requests from stdin until it is closed."""
+    agent_dir = os.path.abspath(sys.argv[1])
+    os.chdir(agent_dir)
+    sys.path.insert(0, agent_dir)
+
+    # Keep the protocol on a private copy of fd 1 and point fd 1 at stderr, so
+    # output that bypasses sys.stdout (subprocesses, C extensions, browser
+    # drivers) cannot corrupt the response lines
+    sys.stdout.flush()
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        try:
+            response = run_evaluation(agent_dir, json.loads(line))
+        except Exception as e:
+            response = {"exit_code": 1, "results": None, "logs": "", "error": str(e)}
+
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 
 from codegenapp.services.adapters.graph_sitter_adapter import GraphSitterAdapter, AnalysisType
+from codegenapp.observability.metrics import graph_sitter_analysis_duration
 from codegenapp.models.api.analysis import (
     BatchAnalysisResponse, AnalysisResultResponse, AnalysisTypeEnum,
     PerformanceMetricsResponse
@@ -181,6 +182,8 @@ class AnalysisService:
         metadata = {"repo_path": repo_path, "analysis_types": analysis_types}
         
         for analysis_type in analysis_types:
+            start = time.perf_counter()
+            outcome = "error"
             try:
                 if analysis_type == AnalysisTypeEnum.FULL_CODEBASE:
                     result = await self.adapter.analyze_codebase(repo_path)
@@ -192,6 +195,7 @@ class AnalysisService:
                     warnings.append(f"Unsupported analysis type for batch processing: {analysis_type}")
                     continue
                 
+                outcome = "success" if result.success else "failure"
                 if result.success:
                     combined_results[analysis_type.value] = result.data
                 else:
@@ -200,6 +204,8 @@ class AnalysisService:
             except Exception as e:
                 logger.error(f"Error in {analysis_type.value} analysis for {repo_path}: {e}")
                 warnings.append(f"Exception in {analysis_type.value}: {str(e)}")
+            
+            graph_sitter_analysis_duration.labels(analysis_type.value, outcome).observe(time.perf_counter() - start)
         
         # Determine overall success
         success = len(combined_results) > 0
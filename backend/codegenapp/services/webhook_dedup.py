@@ -0,0 +1,232 @@
+"""
+Delivery-ID deduplication for webhooks.
+
+GitHub redelivers webhooks and the Cloudflare worker may forward the same
+delivery more than once. The deduplicator remembers delivery IDs for a
+bounded time so a repeated delivery is skipped before it is queued.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Default time delivery IDs are remembered, in seconds
+DEFAULT_DEDUP_TTL = 24 * 60 * 60
+
+# Default maximum delivery IDs remembered in memory
+DEFAULT_DEDUP_MAX_ENTRIES = 100000
+
+
+class DeliveryIdStore(ABC):
+    """Abstract base class for seen delivery ID storage"""
+
+    @abstractmethod
+    async def add(self, delivery_id: str) -> bool:
+        """
+        Record a delivery ID.
+
+        Args:
+            delivery_id: Webhook delivery ID
+
+        Returns:
+            bool: True if the ID was not already recorded
+        """
+        pass
+
+    @abstractmethod
+    async def remove(self, delivery_id: str):
+        """Forget a delivery ID"""
+        pass
+
+    async def close(self):
+        """Release resources"""
+        pass
+
+
+class InMemoryDeliveryIdStore(DeliveryIdStore):
+    """Process-local seen-set with expiry and a size bound"""
+
+    def __init__(self, ttl: float = DEFAULT_DEDUP_TTL, max_entries: int = DEFAULT_DEDUP_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Delivery ID -> expiry time, in insertion (and therefore expiry) order
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    async def add(self, delivery_id: str) -> bool:
+        """Record the ID unless it was seen within the TTL"""
+        now = time.monotonic()
+        self._expire(now)
+
+        if delivery_id in self._seen:
+            return False
+
+        self._seen[delivery_id] = now + self.ttl
+        if len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+        return True
+
+    async def remove(self, delivery_id: str):
+        """Forget the ID"""
+        self._seen.pop(delivery_id, None)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _expire(self, now: float):
+        """Drop expired IDs from the front of the seen-set."""
+        while self._seen:
+            delivery_id, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                break
+            self._seen.popitem(last=False)
+
+
+class RedisDeliveryIdStore(DeliveryIdStore):
+    """Seen-set shared across processes using SET NX with an expiry"""
+
+    def __init__(self, redis_url: str, key_prefix: str = "codegenapp:webhook-delivery", ttl: float = DEFAULT_DEDUP_TTL):
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self._redis: Optional[aioredis.Redis] = None
+
+    async def add(self, delivery_id: str) -> bool:
+        """Record the ID unless another process already recorded it"""
+        created = await self._client().set(
+            f"{self.key_prefix}:{delivery_id}", 1, nx=True, ex=int(self.ttl)
+        )
+        return bool(created)
+
+    async def remove(self, delivery_id: str):
+        """Forget the ID"""
+        await self._client().delete(f"{self.key_prefix}:{delivery_id}")
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _client(self) -> aioredis.Redis:
+        """Get the Redis client, connecting lazily."""
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+
+
+class WebhookDeduplicator:
+    """
+    Skips webhook deliveries whose ID was already seen.
+
+    The in-memory seen-set is always checked first; an optional shared
+    store catches duplicates delivered to other processes. If the shared
+    store is unavailable, deliveries are let through rather than dropped.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_DEDUP_TTL,
+        max_entries: int = DEFAULT_DEDUP_MAX_ENTRIES,
+        shared_store: Optional[DeliveryIdStore] = None
+    ):
+        self.local_store = InMemoryDeliveryIdStore(ttl, max_entries)
+        self.shared_store = shared_store
+
+        self.checked_count = 0
+        self.skipped_count = 0
+
+    async def is_duplicate(self, delivery_id: Optional[str]) -> bool:
+        """
+        Check a delivery and record it as seen.
+
+        Args:
+            delivery_id: Webhook delivery ID (deliveries without one are never duplicates)
+
+        Returns:
+            bool: True if the delivery was already seen and should be skipped
+        """
+        if not delivery_id:
+            return False
+
+        self.checked_count += 1
+
+        if not await self.local_store.add(delivery_id):
+            self.skipped_count += 1
+            return True
+
+        if self.shared_store is not None:
+            try:
+                if not await self.shared_store.add(delivery_id):
+                    self.skipped_count += 1
+                    return True
+            except Exception as e:
+                logger.warning(f"Shared webhook dedup check failed for {delivery_id}: {e}")
+
+        return False
+
+    async def forget(self, delivery_id: Optional[str]):
+        """
+        Forget a delivery so a redelivery is processed.
+
+        Used when a delivery was recorded but could not be accepted.
+
+        Args:
+            delivery_id: Webhook delivery ID
+        """
+        if not delivery_id:
+            return
+
+        await self.local_store.remove(delivery_id)
+
+        if self.shared_store is not None:
+            try:
+                await self.shared_store.remove(delivery_id)
+            except Exception as e:
+                logger.warning(f"Failed to forget webhook delivery {delivery_id}: {e}")
+
+    async def close(self):
+        """Release the shared store"""
+        if self.shared_store is not None:
+            await self.shared_store.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get deduplication statistics"""
+        return {
+            "checked": self.checked_count,
+            "skipped_duplicates": self.skipped_count,
+            "tracked_delivery_ids": len(self.local_store),
+            "shared_store": self.shared_store is not None,
+        }
+
+
+def create_webhook_deduplicator(
+    backend: str = "memory",
+    ttl: float = DEFAULT_DEDUP_TTL,
+    redis_url: Optional[str] = None
+) -> WebhookDeduplicator:
+    """
+    Create a webhook deduplicator by backend name.
+
+    Args:
+        backend: "memory" for a process-local seen-set, "redis" to also share it
+        ttl: Time delivery IDs are remembered, in seconds
+        redis_url: Redis URL, required for the redis backend
+
+    Returns:
+        WebhookDeduplicator: Configured deduplicator
+    """
+    if backend == "memory":
+        return WebhookDeduplicator(ttl=ttl)
+
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("redis_url is required for the redis webhook dedup backend")
+        return WebhookDeduplicator(ttl=ttl, shared_store=RedisDeliveryIdStore(redis_url, ttl=ttl))
+
+    raise ValueError(f"Unknown webhook dedup backend: {backend}")
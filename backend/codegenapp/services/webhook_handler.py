@@ -11,6 +11,7 @@ from .adapters.github_adapter import GitHubAdapter, GitHubWebhookEvent
 from ..repositories.project_repository import ProjectRepository
 from ..repositories.agent_run_repository import AgentRunRepository
 from ..database.connection import DatabaseManager
+from .webhook_dedup import WebhookDeduplicator
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +19,17 @@ logger = logging.getLogger(__name__)
 class WebhookHandler:
     """Service for handling GitHub webhooks"""
     
+    HANDLED_EVENT_TYPES = {'push', 'pull_request', 'issues'}
+    
     def __init__(self, 
                  github_adapter: GitHubAdapter,
                  project_repo: ProjectRepository,
-                 agent_run_repo: AgentRunRepository):
+                 agent_run_repo: AgentRunRepository,
+                 deduplicator: Optional[WebhookDeduplicator] = None):
         self.github_adapter = github_adapter
         self.project_repo = project_repo
         self.agent_run_repo = agent_run_repo
+        self.deduplicator = deduplicator
     
     async def process_webhook(self, 
                             headers: Dict[str, str], 
@@ -44,9 +49,21 @@ class WebhookHandler:
         if not self.github_adapter.verify_webhook_signature(payload, signature):
             raise HTTPException(status_code=401, detail="Invalid webhook signature")
         
+        # Skip redeliveries before doing any work
+        delivery_id = headers.get('X-GitHub-Delivery')
+        if self.deduplicator and await self.deduplicator.is_duplicate(delivery_id):
+            logger.info(f"Skipping duplicate webhook delivery: {delivery_id}")
+            return {'status': 'ignored', 'reason': 'Duplicate delivery'}
+        
+        # Unhandled event types are acknowledged without parsing the body
+        event_type = headers.get('X-GitHub-Event')
+        if event_type not in self.HANDLED_EVENT_TYPES:
+            logger.info(f"Unhandled webhook event type: {event_type}")
+            return {'status': 'ignored', 'reason': f'Unhandled event type: {event_type}'}
+        
         # Parse webhook event
         import json
-        payload_dict = json.loads(payload.decode('utf-8'))
+        payload_dict = json.loads(payload)
         event = self.github_adapter.parse_webhook_event(headers, payload_dict)
         
         if not event:
@@ -0,0 +1,170 @@
+"""
+Webhook ingress checks.
+
+Reads webhook bodies as a stream, rejecting oversize bodies and bad
+signatures before anything is parsed, then extracts only the payload
+fields the webhook processor uses.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+# GitHub caps webhook payloads at 25 MB
+DEFAULT_MAX_WEBHOOK_BODY_BYTES = 25 * 1024 * 1024
+
+# Repository fields used by every event handler
+_REPOSITORY_FIELDS = {"full_name": True, "clone_url": True}
+
+# Payload fields used by the webhook processor, per GitHub event type.
+# Nested dicts select sub-fields; a one-element list selects fields of each item.
+WEBHOOK_PAYLOAD_FIELDS: Dict[str, Dict[str, Any]] = {
+    "pull_request": {
+        "action": True,
+        "pull_request": {
+            "id": True,
+            "number": True,
+            "title": True,
+            "body": True,
+            "state": True,
+            "html_url": True,
+            "merged": True,
+            "head": {"ref": True, "sha": True},
+        },
+        "repository": _REPOSITORY_FIELDS,
+    },
+    "push": {
+        "ref": True,
+        "commits": [{"id": True}],
+        "repository": _REPOSITORY_FIELDS,
+    },
+    "issues": {
+        "action": True,
+        "issue": {"number": True, "title": True},
+        "repository": _REPOSITORY_FIELDS,
+    },
+}
+
+
+class WebhookPayloadTooLargeError(Exception):
+    """Raised when a webhook body exceeds the size limit"""
+    pass
+
+
+class WebhookSignatureError(Exception):
+    """Raised when a webhook signature is missing or does not match"""
+    pass
+
+
+async def read_webhook_body(
+    request: Request,
+    max_bytes: int = DEFAULT_MAX_WEBHOOK_BODY_BYTES,
+    secret: Optional[str] = None,
+    signature: Optional[str] = None
+) -> bytearray:
+    """
+    Read a webhook body, verifying its HMAC-SHA256 signature as it streams.
+
+    Oversize bodies are rejected from the Content-Length header when
+    present, otherwise as soon as the streamed size exceeds the limit.
+
+    Args:
+        request: Incoming request
+        max_bytes: Maximum accepted body size
+        secret: Webhook secret; signature checking is skipped when unset
+        signature: Signature header value ("sha256=<hex>")
+
+    Returns:
+        bytearray: Raw, verified body
+
+    Raises:
+        WebhookPayloadTooLargeError: If the body exceeds max_bytes
+        WebhookSignatureError: If the signature is missing or invalid
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise WebhookPayloadTooLargeError(f"Webhook body of {content_length} bytes exceeds {max_bytes}")
+
+    digest = None
+    if secret:
+        if not signature or not signature.startswith("sha256="):
+            raise WebhookSignatureError("Missing webhook signature")
+        digest = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+    body = bytearray()
+    async for chunk in request.stream():
+        if len(body) + len(chunk) > max_bytes:
+            raise WebhookPayloadTooLargeError(f"Webhook body exceeds {max_bytes} bytes")
+
+        if digest is not None:
+            digest.update(chunk)
+        body += chunk
+
+    if digest is not None and not hmac.compare_digest(digest.hexdigest(), signature[7:]):
+        raise WebhookSignatureError("Invalid webhook signature")
+
+    return body
+
+
+def extract_webhook_fields(event_type: str, body: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse a GitHub webhook body down to the fields its handler uses.
+
+    Event types the processor ignores are never parsed.
+
+    Args:
+        event_type: GitHub event type
+        body: Raw webhook body
+
+    Returns:
+        Optional[Dict[str, Any]]: Slim payload, or None for unhandled event types
+    """
+    fields = WEBHOOK_PAYLOAD_FIELDS.get(event_type)
+    if fields is None:
+        return None
+
+    return select_webhook_fields(event_type, json.loads(body))
+
+
+def select_webhook_fields(event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an already parsed GitHub payload to the fields its handler uses.
+
+    Args:
+        event_type: GitHub event type
+        payload: Parsed webhook payload
+
+    Returns:
+        Dict[str, Any]: Slim payload (unchanged for unknown event types)
+    """
+    fields = WEBHOOK_PAYLOAD_FIELDS.get(event_type)
+    if fields is None:
+        return payload
+
+    return _select(payload, fields)
+
+
+def _select(value: Any, fields: Any) -> Any:
+    """Recursively keep only the selected fields of a parsed value."""
+    if fields is True:
+        return value
+
+    if isinstance(fields, list):
+        if not isinstance(value, list):
+            return []
+        return [_select(item, fields[0]) for item in value]
+
+    if not isinstance(value, dict):
+        return {}
+
+    return {
+        key: _select(value[key], sub_fields)
+        for key, sub_fields in fields.items()
+        if key in value
+    }
@@ -12,7 +12,7 @@ from datetime import datetime
 
 from codegenapp.core.orchestration.coordinator import ServiceCoordinator
 from codegenapp.services.github_service import GitHubService
-from codegenapp.websocket.manager import WebSocketManager
+from codegenapp.websocket.manager import websocket_manager
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ class WebhookProcessor:
     
     def __init__(self):
         self.github_service = GitHubService()
-        self.websocket_manager = WebSocketManager()
+        self.websocket_manager = websocket_manager
         
     async def process_github_webhook(
         self,
@@ -37,6 +37,9 @@ class WebhookProcessor:
             event_type: Type of GitHub event (pull_request, push, etc.)
             payload: Webhook payload from GitHub
             delivery_id: GitHub delivery ID for tracking
+            
+        Raises:
+            Exception: Re-raised so the webhook queue can retry the delivery
         """
         try:
             logger.info(f"Processing GitHub webhook: {event_type}")
@@ -52,6 +55,7 @@ class WebhookProcessor:
                 
         except Exception as e:
             logger.error(f"Error processing GitHub webhook {event_type}: {e}")
+            raise
     
     async def _process_pull_request_event(self, payload: Dict[str, Any]) -> None:
         """Process pull request events"""
@@ -214,8 +218,14 @@ class WebhookProcessor:
                 message=notification_data
             )
             
-            # TODO: Integrate with workflow engine to start validation pipeline
-            # This would trigger the Grainchain snapshot creation and Web-Eval-Agent validation
+            # Debounced; supersedes any pipeline still validating an older head
+            from codegenapp.validation.pipeline_coordinator import pipeline_coordinator
+            
+            await pipeline_coordinator.request_validation(
+                repository=repo_full_name,
+                pull_request_id=str(pr_data.get("id")),
+                head_sha=pr_data.get("head", {}).get("sha")
+            )
             
         except Exception as e:
             logger.error(f"Error triggering validation pipeline: {e}")
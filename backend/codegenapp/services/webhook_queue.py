@@ -0,0 +1,965 @@
+"""
+Durable webhook ingestion queue.
+
+Webhook endpoints append each delivery to a durable store and
+acknowledge immediately. Each process claims deliveries from the store
+under a lease it keeps renewing while it holds them, so processes
+sharing a store never work on the same delivery. Only the oldest
+delivery of a repository can be claimed, and only while no process
+holds one of its deliveries, so each repository is processed in arrival
+order across processes and a burst for one repository cannot occupy
+every worker. A fixed-size pool of async workers drains the claimed
+deliveries, retrying failures with exponential backoff without holding
+a worker during the wait. Deliveries whose process stopped or died are
+claimed again by any process once their lease expires (immediately on
+a clean stop).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import redis.asyncio as aioredis
+
+from codegenapp.observability.metrics import webhook_queue_wait
+
+logger = logging.getLogger(__name__)
+
+# Handler invoked with (event_type, payload, delivery_id) for each delivery
+WebhookHandler = Callable[..., Awaitable[None]]
+
+# Ordering key for deliveries without a repository
+GLOBAL_ORDERING_KEY = "_global"
+
+# Default seconds a claim stays valid without being renewed
+DEFAULT_LEASE_SECONDS = 60.0
+
+# Default seconds between claim attempts when nothing wakes the claimer
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class WebhookQueueFullError(Exception):
+    """Raised when the queue is at its maximum depth"""
+    pass
+
+
+@dataclass
+class WebhookQueueEntry:
+    """A queued webhook delivery"""
+    entry_id: str
+    event_type: str
+    payload: Dict[str, Any]
+    delivery_id: Optional[str]
+    repository: str
+    enqueued_at: float
+    attempts: int = 0
+
+
+class WebhookQueueStore(ABC):
+    """Abstract base class for durable webhook queue storage"""
+
+    @abstractmethod
+    async def connect(self):
+        """Open the store"""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Close the store"""
+        pass
+
+    @abstractmethod
+    async def append(self, entry: WebhookQueueEntry) -> str:
+        """
+        Durably append a delivery.
+
+        Args:
+            entry: Delivery to append (entry_id is assigned by the store)
+
+        Returns:
+            str: Assigned entry ID
+        """
+        pass
+
+    @abstractmethod
+    async def claim(self, consumer: str, limit: int, lease: float) -> List[WebhookQueueEntry]:
+        """
+        Claim the oldest delivery of repositories no consumer holds a delivery of.
+
+        A delivery whose lease expired no longer counts as held.
+
+        Args:
+            consumer: Identity of the claiming process
+            limit: Maximum deliveries (and so repositories) to claim
+            lease: Seconds the claim stays valid unless renewed
+
+        Returns:
+            List[WebhookQueueEntry]: Claimed deliveries, oldest repository head first
+        """
+        pass
+
+    @abstractmethod
+    async def renew(self, consumer: str, entry_ids: List[str], lease: float):
+        """Extend the lease on deliveries the consumer still holds"""
+        pass
+
+    @abstractmethod
+    async def release(self, consumer: str, entry_ids: List[str]):
+        """Give up claims so other consumers can take the deliveries right away"""
+        pass
+
+    @abstractmethod
+    async def count_pending(self) -> int:
+        """Count unprocessed deliveries, claimed or not"""
+        pass
+
+    @abstractmethod
+    async def load_pending(self) -> List[WebhookQueueEntry]:
+        """Load all unprocessed deliveries in arrival order, claimed or not (for inspection)"""
+        pass
+
+    @abstractmethod
+    async def ack(self, entry_id: str):
+        """Remove a successfully processed delivery"""
+        pass
+
+    @abstractmethod
+    async def record_attempt(self, entry_id: str, attempts: int):
+        """Persist the attempt count of a delivery being retried"""
+        pass
+
+    @abstractmethod
+    async def mark_failed(self, entry: WebhookQueueEntry, error: str):
+        """Move a delivery that exhausted its retries to the dead-letter set"""
+        pass
+
+
+class SQLiteWebhookQueueStore(WebhookQueueStore):
+    """
+    SQLite-backed queue store.
+
+    Claims are recorded in owner and lease_until columns and taken in an
+    immediate transaction, so processes sharing the database file never
+    claim the same row. Statements run in a worker thread so disk syncs
+    never block the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    async def connect(self):
+        """Open the database and create the queue table"""
+        if self._conn is not None:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Fetch the result so the statement finishes and cannot hold the CREATE open
+        await self._fetch_all("PRAGMA journal_mode=WAL")
+        await self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_type TEXT NOT NULL,
+                delivery_id TEXT,
+                repository TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT,
+                owner TEXT,
+                lease_until REAL
+            )
+            """
+        )
+
+        # Databases created before claims were leased lack the claim columns
+        columns = {row[1] for row in await self._fetch_all("PRAGMA table_info(webhook_queue)")}
+        for column, column_type in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                await self._execute(f"ALTER TABLE webhook_queue ADD COLUMN {column} {column_type}")
+
+        # Claims look up the head and the holder of each repository
+        await self._execute(
+            "CREATE INDEX IF NOT EXISTS webhook_queue_repository "
+            "ON webhook_queue (status, repository, id)"
+        )
+
+    async def close(self):
+        """Close the database once statements still running in threads finish"""
+        if self._conn is None:
+            return
+
+        conn, self._conn = self._conn, None
+
+        def run():
+            # A claim cancelled by stop() may still be running in its thread
+            with self._lock:
+                conn.close()
+
+        await asyncio.to_thread(run)
+
+    async def append(self, entry: WebhookQueueEntry) -> str:
+        """Insert a delivery and commit before returning"""
+        cursor = await self._execute(
+            "INSERT INTO webhook_queue (event_type, delivery_id, repository, payload, enqueued_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (entry.event_type, entry.delivery_id, entry.repository,
+             json.dumps(entry.payload), entry.enqueued_at)
+        )
+        return str(cursor.lastrowid)
+
+    async def claim(self, consumer: str, limit: int, lease: float) -> List[WebhookQueueEntry]:
+        """Claim the head row of unheld repositories in one immediate transaction"""
+        if self._conn is None:
+            raise RuntimeError("Webhook queue store is not connected")
+
+        def run() -> List[tuple]:
+            now = time.time()
+            with self._lock:
+                # Takes the write lock up front so no other process claims the same rows
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = self._conn.execute(
+                        f"SELECT {self._ENTRY_COLUMNS} FROM webhook_queue WHERE id IN ("
+                        "    SELECT MIN(id) FROM webhook_queue WHERE status = 'pending' "
+                        "    GROUP BY repository "
+                        "    HAVING SUM(owner IS NOT NULL AND lease_until >= ?) = 0"
+                        ") ORDER BY id LIMIT ?",
+                        (now, limit)
+                    ).fetchall()
+                    self._conn.executemany(
+                        "UPDATE webhook_queue SET owner = ?, lease_until = ? WHERE id = ?",
+                        [(consumer, now + lease, row[0]) for row in rows]
+                    )
+                    self._conn.commit()
+                except BaseException:
+                    self._conn.rollback()
+                    raise
+                return rows
+
+        return [self._entry(row) for row in await asyncio.to_thread(run)]
+
+    async def renew(self, consumer: str, entry_ids: List[str], lease: float):
+        """Push the lease of the consumer's rows forward"""
+        await self._execute_many(
+            "UPDATE webhook_queue SET lease_until = ? WHERE id = ? AND owner = ?",
+            [(time.time() + lease, int(entry_id), consumer) for entry_id in entry_ids]
+        )
+
+    async def release(self, consumer: str, entry_ids: List[str]):
+        """Clear the owner of the consumer's rows"""
+        await self._execute_many(
+            "UPDATE webhook_queue SET owner = NULL, lease_until = NULL WHERE id = ? AND owner = ?",
+            [(int(entry_id), consumer) for entry_id in entry_ids]
+        )
+
+    async def count_pending(self) -> int:
+        """Count pending rows"""
+        rows = await self._fetch_all("SELECT COUNT(*) FROM webhook_queue WHERE status = 'pending'")
+        return rows[0][0]
+
+    async def load_pending(self) -> List[WebhookQueueEntry]:
+        """Load pending deliveries ordered by ID"""
+        rows = await self._fetch_all(
+            f"SELECT {self._ENTRY_COLUMNS} FROM webhook_queue WHERE status = 'pending' ORDER BY id"
+        )
+        return [self._entry(row) for row in rows]
+
+    _ENTRY_COLUMNS = "id, event_type, payload, delivery_id, repository, enqueued_at, attempts"
+
+    @staticmethod
+    def _entry(row: tuple) -> WebhookQueueEntry:
+        """Build a delivery from a row of _ENTRY_COLUMNS."""
+        return WebhookQueueEntry(
+            entry_id=str(row[0]),
+            event_type=row[1],
+            payload=json.loads(row[2]),
+            delivery_id=row[3],
+            repository=row[4],
+            enqueued_at=row[5],
+            attempts=row[6]
+        )
+
+    async def ack(self, entry_id: str):
+        """Delete a processed delivery"""
+        await self._execute("DELETE FROM webhook_queue WHERE id = ?", (int(entry_id),))
+
+    async def record_attempt(self, entry_id: str, attempts: int):
+        """Update the attempt count"""
+        await self._execute(
+            "UPDATE webhook_queue SET attempts = ? WHERE id = ?", (attempts, int(entry_id))
+        )
+
+    async def mark_failed(self, entry: WebhookQueueEntry, error: str):
+        """Keep the delivery with a failed status for inspection"""
+        await self._execute(
+            "UPDATE webhook_queue SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+            (entry.attempts, error, int(entry.entry_id))
+        )
+
+    async def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Run a statement and commit in a worker thread."""
+        if self._conn is None:
+            raise RuntimeError("Webhook queue store is not connected")
+
+        def run() -> sqlite3.Cursor:
+            with self._lock:
+                cursor = self._conn.execute(sql, params)
+                self._conn.commit()
+                return cursor
+
+        return await asyncio.to_thread(run)
+
+    async def _execute_many(self, sql: str, params: List[tuple]):
+        """Run a statement for each parameter set and commit once in a worker thread."""
+        if self._conn is None:
+            raise RuntimeError("Webhook queue store is not connected")
+        if not params:
+            return
+
+        def run():
+            with self._lock:
+                self._conn.executemany(sql, params)
+                self._conn.commit()
+
+        await asyncio.to_thread(run)
+
+    async def _fetch_all(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a query in a worker thread and return all rows."""
+        if self._conn is None:
+            raise RuntimeError("Webhook queue store is not connected")
+
+        def run() -> List[tuple]:
+            with self._lock:
+                return self._conn.execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(run)
+
+
+# Appends a delivery to the stream and its repository FIFO
+# KEYS: stream, repositories, repository FIFO; ARGV: repository, field/value pairs
+REDIS_APPEND_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], '*', unpack(ARGV, 2))
+redis.call('RPUSH', KEYS[3], id)
+redis.call('ZADD', KEYS[2], 'NX', tonumber(string.match(id, '^%d+')), ARGV[1])
+return id
+"""
+
+# Leases the head delivery of up to ARGV[4] unleased repositories, oldest head first
+# KEYS: repositories; ARGV: key prefix, consumer, lease in ms, limit
+REDIS_CLAIM_SCRIPT = """
+local claimed = {}
+local remaining = tonumber(ARGV[4])
+local offset = 0
+while remaining > 0 do
+    local repositories = redis.call('ZRANGE', KEYS[1], offset, offset + 99)
+    if #repositories == 0 then
+        break
+    end
+    for _, repository in ipairs(repositories) do
+        local lease = ARGV[1] .. ':lease:' .. repository
+        if remaining > 0 and redis.call('EXISTS', lease) == 0 then
+            local head = redis.call('LINDEX', ARGV[1] .. ':repo:' .. repository, 0)
+            if head then
+                redis.call('SET', lease, ARGV[2] .. ' ' .. head, 'PX', ARGV[3])
+                table.insert(claimed, head)
+                remaining = remaining - 1
+            end
+        end
+    end
+    offset = offset + 100
+end
+return claimed
+"""
+
+# Extends a repository lease if it is still held for the delivery
+# KEYS: lease; ARGV: holder ("<consumer> <entry ID>"), lease in ms
+REDIS_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Drops a repository lease if it is still held for the delivery
+# KEYS: lease; ARGV: holder
+REDIS_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Removes a processed delivery, frees its repository and moves the repository to its next head
+# KEYS: stream, repositories, repository FIFO, lease, attempts; ARGV: entry ID, repository
+REDIS_ACK_SCRIPT = """
+redis.call('XDEL', KEYS[1], ARGV[1])
+redis.call('LREM', KEYS[3], 1, ARGV[1])
+redis.call('HDEL', KEYS[5], ARGV[1])
+local holder = redis.call('GET', KEYS[4])
+if holder and string.match(holder, ' (.+)$') == ARGV[1] then
+    redis.call('DEL', KEYS[4])
+end
+local head = redis.call('LINDEX', KEYS[3], 0)
+if head then
+    redis.call('ZADD', KEYS[2], tonumber(string.match(head, '^%d+')), ARGV[2])
+else
+    redis.call('ZREM', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+
+class RedisStreamWebhookQueueStore(WebhookQueueStore):
+    """
+    Redis stream-backed queue store.
+
+    Deliveries are appended with XADD, and their IDs are also pushed to a
+    FIFO list per repository. A sorted set ranks repositories with
+    pending deliveries by the age of their head. Claiming leases a whole
+    repository with an expiring key naming the consumer and the head
+    delivery, so only one delivery per repository is in flight across
+    processes, and renewing extends that key. Processed entries are
+    deleted from the stream and their FIFO. Each step is a Lua script, so
+    processes never interleave inside one. Attempt counts live in a side
+    hash, and deliveries that exhaust their retries are moved to a
+    dead-letter stream.
+    """
+
+    def __init__(self, redis_url: str, stream: str = "codegenapp:webhooks"):
+        self.redis_url = redis_url
+        self.stream = stream
+        self.repositories_key = f"{stream}:repos"
+        self.attempts_key = f"{stream}:attempts"
+        self.dead_letter_stream = f"{stream}:dead"
+        self._redis: Optional[aioredis.Redis] = None
+        self._scripts: Dict[str, Any] = {}
+
+        # Repository of each delivery claimed through this store
+        self._claimed: Dict[str, str] = {}
+
+    async def connect(self):
+        """Connect to Redis and register the queue scripts"""
+        if self._redis is not None:
+            return
+
+        self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        self._scripts = {
+            name: self._redis.register_script(script)
+            for name, script in (
+                ("append", REDIS_APPEND_SCRIPT),
+                ("claim", REDIS_CLAIM_SCRIPT),
+                ("renew", REDIS_RENEW_SCRIPT),
+                ("release", REDIS_RELEASE_SCRIPT),
+                ("ack", REDIS_ACK_SCRIPT),
+            )
+        }
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._claimed.clear()
+
+    async def append(self, entry: WebhookQueueEntry) -> str:
+        """Append a delivery to the stream and its repository FIFO"""
+        self._client()
+        fields = [item for pair in self._fields(entry).items() for item in pair]
+        return await self._scripts["append"](
+            keys=[self.stream, self.repositories_key, self._fifo_key(entry.repository)],
+            args=[entry.repository, *fields]
+        )
+
+    async def claim(self, consumer: str, limit: int, lease: float) -> List[WebhookQueueEntry]:
+        """Lease the head delivery of unheld repositories and read them from the stream"""
+        redis = self._client()
+        entry_ids = await self._scripts["claim"](
+            keys=[self.repositories_key], args=[self.stream, consumer, int(lease * 1000), limit]
+        )
+        if not entry_ids:
+            return []
+
+        pipeline = redis.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipeline.xrange(self.stream, min=entry_id, max=entry_id, count=1)
+        pipeline.hmget(self.attempts_key, entry_ids)
+        *messages, attempts = await pipeline.execute()
+
+        entries = []
+        for entry_id, message, entry_attempts in zip(entry_ids, messages, attempts):
+            if not message:
+                continue
+            entry = self._entry(entry_id, message[0][1], int(entry_attempts or 0))
+            self._claimed[entry_id] = entry.repository
+            entries.append(entry)
+        return entries
+
+    async def renew(self, consumer: str, entry_ids: List[str], lease: float):
+        """Extend the repository leases still held for the consumer's deliveries"""
+        await self._run_per_entry("renew", consumer, entry_ids, int(lease * 1000))
+
+    async def release(self, consumer: str, entry_ids: List[str]):
+        """Drop the repository leases so any consumer can claim them right away"""
+        await self._run_per_entry("release", consumer, entry_ids)
+        for entry_id in entry_ids:
+            self._claimed.pop(entry_id, None)
+
+    async def count_pending(self) -> int:
+        """Processed entries are deleted, so the stream length is the backlog"""
+        return await self._client().xlen(self.stream)
+
+    async def load_pending(self) -> List[WebhookQueueEntry]:
+        """Read every delivery still in the stream"""
+        redis = self._client()
+        messages = await redis.xrange(self.stream)
+        attempts = await redis.hgetall(self.attempts_key)
+
+        return [
+            self._entry(entry_id, fields, int(attempts.get(entry_id, 0)))
+            for entry_id, fields in messages
+        ]
+
+    async def ack(self, entry_id: str):
+        """Delete a processed delivery and hand its repository to the next head"""
+        self._client()
+        repository = self._claimed.pop(entry_id, None)
+        if repository is None:
+            return
+
+        await self._scripts["ack"](
+            keys=[
+                self.stream, self.repositories_key, self._fifo_key(repository),
+                self._lease_key(repository), self.attempts_key
+            ],
+            args=[entry_id, repository]
+        )
+
+    async def record_attempt(self, entry_id: str, attempts: int):
+        """Store the attempt count in the side hash"""
+        await self._client().hset(self.attempts_key, entry_id, attempts)
+
+    async def mark_failed(self, entry: WebhookQueueEntry, error: str):
+        """Move the delivery to the dead-letter stream"""
+        fields = self._fields(entry)
+        fields.update({"attempts": entry.attempts, "last_error": error})
+
+        await self._client().xadd(self.dead_letter_stream, fields)
+        await self.ack(entry.entry_id)
+
+    async def _run_per_entry(self, script: str, consumer: str, entry_ids: List[str], *args: Any):
+        """Run a lease script for each claimed delivery in one round trip."""
+        entry_ids = [entry_id for entry_id in entry_ids if entry_id in self._claimed]
+        if not entry_ids:
+            return
+
+        pipeline = self._client().pipeline(transaction=False)
+        for entry_id in entry_ids:
+            await self._scripts[script](
+                keys=[self._lease_key(self._claimed[entry_id])],
+                args=[f"{consumer} {entry_id}", *args],
+                client=pipeline
+            )
+        await pipeline.execute()
+
+    def _client(self) -> aioredis.Redis:
+        """Get the connected Redis client."""
+        if self._redis is None:
+            raise RuntimeError("Webhook queue store is not connected")
+        return self._redis
+
+    def _fifo_key(self, repository: str) -> str:
+        return f"{self.stream}:repo:{repository}"
+
+    def _lease_key(self, repository: str) -> str:
+        return f"{self.stream}:lease:{repository}"
+
+    def _fields(self, entry: WebhookQueueEntry) -> Dict[str, Any]:
+        """Serialize a delivery into stream fields."""
+        return {
+            "event_type": entry.event_type,
+            "delivery_id": entry.delivery_id or "",
+            "repository": entry.repository,
+            "payload": json.dumps(entry.payload),
+            "enqueued_at": entry.enqueued_at,
+        }
+
+    @staticmethod
+    def _entry(entry_id: str, fields: Dict[str, str], attempts: int) -> WebhookQueueEntry:
+        """Build a delivery from stream fields."""
+        return WebhookQueueEntry(
+            entry_id=entry_id,
+            event_type=fields["event_type"],
+            payload=json.loads(fields["payload"]),
+            delivery_id=fields.get("delivery_id") or None,
+            repository=fields["repository"],
+            enqueued_at=float(fields["enqueued_at"]),
+            attempts=attempts
+        )
+
+
+class WebhookQueue:
+    """
+    Bounded worker pool draining a durable webhook queue.
+
+    A claimer task takes deliveries from the store under this process's
+    consumer identity, keeping at most ``prefetch`` of them ready or in
+    progress locally, and renews their leases until they are processed.
+    The store hands out one delivery per repository at a time, so
+    deliveries for a repository are processed in order while different
+    repositories proceed concurrently. A delivery waiting to be retried
+    keeps its lease, and so its repository, but frees its worker and its
+    prefetch slot.
+    """
+
+    def __init__(
+        self,
+        store: WebhookQueueStore,
+        handler: WebhookHandler,
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 60.0,
+        max_depth: int = 10000,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        prefetch: Optional[int] = None
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            store: Durable storage for queued deliveries
+            handler: Coroutine called with (event_type, payload, delivery_id)
+            workers: Number of concurrent workers
+            max_attempts: Attempts before a delivery is dead-lettered
+            retry_base_delay: First retry delay in seconds, doubled per attempt
+            retry_max_delay: Maximum retry delay in seconds
+            max_depth: Maximum queued deliveries (across all processes) before rejecting new ones
+            lease_seconds: Seconds a claim survives without renewal, e.g. after a crash
+            poll_interval: Seconds between claim attempts when idle
+            prefetch: Deliveries ready or in progress locally at once (default: one per
+                worker, so a busy process does not hoard deliveries another one could start)
+        """
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_depth = max_depth
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.prefetch = prefetch or workers
+
+        # Identity this process claims deliveries under
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        # Per-repository FIFO of deliveries and the queue of runnable repositories
+        self._pending: Dict[str, Deque[WebhookQueueEntry]] = {}
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._active: Set[str] = set()
+        self._depth = 0
+
+        # Repositories whose head delivery waits to be retried, with the retry timer
+        self._backing_off: Dict[str, asyncio.TimerHandle] = {}
+        self._worker_tasks: List[asyncio.Task] = []
+        self._claim_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+        self.processed_count = 0
+        self.retried_count = 0
+        self.failed_count = 0
+
+    async def start(self):
+        """Open the store and start the claimer and the workers"""
+        if self._worker_tasks:
+            return
+
+        await self.store.connect()
+
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        self._claim_task = asyncio.create_task(self._claim_loop())
+        logger.info(f"Webhook queue started with {self.workers} workers as consumer {self.consumer}")
+
+    async def stop(self):
+        """Stop the workers and release unprocessed deliveries to other consumers"""
+        tasks = self._worker_tasks + ([self._claim_task] if self._claim_task else [])
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._claim_task = None
+
+        for timer in self._backing_off.values():
+            timer.cancel()
+        self._backing_off.clear()
+
+        # Claimed again right away, by this process on restart or by any other
+        await self._store_safely(self.store.release(self.consumer, self._held_entry_ids()))
+
+        self._pending.clear()
+        self._active.clear()
+        self._ready = asyncio.Queue()
+        self._depth = 0
+
+        await self.store.close()
+
+    async def enqueue(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        delivery_id: Optional[str] = None
+    ) -> str:
+        """
+        Durably append a delivery for processing.
+
+        Args:
+            event_type: Type of GitHub event
+            payload: Webhook payload
+            delivery_id: GitHub delivery ID
+
+        Returns:
+            str: Queue entry ID
+        """
+        depth = await self.store.count_pending()
+        if depth >= self.max_depth:
+            raise WebhookQueueFullError(f"Webhook queue is full ({depth} deliveries)")
+
+        entry = WebhookQueueEntry(
+            entry_id="",
+            event_type=event_type,
+            payload=payload,
+            delivery_id=delivery_id,
+            repository=self._ordering_key(payload),
+            enqueued_at=time.time()
+        )
+        entry.entry_id = await self.store.append(entry)
+
+        # Claim it now instead of at the next poll
+        self._wakeup.set()
+        return entry.entry_id
+
+    async def join(self):
+        """Wait until every delivery in the store has been processed or dead-lettered"""
+        while self._depth or await self.store.count_pending():
+            await asyncio.sleep(0.01)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dict[str, Any]: Depth, lag of the oldest delivery and counters
+        """
+        oldest = min(
+            (entries[0].enqueued_at for entries in self._pending.values() if entries),
+            default=None
+        )
+
+        return {
+            "depth": self._depth,
+            "lag_seconds": round(time.time() - oldest, 3) if oldest is not None else 0.0,
+            "repositories": len(self._pending),
+            "active_repositories": len(self._active),
+            "backing_off": len(self._backing_off),
+            "workers": len(self._worker_tasks),
+            "processed": self.processed_count,
+            "retried": self.retried_count,
+            "failed": self.failed_count,
+        }
+
+    async def _claim_loop(self):
+        """Claim deliveries while there is room and keep the held ones leased."""
+        renew_interval = self.lease_seconds / 3
+        last_renewal = time.monotonic()
+
+        while True:
+            try:
+                # Deliveries waiting for a retry do not take a slot
+                room = self.prefetch - (self._depth - len(self._backing_off))
+                if room > 0:
+                    for entry in await self.store.claim(self.consumer, room, self.lease_seconds):
+                        self._schedule(entry)
+
+                if time.monotonic() - last_renewal >= renew_interval:
+                    await self.store.renew(self.consumer, self._held_entry_ids(), self.lease_seconds)
+                    last_renewal = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook queue claim failed: {e}")
+
+            # Woken early by local enqueues and finished deliveries. A timer sets
+            # the event rather than wait_for, which can swallow stop()'s cancel
+            # when the event is set at the same time.
+            timer = asyncio.get_running_loop().call_later(
+                min(self.poll_interval, renew_interval), self._wakeup.set
+            )
+            try:
+                await self._wakeup.wait()
+            finally:
+                timer.cancel()
+            self._wakeup.clear()
+
+    def _held_entry_ids(self) -> List[str]:
+        """IDs of deliveries claimed by this process and not yet finished."""
+        return [entry.entry_id for entries in self._pending.values() for entry in entries]
+
+    def _ordering_key(self, payload: Dict[str, Any]) -> str:
+        """Get the repository whose deliveries must be processed in order."""
+        repository = payload.get("repository") or {}
+        return repository.get("full_name") or GLOBAL_ORDERING_KEY
+
+    def _schedule(self, entry: WebhookQueueEntry):
+        """Add a delivery to its repository FIFO, marking the repository runnable."""
+        entries = self._pending.get(entry.repository)
+        if entries is None:
+            entries = self._pending[entry.repository] = deque()
+
+        entries.append(entry)
+        self._depth += 1
+
+        if len(entries) == 1 and entry.repository not in self._active:
+            self._ready.put_nowait(entry.repository)
+
+    async def _worker(self):
+        """Attempt the head delivery of runnable repositories."""
+        while True:
+            repository = await self._ready.get()
+            self._active.add(repository)
+            entries = self._pending[repository]
+            retry_delay = None
+
+            try:
+                retry_delay = await self._attempt(entries[0])
+            except asyncio.CancelledError:
+                # The delivery stays held so stop() releases it for the next claim
+                raise
+            except Exception as e:
+                logger.error(f"Webhook delivery {entries[0].delivery_id} could not be processed: {e}")
+
+            self._active.discard(repository)
+            self._wakeup.set()
+
+            if retry_delay is not None:
+                # Keep the delivery leased so the repository stays in order, but free the worker
+                self._backing_off[repository] = asyncio.get_running_loop().call_later(
+                    retry_delay, self._retry, repository
+                )
+                continue
+
+            entries.popleft()
+            self._depth -= 1
+
+            if entries:
+                self._ready.put_nowait(repository)
+            else:
+                del self._pending[repository]
+
+    def _retry(self, repository: str):
+        """Make a repository whose backoff elapsed runnable again."""
+        if self._backing_off.pop(repository, None) is not None:
+            self._ready.put_nowait(repository)
+            self._wakeup.set()
+
+    async def _attempt(self, entry: WebhookQueueEntry) -> Optional[float]:
+        """
+        Attempt one delivery.
+
+        Args:
+            entry: Delivery to process
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None once the
+                delivery is processed or dead-lettered
+        """
+        if entry.attempts == 0:
+            webhook_queue_wait.observe(max(0.0, time.time() - entry.enqueued_at))
+
+        entry.attempts += 1
+        try:
+            await self.handler(
+                event_type=entry.event_type,
+                payload=entry.payload,
+                delivery_id=entry.delivery_id
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if entry.attempts >= self.max_attempts:
+                logger.error(
+                    f"Webhook delivery {entry.delivery_id} failed after {entry.attempts} attempts: {e}"
+                )
+                self.failed_count += 1
+                await self._store_safely(self.store.mark_failed(entry, str(e)))
+                return None
+
+            delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (entry.attempts - 1))
+            logger.warning(
+                f"Webhook delivery {entry.delivery_id} failed (attempt {entry.attempts}), "
+                f"retrying in {delay:.1f}s: {e}"
+            )
+            self.retried_count += 1
+            await self._store_safely(self.store.record_attempt(entry.entry_id, entry.attempts))
+            return delay
+
+        self.processed_count += 1
+        await self._store_safely(self.store.ack(entry.entry_id))
+        return None
+
+    async def _store_safely(self, operation: Awaitable[None]):
+        """Run a store update, logging instead of stopping the worker on errors."""
+        try:
+            await operation
+        except Exception as e:
+            logger.error(f"Webhook queue store update failed: {e}")
+
+
+def create_webhook_queue_store(
+    backend: str = "sqlite",
+    sqlite_path: str = "./data/webhook_queue.db",
+    redis_url: Optional[str] = None,
+    redis_stream: str = "codegenapp:webhooks"
+) -> WebhookQueueStore:
+    """
+    Create a webhook queue store by name.
+
+    Args:
+        backend: Store name ("sqlite" or "redis")
+        sqlite_path: Database file for the sqlite store
+        redis_url: Redis URL, required for the redis store
+        redis_stream: Stream name for the redis store
+
+    Returns:
+        WebhookQueueStore: Configured store instance
+    """
+    if backend == "sqlite":
+        return SQLiteWebhookQueueStore(sqlite_path)
+
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("redis_url is required for the redis webhook queue store")
+        return RedisStreamWebhookQueueStore(redis_url, stream=redis_stream)
+
+    raise ValueError(f"Unknown webhook queue backend: {backend}")
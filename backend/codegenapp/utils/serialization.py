@@ -0,0 +1,114 @@
+"""
+JSON serialization fast path.
+
+WebSocket messages, and API responses built from dataclasses (such as
+graph-sitter analysis results), are encoded with orjson when it is
+installed, which handles datetimes, enums, UUIDs and dataclasses natively
+and returns bytes. Routes returning Pydantic models keep FastAPI's
+response_model path, which already serializes them in pydantic-core.
+
+Pydantic models, sets, decimals and paths go through ``_default``;
+anything else raises TypeError instead of being silently stringified.
+Without orjson the stdlib encoder is used with the same type handling,
+so the wire format does not depend on the backend.
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    # Integer keys are common in stats dicts; stdlib json turns them into strings too
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Convert types neither encoder handles natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    """Match orjson's output for the types it handles natively."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return _default(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(
+        obj, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_text(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string, e.g. for a WebSocket text frame.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        str: Encoded JSON
+    """
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON from bytes or str.
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        Any: Decoded object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the serialization fast path"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -6,10 +6,19 @@ with health checking and monitoring capabilities.
 """
 
 import asyncio
+import random
 import aiohttp
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from codegenapp.observability.metrics import deployment_time_to_ready
+
+# Default seconds to wait for a deployment to become ready
+DEFAULT_READINESS_TIMEOUT = 30
+
+# Shortest timeout given to a probe sent right at the readiness deadline
+MIN_PROBE_TIMEOUT = 0.05
+
 
 class DeploymentOrchestrator:
     """
@@ -19,6 +28,29 @@ class DeploymentOrchestrator:
     the deployment lifecycle within snapshot environments.
     """
     
+    def __init__(
+        self,
+        initial_poll_delay: float = 0.25,
+        max_poll_delay: float = 5.0,
+        probe_timeout: float = 5.0,
+        max_connections: int = 50
+    ):
+        """
+        Initialize the orchestrator.
+        
+        Args:
+            initial_poll_delay: Delay before the second readiness probe in seconds
+            max_poll_delay: Upper bound of the backoff delay in seconds
+            probe_timeout: Timeout of a single probe request in seconds, capped by
+                the time left until the readiness deadline
+            max_connections: Connection limit of the pooled HTTP session
+        """
+        self.initial_poll_delay = initial_poll_delay
+        self.max_poll_delay = max_poll_delay
+        self.probe_timeout = probe_timeout
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+    
     async def deploy_application(
         self,
         snapshot_id: str,
@@ -58,63 +90,104 @@ class DeploymentOrchestrator:
     async def check_deployment_health(
         self,
         deployment_url: str,
-        timeout: int = 30
+        timeout: int = DEFAULT_READINESS_TIMEOUT
     ) -> Dict[str, Any]:
         """
-        Check deployment health and validate successful deployment.
+        Wait until the deployment is ready, polling with exponential backoff.
+        
+        The main and /health endpoints are probed concurrently on each attempt
+        and the check returns as soon as both satisfy the readiness criteria:
+        the main endpoint answers 2xx/3xx and the health endpoint either does
+        the same or does not exist.
         
         Args:
             deployment_url: URL of the deployed application
-            timeout: Health check timeout in seconds
+            timeout: Seconds to keep polling before giving up
             
         Returns:
-            dict: Health check result
+            dict: Health check result, including time_to_ready when ready
         """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout
+        health_url = f"{deployment_url.rstrip('/')}/health"
+        session = self._get_session()
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            probe_timeout = aiohttp.ClientTimeout(
+                total=max(min(self.probe_timeout, deadline - loop.time()), MIN_PROBE_TIMEOUT)
+            )
+            main_probe, health_probe = await asyncio.gather(
+                self._probe(session, deployment_url, probe_timeout),
+                self._probe(session, health_url, probe_timeout)
+            )
+            
+            main_healthy = main_probe["status"] is not None and 200 <= main_probe["status"] < 400
+            health_available = health_probe["status"] is not None and health_probe["status"] != 404
+            health_ok = not health_available or 200 <= health_probe["status"] < 400
+            healthy = main_healthy and health_ok
+            
+            now = loop.time()
+            if healthy or now >= deadline:
+                break
+            
+            # Full jitter over an exponentially growing delay, bounded by the deadline
+            delay = min(self.max_poll_delay, self.initial_poll_delay * (2 ** (attempt - 1)))
+            await asyncio.sleep(min(random.uniform(delay / 2, delay), deadline - now))
+        
+        result = {
+            "healthy": healthy,
+            "attempts": attempt,
+            "main_endpoint": {
+                "url": deployment_url,
+                "status": main_probe["status"],
+                "healthy": main_healthy
+            },
+            "health_endpoint": {
+                "url": health_url,
+                "status": health_probe["status"],
+                "available": health_available
+            },
+            "checked_at": datetime.utcnow().isoformat()
+        }
+        
+        if healthy:
+            result["time_to_ready"] = round(now - started, 3)
+            deployment_time_to_ready.observe(now - started)
+        else:
+            result["error"] = main_probe["error"] or f"Deployment not ready after {timeout} seconds"
+            result["timeout"] = timeout
+        
+        return result
+    
+    async def close(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.probe_timeout)
+            )
+        return self._session
+    
+    async def _probe(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        timeout: aiohttp.ClientTimeout
+    ) -> Dict[str, Any]:
+        """Request a URL once, returning its status or the error."""
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=timeout)
-            ) as session:
-                
-                # Check main endpoint
-                async with session.get(deployment_url) as response:
-                    main_status = response.status
-                    main_healthy = 200 <= main_status < 400
-                
-                # Check health endpoint if available
-                health_url = f"{deployment_url}/health"
-                health_status = None
-                try:
-                    async with session.get(health_url) as health_response:
-                        health_status = health_response.status
-                except:
-                    pass  # Health endpoint might not exist
-                
-                return {
-                    "healthy": main_healthy,
-                    "main_endpoint": {
-                        "url": deployment_url,
-                        "status": main_status,
-                        "healthy": main_healthy
-                    },
-                    "health_endpoint": {
-                        "url": health_url,
-                        "status": health_status,
-                        "available": health_status is not None
-                    },
-                    "checked_at": datetime.utcnow().isoformat()
-                }
-                
+            async with session.get(url, timeout=timeout) as response:
+                return {"status": response.status, "error": None}
         except asyncio.TimeoutError:
-            return {
-                "healthy": False,
-                "error": "Health check timed out",
-                "timeout": timeout,
-                "checked_at": datetime.utcnow().isoformat()
-            }
-        except Exception as e:
-            return {
-                "healthy": False,
-                "error": str(e),
-                "checked_at": datetime.utcnow().isoformat()
-            }
-
+            return {"status": None, "error": f"Request to {url} timed out"}
+        except aiohttp.ClientError as e:
+            return {"status": None, "error": str(e) or type(e).__name__}
@@ -0,0 +1,198 @@
+"""
+Local git object cache for validation checkouts.
+
+Keeps one bare mirror per repository on local disk, refreshed with
+incremental fetches, and checks PR heads out of it as ``git worktree``s
+(or ``--shared`` clones). A checkout then only transfers the objects
+that changed since the last fetch instead of the whole history.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default directory holding the bare mirrors
+DEFAULT_GIT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "codegenapp", "git-mirrors")
+
+# Default directory holding per-validation checkouts
+DEFAULT_WORKSPACE_DIR = os.path.join(tempfile.gettempdir(), "codegenapp", "workspaces")
+
+# Checkout modes: linked worktree of the mirror, or clone sharing its objects
+CHECKOUT_MODES = ("worktree", "shared")
+
+
+class GitCacheError(Exception):
+    """Raised when a git operation against the cache fails"""
+    pass
+
+
+class GitMirrorCache:
+    """
+    Per-repository bare mirrors with cheap per-validation checkouts.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        checkout_mode: str = "worktree",
+        min_fetch_interval: float = 5.0,
+        git_timeout: float = 600.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the bare mirrors
+            checkout_mode: "worktree" or "shared"
+            min_fetch_interval: Seconds within which a repeated fetch is skipped
+            git_timeout: Timeout for a single git command in seconds
+        """
+        if checkout_mode not in CHECKOUT_MODES:
+            raise ValueError(f"Unknown checkout mode: {checkout_mode}")
+
+        self.cache_dir = Path(cache_dir)
+        self.checkout_mode = checkout_mode
+        self.min_fetch_interval = min_fetch_interval
+        self.git_timeout = git_timeout
+
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_fetch: Dict[str, float] = {}
+
+    def mirror_path(self, repository_url: str) -> Path:
+        """
+        Get the mirror directory for a repository.
+
+        Args:
+            repository_url: Clone URL of the repository
+
+        Returns:
+            Path: Bare mirror directory
+        """
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", repository_url.rstrip("/").split("/")[-1])
+        digest = hashlib.sha1(repository_url.encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{name}-{digest}"
+
+    async def update_mirror(self, repository_url: str, force: bool = False) -> Path:
+        """
+        Create the mirror or fetch new objects into it.
+
+        Args:
+            repository_url: Clone URL of the repository
+            force: Fetch even if the mirror was fetched moments ago
+
+        Returns:
+            Path: Bare mirror directory
+        """
+        mirror = self.mirror_path(repository_url)
+
+        async with self._lock(repository_url):
+            if not (mirror / "HEAD").exists():
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                logger.info(f"Creating git mirror for {repository_url}")
+                await self._git(["clone", "--mirror", "--quiet", repository_url, str(mirror)])
+            elif force or time.monotonic() - self._last_fetch.get(repository_url, 0.0) >= self.min_fetch_interval:
+                await self._git(["fetch", "--prune", "--quiet", "origin"], cwd=mirror)
+
+            self._last_fetch[repository_url] = time.monotonic()
+
+        return mirror
+
+    async def checkout(self, repository_url: str, ref: str, destination: str) -> Dict[str, str]:
+        """
+        Check out a commit or ref of a repository from the mirror.
+
+        Args:
+            repository_url: Clone URL of the repository
+            ref: Commit SHA, branch or ref (e.g. refs/pull/12/head) to check out
+            destination: Directory to check out into (must not exist)
+
+        Returns:
+            dict: Checkout path, resolved commit SHA and mode
+        """
+        mirror = await self.update_mirror(repository_url)
+
+        commit = await self._resolve(mirror, ref)
+        if commit is None:
+            # Not reachable from mirrored refs yet, e.g. a just-pushed head SHA
+            async with self._lock(repository_url):
+                await self._git(["fetch", "--quiet", "origin", ref], cwd=mirror)
+            commit = await self._resolve(mirror, ref)
+            if commit is None:
+                raise GitCacheError(f"Ref {ref} not found in {repository_url}")
+
+        Path(destination).parent.mkdir(parents=True, exist_ok=True)
+
+        if self.checkout_mode == "worktree":
+            async with self._lock(repository_url):
+                await self._git(["worktree", "add", "--detach", "--quiet", destination, commit], cwd=mirror)
+        else:
+            await self._git(["clone", "--shared", "--no-checkout", "--quiet", str(mirror), destination])
+            await self._git(["checkout", "--detach", "--quiet", commit], cwd=Path(destination))
+
+        return {"clone_path": destination, "commit_sha": commit, "checkout_mode": self.checkout_mode}
+
+    async def remove_checkout(self, repository_url: str, destination: str):
+        """
+        Remove a checkout created by ``checkout``.
+
+        Args:
+            repository_url: Clone URL of the repository
+            destination: Checkout directory
+        """
+        if self.checkout_mode == "worktree":
+            mirror = self.mirror_path(repository_url)
+            async with self._lock(repository_url):
+                try:
+                    await self._git(["worktree", "remove", "--force", destination], cwd=mirror)
+                except GitCacheError as e:
+                    logger.warning(f"git worktree remove failed for {destination}: {e}")
+                await self._git(["worktree", "prune"], cwd=mirror)
+
+        if os.path.exists(destination):
+            await asyncio.to_thread(shutil.rmtree, destination, True)
+
+    async def _resolve(self, mirror: Path, ref: str) -> Optional[str]:
+        """Resolve a ref to a commit SHA, or None if the mirror lacks it."""
+        try:
+            output = await self._git(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], cwd=mirror)
+        except GitCacheError:
+            return None
+        return output.strip() or None
+
+    def _lock(self, repository_url: str) -> asyncio.Lock:
+        """Get the lock serializing mirror updates for a repository."""
+        lock = self._locks.get(repository_url)
+        if lock is None:
+            lock = self._locks[repository_url] = asyncio.Lock()
+        return lock
+
+    async def _git(self, args: List[str], cwd: Optional[Path] = None) -> str:
+        """Run a git command and return its stdout."""
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=str(cwd) if cwd else None,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.git_timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise GitCacheError(f"git {args[0]} timed out after {self.git_timeout}s")
+
+        if process.returncode != 0:
+            raise GitCacheError(f"git {args[0]} failed: {stderr.decode('utf-8', 'replace').strip()}")
+
+        return stdout.decode("utf-8", "replace")
@@ -6,22 +6,35 @@ through deployment testing and final approval decisions.
 """
 
 import asyncio
+import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Tuple
 
 from ..models import (
     ValidationPipeline, ValidationStep, ValidationStatus, ValidationStepType,
     ValidationResult, Project, PullRequest, AuditLog, AuditAction
 )
-from ..database.connection import get_database_session
+from ..config.settings import get_settings
+from ..database.async_session import open_async_session
+from ..repositories.async_repositories import AsyncProjectRepository
 from ..orchestration.state_manager import StateManager
-from ..websocket.connection_manager import ConnectionManager
+from ..websocket.connection_manager import connection_manager
 from .snapshot_manager import SnapshotManager
 from .deployment_orchestrator import DeploymentOrchestrator
+from .pipeline_graph import PipelineGraph, PipelineStep
+from .pipeline_state import PipelineState
+from .result_cache import ValidationResultCache, create_validation_result_cache, validation_cache_key
 from ..services.web_eval_service import WebEvalService
 
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for further pushes before validating a pull request
+DEFAULT_VALIDATION_DEBOUNCE_SECONDS = 5.0
+
+# (repository, pull request ID) identifying the PR a pipeline validates
+PullRequestKey = Tuple[str, str]
+
 
 class PipelineCoordinator:
     """
@@ -31,39 +44,189 @@ class PipelineCoordinator:
     deployment, testing, and cleanup operations.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        debounce_seconds: float = DEFAULT_VALIDATION_DEBOUNCE_SECONDS,
+        result_cache: Optional[ValidationResultCache] = None
+    ):
+        settings = get_settings()
+        
         self.state_manager = StateManager()
-        self.connection_manager = ConnectionManager()
-        self.snapshot_manager = SnapshotManager()
+        self.connection_manager = connection_manager
+        self.snapshot_manager = SnapshotManager(
+            pool_min_size=settings.snapshot_pool_min_size,
+            pool_max_size=settings.snapshot_pool_max_size,
+            pool_idle_timeout=settings.snapshot_pool_idle_timeout
+        )
         self.deployment_orchestrator = DeploymentOrchestrator()
         self.web_eval_service = WebEvalService()
+        self.debounce_seconds = debounce_seconds
         self._running_pipelines: Dict[str, asyncio.Task] = {}
+        self._pipeline_states: Dict[str, PipelineState] = {}
+        
+        # Latest pipeline and head SHA per pull request, for superseding
+        self._pr_pipelines: Dict[PullRequestKey, Tuple[str, Optional[str]]] = {}
+        self._pipeline_keys: Dict[str, PullRequestKey] = {}
+        self._pending_validations: Dict[PullRequestKey, asyncio.Task] = {}
+        self._cancel_reasons: Dict[str, str] = {}
+        
+        # Verdicts per (project, commit, config) reused by re-validations
+        # An empty in-memory cache is falsy, so compare against None
+        if result_cache is None:
+            result_cache = create_validation_result_cache(
+                settings.validation_cache_backend,
+                ttl=settings.validation_cache_ttl,
+                redis_url=settings.redis_url
+            )
+        self.result_cache = result_cache
+        
+        # Step dependency graph; expected durations (seconds) weight progress
+        self.pipeline_graph = PipelineGraph([
+            PipelineStep("snapshot_creation", self._create_snapshot, expected_duration=30),
+            PipelineStep("codebase_clone", self._clone_codebase, ("snapshot_creation",), expected_duration=20),
+            PipelineStep("deployment", self._deploy_application, ("codebase_clone",), expected_duration=60),
+            PipelineStep("code_analysis", self._run_code_analysis, ("codebase_clone",),
+                         required=False, expected_duration=30),
+            PipelineStep("security_scan", self._run_security_scan, ("codebase_clone",),
+                         required=False, expected_duration=30),
+            PipelineStep("health_check", self._check_deployment_health, ("deployment",), expected_duration=15),
+            PipelineStep("web_evaluation", self._run_web_evaluation, ("health_check",), expected_duration=120),
+            PipelineStep(
+                "cleanup",
+                self._cleanup_resources,
+                ("web_evaluation", "code_analysis", "security_scan"),
+                always_run=True,
+                expected_duration=5
+            ),
+        ])
+    
+    async def request_validation(
+        self,
+        repository: str,
+        pull_request_id: str,
+        head_sha: Optional[str] = None,
+        agent_run_id: Optional[str] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Schedule validation of a pull request head, debouncing rapid pushes.
+        
+        The pipeline starts once no newer request for the same pull request
+        arrives within the debounce window, superseding any pipeline still
+        running for an older head.
+        
+        Args:
+            repository: Repository full name (owner/repository)
+            pull_request_id: ID of the pull request
+            head_sha: Head commit SHA to validate (optional)
+            agent_run_id: ID of the associated agent run (optional)
+            force: Rerun even if a verdict for this commit is cached
+            
+        Returns:
+            dict: Scheduled (or already running) pipeline details
+        """
+        key = (repository, pull_request_id)
+        
+        current = self._pr_pipelines.get(key)
+        if current and head_sha and current[1] == head_sha and current[0] in self._running_pipelines:
+            return {
+                "pipeline_id": current[0],
+                "repository": repository,
+                "pull_request_id": pull_request_id,
+                "head_sha": head_sha,
+                "status": "running"
+            }
+        
+        pending = self._pending_validations.pop(key, None)
+        if pending is not None:
+            pending.cancel()
+        
+        pipeline_id = str(uuid.uuid4())
+        self._pending_validations[key] = asyncio.create_task(
+            self._start_after_debounce(key, pipeline_id, head_sha, agent_run_id, force)
+        )
+        
+        return {
+            "pipeline_id": pipeline_id,
+            "repository": repository,
+            "pull_request_id": pull_request_id,
+            "head_sha": head_sha,
+            "status": "scheduled"
+        }
+    
+    async def cancel_pipeline(self, pipeline_id: str, reason: str = "Cancelled") -> bool:
+        """
+        Cancel a running pipeline and wait for its cleanup to finish.
+        
+        Args:
+            pipeline_id: ID of the validation pipeline
+            reason: Reason recorded on the pipeline
+            
+        Returns:
+            bool: True if a running pipeline was cancelled
+        """
+        task = self._running_pipelines.get(pipeline_id)
+        if task is None or task.done():
+            return False
+        
+        self._cancel_reasons[pipeline_id] = reason
+        task.cancel()
+        await asyncio.wait([task])
+        return True
+    
+    async def close(self):
+        """
+        Stop pending and running pipelines and release pooled resources.
+        
+        Running pipelines are cancelled with cleanup first, so their
+        snapshots go back to the pool before it is destroyed.
+        """
+        for task in self._pending_validations.values():
+            task.cancel()
+        self._pending_validations.clear()
+        
+        for pipeline_id in list(self._running_pipelines):
+            await self.cancel_pipeline(pipeline_id, reason="Service shutting down")
+        
+        await self.snapshot_manager.close()
+        await self.deployment_orchestrator.close()
+        await self.result_cache.close()
     
     async def start_validation(
         self,
         pipeline_id: str,
         project_id: str,
         pull_request_id: str,
-        agent_run_id: Optional[str] = None
+        agent_run_id: Optional[str] = None,
+        head_sha: Optional[str] = None,
+        force: bool = False
     ) -> Dict[str, Any]:
         """
         Start a new validation pipeline.
         
+        Any pipeline still running for the same pull request is cancelled
+        as superseded. If the head commit was already validated with the
+        same configuration, the cached verdict is reused unless forced.
+        
         Args:
             pipeline_id: ID of the validation pipeline
             project_id: ID of the project
             pull_request_id: ID of the pull request
             agent_run_id: ID of the associated agent run (optional)
+            head_sha: Head commit SHA being validated (optional)
+            force: Rerun even if a verdict for this commit is cached
             
         Returns:
             dict: Validation pipeline details
         """
-        with next(get_database_session()) as db:
+        async with open_async_session() as db:
             # Validate project exists
-            project = db.query(Project).filter(Project.id == project_id).first()
+            project = await AsyncProjectRepository(db).get_with_settings(project_id)
             if not project:
                 raise ValueError(f"Project {project_id} not found")
             
+            key = (project.github_repo, pull_request_id)
+            
             # Create validation pipeline record
             pipeline = ValidationPipeline(
                 id=pipeline_id,
@@ -75,13 +238,16 @@ class PipelineCoordinator:
                     "timeout_minutes": project.settings.validation_settings.get("timeout_minutes", 30) if project.settings else 30,
                     "max_retries": project.settings.validation_settings.get("max_retries", 3) if project.settings else 3,
                     "required_steps": ["snapshot_creation", "codebase_clone", "deployment", "health_check", "web_evaluation"],
-                    "optional_steps": ["code_analysis", "security_scan"]
+                    "optional_steps": ["code_analysis", "security_scan"],
+                    "repository_url": f"https://github.com/{project.github_repo}.git",
+                    "head_sha": head_sha,
+                    "force_rerun": force
                 },
                 created_at=datetime.utcnow()
             )
             
             db.add(pipeline)
-            db.commit()
+            await db.commit()
             
             # Create audit log
             audit_log = AuditLog.create_log(
@@ -96,7 +262,15 @@ class PipelineCoordinator:
                 }
             )
             db.add(audit_log)
-            db.commit()
+            await db.commit()
+        
+        # Cancel the pipeline validating an older head of this pull request
+        previous = self._pr_pipelines.get(key)
+        if previous is not None:
+            await self.cancel_pipeline(previous[0], reason=f"Superseded by pipeline {pipeline_id}")
+        
+        self._pr_pipelines[key] = (pipeline_id, head_sha)
+        self._pipeline_keys[pipeline_id] = key
         
         # Update state manager
         self.state_manager.add_active_validation(project_id, pipeline_id)
@@ -113,6 +287,43 @@ class PipelineCoordinator:
             "created_at": datetime.utcnow().isoformat()
         }
     
+    async def _start_after_debounce(
+        self,
+        key: PullRequestKey,
+        pipeline_id: str,
+        head_sha: Optional[str],
+        agent_run_id: Optional[str],
+        force: bool = False
+    ):
+        """Start a requested validation unless a newer request arrives first."""
+        try:
+            await asyncio.sleep(self.debounce_seconds)
+        except asyncio.CancelledError:
+            return
+        
+        self._pending_validations.pop(key, None)
+        repository, pull_request_id = key
+        
+        try:
+            async with open_async_session() as db:
+                project = await AsyncProjectRepository(db).get_by_repository(repository)
+                project_id = project.id if project else None
+            
+            if project_id is None:
+                logger.warning(f"No project configured for {repository}, skipping validation")
+                return
+            
+            await self.start_validation(
+                pipeline_id=pipeline_id,
+                project_id=project_id,
+                pull_request_id=pull_request_id,
+                agent_run_id=agent_run_id,
+                head_sha=head_sha,
+                force=force
+            )
+        except Exception as e:
+            logger.error(f"Failed to start validation for {repository} PR {pull_request_id}: {e}")
+    
     async def _execute_pipeline(self, pipeline_id: str):
         """
         Execute the complete validation pipeline.
@@ -120,72 +331,73 @@ class PipelineCoordinator:
         Args:
             pipeline_id: ID of the validation pipeline
         """
+        step_results: Dict[str, Dict[str, Any]] = {}
+        
         try:
-            with next(get_database_session()) as db:
-                pipeline = db.query(ValidationPipeline).filter(
-                    ValidationPipeline.id == pipeline_id
-                ).first()
-                
-                if not pipeline:
-                    return
-                
-                # Update status to running
-                pipeline.status = ValidationStatus.RUNNING
-                pipeline.started_at = datetime.utcnow()
-                db.commit()
-                
-                # Notify progress
-                await self.connection_manager.broadcast_to_project(
-                    pipeline.project_id,
-                    {
-                        "type": "validation_progress",
-                        "pipeline_id": pipeline_id,
-                        "status": "running",
-                        "progress": 5
-                    }
-                )
-            
-            # Execute pipeline steps
-            steps = [
-                ("snapshot_creation", self._create_snapshot),
-                ("codebase_clone", self._clone_codebase),
-                ("deployment", self._deploy_application),
-                ("health_check", self._check_deployment_health),
-                ("web_evaluation", self._run_web_evaluation),
-                ("cleanup", self._cleanup_resources)
-            ]
-            
-            total_steps = len(steps)
-            completed_steps = 0
-            
-            for step_name, step_function in steps:
-                try:
-                    # Execute step
-                    step_result = await step_function(pipeline_id)
-                    completed_steps += 1
-                    
-                    # Update progress
-                    progress = int((completed_steps / total_steps) * 100)
-                    await self._update_pipeline_progress(pipeline_id, progress, step_name)
-                    
-                    # Check if step failed
-                    if not step_result.get("success", False):
-                        await self._handle_step_failure(pipeline_id, step_name, step_result)
-                        return
-                        
-                except Exception as e:
-                    await self._handle_step_error(pipeline_id, step_name, str(e))
+            state = await PipelineState.load(pipeline_id)
+            if not state:
+                return
+            
+            self._pipeline_states[pipeline_id] = state
+            
+            # Reuse the verdict of an earlier run of the same commit and config
+            cache_key = self._result_cache_key(state)
+            if cache_key and not (state.pipeline_config or {}).get("force_rerun"):
+                cached = await self._get_cached_result(cache_key)
+                if cached is not None:
+                    await self._complete_from_cache(pipeline_id, cached)
                     return
             
+            # Update status to running
+            await state.update_pipeline(
+                status=ValidationStatus.RUNNING,
+                started_at=datetime.utcnow()
+            )
+            
+            # Notify progress
+            await self.connection_manager.broadcast_progress(
+                state.project_id,
+                pipeline_id,
+                {
+                    "type": "validation_progress",
+                    "pipeline_id": pipeline_id,
+                    "status": "running",
+                    "progress": 5
+                }
+            )
+            
+            # Execute pipeline steps, running independent steps concurrently
+            async def on_step_finished(step_name: str, step_result: Dict[str, Any], progress: int):
+                await self._update_pipeline_progress(pipeline_id, progress, step_name)
+            
+            failed_step = await self.pipeline_graph.run(pipeline_id, step_results, on_step_finished)
+            
+            if failed_step is not None:
+                await self._handle_step_failure(pipeline_id, failed_step, step_results[failed_step])
+                if self._is_commit_verdict(failed_step, step_results[failed_step]):
+                    await self._cache_result(
+                        cache_key, pipeline_id, ValidationResult.FAILURE, step_results, failed_step
+                    )
+                return
+            
             # Pipeline completed successfully
             await self._complete_pipeline(pipeline_id, ValidationResult.SUCCESS)
+            await self._cache_result(cache_key, pipeline_id, ValidationResult.SUCCESS, step_results)
             
+        except asyncio.CancelledError:
+            await self._handle_pipeline_cancelled(pipeline_id, run_cleanup="cleanup" not in step_results)
+            raise
         except Exception as e:
             await self._handle_pipeline_error(pipeline_id, str(e))
         finally:
             # Clean up pipeline tracking
             if pipeline_id in self._running_pipelines:
                 del self._running_pipelines[pipeline_id]
+            self._pipeline_states.pop(pipeline_id, None)
+            
+            key = self._pipeline_keys.pop(pipeline_id, None)
+            if key is not None and self._pr_pipelines.get(key, (None,))[0] == pipeline_id:
+                del self._pr_pipelines[key]
     
     async def _create_snapshot(self, pipeline_id: str) -> Dict[str, Any]:
         """
@@ -197,61 +409,29 @@ class PipelineCoordinator:
         Returns:
             dict: Snapshot creation result
         """
-        step_id = str(uuid.uuid4())
-        
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            # Create step record
-            step = ValidationStep(
-                id=step_id,
-                pipeline_id=pipeline_id,
-                step_type=ValidationStepType.SNAPSHOT_CREATION,
-                step_name="Create Snapshot Environment",
-                execution_order=1,
-                status=ValidationStatus.RUNNING,
-                started_at=datetime.utcnow()
-            )
-            db.add(step)
-            db.commit()
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(
+            ValidationStepType.SNAPSHOT_CREATION, "Create Snapshot Environment", 1
+        )
         
         try:
             # Create snapshot via snapshot manager
             snapshot_result = await self.snapshot_manager.create_snapshot(
                 pipeline_id=pipeline_id,
-                project_id=pipeline.project_id
+                project_id=state.project_id
             )
             
-            # Update step with results
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.COMPLETED
-                step.result = ValidationResult.SUCCESS
-                step.completed_at = datetime.utcnow()
-                step.artifacts = snapshot_result
-                
-                # Update pipeline with snapshot ID
-                pipeline = db.query(ValidationPipeline).filter(
-                    ValidationPipeline.id == pipeline_id
-                ).first()
-                pipeline.snapshot_id = snapshot_result.get("snapshot_id")
-                
-                db.commit()
+            # Update step and pipeline with snapshot ID
+            await state.finish_step(
+                step_id,
+                artifacts=snapshot_result,
+                pipeline_updates={"snapshot_id": snapshot_result.get("snapshot_id")}
+            )
             
             return {"success": True, "snapshot_id": snapshot_result.get("snapshot_id")}
             
         except Exception as e:
-            # Update step with error
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.FAILED
-                step.result = ValidationResult.FAILURE
-                step.error_logs = str(e)
-                step.completed_at = datetime.utcnow()
-                db.commit()
-            
+            await state.fail_step(step_id, str(e))
             return {"success": False, "error": str(e)}
     
     async def _clone_codebase(self, pipeline_id: str) -> Dict[str, Any]:
@@ -264,54 +444,25 @@ class PipelineCoordinator:
         Returns:
             dict: Codebase cloning result
         """
-        step_id = str(uuid.uuid4())
-        
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            # Create step record
-            step = ValidationStep(
-                id=step_id,
-                pipeline_id=pipeline_id,
-                step_type=ValidationStepType.CODEBASE_CLONE,
-                step_name="Clone PR Codebase",
-                execution_order=2,
-                status=ValidationStatus.RUNNING,
-                started_at=datetime.utcnow()
-            )
-            db.add(step)
-            db.commit()
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.CODEBASE_CLONE, "Clone PR Codebase", 2)
         
         try:
-            # Clone codebase via snapshot manager
+            # Check out the PR head via the snapshot manager's git mirror
+            config = state.pipeline_config or {}
             clone_result = await self.snapshot_manager.clone_pr_codebase(
-                snapshot_id=pipeline.snapshot_id,
-                pull_request_id=pipeline.pull_request_id
+                snapshot_id=state.snapshot_id,
+                pull_request_id=state.pull_request_id,
+                repository_url=config.get("repository_url"),
+                head_ref=config.get("head_sha")
             )
             
-            # Update step with results
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.COMPLETED
-                step.result = ValidationResult.SUCCESS
-                step.completed_at = datetime.utcnow()
-                step.artifacts = clone_result
-                db.commit()
+            await state.finish_step(step_id, artifacts=clone_result)
             
             return {"success": True, "clone_path": clone_result.get("clone_path")}
             
         except Exception as e:
-            # Update step with error
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.FAILED
-                step.result = ValidationResult.FAILURE
-                step.error_logs = str(e)
-                step.completed_at = datetime.utcnow()
-                db.commit()
-            
+            await state.fail_step(step_id, str(e))
             return {"success": False, "error": str(e)}
     
     async def _deploy_application(self, pipeline_id: str) -> Dict[str, Any]:
@@ -324,62 +475,28 @@ class PipelineCoordinator:
         Returns:
             dict: Deployment result
         """
-        step_id = str(uuid.uuid4())
-        
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            # Create step record
-            step = ValidationStep(
-                id=step_id,
-                pipeline_id=pipeline_id,
-                step_type=ValidationStepType.DEPLOYMENT,
-                step_name="Deploy Application",
-                execution_order=3,
-                status=ValidationStatus.RUNNING,
-                started_at=datetime.utcnow()
-            )
-            db.add(step)
-            db.commit()
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.DEPLOYMENT, "Deploy Application", 3)
         
         try:
             # Deploy via deployment orchestrator
             deploy_result = await self.deployment_orchestrator.deploy_application(
-                snapshot_id=pipeline.snapshot_id,
-                project_id=pipeline.project_id
+                snapshot_id=state.snapshot_id,
+                project_id=state.project_id
             )
             
-            # Update step and pipeline with results
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.COMPLETED
-                step.result = ValidationResult.SUCCESS
-                step.completed_at = datetime.utcnow()
-                step.artifacts = deploy_result
-                step.command_executed = deploy_result.get("commands_executed", [])
-                
-                # Update pipeline with deployment URL
-                pipeline = db.query(ValidationPipeline).filter(
-                    ValidationPipeline.id == pipeline_id
-                ).first()
-                pipeline.deployment_url = deploy_result.get("deployment_url")
-                
-                db.commit()
+            # Update step and pipeline with deployment URL
+            await state.finish_step(
+                step_id,
+                artifacts=deploy_result,
+                commands_executed=deploy_result.get("commands_executed", []),
+                pipeline_updates={"deployment_url": deploy_result.get("deployment_url")}
+            )
             
             return {"success": True, "deployment_url": deploy_result.get("deployment_url")}
             
         except Exception as e:
-            # Update step with error
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.FAILED
-                step.result = ValidationResult.FAILURE
-                step.error_logs = str(e)
-                step.completed_at = datetime.utcnow()
-                db.commit()
-            
+            await state.fail_step(step_id, str(e))
             return {"success": False, "error": str(e)}
     
     async def _check_deployment_health(self, pipeline_id: str) -> Dict[str, Any]:
@@ -392,53 +509,25 @@ class PipelineCoordinator:
         Returns:
             dict: Health check result
         """
-        step_id = str(uuid.uuid4())
-        
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            # Create step record
-            step = ValidationStep(
-                id=step_id,
-                pipeline_id=pipeline_id,
-                step_type=ValidationStepType.HEALTH_CHECK,
-                step_name="Health Check",
-                execution_order=4,
-                status=ValidationStatus.RUNNING,
-                started_at=datetime.utcnow()
-            )
-            db.add(step)
-            db.commit()
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.HEALTH_CHECK, "Health Check", 4)
         
         try:
             # Perform health check
             health_result = await self.deployment_orchestrator.check_deployment_health(
-                deployment_url=pipeline.deployment_url
+                deployment_url=state.deployment_url
             )
             
-            # Update step with results
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.COMPLETED
-                step.result = ValidationResult.SUCCESS if health_result.get("healthy") else ValidationResult.FAILURE
-                step.completed_at = datetime.utcnow()
-                step.artifacts = health_result
-                db.commit()
+            await state.finish_step(
+                step_id,
+                result=ValidationResult.SUCCESS if health_result.get("healthy") else ValidationResult.FAILURE,
+                artifacts=health_result
+            )
             
             return {"success": health_result.get("healthy", False), "health_data": health_result}
             
         except Exception as e:
-            # Update step with error
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.FAILED
-                step.result = ValidationResult.FAILURE
-                step.error_logs = str(e)
-                step.completed_at = datetime.utcnow()
-                db.commit()
-            
+            await state.fail_step(step_id, str(e))
             return {"success": False, "error": str(e)}
     
     async def _run_web_evaluation(self, pipeline_id: str) -> Dict[str, Any]:
@@ -451,54 +540,84 @@ class PipelineCoordinator:
         Returns:
             dict: Web evaluation result
         """
-        step_id = str(uuid.uuid4())
-        
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            # Create step record
-            step = ValidationStep(
-                id=step_id,
-                pipeline_id=pipeline_id,
-                step_type=ValidationStepType.WEB_EVALUATION,
-                step_name="Web Evaluation Testing",
-                execution_order=5,
-                status=ValidationStatus.RUNNING,
-                started_at=datetime.utcnow()
-            )
-            db.add(step)
-            db.commit()
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.WEB_EVALUATION, "Web Evaluation Testing", 5)
         
         try:
             # Run web evaluation
             eval_result = await self.web_eval_service.evaluate_deployment(
-                deployment_url=pipeline.deployment_url,
-                project_id=pipeline.project_id
+                deployment_url=state.deployment_url,
+                project_id=state.project_id
             )
             
-            # Update step with results
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.COMPLETED
-                step.result = ValidationResult.SUCCESS if eval_result.get("passed") else ValidationResult.FAILURE
-                step.completed_at = datetime.utcnow()
-                step.artifacts = eval_result
-                db.commit()
+            await state.finish_step(
+                step_id,
+                result=ValidationResult.SUCCESS if eval_result.get("passed") else ValidationResult.FAILURE,
+                artifacts=eval_result
+            )
             
             return {"success": eval_result.get("passed", False), "evaluation_data": eval_result}
             
         except Exception as e:
-            # Update step with error
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.FAILED
-                step.result = ValidationResult.FAILURE
-                step.error_logs = str(e)
-                step.completed_at = datetime.utcnow()
-                db.commit()
+            await state.fail_step(step_id, str(e))
+            return {"success": False, "error": str(e)}
+    
+    async def _run_code_analysis(self, pipeline_id: str) -> Dict[str, Any]:
+        """
+        Run static code analysis on the PR codebase.
+        
+        Optional step, run alongside deployment.
+        
+        Args:
+            pipeline_id: ID of the validation pipeline
+            
+        Returns:
+            dict: Code analysis result
+        """
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.CODE_ANALYSIS, "Code Analysis", 3)
+        
+        try:
+            # Analyze codebase via snapshot manager
+            analysis_result = await self.snapshot_manager.run_code_analysis(
+                snapshot_id=state.snapshot_id
+            )
+            
+            await state.finish_step(step_id, artifacts=analysis_result)
+            
+            return {"success": True, "analysis_data": analysis_result}
+            
+        except Exception as e:
+            await state.fail_step(step_id, str(e), result=ValidationResult.WARNING)
+            return {"success": False, "error": str(e)}
+    
+    async def _run_security_scan(self, pipeline_id: str) -> Dict[str, Any]:
+        """
+        Scan the PR codebase for security issues.
+        
+        Optional step, run alongside deployment.
+        
+        Args:
+            pipeline_id: ID of the validation pipeline
             
+        Returns:
+            dict: Security scan result
+        """
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.SECURITY_SCAN, "Security Scan", 3)
+        
+        try:
+            # Scan codebase via snapshot manager
+            scan_result = await self.snapshot_manager.run_security_scan(
+                snapshot_id=state.snapshot_id
+            )
+            
+            await state.finish_step(step_id, artifacts=scan_result)
+            
+            return {"success": True, "scan_data": scan_result}
+            
+        except Exception as e:
+            await state.fail_step(step_id, str(e), result=ValidationResult.WARNING)
             return {"success": False, "error": str(e)}
     
     async def _cleanup_resources(self, pipeline_id: str) -> Dict[str, Any]:
@@ -511,105 +630,77 @@ class PipelineCoordinator:
         Returns:
             dict: Cleanup result
         """
-        step_id = str(uuid.uuid4())
-        
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            # Create step record
-            step = ValidationStep(
-                id=step_id,
-                pipeline_id=pipeline_id,
-                step_type=ValidationStepType.CLEANUP,
-                step_name="Resource Cleanup",
-                execution_order=6,
-                status=ValidationStatus.RUNNING,
-                started_at=datetime.utcnow()
-            )
-            db.add(step)
-            db.commit()
+        state = self._pipeline_states[pipeline_id]
+        step_id = await state.start_step(ValidationStepType.CLEANUP, "Resource Cleanup", 6)
         
         try:
             # Cleanup via snapshot manager
             cleanup_result = await self.snapshot_manager.cleanup_snapshot(
-                snapshot_id=pipeline.snapshot_id
+                snapshot_id=state.snapshot_id
             )
             
-            # Update step with results
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.COMPLETED
-                step.result = ValidationResult.SUCCESS
-                step.completed_at = datetime.utcnow()
-                step.artifacts = cleanup_result
-                db.commit()
+            await state.finish_step(step_id, artifacts=cleanup_result)
             
             return {"success": True, "cleanup_data": cleanup_result}
             
         except Exception as e:
-            # Update step with error (but don't fail pipeline)
-            with next(get_database_session()) as db:
-                step = db.query(ValidationStep).filter(ValidationStep.id == step_id).first()
-                step.status = ValidationStatus.FAILED
-                step.result = ValidationResult.WARNING  # Warning, not failure
-                step.error_logs = str(e)
-                step.completed_at = datetime.utcnow()
-                db.commit()
-            
-            return {"success": True, "warning": str(e)}  # Don't fail pipeline for cleanup issues
+            # Warning, not failure: cleanup issues don't fail the pipeline
+            await state.fail_step(step_id, str(e), result=ValidationResult.WARNING)
+            return {"success": True, "warning": str(e)}
     
     async def _update_pipeline_progress(self, pipeline_id: str, progress: int, current_step: str):
         """Update pipeline progress and notify clients."""
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            if pipeline:
-                pipeline.progress_percentage = progress
-                pipeline.current_step = current_step
-                db.commit()
-                
-                # Notify connected clients
-                await self.connection_manager.broadcast_to_project(
-                    pipeline.project_id,
-                    {
-                        "type": "validation_progress",
-                        "pipeline_id": pipeline_id,
-                        "progress": progress,
-                        "current_step": current_step
-                    }
-                )
+        state = self._pipeline_states.get(pipeline_id)
+        if not state:
+            return
+        
+        await state.update_pipeline(progress_percentage=progress, current_step=current_step)
+        
+        # Notify connected clients
+        await self.connection_manager.broadcast_progress(
+            state.project_id,
+            pipeline_id,
+            {
+                "type": "validation_progress",
+                "pipeline_id": pipeline_id,
+                "progress": progress,
+                "current_step": current_step
+            }
+        )
     
-    async def _complete_pipeline(self, pipeline_id: str, result: ValidationResult):
+    async def _complete_pipeline(
+        self,
+        pipeline_id: str,
+        result: ValidationResult,
+        cached_from: Optional[str] = None
+    ):
         """Complete the validation pipeline."""
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            if pipeline:
-                pipeline.status = ValidationStatus.COMPLETED
-                pipeline.overall_result = result
-                pipeline.completed_at = datetime.utcnow()
-                pipeline.progress_percentage = 100
-                db.commit()
-                
-                # Update state manager
-                self.state_manager.remove_active_validation(pipeline.project_id, pipeline_id)
-                
-                # Notify connected clients
-                await self.connection_manager.broadcast_to_project(
-                    pipeline.project_id,
-                    {
-                        "type": "validation_completed",
-                        "pipeline_id": pipeline_id,
-                        "result": result.value,
-                        "deployment_url": pipeline.deployment_url
-                    }
-                )
+        state = await self._get_pipeline_state(pipeline_id)
+        if not state:
+            return
+        
+        await state.update_pipeline(
+            status=ValidationStatus.COMPLETED,
+            overall_result=result,
+            completed_at=datetime.utcnow(),
+            progress_percentage=100
+        )
+        
+        # Update state manager
+        self.state_manager.remove_active_validation(state.project_id, pipeline_id)
+        
+        # Notify connected clients, dropping any buffered progress first
+        self.connection_manager.finish_progress(state.project_id, pipeline_id)
+        await self.connection_manager.broadcast_to_project(
+            state.project_id,
+            {
+                "type": "validation_completed",
+                "pipeline_id": pipeline_id,
+                "result": result.value,
+                "deployment_url": state.deployment_url,
+                "cached_from": cached_from
+            }
+        )
     
     async def _handle_step_failure(self, pipeline_id: str, step_name: str, step_result: Dict[str, Any]):
         """Handle step failure and potentially retry or fail pipeline."""
@@ -622,18 +713,142 @@ class PipelineCoordinator:
     
     async def _handle_pipeline_error(self, pipeline_id: str, error: str):
         """Handle pipeline-level error."""
-        with next(get_database_session()) as db:
-            pipeline = db.query(ValidationPipeline).filter(
-                ValidationPipeline.id == pipeline_id
-            ).first()
-            
-            if pipeline:
-                pipeline.status = ValidationStatus.FAILED
-                pipeline.overall_result = ValidationResult.FAILURE
-                pipeline.error_message = error
-                pipeline.completed_at = datetime.utcnow()
-                db.commit()
-                
-                # Update state manager
-                self.state_manager.remove_active_validation(pipeline.project_id, pipeline_id)
+        state = await self._get_pipeline_state(pipeline_id)
+        if not state:
+            return
+        
+        await state.update_pipeline(
+            status=ValidationStatus.FAILED,
+            overall_result=ValidationResult.FAILURE,
+            error_message=error,
+            completed_at=datetime.utcnow()
+        )
+        
+        self.connection_manager.finish_progress(state.project_id, pipeline_id)
+        
+        # Update state manager
+        self.state_manager.remove_active_validation(state.project_id, pipeline_id)
+    
+    async def _handle_pipeline_cancelled(self, pipeline_id: str, run_cleanup: bool = True):
+        """Release resources of a cancelled pipeline and record the cancellation."""
+        reason = self._cancel_reasons.pop(pipeline_id, "Cancelled")
+        
+        try:
+            state = await self._get_pipeline_state(pipeline_id)
+            if not state:
+                return
+            
+            # Tear down the snapshot environment the pipeline created
+            if run_cleanup and state.snapshot_id:
+                await self._cleanup_resources(pipeline_id)
+            
+            await state.update_pipeline(
+                status=ValidationStatus.CANCELLED,
+                error_message=reason,
+                completed_at=datetime.utcnow()
+            )
+            
+            self.state_manager.remove_active_validation(state.project_id, pipeline_id)
+            
+            self.connection_manager.finish_progress(state.project_id, pipeline_id)
+            await self.connection_manager.broadcast_to_project(
+                state.project_id,
+                {
+                    "type": "validation_cancelled",
+                    "pipeline_id": pipeline_id,
+                    "reason": reason
+                }
+            )
+            
+            logger.info(f"Cancelled validation pipeline {pipeline_id}: {reason}")
+            
+        except Exception as e:
+            logger.error(f"Error cancelling validation pipeline {pipeline_id}: {e}")
+    
+    def _result_cache_key(self, state: PipelineState) -> Optional[str]:
+        """Get the result cache key of a pipeline, or None without a head commit."""
+        config = state.pipeline_config or {}
+        if not config.get("head_sha"):
+            return None
+        return validation_cache_key(state.project_id, config["head_sha"], config)
+    
+    def _is_commit_verdict(self, failed_step: str, step_result: Dict[str, Any]) -> bool:
+        """
+        Check whether a failure judges the commit rather than the infrastructure.
+        
+        Only a web evaluation that ran and reported a failing result is
+        cached; snapshot, clone, deployment or cleanup failures and
+        evaluation errors may pass when the same commit is retried.
+        
+        Args:
+            failed_step: Name of the step that failed the pipeline
+            step_result: Result returned by that step
+            
+        Returns:
+            bool: Whether the failure may be cached for the commit
+        """
+        return failed_step == "web_evaluation" and "evaluation_data" in step_result
+    
+    async def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached verdict, treating cache errors as misses."""
+        try:
+            return await self.result_cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Validation result cache lookup failed: {e}")
+            return None
+    
+    async def _cache_result(
+        self,
+        cache_key: Optional[str],
+        pipeline_id: str,
+        result: ValidationResult,
+        step_results: Dict[str, Dict[str, Any]],
+        failed_step: Optional[str] = None
+    ):
+        """Store the verdict of a pipeline that ran to completion."""
+        if not cache_key:
+            return
+        
+        # The deployment is torn down after the run, so its URL is not kept
+        try:
+            await self.result_cache.set(cache_key, {
+                "pipeline_id": pipeline_id,
+                "overall_result": result.value,
+                "failed_step": failed_step,
+                "step_results": step_results,
+                "cached_at": datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            logger.warning(f"Failed to cache result of validation pipeline {pipeline_id}: {e}")
+    
+    async def _complete_from_cache(self, pipeline_id: str, cached: Dict[str, Any]):
+        """Complete a pipeline with the verdict of an earlier run of the same commit."""
+        state = self._pipeline_states[pipeline_id]
+        source_pipeline_id = cached.get("pipeline_id")
+        
+        await state.update_pipeline(
+            started_at=datetime.utcnow(),
+            current_step="cached",
+            error_message=(
+                f"Step {cached['failed_step']} failed in pipeline {source_pipeline_id}"
+                if cached.get("failed_step") else None
+            )
+        )
+        await self._complete_pipeline(
+            pipeline_id, ValidationResult(cached["overall_result"]), cached_from=source_pipeline_id
+        )
+        
+        logger.info(f"Validation pipeline {pipeline_id} reused the verdict of pipeline {source_pipeline_id}")
+    
+    async def _get_pipeline_state(self, pipeline_id: str) -> Optional[PipelineState]:
+        """Get the in-memory state of a pipeline, loading it if not running."""
+        state = self._pipeline_states.get(pipeline_id)
+        if state is None:
+            state = await PipelineState.load(pipeline_id)
+            if state is not None:
+                self._pipeline_states[pipeline_id] = state
+        return state
+
 
+# Global pipeline coordinator instance
+pipeline_coordinator = PipelineCoordinator()
@@ -0,0 +1,193 @@
+"""
+Dependency graph execution for validation pipelines.
+
+Pipeline steps declare the steps they depend on and run concurrently as
+soon as those have succeeded. A failed required step cancels its running
+siblings and skips everything downstream, except steps marked
+``always_run`` (such as cleanup), which run once their dependencies have
+settled either way. Progress is weighted by each step's expected
+duration, refined from observed durations.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Coroutine running a step for a pipeline ID and returning its result
+StepFunction = Callable[[str], Awaitable[Dict[str, Any]]]
+
+# Callback invoked with (step_name, result, progress_percentage) as steps finish
+StepFinishedCallback = Callable[[str, Dict[str, Any], int], Awaitable[None]]
+
+# Weight given to the latest observed duration when refining estimates
+DURATION_SMOOTHING = 0.3
+
+
+@dataclass
+class PipelineStep:
+    """A node of the pipeline graph"""
+    name: str
+    run: StepFunction
+    depends_on: Tuple[str, ...] = ()
+    required: bool = True
+    always_run: bool = False
+    expected_duration: float = 1.0
+
+
+class PipelineGraph:
+    """
+    Executes pipeline steps in dependency order with maximal concurrency.
+    """
+
+    def __init__(self, steps: List[PipelineStep]):
+        """
+        Initialize the graph.
+
+        Args:
+            steps: Pipeline steps; dependencies must name other steps and be acyclic
+        """
+        self.steps: Dict[str, PipelineStep] = {step.name: step for step in steps}
+        self.expected_durations: Dict[str, float] = {
+            step.name: step.expected_duration for step in steps
+        }
+        self._validate()
+
+    async def run(
+        self,
+        pipeline_id: str,
+        results: Dict[str, Dict[str, Any]],
+        on_step_finished: Optional[StepFinishedCallback] = None
+    ) -> Optional[str]:
+        """
+        Run every step of the graph.
+
+        Args:
+            pipeline_id: ID of the validation pipeline
+            results: Filled with each step's result as it finishes
+            on_step_finished: Called after each step with the overall progress
+
+        Returns:
+            Optional[str]: Name of the first failed required step, or None
+        """
+        loop = asyncio.get_running_loop()
+        pending = dict(self.steps)
+        running: Dict[asyncio.Task, str] = {}
+        started_at: Dict[str, float] = {}
+        weights = dict(self.expected_durations)
+        total_weight = sum(weights.values()) or 1.0
+        finished_weight = 0.0
+        failed_step: Optional[str] = None
+
+        try:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    state = self._dependency_state(step, results)
+                    if state == "waiting":
+                        continue
+
+                    del pending[name]
+
+                    if (failed_step and not step.always_run) or state == "blocked":
+                        results[name] = {"success": False, "skipped": True}
+                        finished_weight += weights[name]
+                        continue
+
+                    started_at[name] = loop.time()
+                    running[asyncio.create_task(self._run_step(step, pipeline_id))] = name
+
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    name = running.pop(task)
+                    step = self.steps[name]
+
+                    if task.cancelled():
+                        result = {"success": False, "cancelled": True}
+                    else:
+                        result = task.result()
+                        self._record_duration(name, loop.time() - started_at[name])
+
+                    results[name] = result
+                    finished_weight += weights[name]
+
+                    if not result.get("success", False) and step.required and failed_step is None:
+                        failed_step = name
+                        self._cancel_siblings(running)
+
+                    if on_step_finished is not None:
+                        progress = int(finished_weight / total_weight * 100)
+                        await on_step_finished(name, result, progress)
+
+        except asyncio.CancelledError:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+
+        return failed_step
+
+    async def _run_step(self, step: PipelineStep, pipeline_id: str) -> Dict[str, Any]:
+        """Run one step, turning exceptions into a failed result."""
+        try:
+            return await step.run(pipeline_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Pipeline {pipeline_id} step {step.name} raised: {e}")
+            return {"success": False, "error": str(e)}
+
+    def _dependency_state(self, step: PipelineStep, results: Dict[str, Dict[str, Any]]) -> str:
+        """Classify a pending step as "waiting", "ready" or "blocked"."""
+        if any(dependency not in results for dependency in step.depends_on):
+            return "waiting"
+
+        if step.always_run:
+            return "ready"
+
+        if all(results[dependency].get("success", False) for dependency in step.depends_on):
+            return "ready"
+
+        return "blocked"
+
+    def _cancel_siblings(self, running: Dict[asyncio.Task, str]):
+        """Cancel running steps after a required step failed."""
+        for task, name in running.items():
+            if not self.steps[name].always_run:
+                task.cancel()
+
+    def _record_duration(self, name: str, duration: float):
+        """Refine a step's expected duration from an observed run."""
+        previous = self.expected_durations[name]
+        self.expected_durations[name] = (
+            (1 - DURATION_SMOOTHING) * previous + DURATION_SMOOTHING * duration
+        )
+
+    def _validate(self):
+        """Check dependencies exist and form no cycles."""
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"Step {step.name} depends on unknown step {dependency}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline graph has a cycle through {name}")
+
+            visiting.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.steps:
+            visit(name)
@@ -0,0 +1,207 @@
+"""
+In-memory validation pipeline state with batched persistence.
+
+Keeps a copy of the pipeline row and its step records for the lifetime
+of a pipeline run. Each state transition (step started, step finished
+together with the pipeline fields it sets, progress update) is written
+in a single session and commit using primary-key UPDATEs, so rows are
+never re-selected. Writes use async sessions, serialized per pipeline,
+so they wait on the connection pool rather than blocking the event loop.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.async_session import open_async_session
+from ..models import ValidationPipeline, ValidationResult, ValidationStatus, ValidationStep, ValidationStepType
+
+logger = logging.getLogger(__name__)
+
+# Pipeline columns mirrored in memory
+PIPELINE_FIELDS = (
+    "project_id", "pull_request_id", "agent_run_id", "status", "snapshot_id",
+    "deployment_url", "progress_percentage", "current_step", "overall_result",
+    "error_message", "started_at", "completed_at", "pipeline_config",
+)
+
+
+class PipelineState:
+    """
+    Write-through cache of a validation pipeline and its steps.
+    """
+
+    def __init__(self, pipeline_id: str, **fields: Any):
+        self.pipeline_id = pipeline_id
+        for field in PIPELINE_FIELDS:
+            setattr(self, field, fields.get(field))
+
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.write_count = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def load(cls, pipeline_id: str) -> Optional["PipelineState"]:
+        """
+        Load pipeline state with a single query.
+
+        Args:
+            pipeline_id: ID of the validation pipeline
+
+        Returns:
+            Optional[PipelineState]: Pipeline state, or None if the pipeline does not exist
+        """
+        async with open_async_session() as db:
+            pipeline = await db.get(ValidationPipeline, pipeline_id)
+            if not pipeline:
+                return None
+            fields = {field: getattr(pipeline, field) for field in PIPELINE_FIELDS}
+
+        return cls(pipeline_id, **fields)
+
+    async def update_pipeline(self, **fields: Any):
+        """
+        Update pipeline fields in memory and persist them in one statement.
+
+        Args:
+            **fields: Pipeline columns to set
+        """
+        self._apply(fields)
+
+        async def write(db: AsyncSession):
+            await self._update_pipeline_row(db, fields)
+
+        await self._write(write)
+
+    async def start_step(
+        self,
+        step_type: ValidationStepType,
+        step_name: str,
+        execution_order: int
+    ) -> str:
+        """
+        Record a running step.
+
+        Args:
+            step_type: Type of the step
+            step_name: Display name of the step
+            execution_order: Position of the step in the pipeline
+
+        Returns:
+            str: ID of the step record
+        """
+        step_id = str(uuid.uuid4())
+        values = {
+            "step_type": step_type,
+            "step_name": step_name,
+            "execution_order": execution_order,
+            "status": ValidationStatus.RUNNING,
+            "started_at": datetime.utcnow(),
+        }
+        self.steps[step_id] = dict(values)
+
+        async def write(db: AsyncSession):
+            db.add(ValidationStep(id=step_id, pipeline_id=self.pipeline_id, **values))
+
+        await self._write(write)
+        return step_id
+
+    async def finish_step(
+        self,
+        step_id: str,
+        result: ValidationResult = ValidationResult.SUCCESS,
+        artifacts: Optional[Dict[str, Any]] = None,
+        commands_executed: Optional[List[str]] = None,
+        pipeline_updates: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Record a completed step and the pipeline fields it produced in one commit.
+
+        Args:
+            step_id: ID of the step record
+            result: Step result
+            artifacts: Step output (optional)
+            commands_executed: Commands the step ran, stored one per line (optional)
+            pipeline_updates: Pipeline columns to set, e.g. snapshot_id (optional)
+        """
+        values: Dict[str, Any] = {
+            "status": ValidationStatus.COMPLETED,
+            "result": result,
+            "completed_at": datetime.utcnow(),
+            "artifacts": artifacts,
+        }
+        if commands_executed is not None:
+            values["command_executed"] = "\n".join(commands_executed)
+
+        await self._finish(step_id, values, pipeline_updates)
+
+    async def fail_step(
+        self,
+        step_id: str,
+        error: str,
+        result: ValidationResult = ValidationResult.FAILURE
+    ):
+        """
+        Record a failed step.
+
+        Args:
+            step_id: ID of the step record
+            error: Error description
+            result: Step result (WARNING for non-fatal failures)
+        """
+        await self._finish(step_id, {
+            "status": ValidationStatus.FAILED,
+            "result": result,
+            "error_logs": error,
+            "completed_at": datetime.utcnow(),
+        })
+
+    async def _finish(
+        self,
+        step_id: str,
+        values: Dict[str, Any],
+        pipeline_updates: Optional[Dict[str, Any]] = None
+    ):
+        """Persist a step transition and optional pipeline updates together."""
+        self.steps.setdefault(step_id, {}).update(values)
+        if pipeline_updates:
+            self._apply(pipeline_updates)
+
+        async def write(db: AsyncSession):
+            await db.execute(
+                update(ValidationStep)
+                .where(ValidationStep.id == step_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if pipeline_updates:
+                await self._update_pipeline_row(db, pipeline_updates)
+
+        await self._write(write)
+
+    def _apply(self, fields: Dict[str, Any]):
+        """Update the in-memory copy of the pipeline."""
+        for field, value in fields.items():
+            setattr(self, field, value)
+
+    async def _update_pipeline_row(self, db: AsyncSession, fields: Dict[str, Any]):
+        """Issue a primary-key UPDATE of the pipeline row."""
+        await db.execute(
+            update(ValidationPipeline)
+            .where(ValidationPipeline.id == self.pipeline_id)
+            .values(**fields)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _write(self, operation: Callable[[AsyncSession], Awaitable[None]]):
+        """Run one transition in its own session and commit."""
+        async with self._lock:
+            async with open_async_session() as db:
+                await operation(db)
+                await db.commit()
+            self.write_count += 1
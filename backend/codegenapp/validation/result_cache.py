@@ -0,0 +1,202 @@
+"""
+Validation result cache keyed by commit.
+
+A pipeline's verdict depends only on the project, the commit validated
+and the pipeline configuration, so re-validating the same commit (a
+retry, a re-opened PR, a duplicate webhook) can reuse the earlier
+verdict instead of rebuilding the sandbox and rerunning every step.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Default time a cached verdict stays valid, in seconds
+DEFAULT_RESULT_CACHE_TTL = 24 * 60 * 60
+
+# Default maximum verdicts cached in memory
+DEFAULT_RESULT_CACHE_MAX_ENTRIES = 10000
+
+# Pipeline config keys that do not affect the verdict
+VOLATILE_CONFIG_KEYS = ("head_sha", "force_rerun")
+
+
+def validation_cache_key(project_id: str, commit_sha: str, pipeline_config: Optional[Dict[str, Any]]) -> str:
+    """
+    Build the cache key of a validation.
+
+    Args:
+        project_id: ID of the project
+        commit_sha: Commit SHA validated
+        pipeline_config: Pipeline configuration (volatile keys are ignored)
+
+    Returns:
+        str: Cache key
+    """
+    config = {
+        key: value for key, value in (pipeline_config or {}).items()
+        if key not in VOLATILE_CONFIG_KEYS
+    }
+    config_hash = hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{project_id}:{commit_sha}:{config_hash}"
+
+
+class ValidationResultCache(ABC):
+    """Abstract base class for cached validation verdicts"""
+
+    def __init__(self):
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached verdict.
+
+        Args:
+            key: Cache key from validation_cache_key
+
+        Returns:
+            Optional[dict]: Cached pipeline and step results, or None
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, entry: Dict[str, Any]):
+        """
+        Cache a verdict.
+
+        Args:
+            key: Cache key from validation_cache_key
+            entry: Pipeline and step results
+        """
+        pass
+
+    @abstractmethod
+    async def invalidate(self, key: str):
+        """Drop a cached verdict"""
+        pass
+
+    async def close(self):
+        """Release resources"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {"hits": self.hit_count, "misses": self.miss_count}
+
+    def _record(self, entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Count a lookup as a hit or miss."""
+        if entry is None:
+            self.miss_count += 1
+        else:
+            self.hit_count += 1
+        return entry
+
+
+class InMemoryValidationResultCache(ValidationResultCache):
+    """Process-local verdict cache with expiry and a size bound"""
+
+    def __init__(self, ttl: float = DEFAULT_RESULT_CACHE_TTL, max_entries: int = DEFAULT_RESULT_CACHE_MAX_ENTRIES):
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Key -> (expiry time, entry), least recently set first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the verdict unless it expired"""
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] <= time.monotonic():
+            del self._entries[key]
+            cached = None
+        return self._record(cached[1] if cached else None)
+
+    async def set(self, key: str, entry: Dict[str, Any]):
+        """Cache the verdict, evicting the oldest entry when full"""
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, entry)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, key: str):
+        """Drop the verdict"""
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisValidationResultCache(ValidationResultCache):
+    """Verdict cache shared across processes, stored as JSON with an expiry"""
+
+    def __init__(self, redis_url: str, key_prefix: str = "codegenapp:validation-result", ttl: float = DEFAULT_RESULT_CACHE_TTL):
+        super().__init__()
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self._redis: Optional[aioredis.Redis] = None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the verdict unless it expired"""
+        raw = await self._client().get(f"{self.key_prefix}:{key}")
+        return self._record(json.loads(raw) if raw else None)
+
+    async def set(self, key: str, entry: Dict[str, Any]):
+        """Cache the verdict with the TTL"""
+        await self._client().set(
+            f"{self.key_prefix}:{key}", json.dumps(entry, default=str), ex=int(self.ttl)
+        )
+
+    async def invalidate(self, key: str):
+        """Drop the verdict"""
+        await self._client().delete(f"{self.key_prefix}:{key}")
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _client(self) -> aioredis.Redis:
+        """Get the Redis client, connecting lazily."""
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+
+
+def create_validation_result_cache(
+    backend: str = "memory",
+    ttl: float = DEFAULT_RESULT_CACHE_TTL,
+    redis_url: Optional[str] = None
+) -> ValidationResultCache:
+    """
+    Create a validation result cache by backend name.
+
+    Args:
+        backend: "memory" for a process-local cache, "redis" for a shared one
+        ttl: Time a verdict stays valid, in seconds
+        redis_url: Redis URL, required for the redis backend
+
+    Returns:
+        ValidationResultCache: Configured cache
+    """
+    if backend == "memory":
+        return InMemoryValidationResultCache(ttl=ttl)
+
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("redis_url is required for the redis validation result cache")
+        return RedisValidationResultCache(redis_url, ttl=ttl)
+
+    raise ValueError(f"Unknown validation result cache backend: {backend}")
@@ -6,22 +6,57 @@ with proper resource management and cleanup.
 """
 
 import asyncio
+import logging
+import os
 import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from .git_cache import DEFAULT_GIT_CACHE_DIR, DEFAULT_WORKSPACE_DIR, GitMirrorCache
+from .snapshot_pool import (
+    DEFAULT_POOL_IDLE_TIMEOUT, DEFAULT_POOL_MAX_SIZE, DEFAULT_POOL_MIN_SIZE, SnapshotPool
+)
+
+logger = logging.getLogger(__name__)
+
 
 class SnapshotManager:
     """
     Manages validation environment snapshots.
     
     Creates isolated Docker/Kubernetes environments for validation
-    with proper resource management and cleanup.
+    with proper resource management and cleanup. Environments come from
+    a warm pool per project image and are reset and returned to it on
+    cleanup. PR code is checked out from a local mirror of the repository.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        pool_min_size: int = DEFAULT_POOL_MIN_SIZE,
+        pool_max_size: int = DEFAULT_POOL_MAX_SIZE,
+        pool_idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        git_cache_dir: str = DEFAULT_GIT_CACHE_DIR,
+        workspace_dir: str = DEFAULT_WORKSPACE_DIR
+    ):
         self.docker_registry = "your_registry_url"
         self.k8s_namespace = "codegenapp"
+        self.pool = SnapshotPool(
+            provision=self._provision_snapshot,
+            reset=self._reset_snapshot,
+            destroy=self._destroy_snapshot,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            idle_timeout=pool_idle_timeout
+        )
+        
+        # Snapshots handed out to pipelines: snapshot ID -> (pool key, snapshot)
+        self._leased: Dict[str, tuple] = {}
+        
+        self.git_cache = GitMirrorCache(git_cache_dir)
+        self.workspace_dir = workspace_dir
+        
+        # Checkouts per snapshot: snapshot ID -> (repository URL, checkout path)
+        self._checkouts: Dict[str, tuple] = {}
     
     async def create_snapshot(
         self,
@@ -31,6 +66,8 @@ class SnapshotManager:
         """
         Create an isolated snapshot environment.
         
+        Takes a warm snapshot from the project's pool when one is ready.
+        
         Args:
             pipeline_id: ID of the validation pipeline
             project_id: ID of the project
@@ -38,13 +75,39 @@ class SnapshotManager:
         Returns:
             dict: Snapshot creation result
         """
-        snapshot_id = f"snapshot-{pipeline_id[:8]}-{int(datetime.utcnow().timestamp())}"
+        snapshot, warm = await self.pool.acquire(project_id)
+        self._leased[snapshot["snapshot_id"]] = (project_id, snapshot)
+        
+        return {
+            **snapshot,
+            "pipeline_id": pipeline_id,
+            "warm": warm,
+            "acquired_at": datetime.utcnow().isoformat()
+        }
+    
+    async def warm_pool(self, project_id: str):
+        """
+        Pre-provision snapshots for a project.
+        
+        Args:
+            project_id: ID of the project
+        """
+        await self.pool.warm(project_id)
+    
+    async def close(self):
+        """Destroy all pooled snapshots."""
+        await self.pool.close()
+    
+    async def _provision_snapshot(self, project_id: str) -> Dict[str, Any]:
+        """Provision a new snapshot environment for a project image."""
+        snapshot_id = f"snapshot-{uuid.uuid4().hex[:8]}-{int(datetime.utcnow().timestamp())}"
         
         # Simulate snapshot creation (replace with actual Docker/K8s implementation)
         await asyncio.sleep(2)  # Simulate creation time
         
         return {
             "snapshot_id": snapshot_id,
+            "project_id": project_id,
             "status": "created",
             "resources": {
                 "cpu": "2 cores",
@@ -61,18 +124,39 @@ class SnapshotManager:
     async def clone_pr_codebase(
         self,
         snapshot_id: str,
-        pull_request_id: str
+        pull_request_id: str,
+        repository_url: Optional[str] = None,
+        head_ref: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Clone PR codebase into snapshot environment.
         
+        With a repository URL and head ref, the PR head is checked out as a
+        worktree of the repository's local mirror, which is only fetched
+        incrementally.
+        
         Args:
             snapshot_id: ID of the snapshot
             pull_request_id: ID of the pull request
+            repository_url: Clone URL of the repository (optional)
+            head_ref: Head commit SHA or ref of the pull request (optional)
             
         Returns:
             dict: Clone operation result
         """
+        if repository_url and head_ref:
+            await self._remove_checkout(snapshot_id)
+            
+            destination = os.path.join(self.workspace_dir, f"{snapshot_id}-{pull_request_id}")
+            checkout = await self.git_cache.checkout(repository_url, head_ref, destination)
+            self._checkouts[snapshot_id] = (repository_url, destination)
+            
+            return {
+                **checkout,
+                "branch": f"pr-{pull_request_id}",
+                "cloned_at": datetime.utcnow().isoformat()
+            }
+        
         # Simulate codebase cloning (replace with actual git operations)
         await asyncio.sleep(3)  # Simulate clone time
         
@@ -85,18 +169,73 @@ class SnapshotManager:
             "cloned_at": datetime.utcnow().isoformat()
         }
     
+    async def run_code_analysis(self, snapshot_id: str) -> Dict[str, Any]:
+        """
+        Run static code analysis on the cloned codebase.
+        
+        Args:
+            snapshot_id: ID of the snapshot
+            
+        Returns:
+            dict: Code analysis result
+        """
+        # Simulate static analysis (replace with graph-sitter analysis)
+        await asyncio.sleep(2)  # Simulate analysis time
+        
+        return {
+            "snapshot_id": snapshot_id,
+            "issues_found": 0,
+            "files_analyzed": 150,
+            "analyzed_at": datetime.utcnow().isoformat()
+        }
+    
+    async def run_security_scan(self, snapshot_id: str) -> Dict[str, Any]:
+        """
+        Scan the cloned codebase for security issues.
+        
+        Args:
+            snapshot_id: ID of the snapshot
+            
+        Returns:
+            dict: Security scan result
+        """
+        # Simulate security scanning (replace with actual scanner)
+        await asyncio.sleep(2)  # Simulate scan time
+        
+        return {
+            "snapshot_id": snapshot_id,
+            "vulnerabilities_found": 0,
+            "scanned_at": datetime.utcnow().isoformat()
+        }
+    
     async def cleanup_snapshot(self, snapshot_id: str) -> Dict[str, Any]:
         """
         Clean up snapshot resources.
         
+        Pooled snapshots are reset and returned to their pool; others are
+        destroyed.
+        
         Args:
             snapshot_id: ID of the snapshot to cleanup
             
         Returns:
             dict: Cleanup result
         """
-        # Simulate cleanup (replace with actual resource cleanup)
-        await asyncio.sleep(1)  # Simulate cleanup time
+        await self._remove_checkout(snapshot_id)
+        
+        leased = self._leased.pop(snapshot_id, None)
+        
+        if leased is not None:
+            project_id, snapshot = leased
+            returned = await self.pool.release(project_id, snapshot)
+            
+            return {
+                "snapshot_id": snapshot_id,
+                "status": "returned_to_pool" if returned else "cleaned_up",
+                "cleaned_up_at": datetime.utcnow().isoformat()
+            }
+        
+        await self._destroy_snapshot({"snapshot_id": snapshot_id})
         
         return {
             "snapshot_id": snapshot_id,
@@ -108,4 +247,24 @@ class SnapshotManager:
             },
             "cleaned_up_at": datetime.utcnow().isoformat()
         }
-
+    
+    async def _remove_checkout(self, snapshot_id: str):
+        """Remove the PR checkout of a snapshot, if any."""
+        checkout = self._checkouts.pop(snapshot_id, None)
+        if checkout is None:
+            return
+        
+        try:
+            await self.git_cache.remove_checkout(*checkout)
+        except Exception as e:
+            logger.warning(f"Failed to remove checkout of snapshot {snapshot_id}: {e}")
+    
+    async def _reset_snapshot(self, snapshot: Dict[str, Any]):
+        """Restore a used snapshot to its clean state for reuse."""
+        # Simulate reset (replace with container restore / workspace wipe)
+        await asyncio.sleep(0.2)  # Simulate reset time
+    
+    async def _destroy_snapshot(self, snapshot: Dict[str, Any]):
+        """Release a snapshot's resources."""
+        # Simulate cleanup (replace with actual resource cleanup)
+        await asyncio.sleep(1)  # Simulate cleanup time
@@ -0,0 +1,228 @@
+"""
+Warm snapshot pool.
+
+Keeps pre-provisioned snapshot environments ready per project image so
+a pipeline acquires one immediately instead of waiting for provisioning.
+Returned snapshots are reset and reused, the pool is replenished in the
+background up to its minimum size, and snapshots idle beyond the timeout
+are destroyed down to that minimum.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default number of warm snapshots kept per pool key
+DEFAULT_POOL_MIN_SIZE = 1
+
+# Default maximum number of idle snapshots kept per pool key
+DEFAULT_POOL_MAX_SIZE = 4
+
+# Default seconds an idle snapshot above the minimum is kept
+DEFAULT_POOL_IDLE_TIMEOUT = 600.0
+
+Snapshot = Dict[str, Any]
+
+
+class SnapshotPool:
+    """
+    Per-key pool of ready snapshot environments.
+    """
+
+    def __init__(
+        self,
+        provision: Callable[[str], Awaitable[Snapshot]],
+        reset: Callable[[Snapshot], Awaitable[None]],
+        destroy: Callable[[Snapshot], Awaitable[None]],
+        min_size: int = DEFAULT_POOL_MIN_SIZE,
+        max_size: int = DEFAULT_POOL_MAX_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        maintenance_interval: float = 30.0
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            provision: Coroutine creating a snapshot for a pool key
+            reset: Coroutine restoring a used snapshot to a clean state
+            destroy: Coroutine releasing a snapshot's resources
+            min_size: Warm snapshots kept per key
+            max_size: Maximum idle snapshots kept per key
+            idle_timeout: Seconds before idle snapshots above min_size are destroyed
+            maintenance_interval: Seconds between eviction passes
+        """
+        self.provision = provision
+        self.reset = reset
+        self.destroy = destroy
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.idle_timeout = idle_timeout
+        self.maintenance_interval = maintenance_interval
+
+        # Idle snapshots per key with the time they became idle, oldest first
+        self._idle: Dict[str, Deque[Tuple[Snapshot, float]]] = {}
+        self._provisioning: Dict[str, int] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+        self.hit_count = 0
+        self.miss_count = 0
+        self.evicted_count = 0
+
+    async def acquire(self, key: str) -> Tuple[Snapshot, bool]:
+        """
+        Take a ready snapshot, provisioning one if the pool is empty.
+
+        Args:
+            key: Pool key (project image)
+
+        Returns:
+            tuple: (snapshot, True if it came warm from the pool)
+        """
+        self._ensure_maintenance()
+
+        idle = self._idle.setdefault(key, deque())
+        if idle:
+            snapshot, _ = idle.pop()
+            self.hit_count += 1
+            self._schedule_replenish(key)
+            return snapshot, True
+
+        self.miss_count += 1
+        self._schedule_replenish(key)
+        return await self.provision(key), False
+
+    async def release(self, key: str, snapshot: Snapshot) -> bool:
+        """
+        Reset a used snapshot and return it to the pool.
+
+        Snapshots that fail to reset, or that would exceed max_size, are destroyed.
+
+        Args:
+            key: Pool key the snapshot was acquired for
+            snapshot: Snapshot to return
+
+        Returns:
+            bool: True if the snapshot was returned to the pool
+        """
+        idle = self._idle.setdefault(key, deque())
+
+        if len(idle) < self.max_size:
+            try:
+                await self.reset(snapshot)
+            except Exception as e:
+                logger.warning(f"Failed to reset snapshot {snapshot.get('snapshot_id')}, destroying: {e}")
+            else:
+                if len(idle) < self.max_size:
+                    idle.append((snapshot, time.monotonic()))
+                    return True
+
+        await self._destroy_safely(snapshot)
+        return False
+
+    async def warm(self, key: str):
+        """
+        Provision snapshots for a key up to the minimum size.
+
+        Args:
+            key: Pool key (project image)
+        """
+        await self._replenish(key)
+
+    async def evict_idle(self) -> int:
+        """
+        Destroy snapshots idle longer than the timeout, keeping min_size per key.
+
+        Returns:
+            int: Number of snapshots destroyed
+        """
+        now = time.monotonic()
+        expired = []
+
+        for idle in self._idle.values():
+            while len(idle) > self.min_size and now - idle[0][1] > self.idle_timeout:
+                expired.append(idle.popleft()[0])
+
+        for snapshot in expired:
+            await self._destroy_safely(snapshot)
+
+        self.evicted_count += len(expired)
+        return len(expired)
+
+    async def close(self):
+        """Stop background work and destroy all idle snapshots"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+
+        for task in list(self._background_tasks):
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+        snapshots = [snapshot for idle in self._idle.values() for snapshot, _ in idle]
+        self._idle.clear()
+        await asyncio.gather(*(self._destroy_safely(snapshot) for snapshot in snapshots))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "idle": {key: len(idle) for key, idle in self._idle.items()},
+            "provisioning": dict(self._provisioning),
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+            "evicted": self.evicted_count,
+        }
+
+    def _schedule_replenish(self, key: str):
+        """Refill a key's pool in the background."""
+        task = asyncio.create_task(self._replenish(key))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _replenish(self, key: str):
+        """Provision snapshots until idle plus in-flight reaches min_size."""
+        idle = self._idle.setdefault(key, deque())
+        missing = self.min_size - len(idle) - self._provisioning.get(key, 0)
+        if missing <= 0:
+            return
+
+        self._provisioning[key] = self._provisioning.get(key, 0) + missing
+        try:
+            results = await asyncio.gather(
+                *(self.provision(key) for _ in range(missing)), return_exceptions=True
+            )
+        finally:
+            self._provisioning[key] -= missing
+
+        for snapshot in results:
+            if isinstance(snapshot, BaseException):
+                logger.error(f"Failed to provision warm snapshot for {key}: {snapshot}")
+            elif len(idle) < self.max_size:
+                idle.append((snapshot, time.monotonic()))
+            else:
+                await self._destroy_safely(snapshot)
+
+    def _ensure_maintenance(self):
+        """Start the idle eviction loop on first use."""
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def _maintain(self):
+        """Periodically evict idle snapshots."""
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Snapshot pool maintenance failed: {e}")
+
+    async def _destroy_safely(self, snapshot: Snapshot):
+        """Destroy a snapshot, logging failures."""
+        try:
+            await self.destroy(snapshot)
+        except Exception as e:
+            logger.error(f"Failed to destroy snapshot {snapshot.get('snapshot_id')}: {e}")
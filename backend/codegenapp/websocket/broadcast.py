@@ -0,0 +1,269 @@
+"""
+Broadcast backends for WebSocket fan-out.
+
+Decouples publishing an event from delivering it to sockets, so events
+raised in one worker process reach sockets held by any other worker.
+Each process subscribes once and hands received events to the local
+connection managers registered under a namespace.
+"""
+
+import asyncio
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Handler invoked with (target, data) for each received event
+BroadcastHandler = Callable[[str, str], Awaitable[None]]
+
+
+class BroadcastBackend(ABC):
+    """Abstract base class for broadcast backends"""
+
+    def __init__(self):
+        self._handlers: Dict[str, BroadcastHandler] = {}
+
+    def subscribe(self, namespace: str, handler: BroadcastHandler):
+        """
+        Register the local delivery handler for a namespace.
+
+        Args:
+            namespace: Namespace of the connection manager (e.g. "connections")
+            handler: Coroutine called with (target, data) for each event
+        """
+        self._handlers[namespace] = handler
+
+    def unsubscribe(self, namespace: str):
+        """Remove the local delivery handler for a namespace."""
+        self._handlers.pop(namespace, None)
+
+    async def _dispatch(self, namespace: str, target: str, data: str):
+        """Deliver an event to the local handler for its namespace."""
+        handler = self._handlers.get(namespace)
+        if handler is None:
+            return
+
+        try:
+            await handler(target, data)
+        except Exception as e:
+            logger.error(f"Error delivering broadcast {namespace}:{target}: {e}")
+
+    @abstractmethod
+    async def connect(self):
+        """Start receiving events"""
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        """Stop receiving events and release resources"""
+        pass
+
+    @abstractmethod
+    async def publish(self, namespace: str, target: str, data: str):
+        """
+        Publish an event to every process.
+
+        Args:
+            namespace: Namespace of the connection manager
+            target: Delivery target ("all" or "project:<id>")
+            data: Serialized event
+        """
+        pass
+
+    @abstractmethod
+    async def next_sequence(self, key: str) -> int:
+        """
+        Allocate the next event sequence number shared by every process.
+
+        Args:
+            key: Sequence key (e.g. "connections:<project_id>")
+
+        Returns:
+            int: Monotonically increasing sequence number
+        """
+        pass
+
+    def sequence_epoch(self, key: str) -> Optional[str]:
+        """
+        Get the epoch of the sequence number last allocated for a key.
+
+        Args:
+            key: Sequence key
+
+        Returns:
+            str or None: Epoch of numbering private to this process, None
+            while numbers come from the counter shared by every process
+        """
+        return None
+
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """Single-process backend delivering events directly to local handlers"""
+
+    def __init__(self):
+        super().__init__()
+        self._sequences: Dict[str, int] = {}
+
+    async def connect(self):
+        """Nothing to connect for in-process delivery"""
+        pass
+
+    async def disconnect(self):
+        """Nothing to release for in-process delivery"""
+        pass
+
+    async def publish(self, namespace: str, target: str, data: str):
+        """Deliver the event to this process only"""
+        await self._dispatch(namespace, target, data)
+
+    async def next_sequence(self, key: str) -> int:
+        """Allocate a sequence number from a local counter"""
+        sequence = self._sequences.get(key, 0) + 1
+        self._sequences[key] = sequence
+        return sequence
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """
+    Redis pub/sub backend for cross-process delivery.
+
+    Events are published to ``<prefix>:<namespace>:<target>`` channels and
+    a single pattern subscription per process receives events for every
+    namespace, including those published by this process.
+
+    While Redis is unreachable, events are delivered to this process only
+    and sequence numbers continue from the last shared value this process
+    saw, so broadcasts degrade instead of failing their callers. Those
+    numbers can collide with other processes', so each outage numbers a
+    key under a fresh epoch and reconnecting clients see a replay gap.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        channel_prefix: str = "codegenapp:ws",
+        reconnect_delay: float = 1.0
+    ):
+        super().__init__()
+        self.redis_url = redis_url
+        self.channel_prefix = channel_prefix
+        self.reconnect_delay = reconnect_delay
+        self._redis: Optional[aioredis.Redis] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._sequences: Dict[str, int] = {}
+        self._fallback_epochs: Dict[str, str] = {}
+
+    async def connect(self):
+        """Connect to Redis and start the subscription listener"""
+        if self._listener_task is not None:
+            return
+
+        self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        self._listener_task = asyncio.create_task(self._listen())
+        logger.info(f"Redis broadcast backend connected ({self.channel_prefix})")
+
+    async def disconnect(self):
+        """Stop the listener and close the Redis connection"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, namespace: str, target: str, data: str):
+        """Publish the event to the namespace/target channel"""
+        if self._redis is None:
+            raise RuntimeError("Redis broadcast backend is not connected")
+
+        try:
+            await self._redis.publish(f"{self.channel_prefix}:{namespace}:{target}", data)
+        except Exception as e:
+            # Other processes miss the event, but local sockets still get it
+            logger.error(f"Redis broadcast publish failed, delivering locally: {e}")
+            await self._dispatch(namespace, target, data)
+
+    async def next_sequence(self, key: str) -> int:
+        """Allocate a sequence number from a shared Redis counter"""
+        if self._redis is None:
+            raise RuntimeError("Redis broadcast backend is not connected")
+
+        try:
+            sequence = await self._redis.incr(f"{self.channel_prefix}-seq:{key}")
+            self._fallback_epochs.pop(key, None)
+        except Exception as e:
+            logger.error(f"Redis sequence allocation failed, using local counter: {e}")
+            sequence = self._sequences.get(key, 0) + 1
+            if key not in self._fallback_epochs:
+                self._fallback_epochs[key] = f"local-{uuid.uuid4().hex[:12]}"
+
+        self._sequences[key] = sequence
+        return sequence
+
+    def sequence_epoch(self, key: str) -> Optional[str]:
+        """Get the epoch of the current outage's local numbering, if any"""
+        return self._fallback_epochs.get(key)
+
+    async def _listen(self):
+        """Receive events from Redis, resubscribing after connection errors"""
+        pattern = f"{self.channel_prefix}:*"
+        prefix_length = len(self.channel_prefix) + 1
+
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(pattern)
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+
+                    namespace, _, target = message["channel"][prefix_length:].partition(":")
+                    await self._dispatch(namespace, target, message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis broadcast subscription failed: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def create_broadcast_backend(
+    backend: str = "memory",
+    redis_url: Optional[str] = None,
+    channel_prefix: str = "codegenapp:ws"
+) -> BroadcastBackend:
+    """
+    Create a broadcast backend by name.
+
+    Args:
+        backend: Backend name ("memory" or "redis")
+        redis_url: Redis URL, required for the redis backend
+        channel_prefix: Channel prefix for the redis backend
+
+    Returns:
+        BroadcastBackend: Configured backend instance
+    """
+    if backend == "memory":
+        return InMemoryBroadcastBackend()
+
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("redis_url is required for the redis broadcast backend")
+        return RedisBroadcastBackend(redis_url, channel_prefix=channel_prefix)
+
+    raise ValueError(f"Unknown broadcast backend: {backend}")
@@ -5,17 +5,38 @@ Manages WebSocket connections for real-time dashboard updates
 and project-specific notifications in the CI/CD system.
 """
 
-import json
 import asyncio
 import logging
+import time
 import uuid
-from typing import Dict, List, Set, Any, Optional
+from collections import deque
+from typing import Callable, Deque, Dict, List, Set, Any, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+
+from ..observability.metrics import set_gauge_function, websocket_send_duration, websocket_send_queue_depth
+from ..observability.tracing import traced
+from ..utils.serialization import dumps_text
+from .broadcast import BroadcastBackend
+from .event_replay import DEFAULT_REPLAY_BUFFER_SIZE, EventReplayBuffer
+from .progress_throttle import DEFAULT_PROGRESS_UPDATES_PER_SECOND, ProgressThrottle
 
 logger = logging.getLogger(__name__)
 
+# Default bound on messages waiting to be written to a single connection
+DEFAULT_SEND_QUEUE_SIZE = 256
+
+# Default time a single send may take before the client is considered dead
+DEFAULT_SEND_TIMEOUT = 10.0
+
+# Message types where only the latest queued value per entity matters
+COALESCABLE_MESSAGE_TYPES = {
+    "agent_run_progress",
+    "validation_progress",
+    "progress_update",
+}
+
 
 @dataclass
 class WebSocketMessage:
@@ -32,30 +53,206 @@ class WebSocketMessage:
             self.message_id = str(uuid.uuid4())
 
 
+class ConnectionSendQueue:
+    """
+    Bounded outgoing message queue for a single WebSocket connection.
+    
+    Messages are enqueued without touching the socket and written by a
+    dedicated writer task, so a slow client only delays its own updates.
+    Messages enqueued with a coalesce key replace a still-queued message
+    with the same key instead of growing the queue.
+    """
+    
+    def __init__(
+        self,
+        connection_id: str,
+        websocket: WebSocket,
+        on_sent: Callable[[str], None],
+        on_failed: Callable[[str], None],
+        max_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT
+    ):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.max_size = max_size
+        self.send_timeout = send_timeout
+        self._on_sent = on_sent
+        self._on_failed = on_failed
+        
+        # Pending entries are [coalesce_key, payload] so they can be updated in place
+        self._pending: Deque[List[Any]] = deque()
+        self._coalescable: Dict[str, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        
+        self.sent_count = 0
+        self.coalesced_count = 0
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def start(self):
+        """Start the writer task for this connection."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self):
+        """Stop the writer task, discarding any pending messages."""
+        self._pending.clear()
+        self._coalescable.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+    
+    def offer(self, payload: str, coalesce_key: Optional[str] = None) -> bool:
+        """
+        Enqueue a serialized message without blocking.
+        
+        Args:
+            payload: Serialized message text
+            coalesce_key: Key identifying messages that supersede each other (optional)
+            
+        Returns:
+            bool: False if the queue is full and the message was not accepted
+        """
+        if coalesce_key is not None:
+            entry = self._coalescable.get(coalesce_key)
+            if entry is not None:
+                entry[1] = payload
+                self.coalesced_count += 1
+                return True
+        
+        if len(self._pending) >= self.max_size:
+            return False
+        
+        entry = [coalesce_key, payload]
+        self._pending.append(entry)
+        if coalesce_key is not None:
+            self._coalescable[coalesce_key] = entry
+        
+        self._ready.set()
+        return True
+    
+    def extend(self, payloads: List[str]):
+        """
+        Enqueue a burst of serialized messages, ignoring the queue bound.
+        
+        Used for replays, whose size is already bounded by the replay buffer.
+        
+        Args:
+            payloads: Serialized message texts in delivery order
+        """
+        if not payloads:
+            return
+        
+        self._pending.extend([None, payload] for payload in payloads)
+        self._ready.set()
+    
+    async def _run(self):
+        """Drain the queue into the socket until stopped or a send fails."""
+        while True:
+            if not self._pending:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            
+            # Take one message at a time so later messages can still be
+            # coalesced into queued ones; each send gets the full timeout
+            coalesce_key, payload = self._pending.popleft()
+            if coalesce_key is not None:
+                self._coalescable.pop(coalesce_key, None)
+            
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(payload), timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.info(f"WebSocket send failed for {self.connection_id}: {e}")
+                self._on_failed(self.connection_id)
+                return
+            
+            self.sent_count += 1
+            websocket_send_duration.observe(time.perf_counter() - start)
+            self._on_sent(self.connection_id)
+
+
 class ConnectionManager:
     """
     WebSocket connection manager for real-time updates.
     
     Manages connections, broadcasts, and project-specific
-    communication channels for the dashboard.
+    communication channels for the dashboard. When a broadcast backend
+    is attached, broadcasts are published through it and delivered to
+    local sockets by every process subscribed to the backend.
     """
     
-    def __init__(self):
+    broadcast_namespace = "connections"
+    
+    def __init__(
+        self,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+        progress_updates_per_second: float = DEFAULT_PROGRESS_UPDATES_PER_SECOND,
+        replay_buffer_size: int = DEFAULT_REPLAY_BUFFER_SIZE
+    ):
+        self.send_queue_size = send_queue_size
+        self.send_timeout = send_timeout
+        
+        # Coalesces progress broadcasts per (project, run)
+        self.progress_throttle = ProgressThrottle(progress_updates_per_second)
+        
+        # Recent project events kept for replay to reconnecting clients
+        self.event_replay = EventReplayBuffer(replay_buffer_size)
+        
         # Active connections by connection ID
         self.active_connections: Dict[str, WebSocket] = {}
         
+        # Outgoing message queues by connection ID
+        self.send_queues: Dict[str, ConnectionSendQueue] = {}
+        
         # Project subscriptions: project_id -> set of connection IDs
         self.project_subscriptions: Dict[str, Set[str]] = {}
         
+        # Reverse index: connection_id -> set of subscribed project IDs
+        self.connection_projects: Dict[str, Set[str]] = {}
+        
         # Connection metadata: connection_id -> metadata
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
+        
+        # Connections dropped because their send queue overflowed
+        self.dropped_connections = 0
+        
+        # Socket close tasks scheduled for dropped connections
+        self._close_tasks: Set[asyncio.Task] = set()
+        
+        # Cross-process broadcast backend (optional)
+        self.broadcast_backend: Optional[BroadcastBackend] = None
+    
+    def attach_broadcast_backend(self, backend: BroadcastBackend):
+        """
+        Route broadcasts through a broadcast backend.
+        
+        Args:
+            backend: Backend delivering events to every subscribed process
+        """
+        self.broadcast_backend = backend
+        backend.subscribe(self.broadcast_namespace, self._handle_broadcast)
+    
+    def detach_broadcast_backend(self):
+        """Deliver broadcasts to local sockets only."""
+        if self.broadcast_backend is not None:
+            self.broadcast_backend.unsubscribe(self.broadcast_namespace)
+            self.broadcast_backend = None
     
     async def connect(
         self,
         websocket: WebSocket,
         connection_id: str,
         project_id: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        last_seq: Optional[int] = None,
+        epoch: Optional[str] = None
     ):
         """
         Accept a new WebSocket connection.
@@ -65,11 +262,23 @@ class ConnectionManager:
             connection_id: Unique connection identifier
             project_id: Project to subscribe to (optional)
             user_id: User ID for the connection (optional)
+            last_seq: Last project event sequence seen before reconnecting (optional)
+            epoch: Epoch sent with that event (optional)
         """
         await websocket.accept()
         
-        # Store connection
+        # Store connection and start its writer
         self.active_connections[connection_id] = websocket
+        send_queue = ConnectionSendQueue(
+            connection_id,
+            websocket,
+            on_sent=self._mark_activity,
+            on_failed=self.disconnect,
+            max_size=self.send_queue_size,
+            send_timeout=self.send_timeout
+        )
+        self.send_queues[connection_id] = send_queue
+        send_queue.start()
         
         # Store metadata
         self.connection_metadata[connection_id] = {
@@ -81,7 +290,7 @@ class ConnectionManager:
         
         # Subscribe to project if specified
         if project_id:
-            await self.subscribe_to_project(connection_id, project_id)
+            await self.subscribe_to_project(connection_id, project_id, last_seq=last_seq, epoch=epoch)
         
         # Send connection confirmation
         await self.send_personal_message(connection_id, {
@@ -101,26 +310,113 @@ class ConnectionManager:
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
         
-        # Remove from project subscriptions
-        for project_id, subscribers in self.project_subscriptions.items():
-            subscribers.discard(connection_id)
+        # Stop the writer task
+        send_queue = self.send_queues.pop(connection_id, None)
+        if send_queue is not None:
+            send_queue.stop()
+        
+        # Remove from subscribed projects only, pruning emptied project sets
+        for project_id in self.connection_projects.pop(connection_id, ()):
+            self._remove_subscriber(project_id, connection_id)
         
         # Remove metadata
         if connection_id in self.connection_metadata:
             del self.connection_metadata[connection_id]
     
-    async def subscribe_to_project(self, connection_id: str, project_id: str):
+    def disconnect_many(self, connection_ids: List[str]):
+        """
+        Remove many WebSocket connections at once.
+        
+        Connections are grouped by project first, so each affected
+        project's subscriber set is updated once with a set difference
+        rather than once per departing subscriber.
+        
+        Args:
+            connection_ids: Connection identifiers to remove
+        """
+        departing: Dict[str, Set[str]] = {}
+        for connection_id in connection_ids:
+            self.active_connections.pop(connection_id, None)
+            self.connection_metadata.pop(connection_id, None)
+            
+            send_queue = self.send_queues.pop(connection_id, None)
+            if send_queue is not None:
+                send_queue.stop()
+            
+            for project_id in self.connection_projects.pop(connection_id, ()):
+                departing.setdefault(project_id, set()).add(connection_id)
+        
+        for project_id, removed in departing.items():
+            subscribers = self.project_subscriptions.get(project_id)
+            if subscribers is None:
+                continue
+            subscribers -= removed
+            if not subscribers:
+                del self.project_subscriptions[project_id]
+        
+        if connection_ids:
+            logger.info(f"Disconnected {len(connection_ids)} WebSocket connections")
+    
+    async def disconnect_all(self, code: int = 1012):
+        """
+        Close and remove every connection, e.g. before a deploy restart.
+        
+        All sockets are closed concurrently and the subscription indexes are
+        reset wholesale instead of being unwound connection by connection.
+        
+        Args:
+            code: WebSocket close code sent to clients (1012 = service restart)
+        """
+        websockets = list(self.active_connections.values())
+        
+        for send_queue in self.send_queues.values():
+            send_queue.stop()
+        
+        self.active_connections.clear()
+        self.send_queues.clear()
+        self.project_subscriptions.clear()
+        self.connection_projects.clear()
+        self.connection_metadata.clear()
+        
+        await self._close_websockets(websockets, code=code)
+        
+        if websockets:
+            logger.info(f"Closed all {len(websockets)} WebSocket connections")
+    
+    def _remove_subscriber(self, project_id: str, connection_id: str):
+        """Remove a connection from a project's subscribers, dropping empty sets."""
+        subscribers = self.project_subscriptions.get(project_id)
+        if subscribers is None:
+            return
+        
+        subscribers.discard(connection_id)
+        if not subscribers:
+            del self.project_subscriptions[project_id]
+    
+    async def subscribe_to_project(
+        self,
+        connection_id: str,
+        project_id: str,
+        last_seq: Optional[int] = None,
+        epoch: Optional[str] = None
+    ):
         """
         Subscribe a connection to project updates.
         
         Args:
             connection_id: Connection identifier
             project_id: Project ID to subscribe to
+            last_seq: Replay buffered events after this sequence number (optional)
+            epoch: Epoch sent with the last_seq event (optional)
         """
+        if connection_id not in self.active_connections:
+            return
+        
         if project_id not in self.project_subscriptions:
             self.project_subscriptions[project_id] = set()
         
         self.project_subscriptions[project_id].add(connection_id)
+        self.connection_projects.setdefault(connection_id, set()).add(project_id)
         
         # Update connection metadata
         if connection_id in self.connection_metadata:
@@ -132,6 +428,49 @@ class ConnectionManager:
             "project_id": project_id,
             "timestamp": datetime.utcnow().isoformat()
         })
+        
+        if last_seq is not None:
+            self.replay_events(connection_id, project_id, last_seq, epoch)
+    
+    def replay_events(
+        self,
+        connection_id: str,
+        project_id: str,
+        last_seq: int,
+        epoch: Optional[str] = None
+    ) -> int:
+        """
+        Replay buffered project events a connection missed.
+        
+        If some events already fell out of the buffer, or the sequence
+        numbering restarted since last_seq, a ``replay_gap`` message is
+        sent first so the client can resynchronize over REST.
+        
+        Args:
+            connection_id: Connection identifier
+            project_id: Project ID to replay events for
+            last_seq: Last sequence number the client received
+            epoch: Epoch sent with that event (optional)
+            
+        Returns:
+            int: Number of events replayed
+        """
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
+            return 0
+        
+        events, complete = self.event_replay.events_since(project_id, last_seq, epoch)
+        
+        if not complete:
+            send_queue.extend([dumps_text({
+                "type": "replay_gap",
+                "project_id": project_id,
+                "last_seq": last_seq,
+                "timestamp": datetime.utcnow().isoformat()
+            })])
+        
+        send_queue.extend(events)
+        return len(events)
     
     async def unsubscribe_from_project(self, connection_id: str, project_id: str):
         """
@@ -141,8 +480,11 @@ class ConnectionManager:
             connection_id: Connection identifier
             project_id: Project ID to unsubscribe from
         """
-        if project_id in self.project_subscriptions:
-            self.project_subscriptions[project_id].discard(connection_id)
+        self._remove_subscriber(project_id, connection_id)
+        
+        subscribed_projects = self.connection_projects.get(connection_id)
+        if subscribed_projects is not None:
+            subscribed_projects.discard(project_id)
         
         # Send unsubscription confirmation
         await self.send_personal_message(connection_id, {
@@ -159,57 +501,48 @@ class ConnectionManager:
             connection_id: Target connection identifier
             message: Message to send
         """
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
-            try:
-                await websocket.send_text(json.dumps(message))
-                
-                # Update last activity
-                if connection_id in self.connection_metadata:
-                    self.connection_metadata[connection_id]["last_activity"] = datetime.utcnow().isoformat()
-                    
-            except Exception as e:
-                # Connection might be closed, remove it
-                self.disconnect(connection_id)
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
+            return
+        
+        if not send_queue.offer(dumps_text(message), self._coalesce_key(message)):
+            self._drop_slow_connections([connection_id])
     
+    @traced("websocket.broadcast_to_project", component="websocket")
     async def broadcast_to_project(self, project_id: str, message: Dict[str, Any]):
         """
         Broadcast a message to all connections subscribed to a project.
         
+        The message is serialized once and enqueued on each subscriber's
+        send queue; delivery happens on the per-connection writer tasks.
+        
         Args:
             project_id: Project ID to broadcast to
             message: Message to broadcast
         """
-        if project_id not in self.project_subscriptions:
-            return
+        if isinstance(message, WebSocketMessage):
+            message = asdict(message)
         
-        # Add timestamp to message
+        # Add timestamp and replay sequence number to message
         message["timestamp"] = datetime.utcnow().isoformat()
-        message_json = json.dumps(message)
-        
-        # Get subscribers
-        subscribers = self.project_subscriptions[project_id].copy()
+        message["seq"] = await self._next_sequence(project_id)
+        epoch = self._sequence_epoch(project_id)
+        if epoch is not None:
+            message["epoch"] = epoch
+        message_json = dumps_text(message)
+        coalesce_key = self._coalesce_key(message)
+        
+        if self.broadcast_backend is not None:
+            await self.broadcast_backend.publish(
+                self.broadcast_namespace,
+                f"project:{project_id}",
+                self._frame_broadcast(message_json, coalesce_key, message["seq"])
+            )
+            return
         
-        # Send to all subscribers
-        disconnected_connections = []
-        for connection_id in subscribers:
-            if connection_id in self.active_connections:
-                websocket = self.active_connections[connection_id]
-                try:
-                    await websocket.send_text(message_json)
-                    
-                    # Update last activity
-                    if connection_id in self.connection_metadata:
-                        self.connection_metadata[connection_id]["last_activity"] = datetime.utcnow().isoformat()
-                        
-                except Exception as e:
-                    # Connection might be closed, mark for removal
-                    disconnected_connections.append(connection_id)
-        
-        # Clean up disconnected connections
-        for connection_id in disconnected_connections:
-            self.disconnect(connection_id)
+        self._deliver_project_event(project_id, message["seq"], message_json, coalesce_key)
     
+    @traced("websocket.broadcast_to_all", component="websocket")
     async def broadcast_to_all(self, message: Dict[str, Any]):
         """
         Broadcast a message to all active connections.
@@ -217,31 +550,192 @@ class ConnectionManager:
         Args:
             message: Message to broadcast
         """
+        if isinstance(message, WebSocketMessage):
+            message = asdict(message)
+        
         # Add timestamp to message
         message["timestamp"] = datetime.utcnow().isoformat()
-        message_json = json.dumps(message)
+        message_json = dumps_text(message)
+        coalesce_key = self._coalesce_key(message)
+        
+        if self.broadcast_backend is not None:
+            await self.broadcast_backend.publish(
+                self.broadcast_namespace,
+                "all",
+                self._frame_broadcast(message_json, coalesce_key)
+            )
+            return
+        
+        self._fan_out_to_all(message_json, coalesce_key)
+    
+    async def broadcast_progress(self, project_id: str, entity_id: str, message: Dict[str, Any]):
+        """
+        Broadcast a progress update, throttled per project and run.
+        
+        Intermediate updates within the throttle interval are coalesced
+        and only the latest is serialized and sent.
+        
+        Args:
+            project_id: Project ID to broadcast to
+            entity_id: Run or pipeline the progress belongs to
+            message: Progress message
+        """
+        await self.progress_throttle.submit(
+            (project_id, entity_id),
+            message,
+            lambda latest: self.broadcast_to_project(project_id, latest)
+        )
+    
+    def finish_progress(self, project_id: str, entity_id: str):
+        """
+        Discard buffered progress before a terminal event is broadcast.
+        
+        Args:
+            project_id: Project ID of the run
+            entity_id: Run or pipeline that reached a terminal state
+        """
+        self.progress_throttle.finish((project_id, entity_id))
+    
+    async def _next_sequence(self, project_id: str) -> int:
+        """Allocate the next replay sequence number for a project."""
+        if self.broadcast_backend is not None:
+            return await self.broadcast_backend.next_sequence(
+                f"{self.broadcast_namespace}:{project_id}"
+            )
+        
+        return self.event_replay.next_sequence(project_id)
+    
+    def _sequence_epoch(self, project_id: str) -> Optional[str]:
+        """Get the epoch of the project's latest sequence number, if numbering is not shared."""
+        if self.broadcast_backend is None:
+            # Local numbering restarts with the process
+            return self.event_replay.epoch(project_id)
+        
+        # Shared counters have no epoch, except while a backend numbers locally
+        epoch = self.broadcast_backend.sequence_epoch(f"{self.broadcast_namespace}:{project_id}")
+        self.event_replay.set_epoch(project_id, epoch)
+        return epoch
+    
+    def _deliver_project_event(
+        self,
+        project_id: str,
+        sequence: int,
+        message_json: str,
+        coalesce_key: Optional[str]
+    ):
+        """Buffer a project event for replay and enqueue it for local subscribers."""
+        self.event_replay.record(project_id, sequence, message_json, coalesce_key)
+        self._fan_out_to_project(project_id, message_json, coalesce_key)
+    
+    def _fan_out_to_project(self, project_id: str, message_json: str, coalesce_key: Optional[str]):
+        """Enqueue a serialized message for local subscribers of a project."""
+        subscribers = self.project_subscriptions.get(project_id)
+        if not subscribers:
+            return
+        
+        overflowed_connections = []
+        for connection_id in subscribers:
+            send_queue = self.send_queues.get(connection_id)
+            if send_queue is not None and not send_queue.offer(message_json, coalesce_key):
+                overflowed_connections.append(connection_id)
+        
+        self._drop_slow_connections(overflowed_connections)
+    
+    def _fan_out_to_all(self, message_json: str, coalesce_key: Optional[str]):
+        """Enqueue a serialized message for every local connection."""
+        overflowed_connections = [
+            connection_id
+            for connection_id, send_queue in self.send_queues.items()
+            if not send_queue.offer(message_json, coalesce_key)
+        ]
+        
+        self._drop_slow_connections(overflowed_connections)
+    
+    def _frame_broadcast(
+        self,
+        message_json: str,
+        coalesce_key: Optional[str],
+        sequence: Optional[int] = None
+    ) -> str:
+        """Prefix a serialized message with its coalesce key and sequence for the backend."""
+        # Serialized JSON never contains a raw newline, so it can delimit the header
+        return f"{coalesce_key or ''}\n{sequence or ''}\n{message_json}"
+    
+    async def _handle_broadcast(self, target: str, data: str):
+        """
+        Deliver an event received from the broadcast backend to local sockets.
+        
+        Args:
+            target: Delivery target ("all" or "project:<id>")
+            data: Framed serialized message
+        """
+        coalesce_key, sequence, message_json = data.split("\n", 2)
+        coalesce_key = coalesce_key or None
+        
+        if target == "all":
+            self._fan_out_to_all(message_json, coalesce_key)
+        elif target.startswith("project:"):
+            self._deliver_project_event(
+                target[len("project:"):], int(sequence), message_json, coalesce_key
+            )
+    
+    def _coalesce_key(self, message: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the key under which queued copies of a message may be merged.
+        
+        Only progress-style messages coalesce; the latest value per run,
+        pipeline or task supersedes any value still waiting to be sent.
+        """
+        message_type = message.get("type")
+        if message_type not in COALESCABLE_MESSAGE_TYPES:
+            return None
+        
+        entity_id = message.get("run_id") or message.get("pipeline_id") or message.get("task_id")
+        if entity_id is None:
+            return None
         
-        # Get all active connections
-        connection_ids = list(self.active_connections.keys())
+        return f"{message_type}:{entity_id}"
+    
+    def _mark_activity(self, connection_id: str):
+        """Record a successful send on a connection."""
+        metadata = self.connection_metadata.get(connection_id)
+        if metadata is not None:
+            metadata["last_activity"] = datetime.utcnow().isoformat()
+    
+    def _drop_slow_connections(self, connection_ids: List[str]):
+        """
+        Disconnect clients whose send queue overflowed.
         
-        # Send to all connections
-        disconnected_connections = []
+        Args:
+            connection_ids: Connections to drop
+        """
+        websockets = []
         for connection_id in connection_ids:
-            websocket = self.active_connections[connection_id]
+            websocket = self.active_connections.get(connection_id)
+            if websocket is None:
+                continue
+            
+            logger.warning(f"Dropping slow WebSocket connection {connection_id}: send queue full")
+            self.dropped_connections += 1
+            self.disconnect(connection_id)
+            websockets.append(websocket)
+        
+        if not websockets:
+            return
+        
+        task = asyncio.create_task(self._close_websockets(websockets, code=1013))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+    
+    async def _close_websockets(self, websockets: List[WebSocket], code: int = 1000):
+        """Close sockets concurrently, ignoring errors from already-dead peers."""
+        async def close(websocket: WebSocket):
             try:
-                await websocket.send_text(message_json)
-                
-                # Update last activity
-                if connection_id in self.connection_metadata:
-                    self.connection_metadata[connection_id]["last_activity"] = datetime.utcnow().isoformat()
-                    
-            except Exception as e:
-                # Connection might be closed, mark for removal
-                disconnected_connections.append(connection_id)
+                await websocket.close(code=code)
+            except Exception:
+                pass
         
-        # Clean up disconnected connections
-        for connection_id in disconnected_connections:
-            self.disconnect(connection_id)
+        await asyncio.gather(*(close(websocket) for websocket in websockets))
     
     async def handle_message(self, connection_id: str, message: Dict[str, Any]):
         """
@@ -256,7 +750,9 @@ class ConnectionManager:
         if message_type == "subscribe_project":
             project_id = message.get("project_id")
             if project_id:
-                await self.subscribe_to_project(connection_id, project_id)
+                await self.subscribe_to_project(
+                    connection_id, project_id, last_seq=message.get("last_seq"), epoch=message.get("epoch")
+                )
         
         elif message_type == "unsubscribe_project":
             project_id = message.get("project_id")
@@ -288,6 +784,10 @@ class ConnectionManager:
         """
         return {
             "total_connections": len(self.active_connections),
+            "queued_messages": sum(len(queue) for queue in self.send_queues.values()),
+            "dropped_connections": self.dropped_connections,
+            "progress_throttle": self.progress_throttle.get_stats(),
+            "event_replay": self.event_replay.get_stats(),
             "project_subscriptions": {
                 project_id: len(subscribers)
                 for project_id, subscribers in self.project_subscriptions.items()
@@ -321,15 +821,22 @@ class ConnectionManager:
             if last_activity < cutoff_time:
                 stale_connections.append(connection_id)
         
-        # Disconnect stale connections
-        for connection_id in stale_connections:
-            if connection_id in self.active_connections:
-                try:
-                    await self.active_connections[connection_id].close()
-                except:
-                    pass
-            self.disconnect(connection_id)
+        # Disconnect stale connections, closing their sockets concurrently
+        stale_websockets = [
+            self.active_connections[connection_id]
+            for connection_id in stale_connections
+            if connection_id in self.active_connections
+        ]
+        self.disconnect_many(stale_connections)
+        
+        await self._close_websockets(stale_websockets)
 
 
 # Global connection manager instance
 connection_manager = ConnectionManager()
+
+# Queue depth is summed only when metrics are scraped
+set_gauge_function(
+    websocket_send_queue_depth,
+    lambda: sum(len(send_queue) for send_queue in connection_manager.send_queues.values())
+)
@@ -0,0 +1,176 @@
+"""
+Event replay buffer for WebSocket reconnects.
+
+Keeps a bounded ring buffer of recent project events tagged with
+monotonically increasing sequence numbers, so a reconnecting client can
+ask for everything after the last sequence it saw instead of falling
+back to polling the REST endpoints.
+
+Locally allocated sequences restart at 1 after a process restart or
+when a project is evicted, so each project's numbering carries an
+epoch. A client presenting a sequence from another epoch, or one ahead
+of the current sequence, is told its replay is incomplete.
+"""
+
+import logging
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default number of events retained per project
+DEFAULT_REPLAY_BUFFER_SIZE = 500
+
+# Default number of projects with retained events
+DEFAULT_REPLAY_MAX_PROJECTS = 1000
+
+# Buffered event: (sequence, coalesce_key, serialized message)
+ReplayEvent = Tuple[int, Optional[str], str]
+
+
+class EventReplayBuffer:
+    """
+    Per-project ring buffers of serialized events.
+
+    Project buffers are evicted least-recently-used once more than
+    ``max_projects`` projects have buffered events.
+    """
+
+    def __init__(
+        self,
+        max_events_per_project: int = DEFAULT_REPLAY_BUFFER_SIZE,
+        max_projects: int = DEFAULT_REPLAY_MAX_PROJECTS
+    ):
+        self.max_events_per_project = max_events_per_project
+        self.max_projects = max_projects
+        self._buffers: "OrderedDict[str, Deque[ReplayEvent]]" = OrderedDict()
+        self._sequences: Dict[str, int] = {}
+        self._epochs: Dict[str, str] = {}
+
+    def epoch(self, project_id: str) -> str:
+        """
+        Get the epoch of a project's sequence numbers.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            str: Epoch, new whenever the project's numbering starts over
+        """
+        epoch = self._epochs.get(project_id)
+        if epoch is None:
+            epoch = self._epochs[project_id] = uuid.uuid4().hex[:12]
+        return epoch
+
+    def set_epoch(self, project_id: str, epoch: Optional[str]):
+        """
+        Adopt the epoch of sequence numbers allocated by a broadcast backend.
+
+        Args:
+            project_id: Project ID
+            epoch: Epoch of the latest sequence number, None for shared numbering
+        """
+        if epoch is None:
+            self._epochs.pop(project_id, None)
+        else:
+            self._epochs[project_id] = epoch
+
+    def next_sequence(self, project_id: str) -> int:
+        """
+        Allocate the next local sequence number for a project.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            int: Sequence number, starting at 1
+        """
+        sequence = self._sequences.get(project_id, 0) + 1
+        self._sequences[project_id] = sequence
+        return sequence
+
+    def record(self, project_id: str, sequence: int, message_json: str, coalesce_key: Optional[str] = None):
+        """
+        Buffer a serialized event.
+
+        Args:
+            project_id: Project the event was broadcast to
+            sequence: Sequence number embedded in the event
+            message_json: Serialized event
+            coalesce_key: Key of events that supersede each other (optional)
+        """
+        buffer = self._buffers.get(project_id)
+        if buffer is None:
+            buffer = deque(maxlen=self.max_events_per_project)
+            self._buffers[project_id] = buffer
+
+            if len(self._buffers) > self.max_projects:
+                evicted_project_id, _ = self._buffers.popitem(last=False)
+                self._sequences.pop(evicted_project_id, None)
+                self._epochs.pop(evicted_project_id, None)
+        else:
+            self._buffers.move_to_end(project_id)
+
+        buffer.append((sequence, coalesce_key, message_json))
+
+        # Keep the local counter ahead of sequences allocated elsewhere
+        if sequence > self._sequences.get(project_id, 0):
+            self._sequences[project_id] = sequence
+
+    def events_since(
+        self,
+        project_id: str,
+        last_seq: int,
+        epoch: Optional[str] = None
+    ) -> Tuple[List[str], bool]:
+        """
+        Get buffered events newer than a sequence number.
+
+        Progress events superseded by a later event with the same coalesce
+        key are skipped, since only the latest value matters. A sequence
+        from another epoch, or ahead of the current one, was numbered
+        before the project's numbering restarted: every buffered event is
+        returned and the replay is reported incomplete.
+
+        Args:
+            project_id: Project ID
+            last_seq: Last sequence number the client received
+            epoch: Epoch of last_seq, as sent with the events (optional)
+
+        Returns:
+            tuple: (serialized events in order, False if events were missed
+            because they already fell out of the buffer or the numbering
+            restarted)
+        """
+        current = self._sequences.get(project_id, 0)
+        restarted = last_seq > current or (epoch is not None and epoch != self._epochs.get(project_id))
+        if restarted:
+            last_seq = 0
+
+        buffer = self._buffers.get(project_id)
+        if not buffer:
+            return [], not restarted and last_seq == current
+
+        missed = [event for event in buffer if event[0] > last_seq]
+        complete = not restarted and buffer[0][0] <= last_seq + 1
+
+        latest_by_key: Dict[str, int] = {}
+        for sequence, coalesce_key, _ in missed:
+            if coalesce_key is not None:
+                latest_by_key[coalesce_key] = sequence
+
+        events = [
+            message_json
+            for sequence, coalesce_key, message_json in missed
+            if coalesce_key is None or latest_by_key[coalesce_key] == sequence
+        ]
+
+        return events, complete
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get replay buffer statistics"""
+        return {
+            "buffered_projects": len(self._buffers),
+            "buffered_events": sum(len(buffer) for buffer in self._buffers.values()),
+        }
@@ -5,19 +5,35 @@ This module manages WebSocket connections for real-time updates
 and notifications to connected clients.
 """
 
+import asyncio
 import logging
-import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Set
 from fastapi import WebSocket
 from datetime import datetime
 
+from codegenapp.observability.tracing import traced
+from codegenapp.utils.serialization import dumps_text
+from codegenapp.websocket.broadcast import BroadcastBackend
+from codegenapp.websocket.progress_throttle import ProgressThrottle
+
 logger = logging.getLogger(__name__)
 
+# Progress statuses that end a task and bypass throttling
+TERMINAL_PROGRESS_STATUSES = {"completed", "failed", "cancelled"}
+
+# Default time a single send may take before the client is considered dead
+DEFAULT_SEND_TIMEOUT = 10.0
+
 
 class WebSocketManager:
     """Manager for WebSocket connections and real-time messaging"""
     
-    def __init__(self):
+    broadcast_namespace = "websocket"
+    
+    def __init__(self, send_timeout: float = DEFAULT_SEND_TIMEOUT):
+        # Time a broadcast waits on one connection before dropping it
+        self.send_timeout = send_timeout
+        
         # Store active connections
         self.active_connections: List[WebSocket] = []
         
@@ -26,6 +42,31 @@ class WebSocketManager:
         
         # Store connection metadata
         self.connection_metadata: Dict[WebSocket, Dict[str, Any]] = {}
+        
+        # Cross-process broadcast backend (optional)
+        self.broadcast_backend: Optional[BroadcastBackend] = None
+        
+        # Coalesces progress updates per (project, task)
+        self.progress_throttle = ProgressThrottle()
+        
+        # Socket close tasks scheduled for dropped connections
+        self._close_tasks: Set[asyncio.Task] = set()
+    
+    def attach_broadcast_backend(self, backend: BroadcastBackend) -> None:
+        """
+        Route broadcasts through a broadcast backend
+        
+        Args:
+            backend: Backend delivering events to every subscribed process
+        """
+        self.broadcast_backend = backend
+        backend.subscribe(self.broadcast_namespace, self._handle_broadcast)
+    
+    def detach_broadcast_backend(self) -> None:
+        """Deliver broadcasts to local connections only"""
+        if self.broadcast_backend is not None:
+            self.broadcast_backend.unsubscribe(self.broadcast_namespace)
+            self.broadcast_backend = None
     
     async def connect(self, websocket: WebSocket, project_name: Optional[str] = None) -> None:
         """
@@ -106,12 +147,13 @@ class WebSocketManager:
             message: Message to send
         """
         try:
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(dumps_text(message))
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
             # Remove broken connection
             self.disconnect(websocket)
     
+    @traced("websocket.broadcast_message", component="websocket")
     async def broadcast_message(self, message: Dict[str, Any]) -> None:
         """
         Broadcast a message to all connected clients
@@ -119,26 +161,15 @@ class WebSocketManager:
         Args:
             message: Message to broadcast
         """
-        if not self.active_connections:
-            logger.debug("No active connections to broadcast to")
-            return
-        
-        logger.info(f"Broadcasting message to {len(self.active_connections)} connections")
-        
-        # Send to all connections
-        disconnected_connections = []
+        payload = dumps_text(message)
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to connection: {e}")
-                disconnected_connections.append(connection)
+        if self.broadcast_backend is not None:
+            await self.broadcast_backend.publish(self.broadcast_namespace, "all", payload)
+            return
         
-        # Clean up disconnected connections
-        for connection in disconnected_connections:
-            self.disconnect(connection)
+        await self._deliver_to_all(payload)
     
+    @traced("websocket.broadcast_to_project", component="websocket")
     async def broadcast_to_project(self, project_name: str, message: Dict[str, Any]) -> None:
         """
         Broadcast a message to all clients connected to a specific project
@@ -147,26 +178,125 @@ class WebSocketManager:
             project_name: Name of the project
             message: Message to broadcast
         """
+        payload = dumps_text(message)
+        
+        if self.broadcast_backend is not None:
+            await self.broadcast_backend.publish(
+                self.broadcast_namespace, f"project:{project_name}", payload
+            )
+            return
+        
+        await self._deliver_to_project(project_name, payload)
+    
+    async def _handle_broadcast(self, target: str, payload: str) -> None:
+        """
+        Deliver an event received from the broadcast backend to local connections
+        
+        Args:
+            target: Delivery target ("all" or "project:<name>")
+            payload: Serialized message
+        """
+        if target == "all":
+            await self._deliver_to_all(payload)
+        elif target.startswith("project:"):
+            await self._deliver_to_project(target[len("project:"):], payload)
+    
+    async def _deliver_to_all(self, payload: str) -> None:
+        """Send a serialized message to every local connection"""
+        if not self.active_connections:
+            logger.debug("No active connections to broadcast to")
+            return
+        
+        logger.info(f"Broadcasting message to {len(self.active_connections)} connections")
+        await self._fan_out(self.active_connections, payload)
+    
+    async def _deliver_to_project(self, project_name: str, payload: str) -> None:
+        """Send a serialized message to local connections of a project"""
         if project_name not in self.project_connections:
             logger.debug(f"No connections for project: {project_name}")
             return
         
         connections = self.project_connections[project_name]
         logger.info(f"Broadcasting to project '{project_name}' ({len(connections)} connections)")
+        await self._fan_out(connections, payload)
+    
+    async def _fan_out(self, connections: List[WebSocket], payload: str) -> None:
+        """
+        Send a serialized message to connections concurrently
+        
+        Each send is bounded by the send timeout, so a broadcast takes as
+        long as the slowest healthy client. Connections that fail or time
+        out are dropped together once every send has finished.
+        
+        Args:
+            connections: Target connections
+            payload: Serialized message
+        """
+        # Snapshot, since connects and disconnects can happen while sends are pending
+        connections = list(connections)
+        
+        results = await asyncio.gather(
+            *(asyncio.wait_for(connection.send_text(payload), timeout=self.send_timeout) for connection in connections),
+            return_exceptions=True
+        )
+        
+        dead_connections = []
+        for connection, result in zip(connections, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"Dropping WebSocket connection: send timed out after {self.send_timeout}s")
+                dead_connections.append(connection)
+            elif isinstance(result, Exception):
+                logger.error(f"Error broadcasting to connection: {result}")
+                dead_connections.append(connection)
+        
+        self._drop_connections(dead_connections)
+    
+    def _drop_connections(self, websockets: Iterable[WebSocket]) -> None:
+        """
+        Remove failed connections in one pass and close them in the background
         
-        # Send to project-specific connections
-        disconnected_connections = []
+        Args:
+            websockets: Connections to drop
+        """
+        dead = set(websockets)
+        if not dead:
+            return
+        
+        self.active_connections = [ws for ws in self.active_connections if ws not in dead]
         
-        for connection in connections:
+        # Only the lists of projects the dead connections belonged to change
+        affected_projects = set()
+        for websocket in dead:
+            metadata = self.connection_metadata.pop(websocket, None)
+            if metadata and metadata.get("project_name"):
+                affected_projects.add(metadata["project_name"])
+        
+        for project_name in affected_projects:
+            if project_name not in self.project_connections:
+                continue
+            remaining = [ws for ws in self.project_connections[project_name] if ws not in dead]
+            if remaining:
+                self.project_connections[project_name] = remaining
+            else:
+                del self.project_connections[project_name]
+        
+        logger.info(f"Dropped {len(dead)} WebSocket connections. Total connections: {len(self.active_connections)}")
+        
+        task = asyncio.create_task(self._close_websockets(dead))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+    
+    async def _close_websockets(self, websockets: Iterable[WebSocket]) -> None:
+        """Close sockets concurrently, ignoring errors from already-dead peers"""
+        async def close(websocket: WebSocket) -> None:
             try:
-                await connection.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to project connection: {e}")
-                disconnected_connections.append(connection)
+                await websocket.close()
+            except Exception:
+                pass
         
-        # Clean up disconnected connections
-        for connection in disconnected_connections:
-            self.disconnect(connection)
+        await asyncio.gather(*(close(websocket) for websocket in websockets))
     
     async def send_notification(
         self, 
@@ -208,6 +338,9 @@ class WebSocketManager:
         """
         Send a progress update for a long-running task
         
+        Running updates are throttled per project and task, keeping only the
+        latest value; terminal statuses are sent immediately.
+        
         Args:
             task_id: Unique identifier for the task
             progress: Progress percentage (0-100)
@@ -224,10 +357,20 @@ class WebSocketManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        if project_name:
-            await self.broadcast_to_project(project_name, progress_update)
-        else:
-            await self.broadcast_message(progress_update)
+        async def send_latest(latest: Dict[str, Any]) -> None:
+            if project_name:
+                await self.broadcast_to_project(project_name, latest)
+            else:
+                await self.broadcast_message(latest)
+        
+        throttle_key = (project_name, task_id)
+        
+        if status in TERMINAL_PROGRESS_STATUSES:
+            self.progress_throttle.finish(throttle_key)
+            await send_latest(progress_update)
+            return
+        
+        await self.progress_throttle.submit(throttle_key, progress_update, send_latest)
     
     def get_connection_stats(self) -> Dict[str, Any]:
         """
@@ -61,7 +61,7 @@ class NotificationService:
                                       progress: float,
                                       current_step: Optional[str] = None,
                                       user_id: Optional[str] = None):
-        """Notify agent run progress update"""
+        """Notify agent run progress update, throttled per project and run"""
         message = WebSocketMessage(
             type=NotificationType.AGENT_RUN_PROGRESS.value,
             data={
@@ -73,10 +73,15 @@ class NotificationService:
             }
         )
         
-        await self.connection_manager.broadcast_to_project(project_id, message)
+        async def send_latest(latest: WebSocketMessage):
+            await self.connection_manager.broadcast_to_project(project_id, latest)
+            
+            if user_id:
+                await self.connection_manager.send_to_user(user_id, latest)
         
-        if user_id:
-            await self.connection_manager.send_to_user(user_id, message)
+        await self.connection_manager.progress_throttle.submit(
+            (project_id, run_id), message, send_latest
+        )
     
     async def notify_agent_run_completed(self, 
                                        project_id: str, 
@@ -84,6 +89,8 @@ class NotificationService:
                                        result: Dict[str, Any],
                                        user_id: Optional[str] = None):
         """Notify that an agent run has completed"""
+        self.connection_manager.finish_progress(project_id, run_id)
+        
         message = WebSocketMessage(
             type=NotificationType.AGENT_RUN_COMPLETED.value,
             data={
@@ -107,6 +114,8 @@ class NotificationService:
                                     error: str,
                                     user_id: Optional[str] = None):
         """Notify that an agent run has failed"""
+        self.connection_manager.finish_progress(project_id, run_id)
+        
         message = WebSocketMessage(
             type=NotificationType.AGENT_RUN_FAILED.value,
             data={
@@ -0,0 +1,132 @@
+"""
+Progress update throttling for real-time notifications.
+
+Coalesces chatty progress updates per key (typically project and run)
+so clients receive at most a fixed number of updates per second, always
+ending with the latest value.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default maximum progress updates sent per key per second
+DEFAULT_PROGRESS_UPDATES_PER_SECOND = 4.0
+
+ProgressSender = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class ProgressThrottle:
+    """
+    Per-key coalescing buffer for progress updates.
+
+    The first update for a key is sent immediately. Updates arriving
+    within the throttle interval replace each other in the buffer and
+    only the latest is sent when the interval elapses. Terminal events
+    should call ``finish`` first so no buffered progress follows them.
+    """
+
+    def __init__(self, max_updates_per_second: float = DEFAULT_PROGRESS_UPDATES_PER_SECOND):
+        self.interval = 1.0 / max_updates_per_second
+        # Send time per key, oldest first; entries older than the interval are expired
+        self._last_sent: Dict[Hashable, float] = {}
+        self._pending: Dict[Hashable, Tuple[Dict[str, Any], ProgressSender]] = {}
+        self._flush_tasks: Dict[Hashable, asyncio.Task] = {}
+
+        self.sent_count = 0
+        self.coalesced_count = 0
+
+    async def submit(self, key: Hashable, message: Dict[str, Any], send: ProgressSender):
+        """
+        Send or buffer a progress update.
+
+        Args:
+            key: Throttle key, e.g. (project_id, run_id)
+            message: Progress message
+            send: Coroutine function delivering the message
+        """
+        now = asyncio.get_running_loop().time()
+        self._expire(now)
+        last_sent = self._last_sent.get(key)
+
+        if key not in self._pending and last_sent is None:
+            self._mark_sent(key, now)
+            self.sent_count += 1
+            await send(message)
+            return
+
+        if key in self._pending:
+            self.coalesced_count += 1
+        self._pending[key] = (message, send)
+
+        if key not in self._flush_tasks:
+            delay = max(0.0, last_sent + self.interval - now) if last_sent is not None else 0.0
+            self._flush_tasks[key] = asyncio.create_task(self._flush_later(key, delay))
+
+    def finish(self, key: Hashable):
+        """
+        Drop buffered progress and throttle state for a finished key.
+
+        Args:
+            key: Throttle key whose run has reached a terminal state
+        """
+        self._pending.pop(key, None)
+        self._last_sent.pop(key, None)
+
+        flush_task = self._flush_tasks.pop(key, None)
+        if flush_task is not None and flush_task is not asyncio.current_task():
+            flush_task.cancel()
+
+    async def close(self):
+        """Cancel all pending flushes."""
+        for flush_task in self._flush_tasks.values():
+            flush_task.cancel()
+
+        self._flush_tasks.clear()
+        self._pending.clear()
+        self._last_sent.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get throttle statistics"""
+        return {
+            "tracked_keys": len(self._last_sent),
+            "pending_updates": len(self._pending),
+            "sent_updates": self.sent_count,
+            "coalesced_updates": self.coalesced_count,
+        }
+
+    def _mark_sent(self, key: Hashable, now: float):
+        """Record a send, moving the key to the end of the send-time order."""
+        self._last_sent.pop(key, None)
+        self._last_sent[key] = now
+
+    def _expire(self, now: float):
+        """Forget keys whose last send is older than the interval."""
+        while self._last_sent:
+            key, last_sent = next(iter(self._last_sent.items()))
+            if now - last_sent < self.interval:
+                break
+            del self._last_sent[key]
+
+    async def _flush_later(self, key: Hashable, delay: float):
+        """Send the latest buffered update for a key once the interval elapses."""
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+
+        self._flush_tasks.pop(key, None)
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+
+        message, send = pending
+        self._mark_sent(key, asyncio.get_running_loop().time())
+        self.sent_count += 1
+
+        try:
+            await send(message)
+        except Exception as e:
+            logger.error(f"Error flushing progress update for {key}: {e}")
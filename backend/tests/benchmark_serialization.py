@@ -0,0 +1,232 @@
+"""
+Serialization benchmark for the largest API payloads.
+
+Each payload is requested through a TestClient from two routes: the
+FastAPI-native one (response_model validation plus pydantic-core
+serialization) and one returning FastJSONResponse directly. Timings
+include routing and the ASGI round trip, so they reflect what the app
+actually spends per request.
+
+Usage (from the backend directory):
+    python -m tests.benchmark_serialization [--scale 1000] [--repeat 5]
+"""
+
+import argparse
+import dataclasses
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from codegenapp.models.api.analysis import (
+    AnalysisResultResponse, AnalysisTypeEnum, VisualEdgeResponse, VisualGraphResponse, VisualNodeResponse
+)
+from codegenapp.models.workflow_state import WorkflowExecution, WorkflowMetadata, WorkflowState, WorkflowTransition
+from codegenapp.services.adapters.graph_sitter_adapter import CodebaseStructure, FileStructure, SymbolInfo
+from codegenapp.utils.serialization import ORJSON_AVAILABLE, FastJSONResponse
+
+
+def build_codebase_structure(files: int) -> CodebaseStructure:
+    """Codebase structure with ten symbols per file"""
+    file_structures = []
+    symbol_index = {}
+    for i in range(files):
+        path = f"src/package_{i % 20}/module_{i}.py"
+        symbols = [
+            SymbolInfo(
+                name=f"function_{i}_{j}",
+                type="function",
+                file_path=path,
+                line_number=j * 12,
+                column_number=0,
+                definition=f"def function_{i}_{j}(arg, *args, **kwargs):",
+                usages=[{"file_path": f"src/module_{k}.py", "line": k} for k in range(3)],
+                parameters=["arg", "*args", "**kwargs"],
+                return_type="Dict[str, Any]",
+                docstring="Transform the input and return the result."
+            )
+            for j in range(10)
+        ]
+        symbol_index.update({f"{path}:{symbol.name}": symbol for symbol in symbols})
+        file_structures.append(FileStructure(
+            path=path,
+            language="python",
+            functions=symbols[:8],
+            classes=symbols[8:],
+            imports=[{"module": f"package_{k}", "name": "helper"} for k in range(5)],
+            exports=[{"name": symbol.name} for symbol in symbols[:3]],
+            dependencies=[f"src/package_{k}/module_{k}.py" for k in range(5)],
+            lines_of_code=120,
+            complexity_score=3.5
+        ))
+
+    return CodebaseStructure(
+        total_files=files,
+        total_lines=files * 120,
+        languages={"python": files},
+        file_structures=file_structures,
+        dependency_graph={structure.path: structure.dependencies for structure in file_structures},
+        symbol_index=symbol_index,
+        analysis_timestamp=datetime.utcnow().isoformat(),
+        analysis_duration=12.5
+    )
+
+
+def build_visual_graph(nodes: int) -> VisualGraphResponse:
+    """Visualization graph with three edges per node"""
+    return VisualGraphResponse(
+        nodes=[
+            VisualNodeResponse(
+                id=f"node_{i}",
+                label=f"module_{i}.py",
+                type="file",
+                file_path=f"src/module_{i}.py",
+                line_number=1,
+                metadata={"x": i * 1.5, "y": i * 0.5, "size": 10, "color": "#4f46e5"}
+            )
+            for i in range(nodes)
+        ],
+        edges=[
+            VisualEdgeResponse(
+                source=f"node_{i}",
+                target=f"node_{(i + k) % nodes}",
+                type="import",
+                metadata={"weight": k}
+            )
+            for i in range(nodes)
+            for k in range(1, 4)
+        ],
+        layout_hints={"algorithm": "hierarchical", "direction": "TB"},
+        metadata={"total_nodes": nodes, "total_edges": nodes * 3}
+    )
+
+
+def build_execution_list(executions: int) -> list:
+    """Workflow executions with a full state history each"""
+    now = datetime.utcnow()
+    states = list(WorkflowState)
+    return [
+        WorkflowExecution(
+            id=f"execution-{i}",
+            project_id=f"project-{i % 10}",
+            current_state=WorkflowState.VALIDATING,
+            metadata=WorkflowMetadata(
+                project_id=f"project-{i % 10}",
+                repository={"owner": "org", "name": f"repo-{i % 10}", "branch": "main"},
+                initial_requirements="Add retry handling to the webhook processor",
+                agent_run_history=[f"run-{i}-{k}" for k in range(5)],
+                pr_history=[i, i + 1],
+                accumulated_context=["context line"] * 10
+            ),
+            created_at=now,
+            started_at=now,
+            last_activity=now + timedelta(minutes=5),
+            state_history=[
+                WorkflowTransition(
+                    from_state=states[k],
+                    to_state=states[k + 1],
+                    timestamp=now + timedelta(seconds=k),
+                    trigger="step_completed",
+                    metadata={"step": k}
+                )
+                for k in range(len(states) - 1)
+            ],
+            final_result={"checks": [{"name": f"check-{k}", "passed": True} for k in range(10)]}
+        )
+        for i in range(executions)
+    ]
+
+
+def build_app(scale: int) -> FastAPI:
+    """App serving each payload from a native and a FastJSONResponse route."""
+    structure = build_codebase_structure(scale)
+    graph = build_visual_graph(scale)
+    executions = build_execution_list(scale)
+    app = FastAPI()
+
+    @app.get("/codebase_structure/native", response_model=AnalysisResultResponse)
+    async def structure_native():
+        return AnalysisResultResponse(
+            success=True,
+            analysis_type=AnalysisTypeEnum.FULL_CODEBASE,
+            data=dataclasses.asdict(structure)
+        )
+
+    @app.get("/codebase_structure/fast")
+    async def structure_fast():
+        return FastJSONResponse({"success": True, "analysis_type": AnalysisTypeEnum.FULL_CODEBASE, "data": structure})
+
+    @app.get("/visual_graph/native", response_model=VisualGraphResponse)
+    async def graph_native():
+        return graph
+
+    @app.get("/visual_graph/fast")
+    async def graph_fast():
+        return FastJSONResponse(graph)
+
+    @app.get("/workflow_executions/native", response_model=List[WorkflowExecution])
+    async def executions_native():
+        return executions
+
+    @app.get("/workflow_executions/fast")
+    async def executions_fast():
+        return FastJSONResponse(executions)
+
+    return app
+
+
+def measure(request: Callable[[], Any], repeat: int) -> float:
+    """Best time of several requests, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        request()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(scale: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time both response paths for each payload.
+
+    Args:
+        scale: Files, graph nodes and executions per payload
+        repeat: Requests per measurement (the best one is reported)
+
+    Returns:
+        dict: Timings in milliseconds and response size per payload
+    """
+    client = TestClient(build_app(scale))
+
+    results = {}
+    for name in ("codebase_structure", "visual_graph", "workflow_executions"):
+        native_ms = measure(lambda: client.get(f"/{name}/native").raise_for_status(), repeat)
+        fast_ms = measure(lambda: client.get(f"/{name}/fast").raise_for_status(), repeat)
+        results[name] = {
+            "bytes": len(client.get(f"/{name}/fast").content),
+            "native_ms": round(native_ms, 2),
+            "fast_ms": round(fast_ms, 2),
+            "speedup": round(native_ms / fast_ms, 1),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of large payloads")
+    parser.add_argument("--scale", type=int, default=1000, help="Files, graph nodes and executions per payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Requests per measurement")
+    args = parser.parse_args()
+
+    print(f"orjson available: {ORJSON_AVAILABLE}")
+    print(f"{'payload':<22}{'size':>12}{'native ms':>12}{'fast ms':>10}{'speedup':>10}")
+    for name, result in run(args.scale, args.repeat).items():
+        print(
+            f"{name:<22}{result['bytes']:>12,}{result['native_ms']:>12}"
+            f"{result['fast_ms']:>10}{result['speedup']:>9}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+WebSocket fan-out and connection churn benchmark.
+
+Broadcasts to thousands of in-process sockets, a few of which never
+finish a send, and times how long enqueueing takes and when every fast
+socket has received everything. Separately times connecting, subscribing
+and disconnecting many connections spread over many projects, which must
+not scan every project per disconnect.
+
+Usage (from the backend directory):
+    python -m tests.benchmark_websocket_fanout [--sockets 5000] [--connections 10000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from codegenapp.websocket.connection_manager import ConnectionManager
+
+from tests.test_connection_manager import FakeWebSocket, wait_until
+
+
+async def run_fanout(sockets: int, broadcasts: int, slow_every: int) -> Dict[str, float]:
+    """
+    Time project broadcasts to many sockets with a few stalled clients.
+
+    Args:
+        sockets: Sockets subscribed to the project
+        broadcasts: Broadcasts sent back to back
+        slow_every: Every n-th socket takes 30s per send
+
+    Returns:
+        dict: Enqueue and delivery times in milliseconds
+    """
+    manager = ConnectionManager()
+    websockets = []
+    for i in range(sockets):
+        websocket = FakeWebSocket(send_delay=30.0 if i % slow_every == 0 else 0.0)
+        websockets.append(websocket)
+        await manager.connect(websocket, f"conn-{i}", project_id="project-1")
+
+    fast_sockets = [websocket for websocket in websockets if not websocket.send_delay]
+    await wait_until(lambda: all(websocket.sent for websocket in fast_sockets), timeout=60.0)
+    expected = len(fast_sockets[0].sent) + broadcasts
+
+    started = time.perf_counter()
+    for i in range(broadcasts):
+        await manager.broadcast_to_project("project-1", {"type": "notification", "index": i})
+    enqueue_seconds = time.perf_counter() - started
+
+    await wait_until(lambda: all(len(websocket.sent) >= expected for websocket in fast_sockets), timeout=60.0)
+    delivered_seconds = time.perf_counter() - started
+
+    manager.disconnect_many([f"conn-{i}" for i in range(sockets)])
+    return {
+        "enqueue_ms": round(enqueue_seconds * 1000, 1),
+        "delivered_ms": round(delivered_seconds * 1000, 1),
+    }
+
+
+async def run_churn(connections: int, projects: int) -> Dict[str, float]:
+    """
+    Time connection churn over many projects.
+
+    Args:
+        connections: Connections opened, each subscribed to two projects
+        projects: Distinct projects the connections are spread over
+
+    Returns:
+        dict: Connect, individual disconnect and bulk disconnect times in milliseconds
+    """
+    manager = ConnectionManager()
+
+    started = time.perf_counter()
+    for i in range(connections):
+        connection_id = f"conn-{i}"
+        await manager.connect(FakeWebSocket(), connection_id, project_id=f"project-{i % projects}")
+        await manager.subscribe_to_project(connection_id, f"project-{(i * 7) % projects}")
+    connect_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(0, connections, 2):
+        manager.disconnect(f"conn-{i}")
+    disconnect_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    manager.disconnect_many([f"conn-{i}" for i in range(1, connections, 2)])
+    bulk_seconds = time.perf_counter() - started
+
+    return {
+        "connect_ms": round(connect_seconds * 1000, 1),
+        "disconnect_ms": round(disconnect_seconds * 1000, 1),
+        "bulk_disconnect_ms": round(bulk_seconds * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket fan-out and connection churn")
+    parser.add_argument("--sockets", type=int, default=5000, help="Sockets receiving the broadcasts")
+    parser.add_argument("--broadcasts", type=int, default=20, help="Broadcasts sent back to back")
+    parser.add_argument("--slow-every", type=int, default=1000, help="Every n-th socket stalls on send")
+    parser.add_argument("--connections", type=int, default=10000, help="Connections opened for churn")
+    parser.add_argument("--projects", type=int, default=5000, help="Projects the connections spread over")
+    args = parser.parse_args()
+
+    fanout = asyncio.run(run_fanout(args.sockets, args.broadcasts, args.slow_every))
+    print(
+        f"{args.sockets} sockets x {args.broadcasts} broadcasts: "
+        f"enqueue {fanout['enqueue_ms']}ms, delivered {fanout['delivered_ms']}ms"
+    )
+
+    churn = asyncio.run(run_churn(args.connections, args.projects))
+    print(
+        f"{args.connections} connections across {args.projects} projects: "
+        f"connect {churn['connect_ms']}ms, disconnect half {churn['disconnect_ms']}ms, "
+        f"bulk disconnect half {churn['bulk_disconnect_ms']}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Tests for the async database session layer and repositories.
+"""
+
+import os
+
+import pytest
+
+# Use SQLite like TestingSettings instead of the default PostgreSQL URL
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from codegenapp.database.async_session import (
+    async_health_check, async_session_scope, dispose_async_engine, get_async_engine,
+    init_async_engine, open_async_session, to_async_url
+)
+from codegenapp.repositories.async_repositories import AsyncAuditLogRepository
+from codegenapp.models import AuditAction, AuditLog
+from codegenapp.models.audit_log import Base
+
+
+async def create_engine(tmp_path):
+    """Create the async engine on a temporary SQLite database with the audit log table"""
+    engine = init_async_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def make_log(entity_id: str) -> AuditLog:
+    return AuditLog.create_log(
+        action=AuditAction.AGENT_RUN_CANCELLED,
+        description="Cancelled agent run",
+        entity_type="agent_run",
+        entity_id=entity_id
+    )
+
+
+class TestAsyncSession:
+    """Test suite for the async engine, sessions and repositories"""
+
+    def test_urls_are_mapped_to_async_drivers(self):
+        """Test sync URLs are rewritten to asyncpg and aiosqlite"""
+        assert to_async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+        assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+        assert to_async_url("postgresql+asyncpg://db/app") == "postgresql+asyncpg://db/app"
+
+    @pytest.mark.asyncio
+    async def test_repository_round_trip(self, tmp_path):
+        """Test entities added through a repository are read back in a new session"""
+        await create_engine(tmp_path)
+        async with open_async_session() as db:
+            log = await AsyncAuditLogRepository(db).add(make_log("run-1"))
+
+        async with open_async_session() as db:
+            repository = AsyncAuditLogRepository(db)
+            assert (await repository.get(log.id)).entity_id == "run-1"
+            assert [entry.id for entry in await repository.list_for_entity("agent_run", "run-1")] == [log.id]
+
+            await repository.update_by_id(log.id, {"entity_id": "run-2"})
+            assert await repository.list_for_entity("agent_run", "run-1") == []
+
+        await dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_scope_rolls_back_on_error(self, tmp_path):
+        """Test a failed transactional scope leaves nothing behind"""
+        await create_engine(tmp_path)
+        with pytest.raises(RuntimeError):
+            async with async_session_scope() as db:
+                db.add(make_log("run-1"))
+                await db.flush()
+                raise RuntimeError("boom")
+
+        async with async_session_scope() as db:
+            assert await AsyncAuditLogRepository(db).list_for_entity("agent_run", "run-1") == []
+
+        await dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_health_check_and_dispose(self, tmp_path):
+        """Test the health check uses the shared engine and dispose resets it"""
+        engine = await create_engine(tmp_path)
+        assert await async_health_check()
+
+        await dispose_async_engine()
+        assert get_async_engine() is not engine
+        await dispose_async_engine()
@@ -0,0 +1,182 @@
+"""
+Tests for WebSocket broadcast backends.
+"""
+
+import pytest
+import asyncio
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from codegenapp.websocket.broadcast import (
+    InMemoryBroadcastBackend, RedisBroadcastBackend, create_broadcast_backend
+)
+from codegenapp.websocket.connection_manager import ConnectionManager
+from codegenapp.websocket.manager import WebSocketManager
+
+from test_connection_manager import FakeWebSocket, wait_until
+
+
+class FanOutBackend(InMemoryBroadcastBackend):
+    """In-memory backend that also delivers to peer backends, like Redis would"""
+
+    def __init__(self):
+        super().__init__()
+        self.peers = []
+
+    async def publish(self, namespace: str, target: str, data: str):
+        for backend in [self] + self.peers:
+            await backend._dispatch(namespace, target, data)
+
+
+class UnreachableRedis:
+    """Redis client whose commands fail as if the server were down"""
+
+    async def publish(self, channel, data):
+        raise RedisConnectionError("Connection refused")
+
+    async def incr(self, key):
+        raise RedisConnectionError("Connection refused")
+
+
+class CountingRedis(UnreachableRedis):
+    """Redis client whose counters work again while pub/sub is still down"""
+
+    def __init__(self, counters):
+        self.counters = counters
+
+    async def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+
+class TestBroadcastBackends:
+    """Test suite for cross-manager broadcast delivery"""
+
+    def test_backend_factory(self):
+        """Test backends are created by name"""
+        assert isinstance(create_broadcast_backend("memory"), InMemoryBroadcastBackend)
+        assert isinstance(
+            create_broadcast_backend("redis", redis_url="redis://localhost:6379/0"),
+            RedisBroadcastBackend
+        )
+
+        with pytest.raises(ValueError):
+            create_broadcast_backend("redis")
+        with pytest.raises(ValueError):
+            create_broadcast_backend("kafka")
+
+    @pytest.mark.asyncio
+    async def test_project_event_reaches_other_worker(self):
+        """Test an event published in one worker is delivered by another"""
+        worker_a, worker_b = FanOutBackend(), FanOutBackend()
+        worker_a.peers.append(worker_b)
+        worker_b.peers.append(worker_a)
+
+        manager_a, manager_b = ConnectionManager(), ConnectionManager()
+        manager_a.attach_broadcast_backend(worker_a)
+        manager_b.attach_broadcast_backend(worker_b)
+
+        websocket = FakeWebSocket()
+        await manager_b.connect(websocket, "conn", project_id="project-1")
+
+        # Worker A has no local subscribers but must still publish
+        await manager_a.broadcast_to_project(
+            "project-1", {"type": "agent_run_progress", "run_id": "r1", "progress": 50}
+        )
+        await manager_a.broadcast_to_all({"type": "system_alert"})
+
+        await wait_until(lambda: any(m.get("type") == "system_alert" for m in websocket.sent))
+        progress = [m for m in websocket.sent if m.get("type") == "agent_run_progress"]
+        assert progress[0]["progress"] == 50
+
+        manager_b.disconnect("conn")
+
+    @pytest.mark.asyncio
+    async def test_websocket_manager_delivers_through_backend(self):
+        """Test WebSocketManager project broadcasts go through the backend"""
+        backend = InMemoryBroadcastBackend()
+        manager = WebSocketManager()
+        manager.attach_broadcast_backend(backend)
+
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "owner/repo")
+
+        await manager.broadcast_to_project("owner/repo", {"type": "push", "commit_count": 2})
+        await manager.broadcast_to_project("other/repo", {"type": "push", "commit_count": 1})
+
+        pushes = [m for m in websocket.sent if m.get("type") == "push"]
+        assert pushes == [{"type": "push", "commit_count": 2}]
+
+        manager.detach_broadcast_backend()
+        assert "websocket" not in backend._handlers
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_falls_back_to_local_delivery(self):
+        """Test a Redis outage does not fail broadcasts and local sockets still receive them"""
+        backend = RedisBroadcastBackend("redis://localhost:6379/0")
+        backend._redis = UnreachableRedis()
+
+        connection_manager = ConnectionManager()
+        connection_manager.attach_broadcast_backend(backend)
+        websocket_manager = WebSocketManager()
+        websocket_manager.attach_broadcast_backend(backend)
+
+        project_socket, repo_socket = FakeWebSocket(), FakeWebSocket()
+        await connection_manager.connect(project_socket, "conn", project_id="project-1")
+        await websocket_manager.connect(repo_socket, "owner/repo")
+
+        await connection_manager.broadcast_to_project("project-1", {"type": "validation_started"})
+        await connection_manager.broadcast_to_project("project-1", {"type": "validation_completed"})
+        await websocket_manager.broadcast_to_project("owner/repo", {"type": "push", "commit_count": 1})
+
+        await wait_until(lambda: any(m.get("type") == "validation_completed" for m in project_socket.sent))
+        events = [m for m in project_socket.sent if m.get("type", "").startswith("validation_")]
+        assert [m["seq"] for m in events] == [1, 2]
+        assert {"type": "push", "commit_count": 1} in repo_socket.sent
+
+        connection_manager.disconnect("conn")
+        backend._redis = None
+
+    @pytest.mark.asyncio
+    async def test_local_sequence_fallback_uses_a_fresh_epoch(self):
+        """Test events numbered locally during an outage make reconnecting clients resynchronize"""
+        backend = RedisBroadcastBackend("redis://localhost:6379/0")
+        backend._redis = UnreachableRedis()
+        manager = ConnectionManager()
+        manager.attach_broadcast_backend(backend)
+
+        first = FakeWebSocket()
+        await manager.connect(first, "conn-1", project_id="project-1")
+        await manager.broadcast_to_project("project-1", {"type": "step", "number": 1})
+        await wait_until(lambda: any(m.get("type") == "step" for m in first.sent))
+        outage_event = first.sent[-1]
+        assert outage_event["seq"] == 1
+        assert outage_event["epoch"].startswith("local-")
+
+        # Redis is back and other workers have advanced the shared counter meanwhile
+        backend._redis = CountingRedis({"codegenapp:ws-seq:connections:project-1": 5})
+        await manager.broadcast_to_project("project-1", {"type": "step", "number": 2})
+        await wait_until(lambda: sum(m.get("type") == "step" for m in first.sent) == 2)
+        shared_event = first.sent[-1]
+        assert shared_event["seq"] == 6
+        assert "epoch" not in shared_event
+
+        lagging, current = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(
+            lagging, "conn-2", project_id="project-1", last_seq=outage_event["seq"], epoch=outage_event["epoch"]
+        )
+        await manager.connect(current, "conn-3", project_id="project-1", last_seq=shared_event["seq"])
+        await wait_until(lambda: not manager.send_queues["conn-2"] and not manager.send_queues["conn-3"])
+        await asyncio.sleep(0.01)
+        assert any(m.get("type") == "replay_gap" for m in lagging.sent)
+        assert not any(m.get("type") == "replay_gap" for m in current.sent)
+
+        # A later outage numbers under another epoch
+        backend._redis = UnreachableRedis()
+        await manager.broadcast_to_project("project-1", {"type": "step", "number": 3})
+        await wait_until(lambda: sum(m.get("type") == "step" for m in first.sent) == 3)
+        assert first.sent[-1]["epoch"] not in (None, outage_event["epoch"])
+
+        for connection_id in ("conn-1", "conn-2", "conn-3"):
+            manager.disconnect(connection_id)
+        backend._redis = None
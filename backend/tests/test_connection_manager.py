@@ -0,0 +1,236 @@
+"""
+Tests for the WebSocket connection manager fan-out.
+"""
+
+import pytest
+import asyncio
+import json
+import time
+
+from codegenapp.websocket.connection_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Minimal WebSocket stand-in recording sent messages"""
+
+    def __init__(self, send_delay: float = 0.0):
+        self.send_delay = send_delay
+        self.sent = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+
+async def wait_until(predicate, timeout: float = 5.0):
+    """Poll until predicate() is true or fail after timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+class TestConnectionManagerFanOut:
+    """Test suite for per-connection send queues"""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_broadcast(self):
+        """Test broadcast returns without waiting on a slow subscriber"""
+        manager = ConnectionManager()
+        fast = FakeWebSocket()
+        slow = FakeWebSocket(send_delay=5.0)
+
+        await manager.connect(fast, "fast", project_id="project-1")
+        await manager.connect(slow, "slow", project_id="project-1")
+
+        started = time.monotonic()
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_started", "run_id": "r1"})
+        assert time.monotonic() - started < 0.5
+
+        await wait_until(lambda: any(m.get("type") == "agent_run_started" for m in fast.sent))
+
+        manager.disconnect("fast")
+        manager.disconnect("slow")
+
+    @pytest.mark.asyncio
+    async def test_overflowing_client_is_dropped(self):
+        """Test a client whose queue overflows is disconnected"""
+        manager = ConnectionManager(send_queue_size=4)
+        stuck = FakeWebSocket(send_delay=60.0)
+
+        await manager.connect(stuck, "stuck", project_id="project-1")
+
+        for i in range(10):
+            await manager.broadcast_to_project("project-1", {"type": "notification", "index": i})
+
+        assert "stuck" not in manager.active_connections
+        assert "project-1" not in manager.project_subscriptions
+        assert manager.dropped_connections == 1
+
+        await wait_until(lambda: stuck.closed)
+
+    @pytest.mark.asyncio
+    async def test_progress_messages_are_coalesced(self):
+        """Test queued progress updates for the same run collapse to the latest"""
+        manager = ConnectionManager(send_queue_size=4)
+        websocket = FakeWebSocket(send_delay=0.05)
+
+        await manager.connect(websocket, "conn", project_id="project-1")
+
+        for progress in range(0, 101, 5):
+            await manager.broadcast_to_project(
+                "project-1",
+                {"type": "agent_run_progress", "run_id": "r1", "progress": progress}
+            )
+
+        assert "conn" in manager.active_connections
+
+        await wait_until(lambda: any(
+            m.get("type") == "agent_run_progress" and m["progress"] == 100 for m in websocket.sent
+        ))
+        progress_values = [m["progress"] for m in websocket.sent if m.get("type") == "agent_run_progress"]
+        assert progress_values == sorted(progress_values)
+        assert len(progress_values) < 21
+
+        manager.disconnect("conn")
+
+    @pytest.mark.asyncio
+    async def test_updates_coalesce_while_an_earlier_message_is_sending(self):
+        """Test messages behind an in-flight send stay queued and keep coalescing"""
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+
+        await manager.connect(websocket, "conn", project_id="project-1")
+        await wait_until(lambda: len(manager.send_queues["conn"]) == 0)
+        websocket.send_delay = 0.05
+
+        await manager.broadcast_to_project("project-1", {"type": "notification"})
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_progress", "run_id": "r1", "progress": 1})
+        await asyncio.sleep(0.01)
+        for progress in range(2, 21):
+            await manager.broadcast_to_project(
+                "project-1",
+                {"type": "agent_run_progress", "run_id": "r1", "progress": progress}
+            )
+
+        await wait_until(lambda: any(m.get("type") == "agent_run_progress" for m in websocket.sent))
+        progress_values = [m["progress"] for m in websocket.sent if m.get("type") == "agent_run_progress"]
+        assert progress_values == [20]
+
+        manager.disconnect("conn")
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_applies_per_message(self):
+        """Test a backlog slower in total than the timeout is still delivered"""
+        manager = ConnectionManager(send_timeout=0.1)
+        websocket = FakeWebSocket(send_delay=0.04)
+
+        await manager.connect(websocket, "conn", project_id="project-1")
+        for i in range(6):
+            await manager.broadcast_to_project("project-1", {"type": "notification", "index": i})
+
+        await wait_until(lambda: sum(m.get("type") == "notification" for m in websocket.sent) == 6)
+        assert "conn" in manager.active_connections
+
+        manager.disconnect("conn")
+
+    @pytest.mark.asyncio
+    async def test_failed_send_disconnects_client(self):
+        """Test a socket that errors on send is removed"""
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+
+        async def broken_send(data):
+            raise RuntimeError("connection reset")
+
+        await manager.connect(websocket, "conn", project_id="project-1")
+        await wait_until(lambda: len(manager.send_queues["conn"]) == 0)
+        websocket.send_text = broken_send
+
+        await manager.broadcast_to_all({"type": "system_alert"})
+
+        await wait_until(lambda: "conn" not in manager.active_connections)
+
+
+class TestConnectionTeardown:
+    """Test suite for subscription indexes and connection teardown"""
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_prunes_empty_projects(self):
+        """Test emptied project sets and reverse index entries are removed"""
+        manager = ConnectionManager()
+        await manager.connect(FakeWebSocket(), "conn", project_id="project-1")
+        await manager.subscribe_to_project("conn", "project-2")
+
+        assert manager.connection_projects["conn"] == {"project-1", "project-2"}
+
+        await manager.unsubscribe_from_project("conn", "project-1")
+        assert "project-1" not in manager.project_subscriptions
+        assert manager.connection_projects["conn"] == {"project-2"}
+
+        manager.disconnect("conn")
+        assert manager.project_subscriptions == {}
+        assert manager.connection_projects == {}
+
+    @pytest.mark.asyncio
+    async def test_disconnect_all_closes_every_socket(self):
+        """Test mass disconnect closes sockets and resets indexes"""
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(50)]
+        for i, websocket in enumerate(sockets):
+            await manager.connect(websocket, f"conn-{i}", project_id=f"project-{i % 5}")
+
+        await manager.disconnect_all()
+
+        assert all(websocket.closed for websocket in sockets)
+        assert manager.active_connections == {}
+        assert manager.send_queues == {}
+        assert manager.project_subscriptions == {}
+        assert manager.connection_projects == {}
+
+    @pytest.mark.asyncio
+    async def test_churn_across_many_projects_leaves_no_index_entries(self):
+        """Test churn of 10k connections over 5k projects prunes every index"""
+        manager = ConnectionManager()
+        project_count = 5000
+        connection_count = 10000
+
+        async def connect_batch(prefix: str):
+            for i in range(connection_count):
+                connection_id = f"{prefix}-{i}"
+                await manager.connect(FakeWebSocket(), connection_id, project_id=f"project-{i % project_count}")
+                await manager.subscribe_to_project(connection_id, f"project-{(i * 7) % project_count}")
+
+        await connect_batch("a")
+        assert len(manager.project_subscriptions) == project_count
+
+        for i in range(connection_count):
+            manager.disconnect(f"a-{i}")
+        assert manager.project_subscriptions == {}
+        assert manager.connection_projects == {}
+
+        # Reconnect and tear down in bulk, as when stale connections are cleaned up
+        await connect_batch("b")
+        manager.disconnect_many([f"b-{i}" for i in range(0, connection_count, 2)])
+        assert len(manager.active_connections) == connection_count // 2
+        assert all(
+            int(connection_id.split("-")[1]) % 2 == 1
+            for subscribers in manager.project_subscriptions.values()
+            for connection_id in subscribers
+        )
+
+        manager.disconnect_many([f"b-{i}" for i in range(1, connection_count, 2)])
+        assert manager.active_connections == {}
+        assert manager.send_queues == {}
+        assert manager.project_subscriptions == {}
+        assert manager.connection_projects == {}
+        assert manager.connection_metadata == {}
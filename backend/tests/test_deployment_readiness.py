@@ -0,0 +1,87 @@
+"""
+Tests for deployment readiness polling.
+"""
+
+import pytest
+import asyncio
+import time
+from aiohttp import web
+from prometheus_client import REGISTRY
+
+from codegenapp.validation.deployment_orchestrator import DeploymentOrchestrator
+
+
+def ready_count() -> float:
+    """Deployments observed by the time-to-ready histogram"""
+    return REGISTRY.get_sample_value("codegenapp_deployment_time_to_ready_seconds_count") or 0.0
+
+
+async def start_app(boot_requests):
+    """Serve an app that answers 503 until it has seen boot_requests requests"""
+    seen = {"count": 0}
+
+    async def handler(request):
+        seen["count"] += 1
+        return web.Response(status=200 if seen["count"] > boot_requests else 503)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    app.router.add_get("/health", handler)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class TestDeploymentReadiness:
+    """Test suite for the readiness waiter"""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_booting_deployment(self):
+        """Test polling continues until the deployment answers and records time-to-ready"""
+        runner, url = await start_app(boot_requests=4)
+        observed = ready_count()
+        orchestrator = DeploymentOrchestrator(initial_poll_delay=0.01, max_poll_delay=0.05)
+        try:
+            result = await orchestrator.check_deployment_health(url, timeout=5)
+        finally:
+            await orchestrator.close()
+            await runner.cleanup()
+
+        assert result["healthy"] is True
+        assert result["attempts"] >= 3
+        assert result["time_to_ready"] > 0
+        assert ready_count() == observed + 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_at_deadline(self):
+        """Test an unreachable deployment fails once the timeout elapses"""
+        observed = ready_count()
+        orchestrator = DeploymentOrchestrator(initial_poll_delay=0.01, max_poll_delay=0.05, probe_timeout=0.2)
+        try:
+            result = await orchestrator.check_deployment_health("http://127.0.0.1:9", timeout=0.3)
+        finally:
+            await orchestrator.close()
+
+        assert result["healthy"] is False
+        assert "error" in result
+        assert ready_count() == observed
+
+    @pytest.mark.asyncio
+    async def test_probe_timeout_is_capped_by_deadline(self):
+        """Test a deployment that never answers does not hold the check past its timeout"""
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        orchestrator = DeploymentOrchestrator(initial_poll_delay=0.01, max_poll_delay=0.05, probe_timeout=5.0)
+        started = time.monotonic()
+        try:
+            result = await orchestrator.check_deployment_health(f"http://127.0.0.1:{port}", timeout=0.3)
+        finally:
+            await orchestrator.close()
+            server.close()
+
+        assert result["healthy"] is False
+        assert time.monotonic() - started < 1.0
@@ -0,0 +1,111 @@
+"""
+Tests for WebSocket event replay on reconnect.
+"""
+
+import pytest
+
+from codegenapp.websocket.connection_manager import ConnectionManager
+from codegenapp.websocket.event_replay import EventReplayBuffer
+
+from test_connection_manager import FakeWebSocket, wait_until
+
+
+class TestEventReplay:
+    """Test suite for replaying missed project events"""
+
+    def test_superseded_progress_is_collapsed(self):
+        """Test only the latest progress per coalesce key is replayed"""
+        buffer = EventReplayBuffer()
+        buffer.record("project-1", 1, '{"progress": 10}', "progress:run-1")
+        buffer.record("project-1", 2, '{"type": "step"}')
+        buffer.record("project-1", 3, '{"progress": 90}', "progress:run-1")
+
+        events, complete = buffer.events_since("project-1", 0)
+
+        assert events == ['{"type": "step"}', '{"progress": 90}']
+        assert complete
+
+    def test_gap_is_reported(self):
+        """Test events already evicted from the ring buffer are flagged"""
+        buffer = EventReplayBuffer(max_events_per_project=2)
+        for sequence in range(1, 5):
+            buffer.record("project-1", sequence, f'{{"seq": {sequence}}}')
+
+        events, complete = buffer.events_since("project-1", 1)
+
+        assert events == ['{"seq": 3}', '{"seq": 4}']
+        assert not complete
+
+    def test_sequence_from_before_a_restart_is_reported(self):
+        """Test a last_seq numbered by an earlier epoch, or ahead of the buffer, is a gap"""
+        buffer = EventReplayBuffer()
+        old_epoch = buffer.epoch("project-1")
+        for sequence in range(1, 4):
+            buffer.record("project-1", buffer.next_sequence("project-1"), f'{{"seq": {sequence}}}')
+
+        restarted = EventReplayBuffer()
+        assert restarted.events_since("project-1", 3) == ([], False)
+
+        for sequence in range(1, 6):
+            restarted.record("project-1", restarted.next_sequence("project-1"), f'{{"seq": {sequence}}}')
+
+        events, complete = restarted.events_since("project-1", 3, old_epoch)
+        assert events == [f'{{"seq": {sequence}}}' for sequence in range(1, 6)]
+        assert not complete
+
+        assert restarted.events_since("project-1", 7) == (events, False)
+        assert restarted.events_since("project-1", 3, restarted.epoch("project-1")) == (events[3:], True)
+
+    @pytest.mark.asyncio
+    async def test_reconnect_after_restart_sends_replay_gap(self):
+        """Test a client reconnecting to a restarted server is told to resynchronize"""
+        before_restart = ConnectionManager()
+        first = FakeWebSocket()
+        await before_restart.connect(first, "conn-1", project_id="project-1")
+        for number in range(3):
+            await before_restart.broadcast_to_project("project-1", {"type": "step", "number": number})
+        await wait_until(lambda: sum(m.get("type") == "step" for m in first.sent) == 3)
+        last_event = first.sent[-1]
+        before_restart.disconnect("conn-1")
+
+        manager = ConnectionManager()
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_started", "run_id": "r2"})
+
+        second = FakeWebSocket()
+        await manager.connect(
+            second, "conn-2", project_id="project-1", last_seq=last_event["seq"], epoch=last_event["epoch"]
+        )
+        await wait_until(lambda: any(m.get("type") == "agent_run_started" for m in second.sent))
+
+        assert [m["type"] for m in second.sent if m["type"] in ("replay_gap", "agent_run_started")] == [
+            "replay_gap", "agent_run_started"
+        ]
+        manager.disconnect("conn-2")
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replays_missed_events(self):
+        """Test a client reconnecting with last_seq receives what it missed"""
+        manager = ConnectionManager()
+        first = FakeWebSocket()
+        await manager.connect(first, "conn-1", project_id="project-1")
+
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_started", "run_id": "r1"})
+        await wait_until(lambda: any(m.get("type") == "agent_run_started" for m in first.sent))
+        last_seq = first.sent[-1]["seq"]
+        manager.disconnect("conn-1")
+
+        # Events raised while no client is connected are still buffered
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_progress", "run_id": "r1", "progress": 40})
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_progress", "run_id": "r1", "progress": 80})
+        await manager.broadcast_to_project("project-1", {"type": "agent_run_completed", "run_id": "r1"})
+
+        second = FakeWebSocket()
+        await manager.connect(second, "conn-2", project_id="project-1", last_seq=last_seq)
+        await wait_until(lambda: any(m.get("type") == "agent_run_completed" for m in second.sent))
+
+        replayed = [m for m in second.sent if "seq" in m]
+        assert [m["type"] for m in replayed] == ["agent_run_progress", "agent_run_completed"]
+        assert replayed[0]["progress"] == 80
+        assert not any(m.get("type") == "replay_gap" for m in second.sent)
+
+        manager.disconnect("conn-2")
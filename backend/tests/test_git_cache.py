@@ -0,0 +1,74 @@
+"""
+Tests for the local git mirror cache.
+"""
+
+import pytest
+import os
+import shutil
+import subprocess
+
+from codegenapp.validation.git_cache import GitMirrorCache
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(cwd, *args):
+    """Run a git command in a directory and return its output"""
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit_file(repo, name, content):
+    """Commit a file to a repository and return the commit SHA"""
+    with open(os.path.join(repo, name), "w") as f:
+        f.write(content)
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", f"Add {name}")
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """Create an upstream repository with one commit"""
+    repo = tmp_path / "origin"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    commit_file(repo, "README.md", "hello")
+    return str(repo)
+
+
+class TestGitMirrorCache:
+    """Test suite for mirror-backed checkouts"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["worktree", "shared"])
+    async def test_checkout_and_remove(self, tmp_path, origin, mode):
+        """Test a commit is checked out from the mirror and removed again"""
+        cache = GitMirrorCache(str(tmp_path / "cache"), checkout_mode=mode)
+        sha = git(origin, "rev-parse", "HEAD")
+        destination = str(tmp_path / "work" / "pr-1")
+
+        result = await cache.checkout(origin, sha, destination)
+
+        assert result["commit_sha"] == sha
+        assert open(os.path.join(destination, "README.md")).read() == "hello"
+
+        await cache.remove_checkout(origin, destination)
+        assert not os.path.exists(destination)
+
+    @pytest.mark.asyncio
+    async def test_new_commits_are_fetched_incrementally(self, tmp_path, origin):
+        """Test a head pushed after the mirror was created is fetched on demand"""
+        cache = GitMirrorCache(str(tmp_path / "cache"), min_fetch_interval=3600)
+        await cache.checkout(origin, "HEAD", str(tmp_path / "first"))
+
+        git(origin, "checkout", "-q", "-b", "feature")
+        sha = commit_file(origin, "feature.txt", "new")
+
+        result = await cache.checkout(origin, sha, str(tmp_path / "second"))
+
+        assert result["commit_sha"] == sha
+        assert os.path.exists(tmp_path / "second" / "feature.txt")
+        assert len(os.listdir(tmp_path / "cache")) == 1
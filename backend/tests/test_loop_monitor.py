@@ -0,0 +1,72 @@
+"""
+Tests for the event-loop lag and slow-callback monitor.
+"""
+
+import pytest
+import asyncio
+import time
+
+from codegenapp.observability.loop_monitor import LoopMonitor
+
+
+def blocking_call(seconds: float):
+    """Block the event loop like a sync client call would"""
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Test suite for loop stall detection"""
+
+    @pytest.mark.asyncio
+    async def test_stall_is_attributed_to_blocking_call_site(self):
+        """Test a blocking call is captured with its stack and duration"""
+        monitor = LoopMonitor(interval=0.02, threshold=0.05)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+
+        blocking_call(0.2)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["stalls"] == 1
+        assert stats["lag"]["max"] >= 0.15
+
+        site = stats["call_sites"][0]
+        assert "blocking_call" in site["call_site"]
+        assert site["count"] == 1
+        assert site["total_seconds"] >= 0.15
+        assert any("test_stall_is_attributed_to_blocking_call_site" in frame for frame in site["stack"])
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_records_no_stalls(self):
+        """Test short awaits do not count as stalls"""
+        monitor = LoopMonitor(interval=0.02, threshold=0.1)
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["stalls"] == 0
+        assert stats["call_sites"] == []
+        assert not stats["running"]
+
+    @pytest.mark.asyncio
+    async def test_call_sites_ranked_by_total_time_and_reset(self):
+        """Test repeated offenders rank first and reset clears them"""
+        monitor = LoopMonitor(interval=0.02, threshold=0.05)
+        await monitor.start()
+
+        for _ in range(2):
+            await asyncio.sleep(0.05)
+            blocking_call(0.1)
+        await asyncio.sleep(0.05)
+        time.sleep(0.12)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        sites = monitor.get_stats()["call_sites"]
+        assert [site["count"] for site in sites] == [2, 1]
+
+        monitor.reset()
+        assert monitor.get_stats()["call_sites"] == []
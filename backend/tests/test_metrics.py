@@ -0,0 +1,109 @@
+"""
+Tests for Prometheus metrics instrumentation.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+import httpx
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from codegenapp.observability.metrics import InstrumentedAsyncTransport, instrument_engine, render_metrics
+
+
+# Worker process recording one sample and a callback gauge value
+WORKER_SCRIPT = """
+import sys
+from codegenapp.observability.metrics import (
+    db_query_duration, sample_gauges, set_gauge_function, websocket_send_queue_depth
+)
+set_gauge_function(websocket_send_queue_depth, lambda: int(sys.argv[1]))
+db_query_duration.labels("SELECT").observe(0.01)
+sample_gauges()
+"""
+
+# Process serving the scrape
+RENDER_SCRIPT = """
+from codegenapp.observability.metrics import render_metrics
+print(render_metrics().decode())
+"""
+
+
+def run_process(script: str, multiprocess_dir: str, *args: str) -> str:
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=multiprocess_dir)
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        cwd=backend_dir, env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+    return result.stdout
+
+
+def sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Test suite for hot-path metrics"""
+
+    @pytest.mark.asyncio
+    async def test_adapter_requests_recorded_by_status(self):
+        """Test the httpx transport records each request with its status"""
+        labels = {"adapter": "test-adapter", "method": "GET", "status": "503"}
+        before = sample("codegenapp_adapter_http_request_duration_seconds_count", labels)
+
+        transport = InstrumentedAsyncTransport(
+            "test-adapter", httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("http://codegen.test/health")
+
+        assert response.status_code == 503
+        assert sample("codegenapp_adapter_http_request_duration_seconds_count", labels) == before + 1
+
+    @pytest.mark.asyncio
+    async def test_adapter_transport_errors_recorded(self):
+        """Test failed requests are recorded with the error status"""
+        def fail(request):
+            raise httpx.ConnectError("refused")
+
+        labels = {"adapter": "failing-adapter", "method": "POST", "status": "error"}
+        async with httpx.AsyncClient(transport=InstrumentedAsyncTransport("failing-adapter", httpx.MockTransport(fail))) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.post("http://codegen.test/runs")
+
+        assert sample("codegenapp_adapter_http_request_duration_seconds_count", labels) == 1
+
+    def test_db_statements_recorded_by_operation(self):
+        """Test engine statements are timed and labelled by statement type"""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        before = sample("codegenapp_db_query_duration_seconds_count", {"operation": "SELECT"})
+
+        with engine.connect() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+            connection.execute(text("SELECT x FROM t"))
+
+        assert sample("codegenapp_db_query_duration_seconds_count", {"operation": "SELECT"}) == before + 1
+        assert sample("codegenapp_db_query_duration_seconds_count", {"operation": "OTHER"}) >= 1
+
+    def test_metrics_render_in_prometheus_format(self):
+        """Test the exposition includes the hot-path metrics"""
+        output = render_metrics().decode()
+
+        assert "# TYPE codegenapp_workflow_step_duration_seconds histogram" in output
+        assert "codegenapp_websocket_send_queue_depth" in output
+        assert "codegenapp_webhook_queue_lag_seconds" in output
+
+    def test_multiprocess_metrics_aggregate_workers(self, tmp_path):
+        """Test /metrics reports samples and queue depths of every worker process"""
+        run_process(WORKER_SCRIPT, str(tmp_path), "3")
+        run_process(WORKER_SCRIPT, str(tmp_path), "4")
+
+        output = run_process(RENDER_SCRIPT, str(tmp_path))
+
+        assert 'codegenapp_db_query_duration_seconds_count{operation="SELECT"} 2.0' in output
+        assert "codegenapp_websocket_send_queue_depth 7.0" in output
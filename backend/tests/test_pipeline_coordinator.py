@@ -0,0 +1,330 @@
+"""
+Tests for PipelineCoordinator verdict caching, superseding and shutdown.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+# Use SQLite like TestingSettings instead of the default PostgreSQL URL
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from codegenapp.database.async_session import dispose_async_engine, init_async_engine, open_async_session
+from codegenapp.models import Base, Project, ValidationPipeline, ValidationResult, ValidationStatus
+from codegenapp.validation import pipeline_coordinator as coordinator_module
+from codegenapp.validation.pipeline_coordinator import PipelineCoordinator
+from codegenapp.validation.pipeline_state import PipelineState
+from codegenapp.validation.result_cache import InMemoryValidationResultCache
+from codegenapp.websocket.connection_manager import ConnectionManager
+
+from test_connection_manager import FakeWebSocket, wait_until
+
+
+class MemoryPipelineState(PipelineState):
+    """Pipeline state kept only in memory, loaded from a per-test registry"""
+
+    registry = {}
+
+    @classmethod
+    async def load(cls, pipeline_id: str):
+        return cls.registry.get(pipeline_id)
+
+    async def _write(self, operation):
+        self.write_count += 1
+
+
+class FakeSnapshotManager:
+    """Snapshot manager whose clone step can be made to fail"""
+
+    def __init__(self, clone_error: str = None):
+        self.clone_error = clone_error
+        self.clones = 0
+        self.cleanups = 0
+        self.closed = False
+
+    async def create_snapshot(self, pipeline_id, project_id):
+        return {"snapshot_id": f"snapshot-{pipeline_id}"}
+
+    async def clone_pr_codebase(self, snapshot_id, pull_request_id, repository_url, head_ref):
+        self.clones += 1
+        if self.clone_error:
+            raise RuntimeError(self.clone_error)
+        return {"clone_path": f"/tmp/{snapshot_id}"}
+
+    async def run_code_analysis(self, snapshot_id):
+        return {}
+
+    async def run_security_scan(self, snapshot_id):
+        return {}
+
+    async def cleanup_snapshot(self, snapshot_id):
+        self.cleanups += 1
+        return {}
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeDeploymentOrchestrator:
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+    async def deploy_application(self, snapshot_id, project_id):
+        return {"deployment_url": "http://preview.local"}
+
+    async def check_deployment_health(self, deployment_url):
+        return {"healthy": True}
+
+
+class FakeStateManager:
+    """Active validations per project, without Redis"""
+
+    def __init__(self):
+        self.active = {}
+
+    def add_active_validation(self, project_id, validation_id):
+        self.active.setdefault(project_id, set()).add(validation_id)
+
+    def remove_active_validation(self, project_id, validation_id):
+        self.active.get(project_id, set()).discard(validation_id)
+
+
+class FakeWebEvalService:
+    """Web evaluation returning a fixed verdict or raising"""
+
+    def __init__(self, passed: bool = True, error: str = None):
+        self.passed = passed
+        self.error = error
+        self.calls = 0
+        # Set to an asyncio.Event to hold evaluations until it is set
+        self.release = None
+
+    async def evaluate_deployment(self, deployment_url, project_id):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        if self.error:
+            raise RuntimeError(self.error)
+        return {"passed": self.passed}
+
+
+class RecordingResultCache(InMemoryValidationResultCache):
+    """In-memory verdict cache that records being closed"""
+
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def make_coordinator(
+    monkeypatch,
+    snapshot_manager=None,
+    web_eval_service=None,
+    memory_state: bool = True
+) -> PipelineCoordinator:
+    """Coordinator running against fake services, with in-memory or database pipeline state"""
+    MemoryPipelineState.registry = {}
+    if memory_state:
+        monkeypatch.setattr(coordinator_module, "PipelineState", MemoryPipelineState)
+
+    coordinator = PipelineCoordinator(debounce_seconds=0.01, result_cache=RecordingResultCache())
+    coordinator.state_manager = FakeStateManager()
+    coordinator.snapshot_manager = snapshot_manager or FakeSnapshotManager()
+    coordinator.deployment_orchestrator = FakeDeploymentOrchestrator()
+    coordinator.web_eval_service = web_eval_service or FakeWebEvalService()
+    return coordinator
+
+
+def add_pipeline(pipeline_id: str, head_sha: str = "abc123") -> MemoryPipelineState:
+    state = MemoryPipelineState(
+        pipeline_id,
+        project_id="project-1",
+        pull_request_id="pr-1",
+        status=ValidationStatus.PENDING,
+        pipeline_config={"timeout_minutes": 30, "head_sha": head_sha, "force_rerun": False}
+    )
+    MemoryPipelineState.registry[pipeline_id] = state
+    return state
+
+
+async def create_project_database(tmp_path):
+    """Create a temporary SQLite database holding one project for owner/repo"""
+    engine = init_async_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with open_async_session() as db:
+        db.add(Project(
+            id="project-1", name="repo", webhook_url="http://hooks.local", github_repo="owner/repo"
+        ))
+        await db.commit()
+
+
+async def load_pipeline(pipeline_id: str) -> ValidationPipeline:
+    async with open_async_session() as db:
+        return await db.get(ValidationPipeline, pipeline_id)
+
+
+class TestPipelineResultCaching:
+    """Test suite for which verdicts are reused by re-validations"""
+
+    @pytest.mark.asyncio
+    async def test_evaluation_failure_is_reused_for_the_same_commit(self, monkeypatch):
+        """Test a failing web evaluation is cached and served to the next run of the commit"""
+        web_eval = FakeWebEvalService(passed=False)
+        coordinator = make_coordinator(monkeypatch, web_eval_service=web_eval)
+
+        first = add_pipeline("p1")
+        await coordinator._execute_pipeline("p1")
+        second = add_pipeline("p2")
+        await coordinator._execute_pipeline("p2")
+
+        assert first.overall_result == ValidationResult.FAILURE
+        assert second.overall_result == ValidationResult.FAILURE
+        assert second.current_step == "cached"
+        assert first.deployment_url == "http://preview.local"
+        assert second.deployment_url is None
+        assert web_eval.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_infrastructure_failure_is_not_cached(self, monkeypatch):
+        """Test a failed clone does not become the verdict of the commit"""
+        snapshot_manager = FakeSnapshotManager(clone_error="git fetch timed out")
+        coordinator = make_coordinator(monkeypatch, snapshot_manager=snapshot_manager)
+
+        first = add_pipeline("p1")
+        await coordinator._execute_pipeline("p1")
+        assert first.overall_result == ValidationResult.FAILURE
+
+        snapshot_manager.clone_error = None
+        second = add_pipeline("p2")
+        await coordinator._execute_pipeline("p2")
+
+        assert second.overall_result == ValidationResult.SUCCESS
+        assert second.current_step != "cached"
+        assert snapshot_manager.clones == 2
+
+    @pytest.mark.asyncio
+    async def test_evaluation_error_is_not_cached(self, monkeypatch):
+        """Test an evaluation that could not run is retried instead of reused"""
+        web_eval = FakeWebEvalService(error="browser crashed")
+        coordinator = make_coordinator(monkeypatch, web_eval_service=web_eval)
+
+        add_pipeline("p1")
+        await coordinator._execute_pipeline("p1")
+        web_eval.error = None
+        second = add_pipeline("p2")
+        await coordinator._execute_pipeline("p2")
+
+        assert second.overall_result == ValidationResult.SUCCESS
+        assert web_eval.calls == 2
+
+
+class TestPipelineSuperseding:
+    """Test suite for debouncing and superseding validations of a pull request"""
+
+    @pytest.mark.asyncio
+    async def test_rapid_pushes_start_only_the_latest_head(self, monkeypatch, tmp_path):
+        """Test requests within the debounce window collapse into one pipeline"""
+        await create_project_database(tmp_path)
+        coordinator = make_coordinator(monkeypatch, memory_state=False)
+
+        scheduled = [
+            await coordinator.request_validation("owner/repo", "pr-1", head_sha=sha)
+            for sha in ("sha-1", "sha-2", "sha-3")
+        ]
+        latest = scheduled[-1]["pipeline_id"]
+        await wait_until(lambda: latest in coordinator._running_pipelines)
+        await coordinator._running_pipelines[latest]
+
+        assert [await load_pipeline(item["pipeline_id"]) for item in scheduled[:2]] == [None, None]
+        pipeline = await load_pipeline(latest)
+        assert pipeline.pipeline_config["head_sha"] == "sha-3"
+        assert pipeline.overall_result == ValidationResult.SUCCESS
+        assert coordinator.web_eval_service.calls == 1
+
+        await dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_new_head_cancels_the_running_pipeline(self, monkeypatch, tmp_path):
+        """Test a push while validating cancels the older pipeline and cleans up its snapshot"""
+        await create_project_database(tmp_path)
+        web_eval = FakeWebEvalService()
+        web_eval.release = asyncio.Event()
+        coordinator = make_coordinator(monkeypatch, web_eval_service=web_eval, memory_state=False)
+        coordinator.connection_manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await coordinator.connection_manager.connect(websocket, "conn", project_id="project-1")
+
+        first = (await coordinator.request_validation("owner/repo", "pr-1", head_sha="sha-1"))["pipeline_id"]
+        await wait_until(lambda: web_eval.calls == 1)
+
+        # The same head is already being validated and is not restarted
+        repeated = await coordinator.request_validation("owner/repo", "pr-1", head_sha="sha-1")
+        assert (repeated["pipeline_id"], repeated["status"]) == (first, "running")
+
+        second = (await coordinator.request_validation("owner/repo", "pr-1", head_sha="sha-2"))["pipeline_id"]
+        await wait_until(lambda: web_eval.calls == 2)
+
+        cancelled = await load_pipeline(first)
+        assert cancelled.status == ValidationStatus.CANCELLED
+        assert cancelled.error_message == f"Superseded by pipeline {second}"
+        assert coordinator.snapshot_manager.cleanups == 1
+        assert coordinator.state_manager.active["project-1"] == {second}
+        await wait_until(lambda: any(m.get("type") == "validation_cancelled" for m in websocket.sent))
+
+        web_eval.release.set()
+        await coordinator._running_pipelines[second]
+        assert (await load_pipeline(second)).overall_result == ValidationResult.SUCCESS
+
+        coordinator.connection_manager.disconnect("conn")
+        await dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_cancel_pipeline_records_the_reason(self, monkeypatch):
+        """Test cancelling a running pipeline marks it cancelled and only succeeds once"""
+        web_eval = FakeWebEvalService()
+        web_eval.release = asyncio.Event()
+        coordinator = make_coordinator(monkeypatch, web_eval_service=web_eval)
+        coordinator.state_manager.add_active_validation("project-1", "p1")
+
+        state = add_pipeline("p1")
+        coordinator._running_pipelines["p1"] = asyncio.create_task(coordinator._execute_pipeline("p1"))
+        await wait_until(lambda: web_eval.calls == 1)
+
+        assert await coordinator.cancel_pipeline("p1", reason="Closed by author")
+        assert not await coordinator.cancel_pipeline("p1")
+
+        assert state.status == ValidationStatus.CANCELLED
+        assert state.error_message == "Closed by author"
+        assert state.overall_result is None
+        assert coordinator.state_manager.active["project-1"] == set()
+        assert "p1" not in coordinator._running_pipelines
+
+
+class TestPipelineCoordinatorClose:
+    """Test suite for releasing coordinator resources on shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_pipelines_and_releases_resources(self, monkeypatch):
+        """Test close cleans up running pipelines before closing pools and the cache"""
+        web_eval = FakeWebEvalService()
+        web_eval.release = asyncio.Event()
+        coordinator = make_coordinator(monkeypatch, web_eval_service=web_eval)
+
+        state = add_pipeline("p1")
+        coordinator._running_pipelines["p1"] = asyncio.create_task(coordinator._execute_pipeline("p1"))
+        await wait_until(lambda: web_eval.calls == 1)
+
+        await coordinator.close()
+
+        assert state.status == ValidationStatus.CANCELLED
+        assert state.error_message == "Service shutting down"
+        assert coordinator.snapshot_manager.cleanups == 1
+        assert coordinator.snapshot_manager.closed
+        assert coordinator.deployment_orchestrator.closed
+        assert coordinator.result_cache.closed
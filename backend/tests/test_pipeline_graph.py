@@ -0,0 +1,94 @@
+"""
+Tests for dependency graph execution of validation pipelines.
+"""
+
+import pytest
+import asyncio
+
+from codegenapp.validation.pipeline_graph import PipelineGraph, PipelineStep
+
+
+def make_step(name, log, delay=0.0, success=True, **kwargs):
+    """Create a step that records start/end events in a shared log"""
+    async def run(pipeline_id):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return {"success": success}
+
+    return PipelineStep(name, run, **kwargs)
+
+
+class TestPipelineGraph:
+    """Test suite for concurrent pipeline step execution"""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """Test steps sharing a dependency overlap and dependents wait"""
+        log = []
+        graph = PipelineGraph([
+            make_step("clone", log, 0.01),
+            make_step("deploy", log, 0.05, depends_on=("clone",)),
+            make_step("analysis", log, 0.05, depends_on=("clone",), required=False),
+            make_step("health", log, 0.01, depends_on=("deploy",)),
+            make_step("cleanup", log, depends_on=("health", "analysis"), always_run=True),
+        ])
+
+        results = {}
+        started = asyncio.get_running_loop().time()
+        failed = await graph.run("p1", results)
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert failed is None
+        assert elapsed < 0.1
+        assert log.index(("start", "analysis")) < log.index(("end", "deploy"))
+        assert log.index(("end", "deploy")) < log.index(("start", "health"))
+        assert log[-1] == ("end", "cleanup")
+
+    @pytest.mark.asyncio
+    async def test_required_failure_cancels_siblings_and_runs_cleanup(self):
+        """Test a failed required step cancels running steps and skips dependents"""
+        log = []
+        graph = PipelineGraph([
+            make_step("clone", log),
+            make_step("deploy", log, 0.01, success=False, depends_on=("clone",)),
+            make_step("scan", log, 1.0, depends_on=("clone",), required=False),
+            make_step("health", log, depends_on=("deploy",)),
+            make_step("cleanup", log, depends_on=("health", "scan"), always_run=True),
+        ])
+
+        results = {}
+        failed = await asyncio.wait_for(graph.run("p1", results), timeout=0.5)
+
+        assert failed == "deploy"
+        assert results["scan"] == {"success": False, "cancelled": True}
+        assert results["health"] == {"success": False, "skipped": True}
+        assert results["cleanup"] == {"success": True}
+        assert ("start", "health") not in log
+
+    @pytest.mark.asyncio
+    async def test_progress_is_weighted_by_expected_duration(self):
+        """Test progress reflects step weights rather than step counts"""
+        log, progress = [], []
+        graph = PipelineGraph([
+            make_step("short", log, expected_duration=1),
+            make_step("long", log, depends_on=("short",), expected_duration=9),
+        ])
+
+        async def on_step_finished(name, result, percentage):
+            progress.append((name, percentage))
+
+        await graph.run("p1", {}, on_step_finished)
+
+        assert progress == [("short", 10), ("long", 100)]
+
+    def test_invalid_graphs_are_rejected(self):
+        """Test unknown dependencies and cycles are rejected"""
+        with pytest.raises(ValueError):
+            PipelineGraph([make_step("a", [], depends_on=("missing",))])
+
+        with pytest.raises(ValueError):
+            PipelineGraph([
+                make_step("a", [], depends_on=("b",)),
+                make_step("b", [], depends_on=("a",)),
+            ])
@@ -0,0 +1,89 @@
+"""
+Tests for batched validation pipeline state persistence.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import event, select
+
+# Use SQLite like TestingSettings instead of the default PostgreSQL URL
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from codegenapp.database.async_session import dispose_async_engine, init_async_engine, open_async_session
+from codegenapp.models import (
+    Base, ValidationPipeline, ValidationResult, ValidationStatus, ValidationStep, ValidationStepType
+)
+from codegenapp.validation.pipeline_state import PipelineState
+
+
+async def create_database(tmp_path):
+    """Create the async engine on a temporary SQLite database with all tables"""
+    engine = init_async_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def record_statements(engine) -> list:
+    """Collect the SQL statements and commits issued through an engine"""
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def commit(conn):
+        statements.append("COMMIT")
+
+    return statements
+
+
+class TestPipelineState:
+    """Test suite for write-through pipeline state on the aiosqlite engine"""
+
+    @pytest.mark.asyncio
+    async def test_step_transition_is_one_commit_without_reselects(self, tmp_path):
+        """Test a finished step and the pipeline fields it sets are written together"""
+        engine = await create_database(tmp_path)
+        async with open_async_session() as db:
+            db.add(ValidationPipeline(
+                id="p1", project_id="project-1", pull_request_id="pr-1", status=ValidationStatus.PENDING
+            ))
+            await db.commit()
+
+        state = await PipelineState.load("p1")
+        statements = record_statements(engine)
+
+        step_id = await state.start_step(ValidationStepType.SNAPSHOT_CREATION, "snapshot_creation", 1)
+        await state.finish_step(
+            step_id,
+            artifacts={"snapshot_id": "snapshot-1"},
+            commands_executed=["docker pull app:latest", "docker run app:latest"],
+            pipeline_updates={"snapshot_id": "snapshot-1", "progress_percentage": 20}
+        )
+
+        assert state.write_count == 2
+        assert statements == ["INSERT", "COMMIT", "UPDATE", "UPDATE", "COMMIT"]
+        assert state.snapshot_id == "snapshot-1"
+
+        async with open_async_session() as db:
+            pipeline = await db.get(ValidationPipeline, "p1")
+            step = (await db.execute(select(ValidationStep))).scalar_one()
+
+        assert (pipeline.snapshot_id, pipeline.progress_percentage) == ("snapshot-1", 20)
+        assert (step.id, step.status, step.result) == (step_id, ValidationStatus.COMPLETED, ValidationResult.SUCCESS)
+        assert step.artifacts == {"snapshot_id": "snapshot-1"}
+        assert step.command_executed == "docker pull app:latest\ndocker run app:latest"
+
+        await dispose_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_missing_pipeline_loads_as_none(self, tmp_path):
+        """Test loading an unknown pipeline returns None instead of empty state"""
+        await create_database(tmp_path)
+
+        assert await PipelineState.load("missing") is None
+
+        await dispose_async_engine()
@@ -0,0 +1,99 @@
+"""
+Tests for progress update throttling.
+"""
+
+import pytest
+import asyncio
+
+from codegenapp.websocket.progress_throttle import ProgressThrottle
+from codegenapp.websocket.manager import WebSocketManager
+
+from test_connection_manager import FakeWebSocket
+
+
+class TestProgressThrottle:
+    """Test suite for per-key progress coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_burst_sends_first_and_latest(self):
+        """Test a burst sends the first update immediately and the latest after the interval"""
+        throttle = ProgressThrottle(max_updates_per_second=20)
+        sent = []
+
+        async def send(message):
+            sent.append(message["progress"])
+
+        for progress in range(1, 51):
+            await throttle.submit(("project-1", "run-1"), {"progress": progress}, send)
+
+        assert sent == [1]
+
+        await asyncio.sleep(0.1)
+        assert sent == [1, 50]
+        assert throttle.coalesced_count == 48
+
+    @pytest.mark.asyncio
+    async def test_keys_are_throttled_independently(self):
+        """Test different runs do not share a throttle window"""
+        throttle = ProgressThrottle(max_updates_per_second=1)
+        sent = []
+
+        async def send(message):
+            sent.append(message["run_id"])
+
+        await throttle.submit(("project-1", "run-1"), {"run_id": "run-1"}, send)
+        await throttle.submit(("project-1", "run-2"), {"run_id": "run-2"}, send)
+
+        assert sent == ["run-1", "run-2"]
+        await throttle.close()
+
+    @pytest.mark.asyncio
+    async def test_finish_discards_buffered_progress(self):
+        """Test buffered progress is never sent after a terminal event"""
+        throttle = ProgressThrottle(max_updates_per_second=20)
+        sent = []
+
+        async def send(message):
+            sent.append(message["progress"])
+
+        await throttle.submit("run-1", {"progress": 10}, send)
+        await throttle.submit("run-1", {"progress": 20}, send)
+        throttle.finish("run-1")
+
+        await asyncio.sleep(0.1)
+        assert sent == [10]
+        assert throttle.get_stats()["tracked_keys"] == 0
+
+    @pytest.mark.asyncio
+    async def test_keys_expire_after_the_interval(self):
+        """Test runs that never finish do not stay tracked"""
+        throttle = ProgressThrottle(max_updates_per_second=20)
+        sent = []
+
+        async def send(message):
+            sent.append(message["run_id"])
+
+        for run in range(100):
+            await throttle.submit(("project-1", f"run-{run}"), {"run_id": run}, send)
+        assert throttle.get_stats()["tracked_keys"] == 100
+
+        await asyncio.sleep(0.06)
+        await throttle.submit(("project-1", "run-0"), {"run_id": 0}, send)
+
+        assert throttle.get_stats()["tracked_keys"] == 1
+        assert sent.count(0) == 2
+
+    @pytest.mark.asyncio
+    async def test_terminal_progress_bypasses_throttle(self):
+        """Test WebSocketManager sends completed status immediately and last"""
+        manager = WebSocketManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "owner/repo")
+
+        for progress in (10, 20, 30):
+            await manager.send_progress_update("task-1", progress, "running", project_name="owner/repo")
+        await manager.send_progress_update("task-1", 100, "completed", project_name="owner/repo")
+
+        await asyncio.sleep(0.5)
+        updates = [(m["progress"], m["status"]) for m in websocket.sent if m["type"] == "progress_update"]
+        assert updates == [(10, "running"), (100, "completed")]
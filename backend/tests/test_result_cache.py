@@ -0,0 +1,51 @@
+"""
+Tests for the commit-keyed validation result cache.
+"""
+
+import pytest
+import asyncio
+
+from codegenapp.validation.result_cache import (
+    InMemoryValidationResultCache, create_validation_result_cache, validation_cache_key
+)
+
+
+class TestValidationResultCache:
+    """Test suite for cached validation verdicts"""
+
+    def test_key_ignores_volatile_config(self):
+        """Test the key depends on project, commit and config but not the head SHA entry"""
+        config = {"timeout_minutes": 30, "head_sha": "abc", "force_rerun": False}
+
+        key = validation_cache_key("p1", "abc", config)
+
+        assert key == validation_cache_key("p1", "abc", {"timeout_minutes": 30, "force_rerun": True})
+        assert key != validation_cache_key("p1", "def", config)
+        assert key != validation_cache_key("p2", "abc", config)
+        assert key != validation_cache_key("p1", "abc", {"timeout_minutes": 60})
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        """Test verdicts are served until the TTL elapses"""
+        cache = InMemoryValidationResultCache(ttl=0.05)
+        await cache.set("k", {"overall_result": "success"})
+
+        assert await cache.get("k") == {"overall_result": "success"}
+        await asyncio.sleep(0.06)
+        assert await cache.get("k") is None
+        assert cache.get_stats() == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_oldest_entry_is_evicted_when_full(self):
+        """Test the cache stays within its size bound"""
+        cache = InMemoryValidationResultCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            await cache.set(key, {"overall_result": "success"})
+
+        assert len(cache) == 2
+        assert await cache.get("a") is None
+
+    def test_unknown_backend_is_rejected(self):
+        """Test the factory rejects unknown backends"""
+        with pytest.raises(ValueError):
+            create_validation_result_cache("memcached")
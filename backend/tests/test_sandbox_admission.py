@@ -0,0 +1,137 @@
+"""
+Tests for sandbox admission control.
+"""
+
+import pytest
+import asyncio
+
+from codegenapp.services.adapters.grainchain_adapter import GrainchainAdapter
+from codegenapp.services.adapters.sandbox_admission import (
+    ResourceRequest, SandboxAdmissionController, SandboxAdmissionError
+)
+from codegenapp.services.adapters.sandbox_backends import SimulatedSandboxBackend
+
+GIB = 1024 ** 3
+
+
+class TestSandboxAdmissionController:
+    """Test suite for resource-aware fair admission"""
+
+    @pytest.mark.asyncio
+    async def test_requests_beyond_capacity_queue_until_release(self):
+        """Test a request that does not fit waits instead of failing"""
+        controller = SandboxAdmissionController(ResourceRequest(cpu=2, memory=4 * GIB, ports=10))
+        await controller.acquire("a", "p1", ResourceRequest(cpu=2, memory=GIB))
+
+        waiter = asyncio.create_task(controller.acquire("b", "p1", ResourceRequest(cpu=1, memory=GIB)))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert controller.expected_wait("p1") > 0
+
+        controller.release("a")
+        await asyncio.wait_for(waiter, timeout=1)
+        assert controller.is_admitted("b")
+
+    @pytest.mark.asyncio
+    async def test_projects_are_served_round_robin(self):
+        """Test a burst from one project does not starve another"""
+        controller = SandboxAdmissionController(ResourceRequest(cpu=1, memory=GIB, ports=10))
+        request = ResourceRequest(cpu=1, memory=GIB)
+        await controller.acquire("running", "busy", request)
+
+        order = []
+
+        async def acquire(sandbox_id, project_id):
+            await controller.acquire(sandbox_id, project_id, request)
+            order.append(sandbox_id)
+
+        tasks = [asyncio.create_task(acquire(f"busy-{i}", "busy")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(acquire("quiet-0", "quiet")))
+        await asyncio.sleep(0)
+
+        previous = "running"
+        for _ in range(4):
+            controller.release(previous)
+            await asyncio.sleep(0.01)
+            previous = order[-1]
+
+        assert order[:2] == ["busy-0", "quiet-0"]
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_oversized_and_timed_out_requests_fail(self):
+        """Test impossible requests fail fast and waits honour the timeout"""
+        controller = SandboxAdmissionController(ResourceRequest(cpu=1, memory=GIB, ports=1))
+
+        with pytest.raises(SandboxAdmissionError):
+            await controller.acquire("big", "p", ResourceRequest(cpu=4, memory=GIB))
+
+        await controller.acquire("a", "p", ResourceRequest(cpu=1, memory=GIB))
+        with pytest.raises(SandboxAdmissionError):
+            await controller.acquire("b", "p", ResourceRequest(cpu=1, memory=GIB), timeout=0.05)
+        assert controller.queued_count == 0
+
+
+class TestGrainchainAdapterAdmission:
+    """Test suite for queued sandbox creation and expiry"""
+
+    @pytest.mark.asyncio
+    async def test_burst_queues_and_expired_sandboxes_are_reaped(self):
+        """Test sandboxes over capacity queue, and reaping frees room for them"""
+        adapter = GrainchainAdapter(
+            {"sandbox_capacity": {"cpu": 1, "memory": "1Gi", "ports": 10}},
+            backend=SimulatedSandboxBackend(startup_delay=0)
+        )
+        parameters = {"resources": {"cpu": 1, "memory": "512Mi"}, "timeout": 0.01}
+        try:
+            first = await adapter.execute_action("create_sandbox", {"parameters": dict(parameters)})
+            await asyncio.sleep(0.02)
+            second = await adapter.execute_action("create_sandbox", {"parameters": dict(parameters)})
+            await asyncio.sleep(0.01)
+
+            assert first["queued"] is False
+            assert second["queued"] is True
+            assert (await adapter.health_check()).startswith("degraded")
+
+            assert await adapter.reap_expired_sandboxes() == 1
+            await asyncio.wait_for(adapter._startup_tasks[second["sandbox_id"]], timeout=1)
+
+            info = await adapter.execute_action("get_sandbox", {"parameters": {"sandbox_id": second["sandbox_id"]}})
+            assert info["status"] == "RUNNING"
+            assert await adapter.health_check() == "healthy"
+        finally:
+            await adapter.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_exited_sandboxes_free_admission_and_finished_entries_expire(self):
+        """Test an exited sandbox releases its budget and finished entries are dropped after retention"""
+        adapter = GrainchainAdapter(
+            {
+                "sandbox_capacity": {"cpu": 1, "memory": "1Gi", "ports": 10},
+                "admission_timeout": 0.05,
+                "finished_sandbox_retention": 0.2
+            },
+            backend=SimulatedSandboxBackend(startup_delay=0)
+        )
+        parameters = {"resources": {"cpu": 1, "memory": "512Mi"}, "timeout": 3600}
+        try:
+            first = await adapter.execute_action("create_sandbox", {"parameters": dict(parameters)})
+            await asyncio.sleep(0.01)
+            second = await adapter.execute_action("create_sandbox", {"parameters": dict(parameters)})
+            await asyncio.wait_for(adapter._startup_tasks[second["sandbox_id"]], timeout=1)
+            assert adapter.active_sandboxes[second["sandbox_id"]]["status"].value == "FAILED"
+
+            # The first sandbox's process exits on its own
+            await adapter.backend.stop(first["sandbox_id"])
+            assert await adapter.reap_expired_sandboxes() == 1
+
+            info = await adapter.execute_action("get_sandbox", {"parameters": {"sandbox_id": first["sandbox_id"]}})
+            assert info["status"] == "STOPPED"
+            assert not adapter.admission.is_admitted(first["sandbox_id"])
+
+            await asyncio.sleep(0.25)
+            assert await adapter.reap_expired_sandboxes() == 2
+            assert adapter.active_sandboxes == {}
+        finally:
+            await adapter.cleanup()
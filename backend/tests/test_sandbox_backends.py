@@ -0,0 +1,111 @@
+"""
+Tests for Grainchain sandbox backends.
+"""
+
+import pytest
+import asyncio
+import subprocess
+import sys
+import urllib.request
+
+from codegenapp.services.adapters.grainchain_adapter import GrainchainAdapter
+from codegenapp.services.adapters.sandbox_backends import (
+    LocalProcessSandboxBackend, SandboxSpec, parse_cpu, parse_memory
+)
+
+
+def fetch(url):
+    """GET a URL and return the response status"""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.status
+
+
+class TestLocalProcessSandboxBackend:
+    """Test suite for subprocess-backed sandboxes"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("isolation", ["none", "auto"])
+    async def test_sandbox_serves_on_allocated_port(self, isolation):
+        """Test a sandbox listens on its own port and stops cleanly"""
+        backend = LocalProcessSandboxBackend(isolation=isolation)
+        try:
+            first, second = await asyncio.gather(
+                backend.start("sb-1", SandboxSpec(image="local")),
+                backend.start("sb-2", SandboxSpec(image="local")),
+            )
+
+            assert first["endpoints"]["http"] != second["endpoints"]["http"]
+            assert await asyncio.to_thread(fetch, first["endpoints"]["http"]) == 200
+            assert backend.ports.in_use == 2
+        finally:
+            await backend.close()
+
+        assert backend.ports.in_use == 0
+        assert not backend.is_running("sb-1")
+
+    @pytest.mark.asyncio
+    async def test_crashing_command_fails_start(self):
+        """Test a command that exits before listening is reported as failed"""
+        backend = LocalProcessSandboxBackend(isolation="none", start_timeout=5)
+
+        with pytest.raises(RuntimeError):
+            await backend.start("sb", SandboxSpec(image="local", command=[sys.executable, "-c", "raise SystemExit(3)"]))
+
+        assert backend.ports.in_use == 0
+
+    def test_child_joins_cgroup_before_exec(self, tmp_path):
+        """Test the child writes its own PID to the cgroup before exec"""
+        (tmp_path / "cgroup.procs").write_text("")
+        preexec = LocalProcessSandboxBackend._sandbox_preexec(tmp_path, 2 * 1024 ** 3)
+
+        output = subprocess.run(
+            [sys.executable, "-c", "import os; print(os.getpid())"],
+            preexec_fn=preexec, capture_output=True, text=True, check=True
+        ).stdout
+
+        assert (tmp_path / "cgroup.procs").read_text() == output.strip()
+        assert LocalProcessSandboxBackend._in_cgroup(tmp_path, int(output))
+
+    def test_child_falls_back_to_rlimits_without_cgroup(self, tmp_path):
+        """Test the memory rlimit applies when the cgroup cannot be joined"""
+        memory = 2 * 1024 ** 3
+        preexec = LocalProcessSandboxBackend._sandbox_preexec(tmp_path / "missing", memory)
+
+        output = subprocess.run(
+            [sys.executable, "-c", "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])"],
+            preexec_fn=preexec, capture_output=True, text=True, check=True
+        ).stdout
+
+        assert int(output) == memory
+
+    def test_resource_quantities(self):
+        """Test CPU and memory quantities are parsed"""
+        assert parse_cpu("500m") == 0.5
+        assert parse_cpu("2 cores") == 2.0
+        assert parse_memory("4GB") == 4 * 1000 ** 3
+        assert parse_memory("512Mi") == 512 * 1024 ** 2
+
+
+class TestGrainchainAdapterSandboxes:
+    """Test suite for adapter sandbox lifecycle on the local backend"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sandboxes_get_unique_ids(self):
+        """Test concurrently created sandboxes get distinct IDs and real endpoints"""
+        adapter = GrainchainAdapter({"sandbox_backend": "local", "sandbox_isolation": "none", "sandbox_capacity": {"cpu": 8}})
+        try:
+            created = await asyncio.gather(*(
+                adapter.execute_action("create_sandbox", {"parameters": {}}) for _ in range(3)
+            ))
+            ids = [sandbox["sandbox_id"] for sandbox in created]
+            assert len(set(ids)) == 3
+
+            await asyncio.gather(*adapter._startup_tasks.values())
+            info = await adapter.execute_action("get_sandbox", {"parameters": {"sandbox_id": ids[0]}})
+            assert info["status"] == "RUNNING"
+            assert await asyncio.to_thread(fetch, info["endpoints"]["http"]) == 200
+
+            await adapter.execute_action("destroy_sandbox", {"parameters": {"sandbox_id": ids[0]}})
+            assert not adapter.backend.is_running(ids[0])
+        finally:
+            await adapter.cleanup()
@@ -0,0 +1,139 @@
+"""
+Tests for sandbox log ring buffers and streaming.
+"""
+
+import pytest
+import asyncio
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from codegenapp.api.websocket import router
+from codegenapp.services.adapters.grainchain_adapter import GrainchainAdapter
+from codegenapp.services.adapters.sandbox_logs import LogRingBuffer, SandboxLogStore, sandbox_log_store
+
+
+class TestLogRingBuffer:
+    """Test suite for offset-addressed log buffers"""
+
+    def test_reads_resume_from_offset(self):
+        """Test a reader only receives bytes after its last offset"""
+        buffer = LogRingBuffer(max_bytes=100)
+        buffer.append(b"hello ")
+        first = buffer.read(0)
+        buffer.append(b"world")
+        second = buffer.read(first["next_offset"])
+
+        assert first["data"] == b"hello "
+        assert second == {"data": b"world", "offset": 6, "next_offset": 11, "truncated": False, "eof": False}
+
+    def test_oldest_bytes_are_dropped_when_full(self):
+        """Test overflow drops old output and flags lagging readers"""
+        buffer = LogRingBuffer(max_bytes=8)
+        buffer.append(b"0123456789abcdef")
+
+        chunk = buffer.read(0)
+
+        assert chunk["data"] == b"89abcdef"
+        assert chunk["offset"] == 8
+        assert chunk["truncated"] is True
+
+    def test_text_reads_stop_at_character_boundaries(self):
+        """Test a multibyte character split across writes or reads is not mangled"""
+        buffer = LogRingBuffer(max_bytes=100)
+        encoded = "ok ✓ done".encode("utf-8")
+        buffer.append(encoded[:4])
+        buffer.append(encoded[4:5])
+
+        first = buffer.read_text(0)
+        buffer.append(encoded[5:])
+        second = buffer.read_text(first["next_offset"], max_bytes=2)
+        third = buffer.read_text(second["next_offset"])
+
+        assert first["text"] == "ok " and first["next_offset"] == 3
+        assert second["text"] == "" and second["next_offset"] == 3
+        assert third["text"] == "✓ done"
+        assert "\ufffd" not in first["text"] + third["text"]
+
+    def test_text_reads_skip_partial_character_after_truncation(self):
+        """Test a read after dropped bytes starts at the next whole character"""
+        buffer = LogRingBuffer(max_bytes=3)
+        buffer.append("a✓b".encode("utf-8"))
+
+        chunk = buffer.read_text(0)
+
+        assert chunk["text"] == "b"
+        assert chunk["offset"] == 4
+        assert chunk["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_on_append_and_close(self):
+        """Test waiting readers wake for new output and for EOF"""
+        buffer = LogRingBuffer()
+        waiter = asyncio.create_task(buffer.wait(0, timeout=1))
+        await asyncio.sleep(0)
+        buffer.append(b"x")
+        assert await waiter is True
+
+        waiter = asyncio.create_task(buffer.wait(1, timeout=1))
+        await asyncio.sleep(0)
+        buffer.close()
+        assert await waiter is True
+        assert buffer.read(1)["eof"] is True
+
+
+class TestSandboxOutputCapture:
+    """Test suite for capturing real sandbox output"""
+
+    @pytest.mark.asyncio
+    async def test_local_sandbox_output_is_tailed_by_offset(self):
+        """Test output of a local sandbox process is readable incrementally"""
+        logs = SandboxLogStore()
+        adapter = GrainchainAdapter({"sandbox_backend": "local", "sandbox_isolation": "none", "sandbox_capacity": {"cpu": 8}}, logs=logs)
+        script = (
+            "import http.server, os, sys\n"
+            "print('building step 1', flush=True)\n"
+            "print('warning: deprecated', file=sys.stderr, flush=True)\n"
+            "http.server.test(http.server.SimpleHTTPRequestHandler, port=int(os.environ['PORT']), bind='127.0.0.1')\n"
+        )
+        try:
+            created = await adapter.execute_action("create_sandbox", {
+                "parameters": {"command": [sys.executable, "-u", "-c", script]}
+            })
+            sandbox_id = created["sandbox_id"]
+            await asyncio.gather(*adapter._startup_tasks.values())
+
+            first = adapter.get_sandbox_logs(sandbox_id)
+            assert "building step 1" in first["logs"]
+            assert "warning: deprecated" in first["logs"]
+
+            again = adapter.get_sandbox_logs(sandbox_id, since_offset=first["next_offset"])
+            assert again["offset"] == first["next_offset"]
+
+            await adapter.execute_action("destroy_sandbox", {"parameters": {"sandbox_id": sandbox_id}})
+            assert adapter.get_sandbox_logs(sandbox_id, since_offset=first["next_offset"]) is not None
+            assert logs.get(sandbox_id).closed
+        finally:
+            await adapter.cleanup()
+
+
+class TestSandboxLogWebSocket:
+    """Test suite for the sandbox log streaming channel"""
+
+    def test_stream_sends_new_bytes_then_end(self):
+        """Test the channel streams from the requested offset and ends at EOF"""
+        buffer = sandbox_log_store.create("sandbox-ws-test")
+        buffer.append(b"line 1\nline 2\n")
+        sandbox_log_store.close("sandbox-ws-test")
+
+        app = FastAPI()
+        app.include_router(router)
+
+        with TestClient(app).websocket_connect("/ws/sandboxes/sandbox-ws-test/logs?since_offset=7") as websocket:
+            chunk = websocket.receive_json()
+            end = websocket.receive_json()
+
+        assert chunk["text"] == "line 2\n"
+        assert chunk["offset"] == 7
+        assert end == {"type": "sandbox_logs_end", "sandbox_id": "sandbox-ws-test", "next_offset": 14}
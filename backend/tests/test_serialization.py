@@ -0,0 +1,99 @@
+"""
+Tests for the JSON serialization fast path.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from codegenapp.models.workflow_state import WorkflowState, WorkflowTransition
+from codegenapp.services.adapters.graph_sitter_adapter import AnalysisType, SymbolInfo
+from codegenapp.utils import serialization
+from codegenapp.utils.serialization import FastJSONResponse, dumps, dumps_text, loads
+
+
+def sample_payload() -> dict:
+    return {
+        "timestamp": datetime(2024, 5, 1, 12, 30, 15, 250000),
+        "state": WorkflowState.VALIDATING,
+        "analysis_type": AnalysisType.FULL_CODEBASE,
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "symbol": SymbolInfo(name="run", type="function", file_path="app.py", line_number=3),
+        "transition": WorkflowTransition(
+            from_state=WorkflowState.CODING,
+            to_state=WorkflowState.PR_CREATED,
+            timestamp=datetime(2024, 5, 1, 12, 0),
+            trigger="pr_opened"
+        ),
+        "tags": {"ci"},
+        "cost": Decimal("1.5"),
+        "counts": {1: "one"},
+        "text": "line one\nline two — ünïcode",
+    }
+
+
+EXPECTED = {
+    "timestamp": "2024-05-01T12:30:15.250000",
+    "state": "validating",
+    "analysis_type": "full_codebase",
+    "id": "12345678-1234-5678-1234-567812345678",
+    "symbol": {
+        "name": "run", "type": "function", "file_path": "app.py", "line_number": 3,
+        "column_number": None, "definition": None, "usages": [], "parameters": [],
+        "return_type": None, "docstring": None,
+    },
+    "transition": {
+        "from_state": "coding", "to_state": "pr_created",
+        "timestamp": "2024-05-01T12:00:00", "trigger": "pr_opened", "metadata": None,
+    },
+    "tags": ["ci"],
+    "cost": 1.5,
+    "counts": {"1": "one"},
+    "text": "line one\nline two — ünïcode",
+}
+
+
+class TestSerialization:
+    """Test suite for orjson-backed serialization"""
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_datetimes_enums_and_models_encoded(self, monkeypatch, orjson_available):
+        """Test both encoders produce the same JSON for the supported types"""
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", orjson_available)
+
+        encoded = dumps(sample_payload())
+
+        assert isinstance(encoded, bytes)
+        assert b"\n" not in encoded
+        assert json.loads(encoded) == EXPECTED
+        assert loads(dumps_text(sample_payload())) == EXPECTED
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_unsupported_types_are_rejected(self, monkeypatch, orjson_available):
+        """Test unknown objects raise instead of being stringified"""
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", orjson_available)
+
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+    def test_response_class_renders_dataclasses(self):
+        """Test FastJSONResponse encodes dataclass results returned by a route"""
+        app = FastAPI()
+
+        @app.get("/symbol")
+        async def symbol():
+            return FastJSONResponse({
+                "analysis_type": AnalysisType.SYMBOL_ANALYSIS,
+                "data": SymbolInfo(name="run", type="function", file_path="app.py", line_number=3),
+            })
+
+        response = TestClient(app).get("/symbol")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"analysis_type": "symbol_analysis", "data": EXPECTED["symbol"]}
@@ -0,0 +1,103 @@
+"""
+Tests for the warm snapshot pool.
+"""
+
+import pytest
+import asyncio
+
+from codegenapp.validation.snapshot_pool import SnapshotPool
+
+
+class FakeProvider:
+    """Records snapshot lifecycle calls"""
+
+    def __init__(self, fail_reset: bool = False):
+        self.fail_reset = fail_reset
+        self.provisioned = 0
+        self.reset = []
+        self.destroyed = []
+
+    async def provision(self, key):
+        self.provisioned += 1
+        await asyncio.sleep(0.01)
+        return {"snapshot_id": f"{key}-{self.provisioned}"}
+
+    async def do_reset(self, snapshot):
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.reset.append(snapshot["snapshot_id"])
+
+    async def destroy(self, snapshot):
+        self.destroyed.append(snapshot["snapshot_id"])
+
+
+def make_pool(provider, **kwargs):
+    return SnapshotPool(provider.provision, provider.do_reset, provider.destroy, **kwargs)
+
+
+class TestSnapshotPool:
+    """Test suite for snapshot reuse, replenishment and eviction"""
+
+    @pytest.mark.asyncio
+    async def test_warm_snapshot_is_acquired_and_replenished(self):
+        """Test acquire hands out a warm snapshot and refills the pool"""
+        provider = FakeProvider()
+        pool = make_pool(provider, min_size=1)
+
+        await pool.warm("project-1")
+        snapshot, warm = await pool.acquire("project-1")
+
+        assert warm and snapshot["snapshot_id"] == "project-1-1"
+        await asyncio.sleep(0.05)
+        assert pool.get_stats()["idle"] == {"project-1": 1}
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_returned_snapshots_are_reset_and_bounded(self):
+        """Test released snapshots are reset, reused, and destroyed beyond max_size"""
+        provider = FakeProvider()
+        pool = make_pool(provider, min_size=0, max_size=1)
+
+        first, warm = await pool.acquire("project-1")
+        second, _ = await pool.acquire("project-1")
+        assert not warm
+
+        assert await pool.release("project-1", first)
+        assert not await pool.release("project-1", second)
+        assert provider.reset == [first["snapshot_id"]]
+        assert provider.destroyed == [second["snapshot_id"]]
+
+        reused, warm = await pool.acquire("project-1")
+        assert warm and reused is first
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_reset_destroys_snapshot(self):
+        """Test a snapshot that cannot be reset is not returned to the pool"""
+        provider = FakeProvider(fail_reset=True)
+        pool = make_pool(provider, min_size=0)
+
+        snapshot, _ = await pool.acquire("project-1")
+
+        assert not await pool.release("project-1", snapshot)
+        assert provider.destroyed == [snapshot["snapshot_id"]]
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_snapshots_above_minimum_are_evicted(self):
+        """Test eviction keeps min_size snapshots and destroys the rest"""
+        provider = FakeProvider()
+        pool = make_pool(provider, min_size=1, max_size=3, idle_timeout=0)
+
+        snapshots = [(await pool.acquire("project-1"))[0] for _ in range(3)]
+        await asyncio.sleep(0.05)
+        for snapshot in snapshots:
+            await pool.release("project-1", snapshot)
+
+        assert await pool.evict_idle() == 2
+        assert pool.get_stats()["idle"] == {"project-1": 1}
+
+        await pool.close()
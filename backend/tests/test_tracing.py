@@ -0,0 +1,102 @@
+"""
+Tests for request-scoped tracing and critical-path summaries.
+"""
+
+import pytest
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from codegenapp.observability.tracing import (
+    JsonFileTracer, Tracer, TracingMiddleware, create_tracer, get_tracer, set_tracer
+)
+
+
+class TestTracing:
+    """Test suite for spans, context propagation and trace export"""
+
+    @pytest.mark.asyncio
+    async def test_background_tasks_inherit_the_current_span(self, tmp_path):
+        """Test spans started in create_task are children of the span that created the task"""
+        tracer = JsonFileTracer(str(tmp_path), export_delay=0.05)
+
+        async def background():
+            with tracer.start_as_current_span("background", {"component": "grainchain"}):
+                await asyncio.sleep(0.02)
+
+        with tracer.start_as_current_span("request", {"component": "http"}) as root:
+            task = asyncio.create_task(background())
+        await task
+        await asyncio.sleep(0.1)  # trace is exported after the delay, off the event loop
+
+        document = json.loads((tmp_path / f"{root.trace_id}.json").read_text())
+        spans = {span["name"]: span for span in document["spans"]}
+        assert spans["background"]["parent_id"] == spans["request"]["span_id"]
+        assert spans["background"]["trace_id"] == root.trace_id
+
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_the_slowest_chain(self, tmp_path):
+        """Test the summary follows sequential steps and skips parallel work that ended early"""
+        tracer = JsonFileTracer(str(tmp_path), export_delay=0)
+
+        async def step(name: str, component: str, seconds: float):
+            with tracer.start_as_current_span(name, {"component": component}):
+                await asyncio.sleep(seconds)
+
+        with tracer.start_as_current_span("workflow.execute", new_trace=True):
+            await step("deploy", "grainchain", 0.05)
+            await asyncio.gather(step("web_eval", "web-eval-agent", 0.08), step("analysis", "graph-sitter", 0.01))
+
+        summary = tracer.get_recent_traces()[0]
+        assert [entry["name"] for entry in summary["critical_path"]] == ["workflow.execute", "deploy", "web_eval"]
+        assert list(summary["critical_path_by_component"])[0] == "web-eval-agent"
+        assert summary["span_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_spans_record_the_error(self, tmp_path):
+        """Test exceptions are recorded on the span and re-raised"""
+        tracer = JsonFileTracer(str(tmp_path), export_delay=0)
+
+        with pytest.raises(RuntimeError):
+            with tracer.start_as_current_span("codegen.create_agent_run"):
+                raise RuntimeError("boom")
+
+        assert tracer.get_recent_traces()[0]["critical_path"][0]["error"] == "RuntimeError: boom"
+
+    def test_middleware_wraps_each_request_in_a_root_span(self, tmp_path):
+        """Test the ASGI middleware opens one root span per HTTP request"""
+        tracer = JsonFileTracer(str(tmp_path), export_delay=0)
+        app = FastAPI()
+        app.add_middleware(TracingMiddleware)
+
+        @app.get("/ping")
+        async def ping():
+            with tracer.start_as_current_span("handler"):
+                return {"ok": True}
+
+        previous = get_tracer()
+        set_tracer(tracer)
+        try:
+            assert TestClient(app).get("/ping").json() == {"ok": True}
+        finally:
+            set_tracer(previous)
+
+        summary = tracer.get_recent_traces()[0]
+        assert [entry["name"] for entry in summary["critical_path"]] == ["GET /ping", "handler"]
+
+    def test_default_tracer_records_nothing(self, tmp_path):
+        """Test the no-op tracer is the default and writes no files"""
+        tracer = create_tracer()
+
+        with tracer.start_as_current_span("request") as span:
+            span.set_attribute("status", 200)
+
+        assert type(tracer) is Tracer
+        assert tracer.get_recent_traces() == []
+
+    def test_unknown_backend_is_rejected(self):
+        """Test the factory rejects unknown backends"""
+        with pytest.raises(ValueError):
+            create_tracer("zipkin")
@@ -0,0 +1,119 @@
+"""
+Tests for the managed Web-Eval-Agent runtime.
+"""
+
+import pytest
+import asyncio
+import textwrap
+
+from codegenapp.services.adapters.web_eval_runtime import WebEvalRuntime, WebEvalRuntimeError
+
+FAKE_AGENT = textwrap.dedent('''
+    import argparse, json, os, time
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = json.load(f)
+
+    if config.get("sleep"):
+        time.sleep(config["sleep"])
+
+    if config.get("raw_output"):
+        # Bypasses sys.stdout like a subprocess or C extension would
+        os.write(1, b"stray output\\n")
+
+    print("evaluating", config["target_url"])
+    with open(args.output, "w") as f:
+        json.dump({
+            "success": True,
+            "test_results": [{"pid": os.getpid(), "key": os.environ.get("GEMINI_API_KEY")}],
+        }, f)
+''')
+
+
+@pytest.fixture
+def agent_dir(tmp_path):
+    """Create a vendored agent checkout"""
+    path = tmp_path / "web-eval-agent"
+    path.mkdir()
+    (path / "main.py").write_text(FAKE_AGENT)
+    return str(path)
+
+
+class TestWebEvalRuntime:
+    """Test suite for the persistent worker pool"""
+
+    @pytest.mark.asyncio
+    async def test_evaluations_reuse_warm_worker(self, agent_dir):
+        """Test evaluations run on the same worker process from a vendored checkout"""
+        runtime = WebEvalRuntime(agent_path=agent_dir, repository_url=None, workers=1)
+        try:
+            first = await runtime.evaluate({"target_url": "http://a"}, env={"GEMINI_API_KEY": "k1"})
+            second = await runtime.evaluate({"target_url": "http://b"}, env={"GEMINI_API_KEY": "k2"})
+        finally:
+            await runtime.close()
+
+        assert first["exit_code"] == 0
+        assert "evaluating http://a" in first["logs"]
+        assert first["results"]["test_results"][0]["key"] == "k1"
+        assert second["results"]["test_results"][0]["key"] == "k2"
+        assert first["results"]["test_results"][0]["pid"] == second["results"]["test_results"][0]["pid"]
+
+    @pytest.mark.asyncio
+    async def test_timed_out_worker_is_replaced(self, agent_dir):
+        """Test a hung evaluation kills its worker and the pool keeps serving"""
+        runtime = WebEvalRuntime(agent_path=agent_dir, repository_url=None, workers=1)
+        try:
+            with pytest.raises(WebEvalRuntimeError):
+                await runtime.evaluate({"target_url": "http://a", "sleep": 5}, timeout=0.5)
+
+            result = await runtime.evaluate({"target_url": "http://b"})
+        finally:
+            await runtime.close()
+
+        assert result["results"]["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_cancelled_evaluation_does_not_leak_its_response(self, agent_dir):
+        """Test a worker cancelled mid-evaluation is replaced instead of reused"""
+        runtime = WebEvalRuntime(agent_path=agent_dir, repository_url=None, workers=1)
+        try:
+            task = asyncio.create_task(runtime.evaluate({"target_url": "http://stale", "sleep": 0.5}))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # The stale evaluation finishes meanwhile; its result must not be read as ours
+            await asyncio.sleep(0.5)
+            result = await runtime.evaluate({"target_url": "http://fresh"})
+        finally:
+            await runtime.close()
+
+        assert "evaluating http://fresh" in result["logs"]
+        assert "http://stale" not in result["logs"]
+
+    @pytest.mark.asyncio
+    async def test_raw_fd_output_does_not_corrupt_protocol(self, agent_dir):
+        """Test output written straight to fd 1 goes to stderr, not the response stream"""
+        runtime = WebEvalRuntime(agent_path=agent_dir, repository_url=None, workers=1)
+        try:
+            first = await runtime.evaluate({"target_url": "http://a", "raw_output": True})
+            second = await runtime.evaluate({"target_url": "http://b"})
+        finally:
+            await runtime.close()
+
+        assert first["results"]["success"] is True
+        assert "evaluating http://b" in second["logs"]
+
+    @pytest.mark.asyncio
+    async def test_offline_without_checkout_fails(self, tmp_path):
+        """Test a missing install with cloning disabled raises instead of hitting the network"""
+        runtime = WebEvalRuntime(install_dir=str(tmp_path / "missing"), repository_url=None)
+
+        with pytest.raises(WebEvalRuntimeError):
+            await runtime.evaluate({"target_url": "http://a"})
@@ -0,0 +1,90 @@
+"""
+Tests for webhook ingress signature and size checks.
+"""
+
+import pytest
+import hashlib
+import hmac
+import json
+
+from codegenapp.services.webhook_ingress import (
+    WebhookPayloadTooLargeError, WebhookSignatureError, extract_webhook_fields, read_webhook_body
+)
+
+
+class FakeRequest:
+    """Request stand-in streaming a body in fixed-size chunks"""
+
+    def __init__(self, body: bytes, chunk_size: int = 1024, headers=None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = headers or {}
+        self.streamed_bytes = 0
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[start:start + self.chunk_size]
+            self.streamed_bytes += len(chunk)
+            yield chunk
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class TestWebhookIngress:
+    """Test suite for streamed webhook verification and field extraction"""
+
+    @pytest.mark.asyncio
+    async def test_valid_signature_returns_body(self):
+        """Test a correctly signed body streamed in chunks is accepted"""
+        body = json.dumps({"ref": "refs/heads/main", "padding": "x" * 5000}).encode()
+        request = FakeRequest(body)
+
+        result = await read_webhook_body(request, secret="s3cret", signature=sign("s3cret", body))
+
+        assert result == body
+
+    @pytest.mark.asyncio
+    async def test_bad_or_missing_signature_is_rejected(self):
+        """Test mismatched and missing signatures are rejected"""
+        body = b'{"ref": "refs/heads/main"}'
+
+        with pytest.raises(WebhookSignatureError):
+            await read_webhook_body(FakeRequest(body), secret="s3cret", signature=sign("other", body))
+
+        missing = FakeRequest(body)
+        with pytest.raises(WebhookSignatureError):
+            await read_webhook_body(missing, secret="s3cret")
+        assert missing.streamed_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_oversize_body_is_rejected_early(self):
+        """Test oversize bodies are rejected from the header or mid-stream"""
+        body = b"x" * 10000
+
+        declared = FakeRequest(body, headers={"content-length": str(len(body))})
+        with pytest.raises(WebhookPayloadTooLargeError):
+            await read_webhook_body(declared, max_bytes=4096)
+        assert declared.streamed_bytes == 0
+
+        undeclared = FakeRequest(body)
+        with pytest.raises(WebhookPayloadTooLargeError):
+            await read_webhook_body(undeclared, max_bytes=4096)
+        assert undeclared.streamed_bytes <= 4096 + undeclared.chunk_size
+
+    def test_extracts_only_handled_fields(self):
+        """Test payloads are reduced to the fields the processor reads"""
+        body = json.dumps({
+            "ref": "refs/heads/main",
+            "commits": [{"id": "a1", "message": "m", "added": ["f"] * 100}],
+            "repository": {"full_name": "org/repo", "owner": {"login": "org"}},
+            "sender": {"login": "someone"},
+        }).encode()
+
+        assert extract_webhook_fields("push", body) == {
+            "ref": "refs/heads/main",
+            "commits": [{"id": "a1"}],
+            "repository": {"full_name": "org/repo"},
+        }
+        assert extract_webhook_fields("watch", b"not even json") is None
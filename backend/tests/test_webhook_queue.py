@@ -0,0 +1,300 @@
+"""
+Tests for the durable webhook ingestion queue and delivery deduplication.
+"""
+
+import pytest
+import asyncio
+
+from codegenapp.services.webhook_dedup import InMemoryDeliveryIdStore, WebhookDeduplicator
+from codegenapp.services.webhook_queue import (
+    SQLiteWebhookQueueStore, WebhookQueue, WebhookQueueFullError, create_webhook_queue_store
+)
+
+from test_connection_manager import wait_until
+
+
+def push_payload(repository: str, number: int):
+    return {"repository": {"full_name": repository}, "number": number}
+
+
+class TestWebhookQueue:
+    """Test suite for webhook queue ordering, retries and recovery"""
+
+    @pytest.mark.asyncio
+    async def test_per_repository_ordering_with_concurrency(self, tmp_path):
+        """Test deliveries for one repository are processed in order, one at a time"""
+        processed = {"org/a": [], "org/b": []}
+        running = {"org/a": 0, "org/b": 0}
+        max_running = {"org/a": 0, "org/b": 0}
+
+        async def handler(event_type, payload, delivery_id):
+            repository = payload["repository"]["full_name"]
+            running[repository] += 1
+            max_running[repository] = max(max_running[repository], running[repository])
+            await asyncio.sleep(0.001)
+            processed[repository].append(payload["number"])
+            running[repository] -= 1
+
+        queue = WebhookQueue(SQLiteWebhookQueueStore(str(tmp_path / "queue.db")), handler, workers=4)
+        await queue.start()
+
+        for number in range(20):
+            await queue.enqueue("push", push_payload("org/a", number), f"a-{number}")
+            await queue.enqueue("push", push_payload("org/b", number), f"b-{number}")
+
+        await asyncio.wait_for(queue.join(), timeout=5)
+        await queue.stop()
+
+        assert processed["org/a"] == list(range(20))
+        assert processed["org/b"] == list(range(20))
+        assert max_running == {"org/a": 1, "org/b": 1}
+
+    @pytest.mark.asyncio
+    async def test_failures_are_retried_then_dead_lettered(self, tmp_path):
+        """Test failing deliveries are retried and dead-lettered after max attempts"""
+        calls = []
+
+        async def handler(event_type, payload, delivery_id):
+            calls.append(delivery_id)
+            if delivery_id == "always" or calls.count(delivery_id) < 2:
+                raise RuntimeError("boom")
+
+        store = SQLiteWebhookQueueStore(str(tmp_path / "queue.db"))
+        queue = WebhookQueue(store, handler, max_attempts=3, retry_base_delay=0.001)
+        await queue.start()
+
+        await queue.enqueue("push", push_payload("org/a", 1), "flaky")
+        await queue.enqueue("push", push_payload("org/b", 1), "always")
+        await asyncio.wait_for(queue.join(), timeout=5)
+
+        stats = queue.get_stats()
+        assert calls.count("flaky") == 2
+        assert calls.count("always") == 3
+        assert (stats["processed"], stats["failed"], stats["depth"]) == (1, 1, 0)
+        assert await store.load_pending() == []
+
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_unprocessed_deliveries_survive_restart(self, tmp_path):
+        """Test deliveries queued before a restart are processed after it"""
+        path = str(tmp_path / "queue.db")
+        release = asyncio.Event()
+
+        async def blocked_handler(event_type, payload, delivery_id):
+            await release.wait()
+
+        queue = WebhookQueue(SQLiteWebhookQueueStore(path), blocked_handler, workers=1, max_depth=2)
+        await queue.start()
+        await queue.enqueue("push", push_payload("org/a", 1), "d1")
+        await queue.enqueue("push", push_payload("org/a", 2), "d2")
+
+        with pytest.raises(WebhookQueueFullError):
+            await queue.enqueue("push", push_payload("org/a", 3), "d3")
+
+        # d1 is claimed and in flight, d2 waits unclaimed in the store
+        await wait_until(lambda: queue.get_stats()["depth"] == 1)
+        await queue.stop()
+
+        processed = []
+
+        async def handler(event_type, payload, delivery_id):
+            processed.append(delivery_id)
+
+        restarted = WebhookQueue(SQLiteWebhookQueueStore(path), handler)
+        await restarted.start()
+        await asyncio.wait_for(restarted.join(), timeout=5)
+        await restarted.stop()
+
+        assert processed == ["d1", "d2"]
+
+    @pytest.mark.asyncio
+    async def test_processes_sharing_a_store_never_handle_the_same_delivery(self, tmp_path):
+        """Test a queue starting next to a busy one does not take its in-flight deliveries"""
+        path = str(tmp_path / "queue.db")
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(event_type, payload, delivery_id):
+            handled.append(delivery_id)
+            if delivery_id == "slow":
+                await release.wait()
+
+        first = WebhookQueue(SQLiteWebhookQueueStore(path), handler, workers=1, poll_interval=0.01)
+        await first.start()
+        await first.enqueue("push", push_payload("org/a", 1), "slow")
+        await wait_until(lambda: handled == ["slow"])
+
+        second = WebhookQueue(SQLiteWebhookQueueStore(path), handler, workers=2, poll_interval=0.01)
+        await second.start()
+        for number in range(10):
+            await second.enqueue("push", push_payload("org/b", number), f"d{number}")
+        await wait_until(lambda: len(handled) == 11)
+
+        release.set()
+        await asyncio.wait_for(first.join(), timeout=5)
+        await first.stop()
+        await second.stop()
+
+        assert sorted(handled) == sorted(["slow"] + [f"d{number}" for number in range(10)])
+
+    @pytest.mark.asyncio
+    async def test_deliveries_of_a_dead_process_are_claimed_after_the_lease(self, tmp_path):
+        """Test a crashed consumer's deliveries are retaken once its lease expires"""
+        path = str(tmp_path / "queue.db")
+
+        async def stuck_handler(event_type, payload, delivery_id):
+            await asyncio.Event().wait()
+
+        crashed = WebhookQueue(SQLiteWebhookQueueStore(path), stuck_handler, lease_seconds=0.2, poll_interval=0.01)
+        await crashed.start()
+        await crashed.enqueue("push", push_payload("org/a", 1), "d1")
+        await wait_until(lambda: crashed.get_stats()["depth"] == 1)
+
+        # Stop the tasks without releasing the claim, like a killed process
+        for task in crashed._worker_tasks + [crashed._claim_task]:
+            task.cancel()
+
+        processed = []
+
+        async def handler(event_type, payload, delivery_id):
+            processed.append(delivery_id)
+
+        survivor = WebhookQueue(SQLiteWebhookQueueStore(path), handler, lease_seconds=0.2, poll_interval=0.01)
+        await survivor.start()
+        await asyncio.sleep(0.1)
+        assert processed == []
+
+        await wait_until(lambda: processed == ["d1"])
+        await survivor.stop()
+
+    @pytest.mark.asyncio
+    async def test_push_storm_does_not_starve_other_repositories(self, tmp_path):
+        """Test a burst for one repository leaves workers for the others"""
+        processed = []
+
+        async def handler(event_type, payload, delivery_id):
+            await asyncio.sleep(0.02)
+            processed.append(delivery_id)
+
+        queue = WebhookQueue(SQLiteWebhookQueueStore(str(tmp_path / "queue.db")), handler, workers=2)
+        await queue.start()
+        for number in range(20):
+            await queue.enqueue("push", push_payload("org/monorepo", number), f"m{number}")
+        await queue.enqueue("push", push_payload("org/b", 1), "b1")
+
+        # Oldest-first claims would fill both slots with the monorepo until it drained
+        await wait_until(lambda: "b1" in processed)
+        assert processed.index("b1") < 5
+        await asyncio.wait_for(queue.join(), timeout=5)
+        await queue.stop()
+        assert [d for d in processed if d.startswith("m")] == [f"m{number}" for number in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_backoff_does_not_hold_a_worker(self, tmp_path):
+        """Test other repositories run while a failed delivery waits for its retry"""
+        processed = []
+
+        async def handler(event_type, payload, delivery_id):
+            processed.append(delivery_id)
+            if processed.count(delivery_id) == 1 and delivery_id == "a1":
+                raise RuntimeError("boom")
+
+        queue = WebhookQueue(
+            SQLiteWebhookQueueStore(str(tmp_path / "queue.db")), handler,
+            workers=1, retry_base_delay=0.3, poll_interval=0.01
+        )
+        await queue.start()
+        await queue.enqueue("push", push_payload("org/a", 1), "a1")
+        await queue.enqueue("push", push_payload("org/a", 2), "a2")
+        await wait_until(lambda: queue.get_stats()["backing_off"] == 1)
+        await queue.enqueue("push", push_payload("org/b", 1), "b1")
+
+        await asyncio.wait_for(queue.join(), timeout=5)
+        await queue.stop()
+
+        # b1 ran during a1's backoff, and a2 still waited for a1
+        assert processed == ["a1", "b1", "a1", "a2"]
+
+    @pytest.mark.asyncio
+    async def test_processes_sharing_a_store_keep_repository_order(self, tmp_path):
+        """Test two processes never run deliveries of one repository concurrently or out of order"""
+        path = str(tmp_path / "queue.db")
+        processed = {"org/a": [], "org/b": []}
+        running = {"org/a": 0, "org/b": 0}
+        max_running = {"org/a": 0, "org/b": 0}
+
+        async def handler(event_type, payload, delivery_id):
+            repository = payload["repository"]["full_name"]
+            running[repository] += 1
+            max_running[repository] = max(max_running[repository], running[repository])
+            await asyncio.sleep(0.005)
+            processed[repository].append(payload["number"])
+            running[repository] -= 1
+
+        queues = [
+            WebhookQueue(SQLiteWebhookQueueStore(path), handler, workers=2, poll_interval=0.01)
+            for _ in range(2)
+        ]
+        for queue in queues:
+            await queue.start()
+        for number in range(10):
+            await queues[number % 2].enqueue("push", push_payload("org/a", number), f"a-{number}")
+            await queues[number % 2].enqueue("push", push_payload("org/b", number), f"b-{number}")
+
+        await asyncio.wait_for(queues[0].join(), timeout=10)
+        for queue in queues:
+            await queue.stop()
+
+        assert processed == {"org/a": list(range(10)), "org/b": list(range(10))}
+        assert max_running == {"org/a": 1, "org/b": 1}
+
+    def test_store_factory(self, tmp_path):
+        """Test stores are created by name"""
+        assert isinstance(
+            create_webhook_queue_store("sqlite", sqlite_path=str(tmp_path / "q.db")),
+            SQLiteWebhookQueueStore
+        )
+
+        with pytest.raises(ValueError):
+            create_webhook_queue_store("redis")
+        with pytest.raises(ValueError):
+            create_webhook_queue_store("kafka")
+
+
+class TestWebhookDeduplication:
+    """Test suite for delivery-ID deduplication"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_deliveries_are_skipped(self):
+        """Test a repeated delivery ID is reported as a duplicate and counted"""
+        deduplicator = WebhookDeduplicator()
+
+        assert not await deduplicator.is_duplicate("delivery-1")
+        assert await deduplicator.is_duplicate("delivery-1")
+        assert not await deduplicator.is_duplicate("delivery-2")
+        assert not await deduplicator.is_duplicate(None)
+
+        assert deduplicator.get_stats()["skipped_duplicates"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ids_expire_and_can_be_forgotten(self):
+        """Test delivery IDs are accepted again after the TTL or forget"""
+        deduplicator = WebhookDeduplicator(ttl=0.01)
+
+        await deduplicator.is_duplicate("delivery-1")
+        await asyncio.sleep(0.02)
+        assert not await deduplicator.is_duplicate("delivery-1")
+
+        await deduplicator.forget("delivery-1")
+        assert not await deduplicator.is_duplicate("delivery-1")
+
+    @pytest.mark.asyncio
+    async def test_shared_store_catches_other_process_duplicates(self):
+        """Test a delivery seen by another process is skipped"""
+        shared = InMemoryDeliveryIdStore()
+        worker_a = WebhookDeduplicator(shared_store=shared)
+        worker_b = WebhookDeduplicator(shared_store=shared)
+
+        assert not await worker_a.is_duplicate("delivery-1")
+        assert await worker_b.is_duplicate("delivery-1")
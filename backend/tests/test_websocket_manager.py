@@ -0,0 +1,91 @@
+"""
+Tests for WebSocketManager broadcast fan-out.
+"""
+
+import pytest
+import asyncio
+import time
+
+from codegenapp.websocket.manager import WebSocketManager
+
+from test_connection_manager import FakeWebSocket, wait_until
+
+
+class RecordingWebSocket(FakeWebSocket):
+    """Fake socket that also keeps the raw payloads it was sent"""
+
+    def __init__(self, send_delay: float = 0.0, fail: bool = False):
+        super().__init__(send_delay)
+        self.fail = fail
+        self.payloads = []
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.payloads.append(data)
+        await super().send_text(data)
+
+
+async def connect_all(manager: WebSocketManager, websockets, project_name: str = "owner/repo"):
+    for websocket in websockets:
+        await manager.connect(websocket, project_name)
+
+
+class TestWebSocketManagerFanOut:
+    """Test suite for concurrent broadcast delivery"""
+
+    @pytest.mark.asyncio
+    async def test_payload_serialized_once_for_all_connections(self):
+        """Test every subscriber receives the same encoded payload"""
+        manager = WebSocketManager()
+        websockets = [RecordingWebSocket() for _ in range(5)]
+        await connect_all(manager, websockets)
+
+        await manager.broadcast_to_project("owner/repo", {"type": "push", "commit_count": 2})
+
+        payloads = [websocket.payloads[-1] for websocket in websockets]
+        assert all(payload is payloads[0] for payload in payloads)
+        assert all(websocket.sent[-1] == {"type": "push", "commit_count": 2} for websocket in websockets)
+
+    @pytest.mark.asyncio
+    async def test_broadcast_latency_bounded_by_slowest_client(self):
+        """Test sends run concurrently instead of one after another"""
+        manager = WebSocketManager()
+        websockets = [RecordingWebSocket() for _ in range(5)]
+        await connect_all(manager, websockets)
+        for websocket in websockets:
+            websocket.send_delay = 0.2
+
+        started = time.monotonic()
+        await manager.broadcast_message({"type": "notification"})
+
+        assert time.monotonic() - started < 0.5
+        assert all(websocket.sent[-1]["type"] == "notification" for websocket in websockets)
+
+    @pytest.mark.asyncio
+    async def test_stuck_and_failed_connections_dropped_together(self):
+        """Test timed-out and failing sockets are removed and closed after one broadcast"""
+        manager = WebSocketManager(send_timeout=0.1)
+        healthy = RecordingWebSocket()
+        stuck = RecordingWebSocket()
+        failed = RecordingWebSocket()
+        await connect_all(manager, [healthy, stuck, failed])
+        await manager.connect(RecordingWebSocket(), "other/repo")
+        other_connections = manager.project_connections["other/repo"]
+
+        stuck.send_delay = 60.0
+        failed.fail = True
+
+        started = time.monotonic()
+        await manager.broadcast_to_project("owner/repo", {"type": "push"})
+
+        assert time.monotonic() - started < 1.0
+        assert healthy.sent[-1] == {"type": "push"}
+        assert manager.project_connections["owner/repo"] == [healthy]
+        assert manager.project_connections["other/repo"] is other_connections
+        assert stuck not in manager.active_connections
+        assert failed not in manager.connection_metadata
+        assert len(manager.active_connections) == 2
+
+        await wait_until(lambda: stuck.closed and failed.closed)
+        assert not healthy.closed